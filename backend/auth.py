@@ -8,9 +8,10 @@ from sqlalchemy.orm import Session
 from config import settings
 from database import get_db
 from models import User
+from user_cache import user_cache
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
@@ -26,6 +27,15 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def hashing_busy() -> HTTPException:
+    """Response for a password hash refused by the hashing pool."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many login attempts in progress, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -50,11 +60,15 @@ def decode_token(token: str) -> Optional[str]:
         return None
 
 
-async def get_current_user(
+def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
 ) -> User:
-    """Get the current authenticated user."""
+    """
+    Get the current authenticated user.
+    
+    A sync dependency, so the lookup runs in the threadpool even for async routes.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -65,9 +79,12 @@ async def get_current_user(
     if username is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.username == username).first()
+    user = user_cache.get(username, db)
     if user is None:
-        raise credentials_exception
+        user = db.query(User).filter(User.username == username).first()
+        if user is None:
+            raise credentials_exception
+        user_cache.put(user)
     
     if not user.is_active:
         raise HTTPException(
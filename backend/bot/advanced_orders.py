@@ -3,34 +3,344 @@ Advanced Trading Strategies for Binance Futures
 Implements: OCO, TWAP, and Grid Trading
 """
 
+import bisect
+import copy
+import hashlib
+import json
 import logging
 import time
-from typing import Dict, Any, List, Optional
+from collections import deque
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
-from decimal import Decimal, ROUND_DOWN
+from decimal import ROUND_DOWN, ROUND_HALF_EVEN
 import threading
+import weakref
 from datetime import datetime, timedelta
+from bot.exchange_info import SymbolFilters, get_exchange_info_cache
+from bot.order_watcher import OrderWatcher
+from bot.scheduler import StrategyScheduler, get_scheduler
+from bot.strategy_store import StrategyStore, get_strategy_store
+from bot.transport import create_client, prepare_client
+from bot.user_stream import UserDataStream, get_user_stream
+from config import settings
 
 logger = logging.getLogger(__name__)
 
+# Maximum orders per futures batchOrders request
+BATCH_ORDER_LIMIT = 5
+# Maximum order IDs per futures batch cancel request
+BATCH_CANCEL_LIMIT = 10
+# Seconds between open-orders polls, made only while the user-data stream is down
+ORDER_POLL_SECONDS = 2
+# Seconds between checks that release stopped grids
+GRID_POLL_SECONDS = 5
+# Most recent grid fills kept per strategy
+GRID_FILL_HISTORY = 500
+# Most recent failed grid replacement orders kept per strategy
+GRID_ERROR_HISTORY = 50
+# A failed grid replacement is retried after this many seconds times the
+# attempt number, up to the attempt limit
+GRID_REPLACE_RETRY_SECONDS = 2
+GRID_REPLACE_MAX_ATTEMPTS = 5
+# What a late TWAP slice does about the slots that passed while it waited:
+# 'merge' trades their quantity now, 'skip' drops them, 'burst' fires each one
+TWAP_CATCH_UP_POLICIES = ('merge', 'skip', 'burst')
+STRATEGY_TYPES = ('OCO', 'TWAP', 'GRID')
+
+# Every live bot in the process, so strategies can be counted across them
+_bots: "weakref.WeakSet[AdvancedOrderBot]" = weakref.WeakSet()
+# Bots rebuilt at startup; nothing else holds on to them
+_recovered_bots: List["AdvancedOrderBot"] = []
+
+
+def account_id(api_key: Optional[str]) -> str:
+    """Store namespace for an API key; the key itself is never written."""
+    return hashlib.sha256((api_key or '').encode()).hexdigest()[:16]
+
+
+def active_strategy_counts() -> Dict[tuple, int]:
+    """Active strategies across all bots in the process, keyed by (type,)."""
+    counts = {(kind,): 0 for kind in STRATEGY_TYPES}
+    for bot in list(_bots):
+        for strategy in list(bot.active_strategies.values()):
+            if strategy.get('status', 'active') == 'active':
+                key = (strategy.get('type', 'OTHER'),)
+                counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def recover_all(
+    credentials: Iterable[Tuple[str, str, bool]],
+    store: Optional[StrategyStore] = None,
+    client_class: type = Client,
+    use_user_stream: bool = True
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Resume every stored strategy at startup.
+    
+    A bot is built only for accounts that have live strategies in the store,
+    and is kept for the life of the process.
+    
+    Args:
+        credentials: (api_key, api_secret, testnet) for each known account
+        store: Strategy store (default: STRATEGY_STORE_PATH, if set)
+        client_class: Client class to build the bots with
+        use_user_stream: Passed to each AdvancedOrderBot
+    
+    Returns:
+        recover_strategies() result per account with stored strategies
+    """
+    store = store if store is not None else get_strategy_store()
+    if store is None:
+        return {}
+    
+    results = {}
+    for api_key, api_secret, testnet in credentials:
+        account = account_id(api_key)
+        if account in results:
+            continue
+        try:
+            if not store.load(account):
+                continue
+            client = create_client(api_key, api_secret, testnet, client_class=client_class)
+            bot = AdvancedOrderBot(client, use_user_stream=use_user_stream, store=store)
+            results[account] = bot.recover_strategies()
+            _recovered_bots.append(bot)
+        except Exception as e:
+            logger.error(f"Failed to recover strategies for account {account}: {str(e)}")
+            results[account] = {'success': False, 'error': str(e)}
+    return results
+
 
 class AdvancedOrderBot:
     """
     Advanced trading bot with OCO, TWAP, and Grid Trading support.
     """
     
-    def __init__(self, client: Client):
+    def __init__(
+        self,
+        client: Client,
+        use_user_stream: bool = True,
+        scheduler: Optional[StrategyScheduler] = None,
+        store: Optional[StrategyStore] = None
+    ):
         """
         Initialize advanced order bot.
         
         Args:
             client: Initialized Binance client
+            use_user_stream: Track fills via the user-data stream instead of
+                polling (default: True)
+            scheduler: Scheduler that runs strategy work (default: the shared one)
+            store: Durable strategy store (default: STRATEGY_STORE_PATH, if set)
         """
-        self.client = client
+        self.client = prepare_client(client)
+        self.exchange_info = get_exchange_info_cache(getattr(client, 'testnet', False))
         self.active_strategies = {}
+        self.use_user_stream = use_user_stream
+        self.user_stream: Optional[UserDataStream] = None
+        self.scheduler = scheduler or get_scheduler()
+        self.order_watcher = OrderWatcher(
+            self.client,
+            interval_seconds=ORDER_POLL_SECONDS,
+            scheduler=self.scheduler,
+            should_poll=self._should_poll
+        )
+        self.store = store if store is not None else get_strategy_store()
+        # Strategies are stored per API key
+        self.account = account_id(getattr(client, 'API_KEY', None))
+        self._snapshot_task = None
+        # Held around every change to a strategy together with its journal
+        # entry, so a snapshot never sees a change without its sequence number
+        self._state_lock = threading.RLock()
+        # Finished strategies already removed from the store
+        self._purged = set()
+        _bots.add(self)
         logger.info("Advanced Order Bot initialized")
     
+    def _get_user_stream(self) -> Optional[UserDataStream]:
+        """Shared user-data stream for this bot's key, or None to poll."""
+        if not self.use_user_stream:
+            return None
+        if self.user_stream is None:
+            try:
+                stream = get_user_stream(self.client)
+            except Exception as e:
+                logger.warning(f"User-data stream unavailable, polling instead: {str(e)}")
+                return None
+            # The stream is shared and outlives this bot, so hold the bot weakly
+            bot = weakref.ref(self)
+            
+            def reconcile():
+                alive = bot()
+                if alive is not None:
+                    alive._reconcile_orders()
+            
+            stream.add_connect_listener(reconcile)
+            self.user_stream = stream
+        return self.user_stream
+    
+    def _reconcile_orders(self) -> None:
+        """
+        Poll every watched symbol once after the user stream (re)connects.
+        
+        Polling stops as soon as the stream is healthy again, so fills made
+        during the outage would otherwise never be seen.
+        """
+        self.scheduler.submit(self.order_watcher.poll, True, owner=self._task_owner('reconcile'))
+    
+    def _should_poll(self) -> bool:
+        """Whether order statuses must come from REST rather than the stream."""
+        return not (self.use_user_stream and self.user_stream is not None and self.user_stream.is_healthy())
+    
+    def _task_owner(self, strategy_id: str) -> str:
+        """Scheduler owner tag; strategy IDs are only unique within one bot."""
+        return f"{id(self)}:{strategy_id}"
+    
+    def _new_strategy_id(self, prefix: str) -> str:
+        """Timestamped strategy ID, suffixed when several start in one second."""
+        base = f"{prefix}_{int(time.time())}"
+        strategy_id = base
+        suffix = 1
+        while strategy_id in self.active_strategies:
+            suffix += 1
+            strategy_id = f"{base}_{suffix}"
+        return strategy_id
+    
+    def _journal(self, strategy_id: str, op: str, data: Dict[str, Any]) -> None:
+        """Record a strategy change in the store; never fails the caller."""
+        if self.store is None or strategy_id in self._purged:
+            return
+        try:
+            self.store.record(self.account, strategy_id, op, data)
+        except Exception as e:
+            logger.error(f"Failed to journal {op} for {strategy_id}: {str(e)}")
+            return
+        self._start_snapshots()
+    
+    def _start_snapshots(self) -> None:
+        """Schedule periodic snapshots once this bot has state worth keeping."""
+        if self._snapshot_task is None:
+            self._snapshot_task = self.scheduler.call_every(
+                settings.STRATEGY_SNAPSHOT_SECONDS,
+                self.snapshot_strategies,
+                owner=self._task_owner('snapshots')
+            )
+    
+    def _set_status(self, strategy_id: str, status: str) -> bool:
+        """
+        Move an active strategy to another status and journal it.
+        
+        Any status other than 'active' is final, so a strategy that was
+        stopped is never later reported as completed.
+        
+        Returns:
+            True if the status was changed
+        """
+        with self._state_lock:
+            strategy = self.active_strategies[strategy_id]
+            if strategy.get('status', 'active') != 'active':
+                return False
+            strategy['status'] = status
+            self._journal(strategy_id, 'set', {'status': status})
+        return True
+    
+    def _is_active(self, strategy_id: str) -> bool:
+        """Whether a strategy may still place or replace orders."""
+        strategy = self.active_strategies.get(strategy_id)
+        return strategy is not None and strategy.get('status', 'active') == 'active'
+    
+    def _stop_strategy(self, strategy_id: str) -> List[int]:
+        """
+        Stop a strategy: cancel its scheduled work and deadline and detach
+        its order monitors.
+        
+        Returns:
+            Order IDs it may still have resting on the book
+        """
+        self._set_status(strategy_id, 'stopped')
+        self.scheduler.cancel_owner(self._task_owner(strategy_id))
+        order_ids = self._strategy_order_ids(self.active_strategies[strategy_id])
+        for order_id in order_ids:
+            self.order_watcher.unwatch(order_id)
+            if self.user_stream is not None:
+                self.user_stream.remove_order(order_id)
+        return order_ids
+    
+    def snapshot_strategies(self) -> int:
+        """
+        Fold the journal into snapshots of the active strategies and purge
+        finished ones from the store.
+        
+        The strategies are copied under the state lock together with the
+        journal position they reflect, so no change is stored twice.
+        
+        Returns:
+            Number of strategies written
+        """
+        if self.store is None:
+            return 0
+        try:
+            with self._state_lock:
+                seq = self.store.last_seq(self.account)
+                active = {}
+                finished = []
+                for sid, strategy in self.active_strategies.items():
+                    if strategy.get('status', 'active') == 'active':
+                        active[sid] = copy.deepcopy(strategy)
+                    elif sid not in self._purged:
+                        finished.append(sid)
+                self._purged.update(finished)
+            written = self.store.snapshot(self.account, active, seq=seq)
+            if finished:
+                self.store.purge(self.account, finished)
+            return written
+        except Exception as e:
+            logger.error(f"Strategy snapshot failed: {str(e)}")
+            return 0
+    
+    def place_batch_orders(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Place several orders through the futures batch-orders endpoint.
+        
+        Orders are sent in chunks of BATCH_ORDER_LIMIT. A rejected order does
+        not affect the others in its chunk.
+        
+        Args:
+            orders: Order parameter dicts as accepted by futures_create_order
+        
+        Returns:
+            List aligned with ``orders``: the exchange order for each accepted
+            order, or a dict with 'error' (and 'error_code') for each rejected one
+        """
+        results = []
+        
+        for start in range(0, len(orders), BATCH_ORDER_LIMIT):
+            chunk = orders[start:start + BATCH_ORDER_LIMIT]
+            # The endpoint takes a JSON list of string-valued orders
+            batch = [{key: str(value) for key, value in params.items()} for params in chunk]
+            
+            try:
+                response = self.client.futures_place_batch_order(batchOrders=batch)
+            except BinanceAPIException as e:
+                logger.error(f"Batch order request failed: {e.message}")
+                results.extend({'error': e.message, 'error_code': e.code} for _ in chunk)
+                continue
+            except Exception as e:
+                logger.error(f"Batch order request failed: {str(e)}")
+                results.extend({'error': str(e)} for _ in chunk)
+                continue
+            
+            # Responses come back in request order; failures carry code/msg
+            for item in response:
+                if 'orderId' in item:
+                    results.append(item)
+                else:
+                    results.append({'error': item.get('msg', 'Unknown error'), 'error_code': item.get('code')})
+        
+        return results
+    
     def place_oco_order(
         self,
         symbol: str,
@@ -51,10 +361,10 @@ class AdvancedOrderBot:
             price: Limit order price (take profit)
             stop_price: Stop price (stop loss trigger)
             stop_limit_price: Stop limit price (stop loss execution)
-            
+        
         Returns:
             Dictionary with order details
-            
+        
         Example:
             # Buy BTC, set take-profit at $95,000 and stop-loss at $90,000
             bot.place_oco_order('BTCUSDT', 'SELL', 0.001, 95000, 90000, 89900)
@@ -78,60 +388,67 @@ class AdvancedOrderBot:
                 if price >= stop_price:
                     raise ValueError("For BUY: Take profit price must be lower than stop price")
             
-            # Get symbol info for price precision
-            exchange_info = self.client.futures_exchange_info()
-            symbol_info = next(s for s in exchange_info['symbols'] if s['symbol'] == symbol)
-            price_filter = next(f for f in symbol_info['filters'] if f['filterType'] == 'PRICE_FILTER')
-            tick_size = float(price_filter['tickSize'])
-            
-            # Round prices to tick size
-            import math
-            price = math.floor(price / tick_size) * tick_size
-            stop_price = math.floor(stop_price / tick_size) * tick_size
-            stop_limit_price = math.floor(stop_limit_price / tick_size) * tick_size
-            
-            # Place limit order (take profit)
-            take_profit_order = self.client.futures_create_order(
-                symbol=symbol,
-                side=side,
-                type='LIMIT',
-                timeInForce='GTC',
-                quantity=quantity,
-                price=price
-            )
-            
-            logger.info(f"Take profit order placed: {take_profit_order['orderId']}")
+            # Round prices down to tick size
+            filters = self.exchange_info.get(symbol, self.client)
+            price = float(filters.quantize_price(price, ROUND_DOWN))
+            stop_price = float(filters.quantize_price(stop_price, ROUND_DOWN))
+            stop_limit_price = float(filters.quantize_price(stop_limit_price, ROUND_DOWN))
             
-            # Place stop-limit order (stop loss) - same side as take profit
+            # Place take profit (limit) and stop loss (stop-limit) in one request.
             # For closing a position, both orders should be on the same side
-            stop_loss_order = self.client.futures_create_order(
-                symbol=symbol,
-                side=side,
-                type='STOP',
-                timeInForce='GTC',
-                quantity=quantity,
-                stopPrice=stop_price,
-                price=stop_limit_price
-            )
+            take_profit_order, stop_loss_order = self.place_batch_orders([
+                {
+                    'symbol': symbol,
+                    'side': side,
+                    'type': 'LIMIT',
+                    'timeInForce': 'GTC',
+                    'quantity': quantity,
+                    'price': price
+                },
+                {
+                    'symbol': symbol,
+                    'side': side,
+                    'type': 'STOP',
+                    'timeInForce': 'GTC',
+                    'quantity': quantity,
+                    'stopPrice': stop_price,
+                    'price': stop_limit_price
+                }
+            ])
+            
+            if 'error' in take_profit_order or 'error' in stop_loss_order:
+                # Never leave half an OCO pair resting on the book
+                for leg in (take_profit_order, stop_loss_order):
+                    if 'orderId' in leg:
+                        try:
+                            self.client.futures_cancel_order(symbol=symbol, orderId=leg['orderId'])
+                        except Exception as e:
+                            logger.error(f"Failed to cancel OCO leg {leg['orderId']}: {str(e)}")
+                failed = take_profit_order if 'error' in take_profit_order else stop_loss_order
+                return {
+                    'success': False,
+                    'error': failed['error'],
+                    'error_code': failed.get('error_code')
+                }
             
+            logger.info(f"Take profit order placed: {take_profit_order['orderId']}")
             logger.info(f"Stop loss order placed: {stop_loss_order['orderId']}")
             
             # Store OCO pair
-            oco_id = f"OCO_{int(time.time())}"
-            self.active_strategies[oco_id] = {
-                'type': 'OCO',
-                'symbol': symbol,
-                'take_profit_order_id': take_profit_order['orderId'],
-                'stop_loss_order_id': stop_loss_order['orderId'],
-                'created_at': datetime.now().isoformat()
-            }
+            with self._state_lock:
+                oco_id = self._new_strategy_id('OCO')
+                self.active_strategies[oco_id] = {
+                    'type': 'OCO',
+                    'symbol': symbol,
+                    'take_profit_order_id': take_profit_order['orderId'],
+                    'stop_loss_order_id': stop_loss_order['orderId'],
+                    'status': 'active',
+                    'created_at': datetime.now().isoformat()
+                }
+                self._journal(oco_id, 'create', self.active_strategies[oco_id])
             
-            # Monitor OCO orders in background
-            threading.Thread(
-                target=self._monitor_oco_orders,
-                args=(oco_id, symbol, take_profit_order['orderId'], stop_loss_order['orderId']),
-                daemon=True
-            ).start()
+            # Monitor OCO orders on the scheduler
+            self._monitor_oco_orders(oco_id, symbol, take_profit_order['orderId'], stop_loss_order['orderId'])
             
             result = {
                 'success': True,
@@ -151,7 +468,7 @@ class AdvancedOrderBot:
             
             logger.info(f"OCO order placed successfully: {oco_id}")
             return result
-            
+        
         except BinanceAPIException as e:
             logger.error(f"Binance API error in OCO order: {e.message}")
             return {
@@ -167,40 +484,61 @@ class AdvancedOrderBot:
             }
     
     def _monitor_oco_orders(self, oco_id: str, symbol: str, tp_order_id: int, sl_order_id: int):
-        """Monitor OCO orders and cancel the opposite one when one is filled."""
-        try:
-            while True:
-                time.sleep(2)
-                
-                # Check take profit order
-                tp_order = self.client.futures_get_order(symbol=symbol, orderId=tp_order_id)
-                
-                if tp_order['status'] == 'FILLED':
-                    logger.info(f"OCO {oco_id}: Take profit filled, cancelling stop loss")
-                    try:
-                        self.client.futures_cancel_order(symbol=symbol, orderId=sl_order_id)
-                    except:
-                        pass
-                    break
-                
-                # Check stop loss order
-                sl_order = self.client.futures_get_order(symbol=symbol, orderId=sl_order_id)
+        """
+        Monitor OCO orders and cancel the opposite one when one is filled.
+        
+        Fills arrive through the user-data stream; the order watcher polls
+        over REST only while the stream is unavailable. Returns at once.
+        """
+        owner = self._task_owner(oco_id)
+        lock = threading.Lock()
+        statuses = {tp_order_id: 'NEW', sl_order_id: 'NEW'}
+        state = {'done': False}
+        stream = self._get_user_stream()
+        
+        def finish():
+            state['done'] = True
+            self.scheduler.cancel_owner(owner)
+            for order_id in (tp_order_id, sl_order_id):
+                self.order_watcher.unwatch(order_id)
+                if stream is not None:
+                    stream.remove_order(order_id)
+            if self._is_active(oco_id):
+                self._set_status(oco_id, 'completed')
+        
+        def on_update(update: Dict[str, Any]):
+            with lock:
+                if state['done']:
+                    return
+                if not self._is_active(oco_id):
+                    # Stopped elsewhere; just let go of the orders
+                    finish()
+                    return
+                statuses[update['order_id']] = update['status']
                 
-                if sl_order['status'] == 'FILLED':
-                    logger.info(f"OCO {oco_id}: Stop loss triggered, cancelling take profit")
+                if update['status'] == 'FILLED':
+                    if update['order_id'] == tp_order_id:
+                        logger.info(f"OCO {oco_id}: Take profit filled, cancelling stop loss")
+                        sibling = sl_order_id
+                    else:
+                        logger.info(f"OCO {oco_id}: Stop loss triggered, cancelling take profit")
+                        sibling = tp_order_id
                     try:
-                        self.client.futures_cancel_order(symbol=symbol, orderId=tp_order_id)
-                    except:
-                        pass
-                    break
+                        self.client.futures_cancel_order(symbol=symbol, orderId=sibling)
+                    except Exception as e:
+                        logger.warning(f"OCO {oco_id}: Failed to cancel order {sibling}: {str(e)}")
+                    finish()
                 
                 # Check if both are cancelled
-                if tp_order['status'] == 'CANCELED' and sl_order['status'] == 'CANCELED':
+                elif all(status in ('CANCELED', 'EXPIRED') for status in statuses.values()):
                     logger.info(f"OCO {oco_id}: Both orders cancelled")
-                    break
-                    
-        except Exception as e:
-            logger.error(f"Error monitoring OCO orders: {str(e)}")
+                    finish()
+        
+        for order_id in (tp_order_id, sl_order_id):
+            self.order_watcher.watch(symbol, order_id, on_update)
+            if stream is not None:
+                # Hand the REST work to the scheduler's pool, off the stream thread
+                stream.on_order(order_id, lambda update: self.scheduler.submit(on_update, update, owner=owner))
     
     def place_twap_order(
         self,
@@ -208,22 +546,28 @@ class AdvancedOrderBot:
         side: str,
         total_quantity: float,
         duration_minutes: int,
-        num_orders: int = 10
+        num_orders: int = 10,
+        catch_up: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Place TWAP (Time-Weighted Average Price) order.
         Splits a large order into smaller chunks executed over time.
         
+        Slice i is due at start + i * interval on the monotonic clock, so the
+        latency of earlier slices never delays later ones.
+        
         Args:
             symbol: Trading pair (e.g., 'BTCUSDT')
             side: 'BUY' or 'SELL'
             total_quantity: Total quantity to trade
             duration_minutes: Time period to spread orders over
             num_orders: Number of smaller orders to split into
-            
+            catch_up: Policy for slots missed by a late slice, one of
+                TWAP_CATCH_UP_POLICIES (default: TWAP_CATCH_UP_POLICY)
+        
         Returns:
             Dictionary with strategy details
-            
+        
         Example:
             # Buy 0.1 BTC over 30 minutes in 10 equal chunks
             bot.place_twap_order('BTCUSDT', 'BUY', 0.1, 30, 10)
@@ -245,50 +589,43 @@ class AdvancedOrderBot:
             if num_orders <= 0:
                 raise ValueError("Number of orders must be positive")
             
+            catch_up = catch_up or settings.TWAP_CATCH_UP_POLICY
+            if catch_up not in TWAP_CATCH_UP_POLICIES:
+                raise ValueError(f"Catch-up policy must be one of {', '.join(TWAP_CATCH_UP_POLICIES)}")
+            
             # Calculate order parameters
             order_quantity = total_quantity / num_orders
             interval_seconds = (duration_minutes * 60) / num_orders
             
-            # Get symbol info for precision
-            exchange_info = self.client.futures_exchange_info()
-            symbol_info = None
-            for s in exchange_info['symbols']:
-                if s['symbol'] == symbol:
-                    symbol_info = s
-                    break
-            
-            if not symbol_info:
-                raise ValueError(f"Symbol {symbol} not found")
-            
-            # Get quantity precision
-            for filter in symbol_info['filters']:
-                if filter['filterType'] == 'LOT_SIZE':
-                    step_size = float(filter['stepSize'])
-                    # Round quantity to step size
-                    order_quantity = round(order_quantity / step_size) * step_size
-                    break
-            
-            twap_id = f"TWAP_{int(time.time())}"
-            self.active_strategies[twap_id] = {
-                'type': 'TWAP',
-                'symbol': symbol,
-                'side': side,
-                'total_quantity': total_quantity,
-                'order_quantity': order_quantity,
-                'num_orders': num_orders,
-                'interval_seconds': interval_seconds,
-                'orders_placed': 0,
-                'orders': [],
-                'status': 'active',
-                'created_at': datetime.now().isoformat()
-            }
+            # Round quantity to step size
+            filters = self.exchange_info.get(symbol, self.client)
+            order_quantity = float(filters.quantize_quantity(order_quantity, ROUND_HALF_EVEN))
+            
+            with self._state_lock:
+                twap_id = self._new_strategy_id('TWAP')
+                self.active_strategies[twap_id] = {
+                    'type': 'TWAP',
+                    'symbol': symbol,
+                    'side': side,
+                    'total_quantity': total_quantity,
+                    'order_quantity': order_quantity,
+                    'num_orders': num_orders,
+                    'interval_seconds': interval_seconds,
+                    'catch_up': catch_up,
+                    'orders_placed': 0,
+                    'orders': [],
+                    # Next slot to fire and scheduling-lag figures
+                    'next_slice': 0,
+                    'slots_missed': 0,
+                    'last_lag_ms': None,
+                    'max_lag_ms': 0.0,
+                    'status': 'active',
+                    'created_at': datetime.now().isoformat()
+                }
+                self._journal(twap_id, 'create', self.active_strategies[twap_id])
             
-            # Execute TWAP in background thread
-            threading.Thread(
-                target=self._execute_twap,
-                args=(twap_id, symbol, side, order_quantity, num_orders, interval_seconds),
-                daemon=True
-            ).start()
+            # Execute TWAP slices on the scheduler
+            self._execute_twap(twap_id, symbol, side, order_quantity, num_orders, interval_seconds)
             
             result = {
                 'success': True,
@@ -302,7 +639,7 @@ class AdvancedOrderBot:
             
             logger.info(f"TWAP order initiated: {twap_id}")
             return result
-            
+        
         except Exception as e:
             logger.error(f"Error placing TWAP order: {str(e)}")
             return {
@@ -310,52 +647,148 @@ class AdvancedOrderBot:
                 'error': str(e)
             }
     
-    def _execute_twap(self, twap_id: str, symbol: str, side: str, quantity: float, num_orders: int, interval: float):
-        """Execute TWAP strategy in background."""
+    def _execute_twap(
+        self,
+        twap_id: str,
+        symbol: str,
+        side: str,
+        quantity: float,
+        num_orders: int,
+        interval: float,
+        first_index: int = 0
+    ):
+        """
+        Schedule the TWAP slices, starting at ``first_index`` (non-zero when
+        resuming a recovered TWAP).
+        
+        Only the next slice is ever pending; each one schedules its successor
+        at a fixed offset from the start so delays do not accumulate. The
+        strategy is expired if it overruns its duration by
+        TWAP_DEADLINE_GRACE_SECONDS.
+        """
+        owner = self._task_owner(twap_id)
+        started = time.monotonic() - first_index * interval
+        
+        def expire(_owner: str):
+            strategy = self.active_strategies[twap_id]
+            self._set_status(twap_id, 'expired')
+            logger.warning(f"TWAP {twap_id} expired after {strategy['orders_placed']}/{num_orders} orders")
+        
+        remaining = (num_orders - first_index) * interval
+        self.scheduler.set_deadline(owner, remaining + settings.TWAP_DEADLINE_GRACE_SECONDS, expire)
+        self.scheduler.submit(
+            self._execute_twap_slice, twap_id, symbol, side, quantity, num_orders, interval, first_index, started,
+            owner=owner
+        )
+    
+    def _execute_twap_slice(
+        self,
+        twap_id: str,
+        symbol: str,
+        side: str,
+        quantity: float,
+        num_orders: int,
+        interval: float,
+        index: int,
+        started: float
+    ):
+        """
+        Place the slice due at ``started + index * interval`` and schedule the
+        next one.
+        
+        A slice that runs late records its lag and applies the strategy's
+        catch-up policy to any later slots that have also come due.
+        """
+        owner = self._task_owner(twap_id)
         try:
             strategy = self.active_strategies[twap_id]
             
-            for i in range(num_orders):
-                if strategy.get('status') == 'cancelled':
-                    logger.info(f"TWAP {twap_id} cancelled after {i} orders")
-                    break
+            if not self._is_active(twap_id):
+                logger.info(f"TWAP {twap_id} {strategy.get('status')} after {strategy['orders_placed']} orders")
+                return
+            
+            lag = max(0.0, time.monotonic() - (started + index * interval))
+            missed = 0
+            if strategy.get('catch_up', 'burst') != 'burst' and interval > 0:
+                missed = min(int(lag // interval), num_orders - 1 - index)
+            
+            slice_quantity = quantity
+            if missed and strategy['catch_up'] == 'merge':
+                filters = self.exchange_info.get(symbol, self.client)
+                slice_quantity = float(filters.quantize_quantity(quantity * (missed + 1), ROUND_HALF_EVEN))
+            if missed:
+                logger.warning(f"TWAP {twap_id}: slice {index+1} is {lag:.1f}s late, {missed} missed slots ({strategy['catch_up']})")
+            
+            try:
+                # Place market order for this chunk
+                order = self.client.futures_create_order(
+                    symbol=symbol,
+                    side=side,
+                    type='MARKET',
+                    quantity=slice_quantity
+                )
                 
-                try:
-                    # Place market order for this chunk
-                    order = self.client.futures_create_order(
-                        symbol=symbol,
-                        side=side,
-                        type='MARKET',
-                        quantity=quantity
-                    )
-                    
-                    strategy['orders'].append({
-                        'order_id': order['orderId'],
-                        'quantity': quantity,
-                        'status': order['status'],
-                        'timestamp': datetime.now().isoformat()
-                    })
+                record = {
+                    'order_id': order['orderId'],
+                    'quantity': slice_quantity,
+                    'status': order['status'],
+                    'slice': index,
+                    'lag_ms': round(lag * 1000, 3),
+                    'timestamp': datetime.now().isoformat()
+                }
+                with self._state_lock:
+                    strategy['orders'].append(record)
                     strategy['orders_placed'] += 1
-                    
-                    logger.info(f"TWAP {twap_id}: Order {i+1}/{num_orders} placed - {order['orderId']}")
-                    
-                    # Wait for next interval (except for last order)
-                    if i < num_orders - 1:
-                        time.sleep(interval)
-                        
-                except BinanceAPIException as e:
-                    logger.error(f"TWAP {twap_id}: Order {i+1} failed - {e.message}")
-                    strategy['orders'].append({
-                        'error': e.message,
-                        'timestamp': datetime.now().isoformat()
-                    })
-            
-            strategy['status'] = 'completed'
-            logger.info(f"TWAP {twap_id} completed: {strategy['orders_placed']}/{num_orders} orders placed")
+                    self._journal(twap_id, 'append', {'key': 'orders', 'value': record})
+                
+                logger.info(f"TWAP {twap_id}: Order {index+1}/{num_orders} placed - {order['orderId']}")
+            
+            except BinanceAPIException as e:
+                logger.error(f"TWAP {twap_id}: Order {index+1} failed - {e.message}")
+                record = {
+                    'error': e.message,
+                    'slice': index,
+                    'lag_ms': round(lag * 1000, 3),
+                    'timestamp': datetime.now().isoformat()
+                }
+                with self._state_lock:
+                    strategy['orders'].append(record)
+                    self._journal(twap_id, 'append', {'key': 'orders', 'value': record})
             
+            index += missed
+            with self._state_lock:
+                strategy['next_slice'] = index + 1
+                strategy['slots_missed'] = strategy.get('slots_missed', 0) + missed
+                strategy['last_lag_ms'] = round(lag * 1000, 3)
+                strategy['max_lag_ms'] = max(strategy.get('max_lag_ms', 0.0), strategy['last_lag_ms'])
+                self._journal(twap_id, 'set', {
+                    key: strategy[key]
+                    for key in ('orders_placed', 'next_slice', 'slots_missed', 'last_lag_ms', 'max_lag_ms')
+                })
+            
+            if not self._is_active(twap_id):
+                # Stopped while this slice's order was in flight
+                return
+            if index < num_orders - 1:
+                # Next slot on the fixed schedule (except after the last order)
+                self.scheduler.call_at(
+                    started + (index + 1) * interval,
+                    self._execute_twap_slice, twap_id, symbol, side, quantity, num_orders, interval, index + 1, started,
+                    owner=owner
+                )
+                if not self._is_active(twap_id):
+                    # Stopped while the next slice was being queued
+                    self.scheduler.cancel_owner(owner)
+                return
+            
+            self.scheduler.cancel_owner(owner)
+            self._set_status(twap_id, 'completed')
+            logger.info(f"TWAP {twap_id} completed: {strategy['orders_placed']}/{num_orders} orders placed")
+        
         except Exception as e:
             logger.error(f"Error executing TWAP {twap_id}: {str(e)}")
-            self.active_strategies[twap_id]['status'] = 'error'
+            self.scheduler.cancel_owner(owner)
+            self._set_status(twap_id, 'error')
     
     def start_grid_trading(
         self,
@@ -375,10 +808,10 @@ class AdvancedOrderBot:
             upper_price: Upper bound of grid
             num_grids: Number of grid levels
             quantity_per_grid: Quantity for each grid order
-            
+        
         Returns:
             Dictionary with grid strategy details
-            
+        
         Example:
             # Create 10 grid levels between $90,000 and $95,000
             bot.start_grid_trading('BTCUSDT', 90000, 95000, 10, 0.001)
@@ -407,84 +840,71 @@ class AdvancedOrderBot:
             price_step = (upper_price - lower_price) / (num_grids - 1)
             grid_levels = [lower_price + (i * price_step) for i in range(num_grids)]
             
-            # Get symbol info for precision
-            exchange_info = self.client.futures_exchange_info()
-            symbol_info = None
-            for s in exchange_info['symbols']:
-                if s['symbol'] == symbol:
-                    symbol_info = s
-                    break
-            
-            # Get price precision
-            tick_size = None
-            for filter in symbol_info['filters']:
-                if filter['filterType'] == 'PRICE_FILTER':
-                    tick_size = float(filter['tickSize'])
-                    break
-            
-            grid_id = f"GRID_{int(time.time())}"
-            self.active_strategies[grid_id] = {
-                'type': 'GRID',
-                'symbol': symbol,
-                'lower_price': lower_price,
-                'upper_price': upper_price,
-                'num_grids': num_grids,
-                'quantity_per_grid': quantity_per_grid,
-                'grid_levels': grid_levels,
-                'orders': [],
-                'active_orders': 0,
-                'total_trades': 0,
-                'status': 'active',
-                'created_at': datetime.now().isoformat()
-            }
+            # Get price precision and round levels to tick size
+            filters = self.exchange_info.get(symbol, self.client)
+            levels = [float(filters.quantize_price(level, ROUND_HALF_EVEN)) for level in grid_levels]
+            # Buy below current price, sell above
+            split = bisect.bisect_left(levels, current_price)
             
-            # Place initial grid orders
-            for level in grid_levels:
-                # Round to tick size
-                level = round(level / tick_size) * tick_size
-                
-                try:
-                    if level < current_price:
-                        # Place buy order below current price
-                        order = self.client.futures_create_order(
-                            symbol=symbol,
-                            side='BUY',
-                            type='LIMIT',
-                            timeInForce='GTC',
-                            quantity=quantity_per_grid,
-                            price=level
-                        )
-                        logger.info(f"Grid buy order placed at ${level}: {order['orderId']}")
-                    else:
-                        # Place sell order above current price
-                        order = self.client.futures_create_order(
-                            symbol=symbol,
-                            side='SELL',
-                            type='LIMIT',
-                            timeInForce='GTC',
-                            quantity=quantity_per_grid,
-                            price=level
-                        )
-                        logger.info(f"Grid sell order placed at ${level}: {order['orderId']}")
+            with self._state_lock:
+                grid_id = self._new_strategy_id('GRID')
+                self.active_strategies[grid_id] = {
+                    'type': 'GRID',
+                    'symbol': symbol,
+                    'lower_price': lower_price,
+                    'upper_price': upper_price,
+                    'num_grids': num_grids,
+                    'quantity_per_grid': quantity_per_grid,
+                    'grid_levels': grid_levels,
+                    # Sorted tick-rounded prices and the live order at each one
+                    'levels': levels,
+                    'slots': [None] * len(levels),
+                    # Open order ID -> index into levels
+                    'open_orders': {},
+                    'fills': deque(maxlen=GRID_FILL_HISTORY),
+                    'active_orders': 0,
+                    'total_trades': 0,
+                    'status': 'active',
+                    'created_at': datetime.now().isoformat()
+                }
+            
+            # Place initial grid orders in batches
+            grid_orders = [
+                {
+                    'symbol': symbol,
+                    'side': 'BUY' if index < split else 'SELL',
+                    'type': 'LIMIT',
+                    'timeInForce': 'GTC',
+                    'quantity': quantity_per_grid,
+                    'price': level
+                }
+                for index, level in enumerate(levels)
+            ]
+            
+            results = self.place_batch_orders(grid_orders)
+            
+            strategy = self.active_strategies[grid_id]
+            with self._state_lock:
+                for index, (params, order) in enumerate(zip(grid_orders, results)):
+                    level = params['price']
+                    if 'error' in order:
+                        logger.error(f"Failed to place grid order at ${level}: {order['error']}")
+                        continue
                     
-                    self.active_strategies[grid_id]['orders'].append({
+                    logger.info(f"Grid {params['side'].lower()} order placed at ${level}: {order['orderId']}")
+                    strategy['slots'][index] = {
                         'order_id': order['orderId'],
                         'price': level,
                         'quantity': quantity_per_grid,
-                        'side': 'BUY' if level < current_price else 'SELL',
+                        'side': params['side'],
                         'status': order['status']
-                    })
-                    self.active_strategies[grid_id]['active_orders'] += 1
-                    
-                except BinanceAPIException as e:
-                    logger.error(f"Failed to place grid order at ${level}: {e.message}")
+                    }
+                    strategy['open_orders'][order['orderId']] = index
+                strategy['active_orders'] = len(strategy['open_orders'])
+                self._journal(grid_id, 'create', strategy)
             
-            # Monitor grid in background
-            threading.Thread(
-                target=self._monitor_grid,
-                args=(grid_id, symbol, current_price, grid_levels, quantity_per_grid, tick_size),
-                daemon=True
-            ).start()
+            # Monitor grid on the scheduler
+            self._monitor_grid(grid_id, symbol, current_price, grid_levels, quantity_per_grid, filters)
             
             result = {
                 'success': True,
@@ -495,13 +915,13 @@ class AdvancedOrderBot:
                 'grid_spacing': price_step,
                 'quantity_per_grid': quantity_per_grid,
                 'grid_levels': grid_levels,
-                'orders': self.active_strategies[grid_id]['orders'],
+                'orders': [slot for slot in strategy['slots'] if slot is not None],
                 'current_price': current_price
             }
             
             logger.info(f"Grid trading started: {grid_id}")
             return result
-            
+        
         except Exception as e:
             logger.error(f"Error starting grid trading: {str(e)}")
             return {
@@ -509,94 +929,429 @@ class AdvancedOrderBot:
                 'error': str(e)
             }
     
-    def _monitor_grid(self, grid_id: str, symbol: str, initial_price: float, grid_levels: List[float], quantity: float, tick_size: float):
-        """Monitor grid orders and replace filled ones."""
-        try:
-            strategy = self.active_strategies[grid_id]
-            
-            while strategy.get('status') == 'active':
-                time.sleep(5)
+    def _monitor_grid(self, grid_id: str, symbol: str, initial_price: Optional[float], grid_levels: List[float], quantity: float, filters: SymbolFilters):
+        """
+        Monitor grid orders and replace filled ones.
+        
+        Fills arrive through the user-data stream; the order watcher polls
+        over REST only while the stream is unavailable. A scheduled check
+        releases the grid once it is no longer active. Returns at once.
+        
+        Work per fill is constant: the filled order is found through the
+        open-order index and its level's slot is replaced in place.
+        """
+        owner = self._task_owner(grid_id)
+        strategy = self.active_strategies[grid_id]
+        lock = threading.Lock()
+        stream = self._get_user_stream()
+        
+        def watch(order_id: int):
+            self.order_watcher.watch(symbol, order_id, lambda update: on_status(order_id, update['status']))
+            if stream is not None:
+                stream.on_order(
+                    order_id,
+                    lambda update: self.scheduler.submit(on_status, order_id, update['status'], owner=owner)
+                )
+        
+        def release(order_id: int):
+            self.order_watcher.unwatch(order_id)
+            if stream is not None:
+                stream.remove_order(order_id)
+        
+        def on_status(order_id: int, status: str):
+            with lock:
+                if strategy.get('status') != 'active' or order_id not in strategy['open_orders']:
+                    return
                 
-                # Check each order
-                for order_info in strategy['orders']:
-                    if order_info.get('checked'):
-                        continue
+                if status in ('CANCELED', 'EXPIRED', 'REJECTED'):
+                    # Cancelled outside the bot; leave the level empty
+                    release(order_id)
+                    with self._state_lock:
+                        index = strategy['open_orders'].pop(order_id)
+                        strategy['slots'][index] = None
+                        strategy['active_orders'] = len(strategy['open_orders'])
+                        self._journal(grid_id, 'set_item', {'key': 'slots', 'index': index, 'value': None})
+                    return
+                
+                if status != 'FILLED':
+                    return
+                
+                release(order_id)
+                with self._state_lock:
+                    index = strategy['open_orders'].pop(order_id)
+                    filled = strategy['slots'][index]
+                    logger.info(f"Grid order filled: {order_id} at ${filled['price']}")
+                    strategy['total_trades'] += 1
+                    fill = {
+                        'order_id': order_id,
+                        'price': filled['price'],
+                        'quantity': filled['quantity'],
+                        'side': filled['side'],
+                        'filled_at': datetime.now().isoformat()
+                    }
+                    strategy['fills'].append(fill)
                     
+                    # Place opposite order at the same level
+                    opposite_side = 'SELL' if filled['side'] == 'BUY' else 'BUY'
+                    price = strategy['levels'][index]
+                    strategy['slots'][index] = None
+                    strategy['active_orders'] = len(strategy['open_orders'])
+                    self._journal(grid_id, 'append', {'key': 'fills', 'value': fill, 'maxlen': GRID_FILL_HISTORY})
+                    self._journal(grid_id, 'set_item', {'key': 'slots', 'index': index, 'value': None})
+                    self._journal(grid_id, 'set', {'total_trades': strategy['total_trades']})
+                
+                replace(index, opposite_side, price, 1)
+        
+        def replace(index: int, side: str, price: float, attempt: int):
+            # Called with the lock held
+            if not self._is_active(grid_id) or strategy['slots'][index] is not None:
+                return
+            
+            try:
+                new_order = self.client.futures_create_order(
+                    symbol=symbol,
+                    side=side,
+                    type='LIMIT',
+                    timeInForce='GTC',
+                    quantity=quantity,
+                    price=price
+                )
+            except Exception as e:
+                message = getattr(e, 'message', None) or str(e)
+                retry = attempt < GRID_REPLACE_MAX_ATTEMPTS
+                logger.error(
+                    f"Grid replacement {side} at ${price} failed (attempt {attempt}): {message}"
+                    + (", retrying" if retry else ", leaving the level empty")
+                )
+                error = {
+                    'index': index,
+                    'side': side,
+                    'price': price,
+                    'attempt': attempt,
+                    'error': message,
+                    'failed_at': datetime.now().isoformat()
+                }
+                with self._state_lock:
+                    errors = strategy.setdefault('errors', [])
+                    errors.append(error)
+                    del errors[:-GRID_ERROR_HISTORY]
+                    self._journal(grid_id, 'append', {'key': 'errors', 'value': error, 'maxlen': GRID_ERROR_HISTORY})
+                if retry:
+                    self.scheduler.call_later(
+                        GRID_REPLACE_RETRY_SECONDS * attempt, retry_replace, index, side, price, attempt + 1,
+                        owner=owner
+                    )
+                return
+            
+            if not self._is_active(grid_id):
+                # Stopped while the replacement was in flight; take it back off the book
+                self.cancel_orders(symbol, [new_order['orderId']])
+                return
+            
+            with self._state_lock:
+                strategy['slots'][index] = {
+                    'order_id': new_order['orderId'],
+                    'price': price,
+                    'quantity': quantity,
+                    'side': side,
+                    'status': new_order['status']
+                }
+                strategy['open_orders'][new_order['orderId']] = index
+                strategy['active_orders'] = len(strategy['open_orders'])
+                self._journal(grid_id, 'set_item', {'key': 'slots', 'index': index, 'value': strategy['slots'][index]})
+            watch(new_order['orderId'])
+            
+            logger.info(f"Grid order replaced with {side} at ${price}")
+        
+        def retry_replace(index: int, side: str, price: float, attempt: int):
+            with lock:
+                replace(index, side, price, attempt)
+        
+        def poll():
+            if strategy.get('status') != 'active':
+                self.scheduler.cancel_owner(owner)
+                with lock:
+                    for slot in strategy['slots']:
+                        if slot is not None:
+                            release(slot['order_id'])
+        
+        with lock:
+            for order_id in list(strategy['open_orders']):
+                watch(order_id)
+        self.scheduler.call_every(GRID_POLL_SECONDS, poll, owner=owner)
+    
+    def cancel_orders(self, symbol: str, order_ids: List[int], owns_symbol: bool = False) -> Dict[str, Any]:
+        """
+        Cancel a set of orders on one symbol with as few requests as possible.
+        
+        Only orders that are still open are targeted. When the caller owns the
+        symbol and every open order on it is in ``order_ids``, a single
+        cancel-all request is used; otherwise the batch cancel endpoint is
+        called in chunks of BATCH_CANCEL_LIMIT.
+        
+        Args:
+            symbol: Trading pair symbol
+            order_ids: Order IDs to cancel
+            owns_symbol: Whether no other strategy has orders on this symbol
+        
+        Returns:
+            Dictionary with the cancelled count and a per-order outcome list
+        """
+        try:
+            open_ids = {order['orderId'] for order in self.client.futures_get_open_orders(symbol=symbol)}
+            
+            outcomes = {}
+            targets = []
+            for order_id in dict.fromkeys(order_ids):
+                if order_id in open_ids:
+                    targets.append(order_id)
+                else:
+                    outcomes[order_id] = {'order_id': order_id, 'status': 'NOT_OPEN'}
+            
+            requests = 1
+            if targets and owns_symbol and open_ids.issubset(targets):
+                # Every open order on the symbol is ours - clear them in one call
+                self.client.futures_cancel_all_open_orders(symbol=symbol)
+                requests += 1
+                for order_id in targets:
+                    outcomes[order_id] = {'order_id': order_id, 'status': 'CANCELED'}
+            else:
+                for start in range(0, len(targets), BATCH_CANCEL_LIMIT):
+                    chunk = targets[start:start + BATCH_CANCEL_LIMIT]
+                    requests += 1
                     try:
-                        order = self.client.futures_get_order(
+                        response = self.client.futures_cancel_orders(
                             symbol=symbol,
-                            orderId=order_info['order_id']
+                            orderIdList=json.dumps(chunk)
                         )
-                        
-                        if order['status'] == 'FILLED':
-                            logger.info(f"Grid order filled: {order_info['order_id']} at ${order_info['price']}")
-                            order_info['checked'] = True
-                            strategy['total_trades'] += 1
-                            strategy['active_orders'] -= 1
-                            
-                            # Place opposite order at the same level
-                            opposite_side = 'SELL' if order_info['side'] == 'BUY' else 'BUY'
-                            price = round(order_info['price'] / tick_size) * tick_size
-                            
-                            new_order = self.client.futures_create_order(
-                                symbol=symbol,
-                                side=opposite_side,
-                                type='LIMIT',
-                                timeInForce='GTC',
-                                quantity=quantity,
-                                price=price
-                            )
-                            
-                            strategy['orders'].append({
-                                'order_id': new_order['orderId'],
-                                'price': price,
-                                'side': opposite_side,
-                                'status': new_order['status']
-                            })
-                            strategy['active_orders'] += 1
-                            
-                            logger.info(f"Grid order replaced with {opposite_side} at ${price}")
-                            
-                    except Exception as e:
-                        logger.error(f"Error checking grid order: {str(e)}")
-                        
+                    except BinanceAPIException as e:
+                        logger.error(f"Batch cancel failed for {symbol}: {e.message}")
+                        for order_id in chunk:
+                            outcomes[order_id] = {'order_id': order_id, 'status': 'ERROR', 'error': e.message, 'error_code': e.code}
+                        continue
+                    
+                    # Responses come back in request order; failures carry code/msg
+                    for order_id, item in zip(chunk, response):
+                        if 'orderId' in item:
+                            outcomes[order_id] = {'order_id': order_id, 'status': item['status']}
+                        else:
+                            outcomes[order_id] = {
+                                'order_id': order_id,
+                                'status': 'ERROR',
+                                'error': item.get('msg', 'Unknown error'),
+                                'error_code': item.get('code')
+                            }
+            
+            results = [outcomes[order_id] for order_id in dict.fromkeys(order_ids)]
+            cancelled = sum(1 for r in results if r['status'] == 'CANCELED')
+            logger.info(f"Cancelled {cancelled}/{len(targets)} open orders on {symbol} in {requests} requests")
+            
+            return {
+                'success': True,
+                'symbol': symbol,
+                'orders_cancelled': cancelled,
+                'requests': requests,
+                'results': results
+            }
+        
+        except BinanceAPIException as e:
+            logger.error(f"Binance API error: {e.message} (Code: {e.code})")
+            return {
+                'success': False,
+                'error': e.message,
+                'error_code': e.code
+            }
         except Exception as e:
-            logger.error(f"Error monitoring grid {grid_id}: {str(e)}")
+            logger.error(f"Error cancelling orders on {symbol}: {str(e)}")
+            return {'success': False, 'error': str(e)}
+    
+    def _strategy_order_ids(self, strategy: Dict[str, Any]) -> List[int]:
+        """Order IDs a strategy may still have resting on the book."""
+        if strategy['type'] == 'OCO':
+            return [strategy['take_profit_order_id'], strategy['stop_loss_order_id']]
+        if 'open_orders' in strategy:
+            return list(strategy['open_orders'])
+        return [
+            order_info['order_id']
+            for order_info in strategy.get('orders', [])
+            if not order_info.get('checked') and 'order_id' in order_info
+        ]
+    
+    def _owns_symbol(self, symbol: str, strategy_ids: List[str]) -> bool:
+        """Whether no strategy outside ``strategy_ids`` is running on the symbol."""
+        return not any(
+            s['symbol'] == symbol and s.get('status', 'active') == 'active'
+            for sid, s in self.active_strategies.items()
+            if sid not in strategy_ids
+        )
+    
+    def _mark_cancelled(self, strategy: Dict[str, Any], results: List[Dict[str, Any]]) -> None:
+        """Record cancel outcomes on a strategy's order book-keeping."""
+        statuses = {r['order_id']: r['status'] for r in results}
+        with self._state_lock:
+            if 'open_orders' in strategy:
+                for order_id, status in statuses.items():
+                    index = strategy['open_orders'].get(order_id)
+                    if index is None or status not in ('CANCELED', 'NOT_OPEN'):
+                        continue
+                    del strategy['open_orders'][order_id]
+                    if status == 'CANCELED':
+                        strategy['slots'][index]['status'] = status
+                strategy['active_orders'] = len(strategy['open_orders'])
+                return
+            for order_info in strategy.get('orders', []):
+                status = statuses.get(order_info.get('order_id'))
+                if status in ('CANCELED', 'NOT_OPEN'):
+                    order_info['checked'] = True
+                    if status == 'CANCELED':
+                        order_info['status'] = status
     
     def stop_grid_trading(self, grid_id: str) -> Dict[str, Any]:
-        """Stop grid trading and cancel all orders."""
+        """Stop grid trading and cancel all of its open orders."""
         try:
             if grid_id not in self.active_strategies:
                 return {'success': False, 'error': 'Grid ID not found'}
             
             strategy = self.active_strategies[grid_id]
-            strategy['status'] = 'stopped'
+            order_ids = self._stop_strategy(grid_id)
             
             symbol = strategy['symbol']
-            cancelled = 0
-            
-            for order_info in strategy['orders']:
-                try:
-                    self.client.futures_cancel_order(
-                        symbol=symbol,
-                        orderId=order_info['order_id']
-                    )
-                    cancelled += 1
-                except:
-                    pass
+            result = self.cancel_orders(
+                symbol,
+                order_ids,
+                owns_symbol=self._owns_symbol(symbol, [grid_id])
+            )
+            if not result['success']:
+                return result
             
-            logger.info(f"Grid {grid_id} stopped. Cancelled {cancelled} orders.")
+            self._mark_cancelled(strategy, result['results'])
+            logger.info(f"Grid {grid_id} stopped. Cancelled {result['orders_cancelled']} orders.")
             
             return {
                 'success': True,
                 'grid_id': grid_id,
-                'orders_cancelled': cancelled
+                'orders_cancelled': result['orders_cancelled'],
+                'results': result['results']
             }
-            
+        
         except Exception as e:
             logger.error(f"Error stopping grid: {str(e)}")
             return {'success': False, 'error': str(e)}
     
+    def emergency_stop(self, symbol: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Stop every active strategy and cancel their open orders.
+        
+        Open positions are left as they are; only resting orders are removed.
+        
+        Args:
+            symbol: Optional symbol to restrict the stop to. If None, all symbols.
+        
+        Returns:
+            Dictionary with per-symbol cancellation results
+        """
+        by_symbol = {}
+        for sid, strategy in self.active_strategies.items():
+            if symbol and strategy['symbol'] != symbol:
+                continue
+            if strategy.get('status', 'active') != 'active':
+                continue
+            by_symbol.setdefault(strategy['symbol'], []).append(sid)
+        
+        results = {}
+        for sym, strategy_ids in by_symbol.items():
+            order_ids = []
+            for sid in strategy_ids:
+                order_ids.extend(self._stop_strategy(sid))
+            
+            # Every strategy on the symbol is stopping, so it is ours to clear
+            results[sym] = self.cancel_orders(sym, order_ids, owns_symbol=True)
+            if results[sym]['success']:
+                for sid in strategy_ids:
+                    self._mark_cancelled(self.active_strategies[sid], results[sym]['results'])
+        
+        logger.warning(f"Emergency stop: {sum(len(ids) for ids in by_symbol.values())} strategies on {len(by_symbol)} symbols")
+        
+        return {
+            'success': all(r['success'] for r in results.values()),
+            'strategies_stopped': sum(len(ids) for ids in by_symbol.values()),
+            'symbols': results
+        }
+    
+    def recover_strategies(self) -> Dict[str, Any]:
+        """
+        Reload this account's live strategies from the store and resume them.
+        
+        Monitors are re-attached first, then a single reconciliation pass
+        makes one open-orders request per symbol. Only tracked orders that
+        left the book while the process was down are looked up individually,
+        and their fills are handled as if they had just happened.
+        
+        Returns:
+            Dictionary with the recovered count per strategy type
+        """
+        if self.store is None:
+            return {'success': False, 'error': 'Strategy store is disabled'}
+        
+        try:
+            states = self.store.load(self.account, active_only=False)
+            # Finished strategies left behind by an earlier process
+            finished = [sid for sid, state in states.items() if state.get('status', 'active') != 'active']
+            if finished:
+                self.store.purge(self.account, finished)
+        except Exception as e:
+            logger.error(f"Failed to load strategies: {str(e)}")
+            return {'success': False, 'error': str(e)}
+        
+        recovered = {}
+        failed = {}
+        for sid, state in states.items():
+            if sid in self.active_strategies or sid in finished:
+                continue
+            symbol = state['symbol']
+            try:
+                if state['type'] == 'GRID':
+                    state['fills'] = deque(state.get('fills', []), maxlen=GRID_FILL_HISTORY)
+                    state['open_orders'] = {
+                        slot['order_id']: index
+                        for index, slot in enumerate(state['slots'])
+                        if slot is not None and slot.get('status') != 'CANCELED'
+                    }
+                    state['active_orders'] = len(state['open_orders'])
+                with self._state_lock:
+                    self.active_strategies[sid] = state
+                if state['type'] == 'OCO':
+                    self._monitor_oco_orders(sid, symbol, state['take_profit_order_id'], state['stop_loss_order_id'])
+                elif state['type'] == 'GRID':
+                    filters = self.exchange_info.get(symbol, self.client)
+                    self._monitor_grid(sid, symbol, None, state['grid_levels'], state['quantity_per_grid'], filters)
+                elif state['type'] == 'TWAP' and state.get('next_slice', len(state['orders'])) >= state['num_orders']:
+                    self._set_status(sid, 'completed')
+                elif state['type'] == 'TWAP':
+                    # Resume with the next slice rather than replaying missed ones
+                    self._execute_twap(
+                        sid, symbol, state['side'], state['order_quantity'], state['num_orders'],
+                        state['interval_seconds'], first_index=state.get('next_slice', len(state['orders']))
+                    )
+                recovered[state['type']] = recovered.get(state['type'], 0) + 1
+            except Exception as e:
+                logger.error(f"Failed to recover strategy {sid}: {str(e)}")
+                with self._state_lock:
+                    self.active_strategies.pop(sid, None)
+                failed[sid] = str(e)
+        
+        # One reconciliation pass over every symbol, whatever the stream state
+        self.order_watcher.poll(force=True)
+        if recovered:
+            self._start_snapshots()
+        
+        logger.info(f"Recovered {sum(recovered.values())} strategies: {recovered}")
+        return {
+            'success': not failed,
+            'recovered': recovered,
+            'failed': failed
+        }
+    
     def get_strategy_status(self, strategy_id: str) -> Dict[str, Any]:
         """Get status of an active strategy."""
         if strategy_id not in self.active_strategies:
@@ -0,0 +1,533 @@
+"""
+Asyncio counterpart of BasicBot for the FastAPI routes.
+All bots share one aiohttp connection pool, so an event loop can keep many
+exchange requests in flight without tying up threadpool workers.
+"""
+
+import asyncio
+import logging
+import weakref
+from typing import Dict, Any, Optional, Literal, Set
+
+import aiohttp
+from binance.client import AsyncClient
+from binance.exceptions import BinanceAPIException, BinanceOrderException
+
+from bot.basic_bot import (
+    format_account_balance,
+    format_cancel_result,
+    format_limit_order,
+    format_market_order,
+    format_open_orders,
+    format_order_status,
+    format_stop_limit_order,
+)
+from bot.exchange_info import ExchangeInfoCache, SymbolFilters, get_exchange_info_cache
+from bot.market_data import get_market_data
+from bot.transport import create_client, prepare_client
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+_connector: Optional[aiohttp.TCPConnector] = None
+# Exchange info download in flight per cache, shared by concurrent requests
+_refreshes: "weakref.WeakKeyDictionary[ExchangeInfoCache, asyncio.Task]" = weakref.WeakKeyDictionary()
+
+
+def get_shared_connector() -> aiohttp.TCPConnector:
+    """Return the process-wide aiohttp connector, creating it on first use."""
+    global _connector
+    if _connector is None or _connector.closed:
+        _connector = aiohttp.TCPConnector(
+            limit=settings.BINANCE_ASYNC_POOL_LIMIT,
+            ttl_dns_cache=300,
+            keepalive_timeout=60
+        )
+    return _connector
+
+
+async def close_shared_connector() -> None:
+    """Close the shared connector and every pooled connection."""
+    global _connector
+    if _connector is not None and not _connector.closed:
+        await _connector.close()
+    _connector = None
+
+
+class PooledAsyncClient(AsyncClient):
+    """AsyncClient whose session borrows connections from the shared pool."""
+    
+    def _init_session(self) -> aiohttp.ClientSession:
+        return aiohttp.ClientSession(
+            connector=get_shared_connector(),
+            connector_owner=False,
+            headers=self._get_headers(),
+            **self._session_params
+        )
+
+
+_public_bots: Dict[bool, "AsyncBasicBot"] = {}
+
+# Session closes scheduled on the loop; referenced so they are not collected early
+_closing: Set[asyncio.Task] = set()
+
+
+def get_public_bot(testnet: bool) -> "AsyncBasicBot":
+    """
+    Return a key-less bot for public market data on an environment.
+    
+    Only unsigned endpoints (prices, exchange info) may be used through it.
+    """
+    testnet = bool(testnet)
+    bot = _public_bots.get(testnet)
+    if bot is None:
+        bot = AsyncBasicBot(None, None, testnet=testnet)
+        _public_bots[testnet] = bot
+    return bot
+
+
+async def close_public_bots() -> None:
+    """Close the sessions of the key-less market-data bots."""
+    while _public_bots:
+        _, bot = _public_bots.popitem()
+        await bot.aclose()
+
+
+class AsyncBasicBot:
+    """
+    Async trading bot for Binance Futures Testnet.
+    Mirrors the BasicBot method surface and return values.
+    """
+    
+    def __init__(self, api_key: str, api_secret: str, testnet: bool = True):
+        """
+        Initialize the async trading bot.
+        
+        No network I/O happens here; the first request opens a pooled connection.
+        
+        Args:
+            api_key: Binance API key
+            api_secret: Binance API secret
+            testnet: Whether to use testnet (default: True)
+        """
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.testnet = testnet
+        self.exchange_info = get_exchange_info_cache(testnet)
+        self.market_data = get_market_data(testnet)
+        self.client = prepare_client(
+            create_client(api_key, api_secret, testnet=testnet, client_class=PooledAsyncClient)
+        )
+        logger.info(f"Async bot initialized. Testnet: {testnet}")
+    
+    def close(self) -> None:
+        """
+        Close the bot's session; pooled connections stay with the connector.
+        
+        Safe to call from any thread: off the client's loop the close is handed
+        to that loop, on it the close runs as a task.
+        """
+        session = self.client.session
+        if session is None or session.closed:
+            return
+        loop = self.client.loop
+        if loop.is_closed():
+            # Loop already gone; nothing left to release
+            return
+        
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        
+        if running is loop:
+            task = loop.create_task(session.close())
+            _closing.add(task)
+            task.add_done_callback(_closing.discard)
+        elif loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+        else:
+            loop.run_until_complete(session.close())
+    
+    async def aclose(self) -> None:
+        """Close the bot's session and wait for it; call from the client's loop."""
+        session = self.client.session
+        if session is not None and not session.closed:
+            await session.close()
+    
+    async def _get_filters(self, symbol: str) -> SymbolFilters:
+        """Look up symbol filters, loading the shared cache if it is stale."""
+        filters = self.exchange_info.lookup(symbol)
+        if filters is None or self.exchange_info.needs_refresh():
+            await self._refresh_exchange_info()
+            filters = self.exchange_info.lookup(symbol)
+        if filters is None:
+            raise ValueError(f"Symbol {symbol} not found")
+        return filters
+    
+    async def _refresh_exchange_info(self) -> None:
+        """Reload the shared cache, joining a download already in flight."""
+        cache = self.exchange_info
+        task = _refreshes.get(cache)
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._download_exchange_info())
+            _refreshes[cache] = task
+        # A cancelled caller must not cancel the download for the others
+        await asyncio.shield(task)
+    
+    async def _download_exchange_info(self) -> None:
+        self.exchange_info.load(await self.client.futures_exchange_info())
+    
+    async def _validate_and_format_quantity(
+        self,
+        symbol: str,
+        quantity: float,
+        price: Optional[float] = None
+    ) -> str:
+        """
+        Validate and format quantity according to symbol's lot size and
+        notional rules; market orders (no price) are valued at the streamed
+        mark price, or skip the notional check until one is cached.
+        """
+        filters = await self._get_filters(symbol)
+        if price is None and filters.min_notional:
+            price = self._mark_price(symbol)
+        return str(filters.validate_quantity(quantity, price))
+    
+    def _mark_price(self, symbol: str) -> Optional[float]:
+        """
+        Fresh price from the market-data stream, preferring the mark price.
+        
+        Subscribes the symbol on first use and never calls REST; returns None
+        until a price has streamed in, leaving the notional check to the
+        exchange.
+        """
+        price = self.market_data.get_price(symbol)
+        if price is None:
+            return None
+        quote = self.market_data.get_quote(symbol)
+        return quote['mark_price'] if quote and quote['mark_price'] is not None else price
+    
+    async def get_account_balance(self) -> Dict[str, Any]:
+        """
+        Get account balance information.
+        
+        Returns:
+            Dictionary containing account balance information
+        """
+        try:
+            logger.info("Fetching account balance...")
+            account = await self.client.futures_account()
+            return format_account_balance(account)
+        
+        except BinanceAPIException as e:
+            logger.error(f"API error while fetching balance: {e.message}")
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error while fetching balance: {str(e)}")
+            raise
+    
+    async def place_market_order(
+        self,
+        symbol: str,
+        side: Literal['BUY', 'SELL'],
+        quantity: float
+    ) -> Dict[str, Any]:
+        """
+        Place a market order.
+        
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTCUSDT')
+            side: Order side ('BUY' or 'SELL')
+            quantity: Order quantity
+        
+        Returns:
+            Dictionary containing order details
+        """
+        try:
+            logger.info(f"Placing MARKET {side} order: {quantity} {symbol}")
+            
+            if side not in ['BUY', 'SELL']:
+                raise ValueError("Side must be 'BUY' or 'SELL'")
+            
+            formatted_quantity = await self._validate_and_format_quantity(symbol, quantity)
+            
+            order = await self.client.futures_create_order(
+                symbol=symbol,
+                side=side,
+                type='MARKET',
+                quantity=formatted_quantity
+            )
+            
+            logger.info(f"Market order placed successfully. Order ID: {order['orderId']}")
+            return format_market_order(order)
+        
+        except (BinanceAPIException, BinanceOrderException) as e:
+            logger.error(f"Binance API error: {e.message} (Code: {e.code})")
+            return {
+                'success': False,
+                'error': e.message,
+                'error_code': e.code
+            }
+        except Exception as e:
+            logger.error(f"Unexpected error placing market order: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    async def place_limit_order(
+        self,
+        symbol: str,
+        side: Literal['BUY', 'SELL'],
+        quantity: float,
+        price: float,
+        time_in_force: str = 'GTC'
+    ) -> Dict[str, Any]:
+        """
+        Place a limit order.
+        
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTCUSDT')
+            side: Order side ('BUY' or 'SELL')
+            quantity: Order quantity
+            price: Limit price
+            time_in_force: Time in force (default: 'GTC' - Good Till Cancel)
+        
+        Returns:
+            Dictionary containing order details
+        """
+        try:
+            logger.info(f"Placing LIMIT {side} order: {quantity} {symbol} @ {price}")
+            
+            if side not in ['BUY', 'SELL']:
+                raise ValueError("Side must be 'BUY' or 'SELL'")
+            
+            formatted_quantity = await self._validate_and_format_quantity(symbol, quantity, price)
+            
+            order = await self.client.futures_create_order(
+                symbol=symbol,
+                side=side,
+                type='LIMIT',
+                quantity=formatted_quantity,
+                price=str(price),
+                timeInForce=time_in_force
+            )
+            
+            logger.info(f"Limit order placed successfully. Order ID: {order['orderId']}")
+            return format_limit_order(order)
+        
+        except (BinanceAPIException, BinanceOrderException) as e:
+            logger.error(f"Binance API error: {e.message} (Code: {e.code})")
+            return {
+                'success': False,
+                'error': e.message,
+                'error_code': e.code
+            }
+        except Exception as e:
+            logger.error(f"Unexpected error placing limit order: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    async def place_stop_limit_order(
+        self,
+        symbol: str,
+        side: Literal['BUY', 'SELL'],
+        quantity: float,
+        stop_price: float,
+        limit_price: float,
+        time_in_force: str = 'GTC'
+    ) -> Dict[str, Any]:
+        """
+        Place a stop-limit order.
+        
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTCUSDT')
+            side: Order side ('BUY' or 'SELL')
+            quantity: Order quantity
+            stop_price: Stop price to trigger the order
+            limit_price: Limit price for the order
+            time_in_force: Time in force (default: 'GTC' - Good Till Cancel)
+        
+        Returns:
+            Dictionary containing order details
+        """
+        try:
+            logger.info(f"Placing STOP_LIMIT {side} order: {quantity} {symbol} stop@{stop_price} limit@{limit_price}")
+            
+            if side not in ['BUY', 'SELL']:
+                raise ValueError("Side must be 'BUY' or 'SELL'")
+            
+            formatted_quantity = await self._validate_and_format_quantity(symbol, quantity, limit_price)
+            
+            order = await self.client.futures_create_order(
+                symbol=symbol,
+                side=side,
+                type='STOP',
+                quantity=formatted_quantity,
+                price=str(limit_price),
+                stopPrice=str(stop_price),
+                timeInForce=time_in_force
+            )
+            
+            logger.info(f"Stop-limit order placed successfully. Order ID: {order['orderId']}")
+            return format_stop_limit_order(order)
+        
+        except BinanceAPIException as e:
+            logger.error(f"Binance API error: {e.message} (Code: {e.code})")
+            return {
+                'success': False,
+                'error': e.message,
+                'error_code': e.code
+            }
+        except Exception as e:
+            logger.error(f"Unexpected error placing stop-limit order: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    async def cancel_order(self, symbol: str, order_id: int) -> Dict[str, Any]:
+        """
+        Cancel an existing order.
+        
+        Args:
+            symbol: Trading pair symbol
+            order_id: Order ID to cancel
+        
+        Returns:
+            Dictionary containing cancellation details
+        """
+        try:
+            logger.info(f"Cancelling order {order_id} for {symbol}")
+            
+            result = await self.client.futures_cancel_order(
+                symbol=symbol,
+                orderId=order_id
+            )
+            
+            logger.info(f"Order {order_id} cancelled successfully")
+            return format_cancel_result(result)
+        
+        except BinanceAPIException as e:
+            logger.error(f"Binance API error: {e.message} (Code: {e.code})")
+            return {
+                'success': False,
+                'error': e.message,
+                'error_code': e.code
+            }
+        except Exception as e:
+            logger.error(f"Unexpected error cancelling order: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    async def get_order_status(self, symbol: str, order_id: int) -> Dict[str, Any]:
+        """
+        Get the status of an order.
+        
+        Args:
+            symbol: Trading pair symbol
+            order_id: Order ID
+        
+        Returns:
+            Dictionary containing order status
+        """
+        try:
+            logger.info(f"Fetching status for order {order_id} on {symbol}")
+            
+            order = await self.client.futures_get_order(
+                symbol=symbol,
+                orderId=order_id
+            )
+            return format_order_status(order)
+        
+        except BinanceAPIException as e:
+            logger.error(f"Binance API error: {e.message} (Code: {e.code})")
+            return {
+                'success': False,
+                'error': e.message,
+                'error_code': e.code
+            }
+        except Exception as e:
+            logger.error(f"Unexpected error fetching order status: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    async def get_open_orders(self, symbol: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get all open orders.
+        
+        Args:
+            symbol: Optional trading pair symbol. If None, returns all open orders.
+        
+        Returns:
+            Dictionary containing open orders
+        """
+        try:
+            logger.info(f"Fetching open orders{' for ' + symbol if symbol else ''}")
+            
+            if symbol:
+                orders = await self.client.futures_get_open_orders(symbol=symbol)
+            else:
+                orders = await self.client.futures_get_open_orders()
+            
+            result = format_open_orders(orders)
+            logger.info(f"Found {result['count']} open orders")
+            
+            return result
+        
+        except BinanceAPIException as e:
+            logger.error(f"Binance API error: {e.message} (Code: {e.code})")
+            return {
+                'success': False,
+                'error': e.message,
+                'error_code': e.code
+            }
+        except Exception as e:
+            logger.error(f"Unexpected error fetching open orders: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    async def get_current_price(self, symbol: str) -> Optional[float]:
+        """
+        Get the current price for a symbol.
+        
+        Served from the shared market-data cache when it holds a fresh price
+        (the bid/ask midpoint), otherwise the last trade price over REST.
+        
+        Args:
+            symbol: Trading pair symbol
+        
+        Returns:
+            Current price as float, or None if error
+        """
+        try:
+            # Unlisted symbols are rejected before any stream or REST call
+            await self._get_filters(symbol)
+        except Exception as e:
+            logger.error(f"Error fetching current price: {str(e)}")
+            return None
+        
+        price = self.market_data.get_price(symbol)
+        if price is not None:
+            return price
+        
+        try:
+            ticker = await self.client.futures_symbol_ticker(symbol=symbol)
+            price = float(ticker['price'])
+            self.market_data.record_price(symbol, price)
+            logger.info(f"Current price for {symbol}: {price}")
+            return price
+        
+        except Exception as e:
+            logger.error(f"Error fetching current price: {str(e)}")
+            return None
@@ -0,0 +1,484 @@
+"""
+Backtester for the OCO, TWAP and grid strategies.
+Replays OHLCV bars (or trades) through the same order logic as
+AdvancedOrderBot, with fill detection vectorised over whole price arrays.
+"""
+
+import argparse
+import json
+import logging
+from decimal import ROUND_DOWN, ROUND_HALF_EVEN
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from bot.exchange_info import SymbolFilters
+
+logger = logging.getLogger(__name__)
+
+BUY = 1
+SELL = -1
+# Bars per block in the grid simulator; bounds memory to a few MB per level
+GRID_BLOCK_BARS = 32768
+
+
+class Bars:
+    """OHLC(V) price bars as parallel NumPy arrays; timestamps in ms."""
+    
+    __slots__ = ('timestamps', 'open', 'high', 'low', 'close', 'volume')
+    
+    def __init__(self, timestamps, open, high, low, close, volume=None):
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.open = np.asarray(open, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+        self.volume = None if volume is None else np.asarray(volume, dtype=np.float64)
+        
+        n = len(self.timestamps)
+        if n == 0:
+            raise ValueError("At least one bar is required")
+        if any(len(a) != n for a in (self.open, self.high, self.low, self.close)):
+            raise ValueError("Bar arrays must have the same length")
+    
+    def __len__(self) -> int:
+        return len(self.timestamps)
+    
+    @classmethod
+    def from_trades(cls, timestamps, prices, quantities=None, bar_ms: Optional[int] = None) -> 'Bars':
+        """
+        Build bars from trade prints.
+        
+        Args:
+            timestamps: Trade times in ms (ascending)
+            prices: Trade prices
+            quantities: Optional trade sizes (become bar volume)
+            bar_ms: Aggregate trades into bars of this length; None keeps
+                one bar per trade
+        """
+        ts = np.asarray(timestamps, dtype=np.int64)
+        px = np.asarray(prices, dtype=np.float64)
+        qty = None if quantities is None else np.asarray(quantities, dtype=np.float64)
+        if bar_ms is None:
+            return cls(ts, px, px, px, px, qty)
+        
+        buckets = ts // bar_ms
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        ends = np.r_[starts[1:] - 1, len(px) - 1]
+        return cls(
+            buckets[starts] * bar_ms,
+            px[starts],
+            np.maximum.reduceat(px, starts),
+            np.minimum.reduceat(px, starts),
+            px[ends],
+            None if qty is None else np.add.reduceat(qty, starts)
+        )
+
+
+def load_bars(path: str) -> Bars:
+    """
+    Load bars from a CSV file.
+    
+    Accepts Binance kline exports (open_time, open, high, low, close,
+    volume, ...) with or without a header row.
+    """
+    with open(path) as f:
+        first = f.readline().split(',')
+    has_header = not first[0].strip().replace('.', '', 1).isdigit()
+    columns = (0, 1, 2, 3, 4, 5) if len(first) > 5 else (0, 1, 2, 3, 4)
+    
+    data = np.loadtxt(path, delimiter=',', skiprows=1 if has_header else 0, usecols=columns, ndmin=2)
+    return Bars(
+        data[:, 0].astype(np.int64),
+        data[:, 1],
+        data[:, 2],
+        data[:, 3],
+        data[:, 4],
+        data[:, 5] if len(columns) > 5 else None
+    )
+
+
+class BacktestResult:
+    """Fills, PnL and equity curve of one simulated strategy."""
+    
+    def __init__(
+        self,
+        strategy: str,
+        bars: Bars,
+        fills: Dict[str, np.ndarray],
+        position: np.ndarray,
+        equity: np.ndarray,
+        fees: float,
+        details: Optional[Dict[str, Any]] = None
+    ):
+        self.strategy = strategy
+        self.timestamps = bars.timestamps
+        self.fills = fills
+        self.position = position
+        self.equity = equity
+        self.fees = fees
+        self.details = details or {}
+    
+    def summary(self) -> Dict[str, Any]:
+        """Headline numbers for the run."""
+        sides = self.fills['side']
+        notional = self.fills['price'] * self.fills['quantity']
+        drawdown = np.maximum.accumulate(self.equity) - self.equity
+        return {
+            'strategy': self.strategy,
+            'fills': int(len(sides)),
+            'buy_fills': int(np.count_nonzero(sides == BUY)),
+            'sell_fills': int(np.count_nonzero(sides == SELL)),
+            'volume': float(notional.sum()),
+            'fees': round(self.fees, 8),
+            'final_position': float(self.position[-1]),
+            'pnl': float(self.equity[-1]),
+            'max_drawdown': float(drawdown.max()),
+            **self.details
+        }
+
+
+def _fills(bars: Bars, bar_idx, side, price, quantity, level=None) -> Dict[str, np.ndarray]:
+    bar_idx = np.asarray(bar_idx, dtype=np.int64)
+    return {
+        'bar': bar_idx,
+        'timestamp': bars.timestamps[bar_idx],
+        'side': np.asarray(side, dtype=np.int8),
+        'price': np.asarray(price, dtype=np.float64),
+        'quantity': np.broadcast_to(np.asarray(quantity, dtype=np.float64), bar_idx.shape).copy(),
+        'level': np.full(bar_idx.shape, -1, dtype=np.int32) if level is None else np.asarray(level, dtype=np.int32)
+    }
+
+
+def _mark_to_market(
+    bars: Bars,
+    fills: Dict[str, np.ndarray],
+    fee_rates,
+    initial_position: float = 0.0,
+    initial_price: float = 0.0
+) -> tuple:
+    """Position and equity per bar; equity starts at zero at the entry price."""
+    n = len(bars)
+    signed = fills['side'] * fills['quantity']
+    notional = fills['price'] * fills['quantity']
+    fees = notional * fee_rates
+    
+    position = initial_position + np.cumsum(np.bincount(fills['bar'], weights=signed, minlength=n))
+    cash = -initial_position * initial_price + np.cumsum(
+        np.bincount(fills['bar'], weights=-signed * fills['price'] - fees, minlength=n)
+    )
+    return position, cash + position * bars.close, float(fees.sum())
+
+
+def backtest_grid(
+    bars: Bars,
+    lower_price: float,
+    upper_price: float,
+    num_grids: int,
+    quantity_per_grid: float,
+    filters: Optional[SymbolFilters] = None,
+    maker_fee: float = 0.0002,
+    start_price: Optional[float] = None
+) -> BacktestResult:
+    """
+    Simulate AdvancedOrderBot.start_grid_trading.
+    
+    Levels are placed as BUY below the start price and SELL above it, and each
+    fill is replaced by the opposite order at the same level from the next bar
+    on, as the live monitor does. A bar fills a BUY if its low reaches the
+    level and a SELL if its high does.
+    
+    Args:
+        bars: Price history
+        lower_price: Lower bound of grid
+        upper_price: Upper bound of grid
+        num_grids: Number of grid levels
+        quantity_per_grid: Quantity for each grid order
+        filters: Symbol filters for tick rounding (optional)
+        maker_fee: Commission rate for the resting grid orders
+        start_price: Price the grid is started at (default: first bar's open)
+    
+    Returns:
+        BacktestResult with one fill per level crossing
+    """
+    if lower_price >= upper_price:
+        raise ValueError("Lower price must be less than upper price")
+    if num_grids < 2:
+        raise ValueError("Number of grids must be at least 2")
+    if quantity_per_grid <= 0:
+        raise ValueError("Quantity per grid must be positive")
+    
+    current_price = bars.open[0] if start_price is None else start_price
+    price_step = (upper_price - lower_price) / (num_grids - 1)
+    levels = np.array([lower_price + (i * price_step) for i in range(num_grids)])
+    if filters is not None:
+        levels = np.array([float(filters.quantize_price(level, ROUND_HALF_EVEN)) for level in levels])
+    
+    # Active side per level: buy below current price, sell above
+    state = np.where(levels < current_price, BUY, SELL).astype(np.int8)
+    fill_bars, fill_levels, fill_sides = [], [], []
+    
+    for start in range(0, len(bars), GRID_BLOCK_BARS):
+        low = bars.low[start:start + GRID_BLOCK_BARS, None]
+        high = bars.high[start:start + GRID_BLOCK_BARS, None]
+        rows = np.arange(len(low), dtype=np.int32)[:, None]
+        
+        # A bar wholly below a level can only fill its BUY, wholly above only
+        # its SELL; a bar spanning the level fills whichever side is active
+        below = high < levels
+        above = low > levels
+        spans = ~(below | above)
+        
+        # After a one-sided bar the active side is pinned (below -> SELL,
+        # above -> BUY); every spanning bar since then flips it once
+        pinned = np.where(below, SELL, BUY).astype(np.int8)
+        last_pin = np.maximum.accumulate(np.where(spans, -1, rows), axis=0)
+        flips = np.cumsum(spans, axis=0, dtype=np.int32)
+        has_pin = last_pin >= 0
+        pin_row = np.maximum(last_pin, 0)
+        flips_since = flips - np.where(has_pin, np.take_along_axis(flips, pin_row, axis=0), 0)
+        base = np.where(has_pin, np.take_along_axis(pinned, pin_row, axis=0), state)
+        after = np.where(flips_since % 2 == 1, -base, base).astype(np.int8)
+        before = np.vstack([state[None, :], after[:-1]])
+        
+        filled = spans | (below & (before == BUY)) | (above & (before == SELL))
+        bar_idx, level_idx = np.nonzero(filled)
+        fill_bars.append(bar_idx + start)
+        fill_levels.append(level_idx)
+        fill_sides.append(before[bar_idx, level_idx])
+        state = after[-1]
+    
+    level_idx = np.concatenate(fill_levels)
+    fills = _fills(
+        bars,
+        np.concatenate(fill_bars),
+        np.concatenate(fill_sides),
+        levels[level_idx],
+        quantity_per_grid,
+        level_idx
+    )
+    position, equity, fees = _mark_to_market(bars, fills, maker_fee)
+    
+    return BacktestResult('GRID', bars, fills, position, equity, fees, {
+        'levels': num_grids,
+        'round_trips': int(len(level_idx) // 2)
+    })
+
+
+def backtest_twap(
+    bars: Bars,
+    side: str,
+    total_quantity: float,
+    duration_minutes: float,
+    num_orders: int = 10,
+    start_time: Optional[int] = None,
+    filters: Optional[SymbolFilters] = None,
+    taker_fee: float = 0.0004,
+    slippage_bps: float = 0.0
+) -> BacktestResult:
+    """
+    Simulate AdvancedOrderBot.place_twap_order.
+    
+    Each slice is a market order at the open of the bar containing its
+    scheduled time, adjusted by ``slippage_bps`` against the order.
+    
+    Args:
+        bars: Price history
+        side: 'BUY' or 'SELL'
+        total_quantity: Total quantity to trade
+        duration_minutes: Time period to spread orders over
+        num_orders: Number of smaller orders to split into
+        start_time: First slice time in ms (default: first bar)
+        filters: Symbol filters for step-size rounding (optional)
+        taker_fee: Commission rate for the market orders
+        slippage_bps: Price impact per slice in basis points
+    
+    Returns:
+        BacktestResult including the average fill price and the bar-close
+        TWAP over the same window
+    """
+    if side not in ['BUY', 'SELL']:
+        raise ValueError("Side must be 'BUY' or 'SELL'")
+    if total_quantity <= 0:
+        raise ValueError("Total quantity must be positive")
+    if duration_minutes <= 0:
+        raise ValueError("Duration must be positive")
+    if num_orders <= 0:
+        raise ValueError("Number of orders must be positive")
+    
+    order_quantity = total_quantity / num_orders
+    interval_seconds = (duration_minutes * 60) / num_orders
+    if filters is not None:
+        order_quantity = float(filters.quantize_quantity(order_quantity, ROUND_HALF_EVEN))
+    
+    start = bars.timestamps[0] if start_time is None else start_time
+    times = start + (np.arange(num_orders) * interval_seconds * 1000).astype(np.int64)
+    bar_idx = np.searchsorted(bars.timestamps, times, side='right') - 1
+    # Slices scheduled outside the data are not executed
+    bar_idx = bar_idx[(bar_idx >= 0) & (times <= bars.timestamps[-1])]
+    
+    sign = BUY if side == 'BUY' else SELL
+    prices = bars.open[bar_idx] * (1 + sign * slippage_bps / 10000)
+    fills = _fills(bars, bar_idx, np.full(len(bar_idx), sign), prices, order_quantity)
+    position, equity, fees = _mark_to_market(bars, fills, taker_fee)
+    
+    window = slice(bar_idx[0], bar_idx[-1] + 1) if len(bar_idx) else slice(0, 0)
+    average_price = float(prices.mean()) if len(prices) else None
+    benchmark = float(bars.close[window].mean()) if len(bar_idx) else None
+    return BacktestResult('TWAP', bars, fills, position, equity, fees, {
+        'slices_executed': int(len(bar_idx)),
+        'order_quantity': order_quantity,
+        'average_price': average_price,
+        'benchmark_twap': benchmark,
+        'slippage_vs_benchmark_bps': (
+            sign * (average_price - benchmark) / benchmark * 10000 if benchmark else None
+        )
+    })
+
+
+def _first(mask: np.ndarray, start: int = 0) -> int:
+    """Index of the first True at or after ``start``, or len(mask)."""
+    hits = mask[start:]
+    idx = int(np.argmax(hits))
+    return start + idx if hits.size and hits[idx] else len(mask)
+
+
+def backtest_oco(
+    bars: Bars,
+    side: str,
+    quantity: float,
+    price: float,
+    stop_price: float,
+    stop_limit_price: float,
+    entry_price: Optional[float] = None,
+    filters: Optional[SymbolFilters] = None,
+    maker_fee: float = 0.0002,
+    taker_fee: float = 0.0004,
+    pessimistic: bool = True
+) -> BacktestResult:
+    """
+    Simulate AdvancedOrderBot.place_oco_order closing an open position.
+    
+    The take profit is a resting limit order; the stop triggers when price
+    trades through ``stop_price`` and then executes as a limit at
+    ``stop_limit_price`` (at the trigger price, or the open after a gap, when
+    that is still within the limit). Whichever leg fills first cancels the
+    other.
+    
+    Args:
+        bars: Price history
+        side: 'SELL' closes a long, 'BUY' closes a short
+        quantity: Order quantity (size of the position being closed)
+        price: Take profit limit price
+        stop_price: Stop loss trigger price
+        stop_limit_price: Stop loss limit price
+        entry_price: Position entry price (default: first bar's open)
+        filters: Symbol filters for tick rounding (optional)
+        maker_fee: Commission rate for the take profit
+        taker_fee: Commission rate for the stop loss
+        pessimistic: When both legs could fill in the same bar, assume the
+            stop loss did
+    
+    Returns:
+        BacktestResult whose details include the outcome
+    """
+    if side not in ['BUY', 'SELL']:
+        raise ValueError("Side must be 'BUY' or 'SELL'")
+    if quantity <= 0:
+        raise ValueError("Quantity must be positive")
+    if side == 'SELL' and price <= stop_price:
+        raise ValueError("For SELL: Take profit price must be higher than stop price")
+    if side == 'BUY' and price >= stop_price:
+        raise ValueError("For BUY: Take profit price must be lower than stop price")
+    
+    if filters is not None:
+        price = float(filters.quantize_price(price, ROUND_DOWN))
+        stop_price = float(filters.quantize_price(stop_price, ROUND_DOWN))
+        stop_limit_price = float(filters.quantize_price(stop_limit_price, ROUND_DOWN))
+    
+    n = len(bars)
+    sign = BUY if side == 'BUY' else SELL
+    if sign == SELL:
+        tp_bar = _first(bars.high >= price)
+        trigger_bar = _first(bars.low <= stop_price)
+    else:
+        tp_bar = _first(bars.low <= price)
+        trigger_bar = _first(bars.high >= stop_price)
+    
+    sl_bar, sl_price = n, None
+    if trigger_bar < n:
+        # Gap-aware trigger price; fill now if the limit allows it
+        triggered_at = (
+            min(bars.open[trigger_bar], stop_price) if sign == SELL
+            else max(bars.open[trigger_bar], stop_price)
+        )
+        if (triggered_at >= stop_limit_price) if sign == SELL else (triggered_at <= stop_limit_price):
+            sl_bar, sl_price = trigger_bar, triggered_at
+        else:
+            limit_hit = bars.high >= stop_limit_price if sign == SELL else bars.low <= stop_limit_price
+            sl_bar, sl_price = _first(limit_hit, trigger_bar), stop_limit_price
+    
+    if tp_bar < sl_bar or (tp_bar == sl_bar < n and not pessimistic):
+        outcome, fill_bar, fill_price, fee_rate = 'TAKE_PROFIT', tp_bar, price, maker_fee
+    elif sl_bar < n:
+        outcome, fill_bar, fill_price, fee_rate = 'STOP_LOSS', sl_bar, sl_price, taker_fee
+    else:
+        outcome, fill_bar, fill_price, fee_rate = 'OPEN', None, None, 0.0
+    
+    if fill_bar is None:
+        fills = _fills(bars, [], [], [], quantity)
+    else:
+        fills = _fills(bars, [fill_bar], [sign], [fill_price], quantity)
+    
+    entry = bars.open[0] if entry_price is None else entry_price
+    position, equity, fees = _mark_to_market(bars, fills, fee_rate, -sign * quantity, entry)
+    
+    return BacktestResult('OCO', bars, fills, position, equity, fees, {
+        'outcome': outcome,
+        'exit_price': fill_price,
+        'entry_price': float(entry)
+    })
+
+
+def main():
+    """Run a backtest from the command line and print its summary."""
+    parser = argparse.ArgumentParser(description='Backtest OCO, TWAP and grid strategies')
+    parser.add_argument('data', help='CSV of bars (Binance kline export format)')
+    subparsers = parser.add_subparsers(dest='strategy', required=True)
+    
+    grid = subparsers.add_parser('grid', help='Grid trading')
+    grid.add_argument('lower_price', type=float)
+    grid.add_argument('upper_price', type=float)
+    grid.add_argument('num_grids', type=int)
+    grid.add_argument('quantity_per_grid', type=float)
+    
+    twap = subparsers.add_parser('twap', help='TWAP execution')
+    twap.add_argument('side', choices=['BUY', 'SELL'])
+    twap.add_argument('total_quantity', type=float)
+    twap.add_argument('duration_minutes', type=float)
+    twap.add_argument('num_orders', type=int)
+    twap.add_argument('--slippage-bps', type=float, default=0.0)
+    
+    oco = subparsers.add_parser('oco', help='OCO exit')
+    oco.add_argument('side', choices=['BUY', 'SELL'])
+    oco.add_argument('quantity', type=float)
+    oco.add_argument('price', type=float)
+    oco.add_argument('stop_price', type=float)
+    oco.add_argument('stop_limit_price', type=float)
+    
+    args = parser.parse_args()
+    bars = load_bars(args.data)
+    
+    if args.strategy == 'grid':
+        result = backtest_grid(bars, args.lower_price, args.upper_price, args.num_grids, args.quantity_per_grid)
+    elif args.strategy == 'twap':
+        result = backtest_twap(bars, args.side, args.total_quantity, args.duration_minutes, args.num_orders,
+                               slippage_bps=args.slippage_bps)
+    else:
+        result = backtest_oco(bars, args.side, args.quantity, args.price, args.stop_price, args.stop_limit_price)
+    
+    print(json.dumps(result.summary(), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,30 +1,148 @@
 import logging
-from typing import Dict, Any, Optional, Literal
-from binance.client import Client
+from typing import Dict, Any, List, Optional, Literal
 from binance.exceptions import BinanceAPIException, BinanceOrderException
-from decimal import Decimal, ROUND_DOWN
+from requests.adapters import HTTPAdapter
 import time
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('trading_bot.log'),
-        logging.StreamHandler()
-    ]
-)
+from bot.exchange_info import get_exchange_info_cache
+from bot.market_data import get_market_data
+from bot.transport import create_client, prepare_client
 
 logger = logging.getLogger(__name__)
 
 
+def format_account_balance(account: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a futures_account response into the balance summary."""
+    balances = []
+    for asset in account['assets']:
+        if float(asset['walletBalance']) > 0:
+            balances.append({
+                'asset': asset['asset'],
+                'wallet_balance': asset['walletBalance'],
+                'available_balance': asset['availableBalance'],
+                'unrealized_profit': asset['unrealizedProfit']
+            })
+    
+    return {
+        'total_wallet_balance': account['totalWalletBalance'],
+        'total_unrealized_profit': account['totalUnrealizedProfit'],
+        'total_margin_balance': account['totalMarginBalance'],
+        'available_balance': account['availableBalance'],
+        'assets': balances
+    }
+
+
+def format_market_order(order: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a market order response."""
+    return {
+        'success': True,
+        'order_id': order['orderId'],
+        'symbol': order['symbol'],
+        'side': order['side'],
+        'type': order['type'],
+        'quantity': order['origQty'],
+        'status': order['status'],
+        'price': order.get('avgPrice', 'N/A'),
+        'time': order['updateTime'],
+        'raw_response': order
+    }
+
+
+def format_limit_order(order: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a limit order response."""
+    return {
+        'success': True,
+        'order_id': order['orderId'],
+        'symbol': order['symbol'],
+        'side': order['side'],
+        'type': order['type'],
+        'quantity': order['origQty'],
+        'price': order['price'],
+        'status': order['status'],
+        'time_in_force': order['timeInForce'],
+        'time': order['updateTime'],
+        'raw_response': order
+    }
+
+
+def format_stop_limit_order(order: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a stop-limit order response."""
+    return {
+        'success': True,
+        'order_id': order['orderId'],
+        'symbol': order['symbol'],
+        'side': order['side'],
+        'type': order['type'],
+        'quantity': order['origQty'],
+        'stop_price': order['stopPrice'],
+        'limit_price': order['price'],
+        'status': order['status'],
+        'time_in_force': order['timeInForce'],
+        'time': order['updateTime'],
+        'raw_response': order
+    }
+
+
+def format_cancel_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a cancel order response."""
+    return {
+        'success': True,
+        'order_id': result['orderId'],
+        'symbol': result['symbol'],
+        'status': result['status'],
+        'raw_response': result
+    }
+
+
+def format_order_status(order: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a query order response."""
+    return {
+        'success': True,
+        'order_id': order['orderId'],
+        'symbol': order['symbol'],
+        'side': order['side'],
+        'type': order['type'],
+        'status': order['status'],
+        'quantity': order['origQty'],
+        'executed_quantity': order['executedQty'],
+        'price': order.get('price', 'N/A'),
+        'avg_price': order.get('avgPrice', 'N/A'),
+        'time': order['time'],
+        'update_time': order['updateTime'],
+        'raw_response': order
+    }
+
+
+def format_open_orders(orders: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Shape an open orders response."""
+    formatted_orders = []
+    for order in orders:
+        formatted_orders.append({
+            'order_id': order['orderId'],
+            'symbol': order['symbol'],
+            'side': order['side'],
+            'type': order['type'],
+            'status': order['status'],
+            'quantity': order['origQty'],
+            'executed_quantity': order['executedQty'],
+            'price': order.get('price', 'N/A'),
+            'stop_price': order.get('stopPrice', 'N/A'),
+            'time': order['time']
+        })
+    
+    return {
+        'success': True,
+        'count': len(formatted_orders),
+        'orders': formatted_orders
+    }
+
+
 class BasicBot:
     """
     A basic trading bot for Binance Futures Testnet.
     Supports market orders, limit orders, and advanced order types.
     """
     
-    def __init__(self, api_key: str, api_secret: str, testnet: bool = True):
+    def __init__(self, api_key: str, api_secret: str, testnet: bool = True, pool_size: int = 20):
         """
         Initialize the trading bot.
         
@@ -32,16 +150,27 @@ class BasicBot:
             api_key: Binance API key
             api_secret: Binance API secret
             testnet: Whether to use testnet (default: True)
+            pool_size: Keep-alive HTTP connections kept for concurrent callers
         """
         self.api_key = api_key
         self.api_secret = api_secret
         self.testnet = testnet
+        self.exchange_info = get_exchange_info_cache(testnet)
+        self.market_data = get_market_data(testnet)
         
         try:
-            self.client = Client(api_key, api_secret, testnet=testnet)
+            self.client = create_client(api_key, api_secret, testnet=testnet)
             if testnet:
                 self.client.API_URL = 'https://testnet.binancefuture.com'
             
+            # A shared bot serves many requests at once; keep enough warm connections
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            self.client.session.mount('https://', adapter)
+            self.client.session.mount('http://', adapter)
+            
+            # Route every call through the shared rate limiter
+            prepare_client(self.client)
+            
             logger.info(f"Bot initialized successfully. Testnet: {testnet}")
             self._test_connection()
         except Exception as e:
@@ -58,6 +187,13 @@ class BasicBot:
             logger.error(f"Connection test failed: {str(e)}")
             return False
     
+    def close(self) -> None:
+        """Close the underlying HTTP session."""
+        try:
+            self.client.close_connection()
+        except Exception as e:
+            logger.warning(f"Error closing connection: {str(e)}")
+    
     def get_account_balance(self) -> Dict[str, Any]:
         """
         Get account balance information.
@@ -69,23 +205,7 @@ class BasicBot:
             logger.info("Fetching account balance...")
             account = self.client.futures_account()
             
-            balances = []
-            for asset in account['assets']:
-                if float(asset['walletBalance']) > 0:
-                    balances.append({
-                        'asset': asset['asset'],
-                        'wallet_balance': asset['walletBalance'],
-                        'available_balance': asset['availableBalance'],
-                        'unrealized_profit': asset['unrealizedProfit']
-                    })
-            
-            result = {
-                'total_wallet_balance': account['totalWalletBalance'],
-                'total_unrealized_profit': account['totalUnrealizedProfit'],
-                'total_margin_balance': account['totalMarginBalance'],
-                'available_balance': account['availableBalance'],
-                'assets': balances
-            }
+            result = format_account_balance(account)
             
             logger.info(f"Account balance retrieved successfully")
             return result
@@ -108,66 +228,55 @@ class BasicBot:
             Dictionary containing symbol information
         """
         try:
-            exchange_info = self.client.futures_exchange_info()
-            
-            for s in exchange_info['symbols']:
-                if s['symbol'] == symbol:
-                    return s
-            
-            raise ValueError(f"Symbol {symbol} not found")
+            return self.exchange_info.get(symbol, self.client).raw
             
         except Exception as e:
             logger.error(f"Error fetching symbol info: {str(e)}")
             raise
     
-    def _validate_and_format_quantity(self, symbol: str, quantity: float) -> str:
+    def _validate_and_format_quantity(
+        self,
+        symbol: str,
+        quantity: float,
+        price: Optional[float] = None
+    ) -> str:
         """
-        Validate and format quantity according to symbol's lot size rules.
+        Validate and format quantity according to symbol's lot size and
+        notional rules.
         
         Args:
             symbol: Trading pair symbol
             quantity: Order quantity
+            price: Order price; market orders (None) are valued at the streamed
+                mark price, or skip the notional check until one is cached
             
         Returns:
             Formatted quantity as string
         """
         try:
-            symbol_info = self.get_symbol_info(symbol)
-            
-            # Find LOT_SIZE filter
-            lot_size_filter = None
-            for f in symbol_info['filters']:
-                if f['filterType'] == 'LOT_SIZE':
-                    lot_size_filter = f
-                    break
-            
-            if not lot_size_filter:
-                return str(quantity)
-            
-            min_qty = Decimal(lot_size_filter['minQty'])
-            max_qty = Decimal(lot_size_filter['maxQty'])
-            step_size = Decimal(lot_size_filter['stepSize'])
-            
-            qty = Decimal(str(quantity))
-            
-            # Check minimum quantity
-            if qty < min_qty:
-                raise ValueError(f"Quantity {quantity} is below minimum {min_qty}")
-            
-            # Check maximum quantity
-            if qty > max_qty:
-                raise ValueError(f"Quantity {quantity} exceeds maximum {max_qty}")
-            
-            # Round to step size
-            precision = abs(step_size.as_tuple().exponent)
-            qty = qty.quantize(step_size, rounding=ROUND_DOWN)
-            
-            return str(qty)
+            filters = self.exchange_info.get(symbol, self.client)
+            if price is None and filters.min_notional:
+                price = self._mark_price(symbol)
+            return str(filters.validate_quantity(quantity, price))
             
         except Exception as e:
             logger.error(f"Error validating quantity: {str(e)}")
             raise
     
+    def _mark_price(self, symbol: str) -> Optional[float]:
+        """
+        Fresh price from the market-data stream, preferring the mark price.
+        
+        Subscribes the symbol on first use and never calls REST; returns None
+        until a price has streamed in, leaving the notional check to the
+        exchange.
+        """
+        price = self.market_data.get_price(symbol)
+        if price is None:
+            return None
+        quote = self.market_data.get_quote(symbol)
+        return quote['mark_price'] if quote and quote['mark_price'] is not None else price
+    
     def place_market_order(
         self,
         symbol: str,
@@ -206,18 +315,7 @@ class BasicBot:
             logger.info(f"Market order placed successfully. Order ID: {order['orderId']}")
             logger.info(f"Order details: {order}")
             
-            return {
-                'success': True,
-                'order_id': order['orderId'],
-                'symbol': order['symbol'],
-                'side': order['side'],
-                'type': order['type'],
-                'quantity': order['origQty'],
-                'status': order['status'],
-                'price': order.get('avgPrice', 'N/A'),
-                'time': order['updateTime'],
-                'raw_response': order
-            }
+            return format_market_order(order)
             
         except BinanceAPIException as e:
             logger.error(f"Binance API error: {e.message} (Code: {e.code})")
@@ -269,7 +367,7 @@ class BasicBot:
                 raise ValueError("Side must be 'BUY' or 'SELL'")
             
             # Format quantity
-            formatted_quantity = self._validate_and_format_quantity(symbol, quantity)
+            formatted_quantity = self._validate_and_format_quantity(symbol, quantity, price)
             
             # Place order
             order = self.client.futures_create_order(
@@ -284,19 +382,7 @@ class BasicBot:
             logger.info(f"Limit order placed successfully. Order ID: {order['orderId']}")
             logger.info(f"Order details: {order}")
             
-            return {
-                'success': True,
-                'order_id': order['orderId'],
-                'symbol': order['symbol'],
-                'side': order['side'],
-                'type': order['type'],
-                'quantity': order['origQty'],
-                'price': order['price'],
-                'status': order['status'],
-                'time_in_force': order['timeInForce'],
-                'time': order['updateTime'],
-                'raw_response': order
-            }
+            return format_limit_order(order)
             
         except BinanceAPIException as e:
             logger.error(f"Binance API error: {e.message} (Code: {e.code})")
@@ -350,7 +436,7 @@ class BasicBot:
                 raise ValueError("Side must be 'BUY' or 'SELL'")
             
             # Format quantity
-            formatted_quantity = self._validate_and_format_quantity(symbol, quantity)
+            formatted_quantity = self._validate_and_format_quantity(symbol, quantity, limit_price)
             
             # Place order
             order = self.client.futures_create_order(
@@ -366,20 +452,7 @@ class BasicBot:
             logger.info(f"Stop-limit order placed successfully. Order ID: {order['orderId']}")
             logger.info(f"Order details: {order}")
             
-            return {
-                'success': True,
-                'order_id': order['orderId'],
-                'symbol': order['symbol'],
-                'side': order['side'],
-                'type': order['type'],
-                'quantity': order['origQty'],
-                'stop_price': order['stopPrice'],
-                'limit_price': order['price'],
-                'status': order['status'],
-                'time_in_force': order['timeInForce'],
-                'time': order['updateTime'],
-                'raw_response': order
-            }
+            return format_stop_limit_order(order)
             
         except BinanceAPIException as e:
             logger.error(f"Binance API error: {e.message} (Code: {e.code})")
@@ -416,13 +489,7 @@ class BasicBot:
             
             logger.info(f"Order {order_id} cancelled successfully")
             
-            return {
-                'success': True,
-                'order_id': result['orderId'],
-                'symbol': result['symbol'],
-                'status': result['status'],
-                'raw_response': result
-            }
+            return format_cancel_result(result)
             
         except BinanceAPIException as e:
             logger.error(f"Binance API error: {e.message} (Code: {e.code})")
@@ -457,21 +524,7 @@ class BasicBot:
                 orderId=order_id
             )
             
-            return {
-                'success': True,
-                'order_id': order['orderId'],
-                'symbol': order['symbol'],
-                'side': order['side'],
-                'type': order['type'],
-                'status': order['status'],
-                'quantity': order['origQty'],
-                'executed_quantity': order['executedQty'],
-                'price': order.get('price', 'N/A'),
-                'avg_price': order.get('avgPrice', 'N/A'),
-                'time': order['time'],
-                'update_time': order['updateTime'],
-                'raw_response': order
-            }
+            return format_order_status(order)
             
         except BinanceAPIException as e:
             logger.error(f"Binance API error: {e.message} (Code: {e.code})")
@@ -505,28 +558,10 @@ class BasicBot:
             else:
                 orders = self.client.futures_get_open_orders()
             
-            formatted_orders = []
-            for order in orders:
-                formatted_orders.append({
-                    'order_id': order['orderId'],
-                    'symbol': order['symbol'],
-                    'side': order['side'],
-                    'type': order['type'],
-                    'status': order['status'],
-                    'quantity': order['origQty'],
-                    'executed_quantity': order['executedQty'],
-                    'price': order.get('price', 'N/A'),
-                    'stop_price': order.get('stopPrice', 'N/A'),
-                    'time': order['time']
-                })
-            
-            logger.info(f"Found {len(formatted_orders)} open orders")
+            result = format_open_orders(orders)
+            logger.info(f"Found {result['count']} open orders")
             
-            return {
-                'success': True,
-                'count': len(formatted_orders),
-                'orders': formatted_orders
-            }
+            return result
             
         except BinanceAPIException as e:
             logger.error(f"Binance API error: {e.message} (Code: {e.code})")
@@ -546,15 +581,30 @@ class BasicBot:
         """
         Get the current price for a symbol.
         
+        Served from the shared market-data cache when it holds a fresh price
+        (the bid/ask midpoint), otherwise the last trade price over REST.
+        
         Args:
             symbol: Trading pair symbol
             
         Returns:
             Current price as float, or None if error
         """
+        try:
+            # Unlisted symbols are rejected before any stream or REST call
+            self.exchange_info.get(symbol, self.client)
+        except Exception as e:
+            logger.error(f"Error fetching current price: {str(e)}")
+            return None
+        
+        price = self.market_data.get_price(symbol)
+        if price is not None:
+            return price
+        
         try:
             ticker = self.client.futures_symbol_ticker(symbol=symbol)
             price = float(ticker['price'])
+            self.market_data.record_price(symbol, price)
             logger.info(f"Current price for {symbol}: {price}")
             return price
             
@@ -9,14 +9,15 @@ import sys
 from typing import Optional
 from getpass import getpass
 import json
-from basic_bot import BasicBot
+from pathlib import Path
 import logging
 
-# Configure logging for CLI
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bot.basic_bot import BasicBot
+from logging_config import configure_logging
+
 logger = logging.getLogger(__name__)
 
 
@@ -89,6 +90,8 @@ def display_orders(orders_result: dict) -> None:
 
 
 def main():
+    configure_logging('trading_bot.log', fmt='%(asctime)s - %(levelname)s - %(message)s')
+    
     parser = argparse.ArgumentParser(
         description='Crypto Trading Bot CLI - Trade on Binance Futures Testnet',
         formatter_class=argparse.RawDescriptionHelpFormatter,
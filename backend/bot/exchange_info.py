@@ -0,0 +1,251 @@
+"""
+Shared cache of Binance Futures exchange information.
+Indexes symbol filters once so order validation needs no network calls.
+"""
+
+import logging
+import threading
+import time
+import weakref
+from decimal import Decimal, ROUND_DOWN
+from typing import Any, Dict, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _quantum(step: Decimal) -> Decimal:
+    """Smallest power of ten able to represent every multiple of ``step``."""
+    return Decimal(1).scaleb(step.normalize().as_tuple().exponent)
+
+
+class SymbolFilters:
+    """
+    Precompiled trading filters for a single symbol.
+    
+    Decimal steps and quanta are built once when the exchange info is loaded,
+    so rounding a price or quantity is pure local arithmetic.
+    """
+    
+    __slots__ = (
+        'symbol', 'tick_size', 'price_quantum', 'min_price', 'max_price',
+        'step_size', 'qty_quantum', 'min_qty', 'max_qty', 'min_notional', 'raw'
+    )
+    
+    def __init__(self, symbol_info: Dict[str, Any]):
+        self.symbol = symbol_info['symbol']
+        self.raw = symbol_info
+        self.tick_size = self.price_quantum = None
+        self.min_price = self.max_price = None
+        self.step_size = self.qty_quantum = None
+        self.min_qty = self.max_qty = None
+        self.min_notional = None
+        
+        for f in symbol_info.get('filters', []):
+            filter_type = f.get('filterType')
+            if filter_type == 'PRICE_FILTER':
+                self.tick_size = Decimal(f['tickSize'])
+                self.price_quantum = _quantum(self.tick_size)
+                self.min_price = Decimal(f['minPrice'])
+                self.max_price = Decimal(f['maxPrice'])
+            elif filter_type == 'LOT_SIZE':
+                self.step_size = Decimal(f['stepSize'])
+                self.qty_quantum = _quantum(self.step_size)
+                self.min_qty = Decimal(f['minQty'])
+                self.max_qty = Decimal(f['maxQty'])
+            elif filter_type == 'MIN_NOTIONAL':
+                # Futures uses 'notional', spot uses 'minNotional'
+                self.min_notional = Decimal(f.get('notional', f.get('minNotional', '0')))
+    
+    def quantize_price(self, price: float, rounding: str = ROUND_DOWN) -> Decimal:
+        """Round a price onto the tick grid."""
+        value = Decimal(str(price))
+        if not self.tick_size:
+            return value
+        ticks = (value / self.tick_size).to_integral_value(rounding=rounding)
+        return (ticks * self.tick_size).quantize(self.price_quantum)
+    
+    def quantize_quantity(self, quantity: float, rounding: str = ROUND_DOWN) -> Decimal:
+        """Round a quantity onto the lot step grid."""
+        value = Decimal(str(quantity))
+        if not self.step_size:
+            return value
+        steps = (value / self.step_size).to_integral_value(rounding=rounding)
+        return (steps * self.step_size).quantize(self.qty_quantum)
+    
+    def validate_quantity(self, quantity: float, price: Optional[float] = None) -> Decimal:
+        """
+        Check a quantity against the lot size and notional limits and round it
+        to step size.
+        
+        Args:
+            quantity: Order quantity
+            price: Price the order is expected to fill at (the limit price, or
+                the mark price for market orders); skips the notional check if None
+        
+        Raises:
+            ValueError: If the quantity is outside the allowed range or the
+                order value is below the minimum notional
+        """
+        qty = Decimal(str(quantity))
+        if self.step_size is not None:
+            if qty < self.min_qty:
+                raise ValueError(f"Quantity {quantity} is below minimum {self.min_qty}")
+            
+            if qty > self.max_qty:
+                raise ValueError(f"Quantity {quantity} exceeds maximum {self.max_qty}")
+            
+            qty = self.quantize_quantity(qty, ROUND_DOWN)
+        
+        if price is not None and self.min_notional:
+            notional = qty * Decimal(str(price))
+            if notional < self.min_notional:
+                raise ValueError(f"Order value {notional} is below minimum notional {self.min_notional}")
+        
+        return qty
+
+
+class ExchangeInfoCache:
+    """
+    TTL cache of ``futures_exchange_info`` indexed by symbol.
+    
+    Each refresh downloads through the client of the call that triggered it.
+    With background refresh enabled, a daemon thread reloads the payload
+    before it goes stale through the most recent client (held weakly, so a
+    closed bot's client is not kept alive), so callers never wait on the network.
+    """
+    
+    # Minimum gap between refreshes triggered by an unknown symbol
+    MISS_REFRESH_INTERVAL = 60
+    
+    def __init__(self, ttl_seconds: float = 300, background_refresh: bool = True):
+        """
+        Initialize the cache.
+        
+        Args:
+            ttl_seconds: Age after which the exchange info is reloaded
+            background_refresh: Refresh from a daemon thread instead of inline
+        """
+        self.ttl_seconds = ttl_seconds
+        self.background_refresh = background_refresh
+        self._symbols: Dict[str, SymbolFilters] = {}
+        self._loaded_at: Optional[float] = None
+        self._last_client: Optional[weakref.ref] = None
+        self._lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self.refreshes = 0
+        self.hits = 0
+        self.misses = 0
+    
+    def load(self, exchange_info: Dict[str, Any]) -> None:
+        """Replace the index with a freshly downloaded exchange info payload."""
+        symbols = {s['symbol']: SymbolFilters(s) for s in exchange_info.get('symbols', [])}
+        with self._lock:
+            self._symbols = symbols
+            self._loaded_at = time.monotonic()
+            self.refreshes += 1
+        logger.info(f"Exchange info loaded: {len(symbols)} symbols")
+    
+    def refresh(self, client: Any) -> None:
+        """Download the exchange info through ``client``."""
+        self.load(client.futures_exchange_info())
+    
+    def needs_refresh(self) -> bool:
+        """True when nothing is loaded yet or the data is past its TTL."""
+        loaded_at = self._loaded_at
+        return loaded_at is None or time.monotonic() - loaded_at >= self.ttl_seconds
+    
+    def lookup(self, symbol: str) -> Optional[SymbolFilters]:
+        """Return the cached filters for a symbol without touching the network."""
+        return self._symbols.get(symbol)
+    
+    def get(self, symbol: str, client: Any) -> SymbolFilters:
+        """
+        Get the filters for a symbol, loading the exchange info if required.
+        
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTCUSDT')
+            client: Binance client used if the cache must be (re)loaded
+        
+        Returns:
+            SymbolFilters for the symbol
+        """
+        self._last_client = weakref.ref(client)
+        if self.background_refresh and not self._refresh_running():
+            self._start_refresh_thread()
+        
+        if self._loaded_at is None or (self.needs_refresh() and not self._refresh_running()):
+            self.refresh(client)
+        
+        filters = self._symbols.get(symbol)
+        if filters is not None:
+            self.hits += 1
+            return filters
+        
+        # Possibly a new listing: reload, but not on every bad symbol
+        self.misses += 1
+        if time.monotonic() - self._loaded_at >= self.MISS_REFRESH_INTERVAL:
+            self.refresh(client)
+            filters = self._symbols.get(symbol)
+            if filters is not None:
+                return filters
+        
+        raise ValueError(f"Symbol {symbol} not found")
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return cache size, age and counters."""
+        loaded_at = self._loaded_at
+        return {
+            'symbols': len(self._symbols),
+            'age_seconds': round(time.monotonic() - loaded_at, 1) if loaded_at else None,
+            'refreshes': self.refreshes,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+    
+    def _refresh_running(self) -> bool:
+        return self._refresh_thread is not None and self._refresh_thread.is_alive()
+    
+    def _start_refresh_thread(self) -> None:
+        with self._lock:
+            if self._refresh_running():
+                return
+            self._refresh_thread = threading.Thread(
+                target=self._refresh_loop,
+                name="exchange-info-refresh",
+                daemon=True
+            )
+            self._refresh_thread.start()
+    
+    def _refresh_loop(self) -> None:
+        """Reload the exchange info shortly before it expires."""
+        interval = max(self.ttl_seconds * 0.8, 1)
+        while True:
+            time.sleep(interval)
+            client = self._last_client() if self._last_client is not None else None
+            if client is None:
+                # Every client that used the cache is gone; reload on next use
+                continue
+            try:
+                self.refresh(client)
+            except Exception as e:
+                logger.error(f"Background exchange info refresh failed: {str(e)}")
+
+
+# One cache per environment; testnet and live list different symbols
+_caches: Dict[bool, ExchangeInfoCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_exchange_info_cache(testnet: bool) -> ExchangeInfoCache:
+    """Return the shared exchange info cache for testnet or live."""
+    with _caches_lock:
+        cache = _caches.get(bool(testnet))
+        if cache is None:
+            cache = ExchangeInfoCache(
+                ttl_seconds=settings.EXCHANGE_INFO_TTL_SECONDS,
+                background_refresh=settings.EXCHANGE_INFO_BACKGROUND_REFRESH
+            )
+            _caches[bool(testnet)] = cache
+        return cache
@@ -0,0 +1,268 @@
+"""
+Shared market-data price cache.
+Listed symbols are subscribed to the bookTicker and markPrice streams on first
+use; reads come straight from memory and symbols nobody has asked about for a
+while, or the least recently used ones past a cap, are unsubscribed again.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from bot.exchange_info import ExchangeInfoCache, get_exchange_info_cache
+from bot.ws_client import StreamConnection, futures_ws_base
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# How often idle symbols are looked for
+JANITOR_INTERVAL_SECONDS = 60
+
+
+class MarketDataService:
+    """
+    Latest prices per symbol for one environment (testnet or live).
+    
+    ``get_price`` never blocks on the network: it returns a cached price no
+    older than the staleness bound, or None so the caller can fall back to
+    REST and hand the result back through ``record_price``.
+    """
+    
+    def __init__(
+        self,
+        testnet: bool,
+        max_age_seconds: float = 5,
+        idle_seconds: float = 300,
+        max_symbols: int = 200,
+        exchange_info: Optional[ExchangeInfoCache] = None
+    ):
+        """
+        Initialize the service (the stream connects on first use).
+        
+        Args:
+            testnet: Whether to use the testnet streams
+            max_age_seconds: Oldest price served from the cache
+            idle_seconds: Unsubscribe symbols not requested for this long
+            max_symbols: Most symbols subscribed at once; the least recently
+                requested one is dropped to make room
+            exchange_info: Only symbols listed here are subscribed (default: no check)
+        """
+        self.testnet = testnet
+        self.max_age_seconds = max_age_seconds
+        self.idle_seconds = idle_seconds
+        self.max_symbols = max_symbols
+        self.exchange_info = exchange_info
+        self._prices: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._request_ids = itertools.count(1)
+        self._janitor: Optional[threading.Thread] = None
+        self.hits = 0
+        self.misses = 0
+        self.connection = StreamConnection(
+            name='market-data-testnet' if testnet else 'market-data',
+            url_factory=lambda: f"{futures_ws_base(testnet)}/ws",
+            on_message=self._handle_message,
+            on_connect=self._resubscribe
+        )
+    
+    @staticmethod
+    def _streams(symbol: str) -> list:
+        lower = symbol.lower()
+        return [f"{lower}@bookTicker", f"{lower}@markPrice@1s"]
+    
+    def get_price(self, symbol: str, max_age_seconds: Optional[float] = None) -> Optional[float]:
+        """
+        Return the cached price for a symbol if it is fresh enough.
+        
+        The first call for a listed symbol subscribes it, so later calls are
+        served from the stream. Unlisted symbols are never subscribed.
+        
+        Args:
+            symbol: Trading pair symbol
+            max_age_seconds: Override of the service's staleness bound
+        
+        Returns:
+            Price as float, or None if there is no fresh price yet
+        """
+        now = time.monotonic()
+        entry = self._prices.get(symbol)
+        if entry is None:
+            entry = self._subscribe(symbol, now)
+            if entry is None:
+                self.misses += 1
+                return None
+        entry['last_requested'] = now
+        
+        max_age = self.max_age_seconds if max_age_seconds is None else max_age_seconds
+        if entry['price'] is not None and now - entry['updated_at'] <= max_age:
+            self.hits += 1
+            return entry['price']
+        self.misses += 1
+        return None
+    
+    def record_price(self, symbol: str, price: float) -> None:
+        """Store a price fetched elsewhere (e.g. the REST fallback)."""
+        now = time.monotonic()
+        entry = self._prices.get(symbol)
+        if entry is None:
+            entry = self._subscribe(symbol, now)
+            if entry is None:
+                return
+        if entry['price'] is None or now - entry['updated_at'] > self.max_age_seconds:
+            # Never overwrite a fresh streamed price
+            entry['price'] = price
+            entry['updated_at'] = now
+    
+    def _subscribe(self, symbol: str, now: float) -> Optional[Dict[str, Any]]:
+        if self.exchange_info is not None and self.exchange_info.lookup(symbol) is None:
+            # Unknown or not yet loaded: never open a stream for it
+            return None
+        
+        evicted = []
+        with self._lock:
+            entry = self._prices.get(symbol)
+            if entry is not None:
+                return entry
+            while self._prices and len(self._prices) >= self.max_symbols:
+                oldest = min(self._prices, key=lambda s: self._prices[s]['last_requested'])
+                del self._prices[oldest]
+                evicted.append(oldest)
+            entry = {
+                'price': None,
+                'bid': None,
+                'ask': None,
+                'mark_price': None,
+                'updated_at': 0.0,
+                'last_requested': now
+            }
+            self._prices[symbol] = entry
+        
+        self._ensure_started()
+        if evicted:
+            self._unsubscribe(evicted)
+            logger.info(f"Evicted market data to stay under {self.max_symbols} symbols: {', '.join(evicted)}")
+        self.connection.send({
+            'method': 'SUBSCRIBE',
+            'params': self._streams(symbol),
+            'id': next(self._request_ids)
+        })
+        logger.info(f"Subscribed to market data for {symbol}")
+        return entry
+    
+    def _ensure_started(self) -> None:
+        self.connection.start()
+        if self._janitor is None or not self._janitor.is_alive():
+            self._janitor = threading.Thread(
+                target=self._unsubscribe_idle_loop,
+                name='market-data-janitor',
+                daemon=True
+            )
+            self._janitor.start()
+    
+    def _resubscribe(self) -> None:
+        with self._lock:
+            symbols = list(self._prices)
+        if symbols:
+            self.connection.send({
+                'method': 'SUBSCRIBE',
+                'params': [stream for symbol in symbols for stream in self._streams(symbol)],
+                'id': next(self._request_ids)
+            })
+    
+    def _unsubscribe_idle_loop(self) -> None:
+        while True:
+            time.sleep(JANITOR_INTERVAL_SECONDS)
+            self.unsubscribe_idle()
+    
+    def unsubscribe_idle(self) -> int:
+        """
+        Drop symbols that have not been requested within the idle window.
+        
+        Returns:
+            Number of symbols unsubscribed
+        """
+        cutoff = time.monotonic() - self.idle_seconds
+        with self._lock:
+            idle = [symbol for symbol, entry in self._prices.items() if entry['last_requested'] < cutoff]
+            for symbol in idle:
+                del self._prices[symbol]
+        
+        if idle:
+            self._unsubscribe(idle)
+            logger.info(f"Unsubscribed idle market data: {', '.join(idle)}")
+        return len(idle)
+    
+    def _unsubscribe(self, symbols: list) -> None:
+        self.connection.send({
+            'method': 'UNSUBSCRIBE',
+            'params': [stream for symbol in symbols for stream in self._streams(symbol)],
+            'id': next(self._request_ids)
+        })
+    
+    def _handle_message(self, message: Dict[str, Any]) -> None:
+        event_type = message.get('e')
+        entry = self._prices.get(message.get('s'))
+        if entry is None:
+            # Subscription acks and symbols dropped in the meantime
+            return
+        
+        if event_type == 'bookTicker':
+            bid = float(message['b'])
+            ask = float(message['a'])
+            entry['bid'] = bid
+            entry['ask'] = ask
+            entry['price'] = (bid + ask) / 2
+            entry['updated_at'] = time.monotonic()
+        elif event_type == 'markPriceUpdate':
+            entry['mark_price'] = float(message['p'])
+            if entry['bid'] is None:
+                entry['price'] = entry['mark_price']
+                entry['updated_at'] = time.monotonic()
+    
+    def get_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Full cached quote (bid, ask, mark price, age) for a symbol, if any."""
+        entry = self._prices.get(symbol)
+        if entry is None or entry['price'] is None:
+            return None
+        return {
+            'symbol': symbol,
+            'price': entry['price'],
+            'bid': entry['bid'],
+            'ask': entry['ask'],
+            'mark_price': entry['mark_price'],
+            'age_seconds': round(time.monotonic() - entry['updated_at'], 3)
+        }
+    
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters for health reporting."""
+        total = self.hits + self.misses
+        return {
+            'symbols': len(self._prices),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / total, 4) if total else 0.0,
+            **self.connection.stats()
+        }
+
+
+_services: Dict[bool, MarketDataService] = {}
+_services_lock = threading.Lock()
+
+
+def get_market_data(testnet: bool) -> MarketDataService:
+    """Return the shared market-data service for an environment."""
+    testnet = bool(testnet)
+    with _services_lock:
+        service = _services.get(testnet)
+        if service is None:
+            service = MarketDataService(
+                testnet,
+                max_age_seconds=settings.MARKET_DATA_MAX_AGE_SECONDS,
+                idle_seconds=settings.MARKET_DATA_IDLE_SECONDS,
+                max_symbols=settings.MARKET_DATA_MAX_SYMBOLS,
+                exchange_info=get_exchange_info_cache(testnet)
+            )
+            _services[testnet] = service
+    return service
@@ -0,0 +1,146 @@
+"""
+Consolidated REST order tracking.
+Every order a strategy registers is grouped by symbol, and each tick makes one
+open-orders request per symbol. Only orders that have left the book are
+looked up individually, so polling cost grows with symbols, not orders.
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from binance.client import Client
+
+from bot.scheduler import StrategyScheduler, get_scheduler
+
+logger = logging.getLogger(__name__)
+
+# Statuses after which an order can no longer change
+FINAL_STATUSES = frozenset({'FILLED', 'CANCELED', 'EXPIRED', 'REJECTED', 'EXPIRED_IN_MATCH'})
+
+
+class OrderWatcher:
+    """
+    Poll order statuses for every strategy sharing one client.
+    
+    Callbacks receive ``{'symbol', 'order_id', 'status'}`` dicts, the same
+    fields the user-data stream provides, and run on a scheduler worker.
+    """
+    
+    def __init__(
+        self,
+        client: Client,
+        interval_seconds: float = 2,
+        scheduler: Optional[StrategyScheduler] = None,
+        should_poll: Optional[Callable[[], bool]] = None
+    ):
+        """
+        Initialize the watcher (the polling task starts with the first order).
+        
+        Args:
+            client: Binance client used for the REST calls
+            interval_seconds: Seconds between ticks
+            scheduler: Scheduler that runs the ticks (default: the shared one)
+            should_poll: Returns False to skip a tick, e.g. while a
+                user-data stream is delivering updates
+        """
+        self.client = client
+        self.interval_seconds = interval_seconds
+        self.scheduler = scheduler or get_scheduler()
+        self.should_poll = should_poll
+        self._lock = threading.Lock()
+        self._symbols: Dict[str, Dict[int, Callable[[Dict[str, Any]], None]]] = {}
+        self._order_symbols: Dict[int, str] = {}
+        self._statuses: Dict[int, str] = {}
+        self._task = None
+        self._owner = f"order-watcher:{id(self)}"
+        self.ticks = 0
+        self.requests = 0
+    
+    def watch(self, symbol: str, order_id: int, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """Report status changes of an order until it reaches a final status."""
+        with self._lock:
+            self._symbols.setdefault(symbol, {})[order_id] = callback
+            self._order_symbols[order_id] = symbol
+            if self._task is None:
+                self._task = self.scheduler.call_every(self.interval_seconds, self.poll, owner=self._owner)
+    
+    def unwatch(self, order_id: int) -> None:
+        """Stop reporting an order."""
+        with self._lock:
+            self._forget(order_id)
+    
+    def _forget(self, order_id: int) -> None:
+        symbol = self._order_symbols.pop(order_id, None)
+        self._statuses.pop(order_id, None)
+        if symbol is None:
+            return
+        orders = self._symbols.get(symbol)
+        orders.pop(order_id, None)
+        if not orders:
+            del self._symbols[symbol]
+        if not self._symbols and self._task is not None:
+            self.scheduler.cancel_owner(self._owner)
+            self._task = None
+    
+    def poll(self, force: bool = False) -> None:
+        """
+        Run one tick: one open-orders call per symbol, then resolve departures.
+        
+        Args:
+            force: Poll even when ``should_poll`` says the stream has it covered
+        """
+        if not force and self.should_poll is not None and not self.should_poll():
+            return
+        self.ticks += 1
+        
+        with self._lock:
+            symbols = list(self._symbols)
+        
+        for symbol in symbols:
+            try:
+                self._poll_symbol(symbol)
+            except Exception as e:
+                logger.error(f"Error polling open orders for {symbol}: {str(e)}")
+    
+    def _poll_symbol(self, symbol: str) -> None:
+        self.requests += 1
+        open_orders = {order['orderId']: order for order in self.client.futures_get_open_orders(symbol=symbol)}
+        
+        updates = []
+        with self._lock:
+            watched = dict(self._symbols.get(symbol, {}))
+            # Watched orders missing from the book were filled or cancelled since the last tick
+            departed = [order_id for order_id in watched if order_id not in open_orders]
+            for order_id, order in open_orders.items():
+                if order_id in watched and self._statuses.get(order_id) != order['status']:
+                    self._statuses[order_id] = order['status']
+                    updates.append((watched[order_id], order_id, order['status']))
+        
+        # Orders no longer on the book need one lookup for their final status
+        for order_id in departed:
+            try:
+                self.requests += 1
+                order = self.client.futures_get_order(symbol=symbol, orderId=order_id)
+            except Exception as e:
+                logger.error(f"Error resolving order {order_id}: {str(e)}")
+                continue
+            updates.append((watched[order_id], order_id, order['status']))
+            if order['status'] in FINAL_STATUSES:
+                self.unwatch(order_id)
+        
+        for callback, order_id, status in updates:
+            try:
+                callback({'symbol': symbol, 'order_id': order_id, 'status': status})
+            except Exception as e:
+                logger.error(f"Order watcher callback for {order_id} failed: {str(e)}")
+    
+    def stats(self) -> Dict[str, Any]:
+        """Counters for health reporting."""
+        with self._lock:
+            return {
+                'symbols': len(self._symbols),
+                'orders': len(self._order_symbols),
+                'ticks': self.ticks,
+                'requests': self.requests
+            }
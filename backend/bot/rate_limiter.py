@@ -0,0 +1,457 @@
+"""
+Request-weight aware rate limiting for Binance Futures.
+Every exchange call passes through one process-wide governor that tracks
+IP request weight and per-key order counts, resyncs from the
+X-MBX-USED-WEIGHT-* / X-MBX-ORDER-COUNT-* headers and lets cancels go
+ahead of new orders, and new orders ahead of status polls.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Lower value wins when weight is scarce
+PRIORITY_CANCEL = 0
+PRIORITY_ORDER = 1
+PRIORITY_QUERY = 2
+
+# (HTTP method, endpoint) -> request weight; anything unlisted costs 1
+ENDPOINT_WEIGHTS = {
+    ('get', 'account'): 5,
+    ('get', 'balance'): 5,
+    ('get', 'positionRisk'): 5,
+    ('get', 'allOrders'): 5,
+    ('get', 'userTrades'): 5,
+    ('post', 'batchOrders'): 5,
+    ('get', 'ticker/24hr'): 40,
+    ('get', 'depth'): 10,
+}
+# Weights that depend on whether a symbol is given
+UNFILTERED_WEIGHTS = {
+    ('get', 'openOrders'): 40,
+    ('get', 'ticker/price'): 2,
+    ('get', 'ticker/bookTicker'): 2,
+}
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request cannot be admitted within the allowed wait."""
+
+
+class TokenBucket:
+    """Token bucket approximating a rolling exchange limit window."""
+    
+    def __init__(self, capacity: float, window_seconds: float):
+        self.capacity = float(capacity)
+        self.refill_rate = capacity / window_seconds
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+    
+    def refill(self, now: float) -> None:
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
+            self.updated = now
+    
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` tokens are available (after refill)."""
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_rate
+    
+    def sync_used(self, used: float, now: float) -> None:
+        """Adopt the exchange's view of how much of the window is used."""
+        self.refill(now)
+        self.tokens = max(0.0, self.capacity - used)
+
+
+class RequestCost:
+    """Weight, order count and priority of a single exchange call."""
+    
+    __slots__ = ('host', 'weight', 'orders', 'priority')
+    
+    def __init__(self, host: str, weight: int, orders: int, priority: int):
+        self.host = host
+        self.weight = weight
+        self.orders = orders
+        self.priority = priority
+
+
+def classify_request(method: str, uri: str, data: Optional[Dict[str, Any]]) -> RequestCost:
+    """
+    Work out what a request will cost from its method, URI and parameters.
+    
+    Args:
+        method: HTTP method as passed to the client ('get', 'post', ...)
+        uri: Full request URI
+        data: Request parameters
+    
+    Returns:
+        RequestCost for the call
+    """
+    parsed = urlparse(uri)
+    # '/fapi/v1/order' -> 'order', '/fapi/v1/ticker/price' -> 'ticker/price'
+    parts = parsed.path.strip('/').split('/')
+    endpoint = '/'.join(parts[2:]) if len(parts) > 2 else parsed.path.strip('/')
+    key = (method, endpoint)
+    data = data or {}
+    
+    if key in UNFILTERED_WEIGHTS and not data.get('symbol'):
+        weight = UNFILTERED_WEIGHTS[key]
+    else:
+        weight = ENDPOINT_WEIGHTS.get(key, 1)
+    
+    orders = 0
+    if method == 'post' and endpoint == 'order':
+        orders = 1
+    elif method == 'post' and endpoint == 'batchOrders':
+        # Already url-encoded JSON by the client; count the order objects
+        batch = str(data.get('batchOrders', ''))
+        orders = max(1, batch.count('%7B') + batch.count('{'))
+    
+    if method == 'delete':
+        priority = PRIORITY_CANCEL
+    elif orders:
+        priority = PRIORITY_ORDER
+    else:
+        priority = PRIORITY_QUERY
+    
+    return RequestCost(parsed.netloc, weight, orders, priority)
+
+
+class RateLimitGovernor:
+    """
+    Process-wide admission control for exchange requests.
+    
+    Request weight is accounted per host (Binance limits it per IP) and
+    order counts per API key. When weight runs short, a waiting request of
+    a higher priority blocks admission of lower priorities, and status polls
+    additionally leave a reserve untouched for cancels and orders.
+    """
+    
+    def __init__(
+        self,
+        weight_per_minute: int = 2400,
+        orders_per_10s: int = 300,
+        orders_per_minute: int = 1200,
+        query_reserve: float = 0.2,
+        max_wait_seconds: float = 30
+    ):
+        """
+        Initialize the governor.
+        
+        Args:
+            weight_per_minute: IP request weight limit per minute
+            orders_per_10s: Order limit per API key per 10 seconds
+            orders_per_minute: Order limit per API key per minute
+            query_reserve: Fraction of weight status polls may not use
+            max_wait_seconds: Longest a request may wait before failing
+        """
+        self.weight_per_minute = weight_per_minute
+        self.orders_per_10s = orders_per_10s
+        self.orders_per_minute = orders_per_minute
+        self.query_reserve = query_reserve
+        self.max_wait_seconds = max_wait_seconds
+        
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._ip_buckets: Dict[str, TokenBucket] = {}
+        self._key_buckets: Dict[str, Dict[str, TokenBucket]] = {}
+        self._banned_until: Dict[str, float] = {}
+        # host -> priority -> number of requests waiting for weight
+        self._waiting: Dict[str, Dict[int, int]] = {}
+        self.admitted = 0
+        self.throttled = 0
+        self.rejected = 0
+    
+    def _ip_bucket(self, host: str) -> TokenBucket:
+        bucket = self._ip_buckets.get(host)
+        if bucket is None:
+            bucket = self._ip_buckets[host] = TokenBucket(self.weight_per_minute, 60)
+        return bucket
+    
+    def _order_buckets(self, api_key: str) -> Dict[str, TokenBucket]:
+        buckets = self._key_buckets.get(api_key)
+        if buckets is None:
+            buckets = self._key_buckets[api_key] = {
+                '10s': TokenBucket(self.orders_per_10s, 10),
+                '1m': TokenBucket(self.orders_per_minute, 60)
+            }
+        return buckets
+    
+    def _try_admit(self, cost: RequestCost, api_key: str, ticket: Dict[str, bool]) -> float:
+        """
+        Consume tokens if the request may go now.
+        
+        A request held back for lack of weight is counted as waiting (in
+        ``ticket``) so that lower priorities on the same host stand aside.
+        
+        Returns:
+            0 if admitted, otherwise the suggested wait in seconds
+        """
+        now = time.monotonic()
+        self._set_waiting(cost, ticket, False)
+        
+        banned_until = self._banned_until.get(cost.host, 0)
+        if now < banned_until:
+            self._set_waiting(cost, ticket, True)
+            return banned_until - now
+        
+        ip_bucket = self._ip_bucket(cost.host)
+        ip_bucket.refill(now)
+        
+        reserve = ip_bucket.capacity * self.query_reserve if cost.priority == PRIORITY_QUERY else 0
+        weight_wait = ip_bucket.wait_time(cost.weight + reserve)
+        waiting = self._waiting.get(cost.host, {})
+        higher_waiting = any(n for p, n in waiting.items() if p < cost.priority)
+        if weight_wait > 0 or higher_waiting:
+            self._set_waiting(cost, ticket, True)
+            return max(weight_wait, 0.05)
+        
+        if cost.orders:
+            order_buckets = self._order_buckets(api_key)
+            order_wait = 0.0
+            for bucket in order_buckets.values():
+                bucket.refill(now)
+                order_wait = max(order_wait, bucket.wait_time(cost.orders))
+            if order_wait > 0:
+                return order_wait
+            for bucket in order_buckets.values():
+                bucket.tokens -= cost.orders
+        
+        ip_bucket.tokens -= cost.weight
+        self.admitted += 1
+        return 0.0
+    
+    def _set_waiting(self, cost: RequestCost, ticket: Dict[str, bool], waiting: bool) -> None:
+        if ticket['waiting'] == waiting:
+            return
+        counts = self._waiting.setdefault(cost.host, {})
+        counts[cost.priority] = counts.get(cost.priority, 0) + (1 if waiting else -1)
+        ticket['waiting'] = waiting
+    
+    def acquire(self, cost: RequestCost, api_key: str) -> None:
+        """
+        Block until the request is admitted.
+        
+        Raises:
+            RateLimitExceeded: If admission takes longer than max_wait_seconds
+        """
+        deadline = time.monotonic() + self.max_wait_seconds
+        ticket = {'waiting': False}
+        with self._cond:
+            wait = self._try_admit(cost, api_key, ticket)
+            if wait == 0:
+                return
+            
+            self.throttled += 1
+            try:
+                while wait > 0:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.rejected += 1
+                        raise RateLimitExceeded(
+                            f"Rate limit: request to {cost.host} not admitted within {self.max_wait_seconds}s"
+                        )
+                    self._cond.wait(min(wait, remaining, 1.0))
+                    wait = self._try_admit(cost, api_key, ticket)
+            finally:
+                self._set_waiting(cost, ticket, False)
+                self._cond.notify_all()
+    
+    async def acquire_async(self, cost: RequestCost, api_key: str) -> None:
+        """Async variant of acquire() that sleeps on the event loop instead of blocking."""
+        deadline = time.monotonic() + self.max_wait_seconds
+        ticket = {'waiting': False}
+        with self._lock:
+            wait = self._try_admit(cost, api_key, ticket)
+            if wait == 0:
+                return
+            self.throttled += 1
+        
+        try:
+            while wait > 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    with self._lock:
+                        self.rejected += 1
+                    raise RateLimitExceeded(
+                        f"Rate limit: request to {cost.host} not admitted within {self.max_wait_seconds}s"
+                    )
+                await asyncio.sleep(min(wait, remaining, 1.0))
+                with self._lock:
+                    wait = self._try_admit(cost, api_key, ticket)
+        finally:
+            with self._cond:
+                self._set_waiting(cost, ticket, False)
+                self._cond.notify_all()
+    
+    def update_from_headers(self, host: str, api_key: str, headers: Any) -> None:
+        """Resync buckets from the X-MBX-* usage headers of a response."""
+        if not headers:
+            return
+        now = time.monotonic()
+        with self._cond:
+            for name, value in headers.items():
+                name = name.upper()
+                if not name.startswith('X-MBX-'):
+                    continue
+                try:
+                    used = float(value)
+                except (TypeError, ValueError):
+                    continue
+                if name == 'X-MBX-USED-WEIGHT-1M':
+                    self._ip_bucket(host).sync_used(used, now)
+                elif name == 'X-MBX-ORDER-COUNT-10S':
+                    self._order_buckets(api_key)['10s'].sync_used(used, now)
+                elif name == 'X-MBX-ORDER-COUNT-1M':
+                    self._order_buckets(api_key)['1m'].sync_used(used, now)
+            self._cond.notify_all()
+    
+    def penalize(self, host: str, status_code: int, retry_after: Optional[float]) -> None:
+        """Pause every request to a host after a 429/418 response."""
+        pause = retry_after if retry_after else (120 if status_code == 418 else 10)
+        with self._cond:
+            self._banned_until[host] = max(self._banned_until.get(host, 0), time.monotonic() + pause)
+            self._ip_bucket(host).tokens = 0
+        logger.warning(f"Rate limited by {host} (HTTP {status_code}); pausing requests for {pause}s")
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Return current headroom per host and per API key."""
+        now = time.monotonic()
+        with self._lock:
+            hosts = {}
+            for host, bucket in self._ip_buckets.items():
+                bucket.refill(now)
+                hosts[host] = {
+                    'weight_available': int(bucket.tokens),
+                    'weight_limit': int(bucket.capacity),
+                    'headroom_pct': round(100 * bucket.tokens / bucket.capacity, 1),
+                    'paused_for_seconds': round(max(0.0, self._banned_until.get(host, 0) - now), 1),
+                    'waiting': sum(self._waiting.get(host, {}).values())
+                }
+            keys = {}
+            for api_key, buckets in self._key_buckets.items():
+                entry = {}
+                for window, bucket in buckets.items():
+                    bucket.refill(now)
+                    entry[f'orders_{window}_available'] = int(bucket.tokens)
+                    entry[f'orders_{window}_limit'] = int(bucket.capacity)
+                keys[mask_api_key(api_key)] = entry
+            return {
+                'hosts': hosts,
+                'api_keys': keys,
+                'admitted': self.admitted,
+                'throttled': self.throttled,
+                'rejected': self.rejected
+            }
+
+
+def mask_api_key(api_key: Optional[str]) -> str:
+    """Shorten an API key for logs and metrics."""
+    if not api_key:
+        return 'anonymous'
+    return f"{api_key[:6]}..."
+
+
+def _retry_after(response: Any) -> Optional[float]:
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        return float(headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+
+# Responses seen by the current call; a context variable so calls on other
+# threads or tasks of the same client never see each other's responses
+_call_responses: ContextVar[Optional[list]] = ContextVar('rate_limit_call_responses', default=None)
+
+
+def _capture_responses(client: Any) -> None:
+    # client.response is shared by every call on the client, so take each
+    # response as python-binance hands it to _handle_response instead
+    handle = getattr(client, '_handle_response', None)
+    if handle is None or client.__dict__.get('_captures_responses'):
+        return
+    
+    def capturing_handle_response(response):
+        responses = _call_responses.get()
+        if responses is not None:
+            responses.append(response)
+        return handle(response)
+    
+    client._handle_response = capturing_handle_response
+    client._captures_responses = True
+
+
+def _after_call(cost: RequestCost, api_key: str, responses: list, status_code: Optional[int]) -> None:
+    # A call that failed before any response (e.g. connection error) has
+    # nothing to resync from
+    response = responses[-1] if responses else None
+    if response is not None:
+        governor.update_from_headers(cost.host, api_key, response.headers)
+    if status_code in (418, 429):
+        governor.penalize(cost.host, status_code, _retry_after(response))
+
+
+def wrap_sync(client: Any, call):
+    """Wrap a sync client's _request so every call is admitted by the governor."""
+    _capture_responses(client)
+    
+    def governed_request(method, uri, signed, force_params=False, **kwargs):
+        cost = classify_request(method, uri, kwargs.get('data'))
+        governor.acquire(cost, client.API_KEY)
+        responses = []
+        token = _call_responses.set(responses)
+        status_code = None
+        try:
+            return call(method, uri, signed, force_params, **kwargs)
+        except Exception as e:
+            status_code = getattr(e, 'status_code', None)
+            raise
+        finally:
+            _call_responses.reset(token)
+            _after_call(cost, client.API_KEY, responses, status_code)
+    
+    return governed_request
+
+
+def wrap_async(client: Any, call):
+    """Wrap an async client's _request so every call is admitted by the governor."""
+    _capture_responses(client)
+    
+    async def governed_request(method, uri, signed, force_params=False, **kwargs):
+        cost = classify_request(method, uri, kwargs.get('data'))
+        await governor.acquire_async(cost, client.API_KEY)
+        responses = []
+        token = _call_responses.set(responses)
+        status_code = None
+        try:
+            return await call(method, uri, signed, force_params, **kwargs)
+        except Exception as e:
+            status_code = getattr(e, 'status_code', None)
+            raise
+        finally:
+            _call_responses.reset(token)
+            _after_call(cost, client.API_KEY, responses, status_code)
+    
+    return governed_request
+
+
+# Shared governor for every bot in the process
+governor = RateLimitGovernor(
+    weight_per_minute=settings.BINANCE_WEIGHT_LIMIT_PER_MINUTE,
+    orders_per_10s=settings.BINANCE_ORDER_LIMIT_PER_10S,
+    orders_per_minute=settings.BINANCE_ORDER_LIMIT_PER_MINUTE,
+    query_reserve=settings.RATE_LIMIT_QUERY_RESERVE,
+    max_wait_seconds=settings.RATE_LIMIT_MAX_WAIT_SECONDS
+)
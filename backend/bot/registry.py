@@ -0,0 +1,215 @@
+"""
+Process-wide registry of warm bot instances.
+Keeps one long-lived bot (and its keep-alive HTTP session) per BotConfig.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
+from typing import Any, Callable, Dict
+
+from bot.async_bot import AsyncBasicBot
+from bot.basic_bot import BasicBot
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class BotRegistry:
+    """
+    LRU/TTL cache of bot instances keyed by BotConfig id.
+    
+    An entry is reused while the config's credentials are unchanged and it has
+    been used within the idle TTL. Entries are dropped when the registry grows
+    past ``max_size`` (least recently used first) or when explicitly
+    invalidated after the config is updated or deleted.
+    """
+    
+    def __init__(
+        self,
+        factory: Callable[..., Any],
+        max_size: int = 256,
+        idle_ttl_seconds: float = 900
+    ):
+        """
+        Initialize the registry.
+        
+        Args:
+            factory: Callable building a bot from (api_key, api_secret, testnet)
+            max_size: Maximum number of warm bots kept
+            idle_ttl_seconds: Drop bots not used for this many seconds
+        """
+        self._factory = factory
+        self.max_size = max_size
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self._entries: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def _fingerprint(bot_config) -> tuple:
+        return (bot_config.api_key, bot_config.api_secret, bool(bot_config.is_testnet))
+    
+    def get(self, bot_config) -> Any:
+        """
+        Return a warm bot for the given config, creating one on a miss.
+        
+        Args:
+            bot_config: BotConfig model instance
+        
+        Returns:
+            Bot instance bound to the config's credentials
+        """
+        fingerprint = self._fingerprint(bot_config)
+        now = time.monotonic()
+        
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._entries.get(bot_config.id)
+            if entry is not None and entry['fingerprint'] == fingerprint:
+                entry['last_used'] = now
+                self._entries.move_to_end(bot_config.id)
+                self.hits += 1
+                return entry['bot']
+            if entry is not None:
+                # Credentials changed underneath us
+                self._drop(bot_config.id)
+            self.misses += 1
+        
+        # Build outside the lock: client construction does network I/O
+        bot = self._factory(
+            api_key=bot_config.api_key,
+            api_secret=bot_config.api_secret,
+            testnet=bot_config.is_testnet
+        )
+        
+        with self._lock:
+            entry = self._entries.get(bot_config.id)
+            if entry is not None and entry['fingerprint'] == fingerprint:
+                # Another request won the race; keep theirs
+                self._close(bot)
+                entry['last_used'] = time.monotonic()
+                return entry['bot']
+            if entry is not None:
+                self._drop(bot_config.id)
+            
+            self._entries[bot_config.id] = {
+                'bot': bot,
+                'fingerprint': fingerprint,
+                'created_at': now,
+                'last_used': now
+            }
+            while len(self._entries) > self.max_size:
+                oldest_id = next(iter(self._entries))
+                self._drop(oldest_id)
+                self.evictions += 1
+        
+        logger.info(f"Bot registry: created bot for config {bot_config.id}")
+        return bot
+    
+    def invalidate(self, config_id: int) -> bool:
+        """
+        Drop the cached bot for a config.
+        
+        Args:
+            config_id: BotConfig id
+        
+        Returns:
+            True if an entry was removed
+        """
+        with self._lock:
+            if config_id not in self._entries:
+                return False
+            self._drop(config_id)
+        
+        logger.info(f"Bot registry: invalidated config {config_id}")
+        return True
+    
+    def clear(self) -> None:
+        """Drop every cached bot."""
+        with self._lock:
+            for config_id in list(self._entries):
+                self._drop(config_id)
+    
+    async def aclear(self) -> None:
+        """
+        Drop every cached bot, awaiting async closes.
+        
+        Used at shutdown, on the event loop, so sessions are closed before the
+        loop and the shared connector go away.
+        """
+        with self._lock:
+            bots = [entry['bot'] for entry in self._entries.values()]
+            self._entries.clear()
+        
+        for bot in bots:
+            aclose = getattr(bot, 'aclose', None)
+            if aclose is None:
+                self._close(bot)
+                continue
+            try:
+                await aclose()
+            except Exception as e:
+                logger.warning(f"Error closing bot: {str(e)}")
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return registry size and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+    
+    def _evict_idle(self, now: float) -> None:
+        # Entries are kept in LRU order, so idle ones are at the front
+        while self._entries:
+            config_id, entry = next(iter(self._entries.items()))
+            if now - entry['last_used'] < self.idle_ttl_seconds:
+                break
+            self._drop(config_id)
+            self.evictions += 1
+    
+    def _drop(self, config_id: int) -> None:
+        entry = self._entries.pop(config_id, None)
+        if entry is not None:
+            self._close(entry['bot'])
+    
+    @staticmethod
+    def _close(bot: Any) -> None:
+        close = getattr(bot, 'close', None)
+        if close is None:
+            return
+        try:
+            close()
+        except Exception as e:
+            logger.warning(f"Error closing bot: {str(e)}")
+
+
+# Shared registry used by the trading routes
+bot_registry = BotRegistry(
+    factory=partial(BasicBot, pool_size=settings.BINANCE_HTTP_POOL_SIZE),
+    max_size=settings.BOT_REGISTRY_MAX_SIZE,
+    idle_ttl_seconds=settings.BOT_REGISTRY_IDLE_TTL_SECONDS
+)
+
+# Async bots for the async trading routes; they share one connection pool
+async_bot_registry = BotRegistry(
+    factory=AsyncBasicBot,
+    max_size=settings.BOT_REGISTRY_MAX_SIZE,
+    idle_ttl_seconds=settings.BOT_REGISTRY_IDLE_TTL_SECONDS
+)
+
+
+def invalidate_bot_config(config_id: int) -> None:
+    """Drop sync and async bots cached for a BotConfig."""
+    bot_registry.invalidate(config_id)
+    async_bot_registry.invalidate(config_id)
@@ -0,0 +1,282 @@
+"""
+Shared scheduler for strategy work.
+One timer thread keeps a heap of pending wakeups and hands due callbacks to a
+bounded worker pool, so the cost of running strategies grows with the number
+of wakeups in flight rather than with one sleeping thread per strategy.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduledTask:
+    """Handle for a scheduled callback."""
+    
+    __slots__ = ('when', 'callback', 'args', 'owner', 'interval', 'cancelled', 'queued')
+    
+    def __init__(self, when: float, callback: Callable, args: tuple, owner: Optional[str], interval: Optional[float]):
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self.owner = owner
+        self.interval = interval
+        self.cancelled = False
+        self.queued = False
+
+
+class StrategyScheduler:
+    """
+    Timer heap plus bounded worker pool.
+    
+    Tasks may be tagged with an owner (a strategy id) so everything belonging
+    to a strategy can be cancelled at once or expired by a deadline. Times are
+    ``time.monotonic()`` seconds.
+    """
+    
+    def __init__(self, max_workers: int = 16, name: str = 'strategy'):
+        """
+        Initialize the scheduler (threads start on first use).
+        
+        Args:
+            max_workers: Worker threads for the callbacks (blocking exchange calls)
+            name: Prefix for thread names
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self._heap: List[tuple] = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._owners: Dict[str, Set[ScheduledTask]] = {}
+        self._deadlines: Dict[str, ScheduledTask] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._cancelled_in_heap = 0
+        self.executed = 0
+        self.failed = 0
+        self.expired = 0
+        self.max_lag = 0.0
+    
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"{self.name}-worker")
+        self._thread = threading.Thread(target=self._run, name=f"{self.name}-timer", daemon=True)
+        self._thread.start()
+    
+    def call_at(self, when: float, callback: Callable, *args, owner: Optional[str] = None) -> ScheduledTask:
+        """Run ``callback(*args)`` at monotonic time ``when``."""
+        return self._schedule(ScheduledTask(when, callback, args, owner, None))
+    
+    def call_later(self, delay: float, callback: Callable, *args, owner: Optional[str] = None) -> ScheduledTask:
+        """Run ``callback(*args)`` after ``delay`` seconds."""
+        return self.call_at(time.monotonic() + delay, callback, *args, owner=owner)
+    
+    def submit(self, callback: Callable, *args, owner: Optional[str] = None) -> ScheduledTask:
+        """Run ``callback(*args)`` on a worker as soon as one is free."""
+        return self.call_at(time.monotonic(), callback, *args, owner=owner)
+    
+    def call_every(
+        self,
+        interval: float,
+        callback: Callable,
+        *args,
+        owner: Optional[str] = None,
+        first_delay: Optional[float] = None
+    ) -> ScheduledTask:
+        """
+        Run ``callback(*args)`` every ``interval`` seconds until cancelled.
+        
+        Runs are on a fixed grid; if a run overruns, missed slots are skipped
+        rather than queued.
+        """
+        delay = interval if first_delay is None else first_delay
+        return self._schedule(ScheduledTask(time.monotonic() + delay, callback, args, owner, interval))
+    
+    def _schedule(self, task: ScheduledTask) -> ScheduledTask:
+        with self._cond:
+            self._ensure_started()
+            if task.owner is not None:
+                self._owners.setdefault(task.owner, set()).add(task)
+            self._push(task)
+            if self._heap[0][2] is task:
+                self._cond.notify()
+        return task
+    
+    def cancel(self, task: ScheduledTask) -> None:
+        """Stop a task; a run already in progress is not interrupted."""
+        with self._cond:
+            self._cancel(task)
+            owned = self._owners.get(task.owner)
+            if owned is not None:
+                owned.discard(task)
+                if not owned:
+                    del self._owners[task.owner]
+    
+    def cancel_owner(self, owner: str) -> int:
+        """
+        Cancel every pending task of an owner, including its deadline.
+        
+        Returns:
+            Number of tasks cancelled
+        """
+        with self._cond:
+            tasks = self._owners.pop(owner, set())
+            deadline = self._deadlines.pop(owner, None)
+            if deadline is not None:
+                tasks.add(deadline)
+            for task in tasks:
+                self._cancel(task)
+            self._compact()
+        return len(tasks)
+    
+    def set_deadline(self, owner: str, seconds: float, on_expire: Optional[Callable[[str], Any]] = None) -> None:
+        """
+        Give an owner a deadline; when it passes, its tasks are cancelled and
+        ``on_expire(owner)`` runs.
+        """
+        def expire():
+            with self._cond:
+                self._deadlines.pop(owner, None)
+            self.expired += 1
+            self.cancel_owner(owner)
+            logger.warning(f"Strategy {owner} passed its deadline")
+            if on_expire is not None:
+                on_expire(owner)
+        
+        self.clear_deadline(owner)
+        task = ScheduledTask(time.monotonic() + seconds, expire, (), None, None)
+        with self._cond:
+            self._deadlines[owner] = task
+        self._schedule(task)
+    
+    def clear_deadline(self, owner: str) -> None:
+        """Remove an owner's deadline, if any."""
+        with self._cond:
+            task = self._deadlines.pop(owner, None)
+            if task is not None:
+                self._cancel(task)
+    
+    def _push(self, task: ScheduledTask) -> None:
+        task.queued = True
+        heapq.heappush(self._heap, (task.when, next(self._sequence), task))
+    
+    def _pop(self) -> ScheduledTask:
+        task = heapq.heappop(self._heap)[2]
+        task.queued = False
+        if task.cancelled:
+            self._cancelled_in_heap -= 1
+        return task
+    
+    def _cancel(self, task: ScheduledTask) -> None:
+        # Cancelled entries stay in the heap until popped or compacted
+        if not task.cancelled:
+            task.cancelled = True
+            if task.queued:
+                self._cancelled_in_heap += 1
+    
+    def _compact(self) -> None:
+        # Drop cancelled entries once they dominate the heap
+        if self._cancelled_in_heap > 64 and self._cancelled_in_heap > len(self._heap) // 2:
+            for entry in self._heap:
+                entry[2].queued = not entry[2].cancelled
+            self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+            heapq.heapify(self._heap)
+            self._cancelled_in_heap = 0
+    
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopping:
+                    if self._heap and self._heap[0][2].cancelled:
+                        self._pop()
+                        continue
+                    now = time.monotonic()
+                    if self._heap and self._heap[0][0] <= now:
+                        break
+                    self._cond.wait(self._heap[0][0] - now if self._heap else None)
+                if self._stopping:
+                    return
+                task = self._pop()
+            
+            self.max_lag = max(self.max_lag, time.monotonic() - task.when)
+            self._executor.submit(self._execute, task)
+    
+    def _execute(self, task: ScheduledTask) -> None:
+        if task.cancelled:
+            return
+        try:
+            task.callback(*task.args)
+            self.executed += 1
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Scheduled task for {task.owner or 'scheduler'} failed: {str(e)}")
+        finally:
+            if task.interval is not None and not task.cancelled:
+                # Next slot on the fixed grid that is still in the future
+                now = time.monotonic()
+                missed = max(0, int((now - task.when) // task.interval))
+                task.when += (missed + 1) * task.interval
+                with self._cond:
+                    if not task.cancelled:
+                        self._push(task)
+                        self._cond.notify()
+            elif task.owner is not None:
+                with self._cond:
+                    owned = self._owners.get(task.owner)
+                    if owned is not None:
+                        owned.discard(task)
+                        if not owned and task.owner not in self._deadlines:
+                            del self._owners[task.owner]
+    
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the timer thread and worker pool; pending tasks are dropped."""
+        with self._cond:
+            self._stopping = True
+            self._heap.clear()
+            self._cancelled_in_heap = 0
+            self._owners.clear()
+            self._deadlines.clear()
+            self._cond.notify()
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Load figures for health reporting."""
+        with self._cond:
+            pending = len(self._heap) - self._cancelled_in_heap
+            owners = len(self._owners)
+        queue = self._executor._work_queue.qsize() if self._executor is not None else 0
+        return {
+            'pending_wakeups': pending,
+            'strategies': owners,
+            'workers': self.max_workers,
+            'queued': queue,
+            'executed': self.executed,
+            'failed': self.failed,
+            'expired': self.expired,
+            'max_lag_ms': round(self.max_lag * 1000, 3)
+        }
+
+
+_scheduler: Optional[StrategyScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> StrategyScheduler:
+    """Return the process-wide strategy scheduler."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = StrategyScheduler(max_workers=settings.STRATEGY_WORKER_THREADS)
+    return _scheduler
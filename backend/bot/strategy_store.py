@@ -0,0 +1,253 @@
+"""
+Durable strategy state.
+Strategy changes are appended to a SQLite journal as they happen and folded
+into per-strategy snapshots periodically, so a restarted process can rebuild
+every live strategy from one snapshot read plus a short journal replay.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS strategy_journal (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    account TEXT NOT NULL,
+    strategy_id TEXT NOT NULL,
+    op TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_strategy_journal_account ON strategy_journal (account, seq);
+CREATE TABLE IF NOT EXISTS strategy_snapshots (
+    account TEXT NOT NULL,
+    strategy_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    active INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (account, strategy_id)
+);
+"""
+
+
+def _encode(value: Any) -> str:
+    # Deques (grid fill history) are stored as lists
+    return json.dumps(value, default=lambda o: list(o) if isinstance(o, deque) else str(o))
+
+
+def apply_op(states: Dict[str, Dict[str, Any]], strategy_id: str, op: str, data: Dict[str, Any]) -> None:
+    """
+    Apply one journal entry to a dict of strategy states.
+    
+    Ops:
+        create: ``data`` is the full state
+        set: merge ``data`` into the top level
+        set_item: ``state[data['key']][data['index']] = data['value']``
+        append: append ``data['value']`` to ``state[data['key']]``, keeping
+            at most ``data['maxlen']`` items when given
+        delete: forget the strategy
+    """
+    if op == 'create':
+        states[strategy_id] = data
+        return
+    if op == 'delete':
+        states.pop(strategy_id, None)
+        return
+    
+    state = states.get(strategy_id)
+    if state is None:
+        return
+    if op == 'set':
+        state.update(data)
+    elif op == 'set_item':
+        state[data['key']][data['index']] = data['value']
+    elif op == 'append':
+        items = state.setdefault(data['key'], [])
+        items.append(data['value'])
+        maxlen = data.get('maxlen')
+        if maxlen is not None and len(items) > maxlen:
+            del items[:len(items) - maxlen]
+    else:
+        raise ValueError(f"Unknown journal op: {op}")
+
+
+class StrategyStore:
+    """
+    Append-only journal plus snapshots in one SQLite file.
+    
+    Strategies are namespaced by account so several API keys can share a
+    file. Safe to use from several threads.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Open (and create if needed) the store.
+        
+        Args:
+            path: SQLite file path, or ':memory:'
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ':memory:':
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self.journal_writes = 0
+        self.snapshots_written = 0
+    
+    def record(self, account: str, strategy_id: str, op: str, data: Dict[str, Any]) -> None:
+        """Append one change to the journal."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO strategy_journal (account, strategy_id, op, data, created_at) VALUES (?, ?, ?, ?, ?)",
+                (account, strategy_id, op, _encode(data), time.time())
+            )
+            self.journal_writes += 1
+    
+    def last_seq(self, account: str) -> int:
+        """Sequence number of the account's latest journal entry (0 if none)."""
+        with self._lock:
+            return self._last_seq(account)
+    
+    def _last_seq(self, account: str) -> int:
+        row = self._conn.execute(
+            "SELECT COALESCE(MAX(seq), 0) FROM strategy_journal WHERE account = ?",
+            (account,)
+        ).fetchone()
+        return row[0]
+    
+    def snapshot(self, account: str, strategies: Dict[str, Dict[str, Any]], seq: Optional[int] = None) -> int:
+        """
+        Write snapshots for an account and drop the journal they cover.
+        
+        Strategies no longer in ``strategies`` are kept as they are; finished
+        ones are stored inactive so recovery skips them.
+        
+        Args:
+            account: Account namespace
+            strategies: Strategy ID -> state
+            seq: Last journal entry the states include (default: the latest).
+                Pass the value read while the states were copied when other
+                threads may be journaling.
+        
+        Returns:
+            Number of strategies snapshotted
+        """
+        now = time.time()
+        with self._lock:
+            if seq is None:
+                seq = self._last_seq(account)
+            rows = [
+                (account, sid, _encode(state), seq, int(state.get('status', 'active') == 'active'), now)
+                for sid, state in list(strategies.items())
+            ]
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO strategy_snapshots (account, strategy_id, state, seq, active, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                # Entries for strategies without a snapshot must survive compaction
+                self._conn.execute(
+                    "DELETE FROM strategy_journal WHERE account = ? AND seq <= ? AND strategy_id IN "
+                    "(SELECT strategy_id FROM strategy_snapshots WHERE account = ?)",
+                    (account, seq, account)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self.snapshots_written += len(rows)
+        return len(rows)
+    
+    def load(self, account: str, active_only: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Rebuild an account's strategies from snapshots plus the journal tail.
+        
+        Args:
+            account: Account namespace
+            active_only: Drop strategies whose status is no longer 'active'
+        
+        Returns:
+            Strategy ID -> state
+        """
+        with self._lock:
+            snapshots = self._conn.execute(
+                "SELECT strategy_id, state, seq FROM strategy_snapshots WHERE account = ?",
+                (account,)
+            ).fetchall()
+            journal = self._conn.execute(
+                "SELECT strategy_id, op, data, seq FROM strategy_journal WHERE account = ? ORDER BY seq",
+                (account,)
+            ).fetchall()
+        
+        states = {}
+        covered = {}
+        for strategy_id, state, seq in snapshots:
+            states[strategy_id] = json.loads(state)
+            covered[strategy_id] = seq
+        
+        for strategy_id, op, data, seq in journal:
+            if seq <= covered.get(strategy_id, 0):
+                continue
+            apply_op(states, strategy_id, op, json.loads(data))
+        
+        if active_only:
+            states = {sid: s for sid, s in states.items() if s.get('status', 'active') == 'active'}
+        return states
+    
+    def purge(self, account: str, strategy_ids: Iterable[str]) -> None:
+        """Forget finished strategies entirely."""
+        ids = [(account, sid) for sid in strategy_ids]
+        with self._lock:
+            self._conn.executemany("DELETE FROM strategy_snapshots WHERE account = ? AND strategy_id = ?", ids)
+            self._conn.executemany("DELETE FROM strategy_journal WHERE account = ? AND strategy_id = ?", ids)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Row counts and write counters."""
+        with self._lock:
+            journal = self._conn.execute("SELECT COUNT(*) FROM strategy_journal").fetchone()[0]
+            snapshots = self._conn.execute("SELECT COUNT(*) FROM strategy_snapshots").fetchone()[0]
+        return {
+            'path': self.path,
+            'journal_rows': journal,
+            'snapshot_rows': snapshots,
+            'journal_writes': self.journal_writes,
+            'snapshots_written': self.snapshots_written
+        }
+    
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_stores: Dict[str, StrategyStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_strategy_store(path: Optional[str] = None) -> Optional[StrategyStore]:
+    """
+    Return the shared store for a path (default: STRATEGY_STORE_PATH).
+    
+    Returns None when persistence is switched off with an empty path.
+    """
+    path = settings.STRATEGY_STORE_PATH if path is None else path
+    if not path:
+        return None
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = StrategyStore(path)
+            _stores[path] = store
+    return store
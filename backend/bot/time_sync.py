@@ -0,0 +1,228 @@
+"""
+Server-time synchronisation for signed Binance requests.
+A request layer keeps a per-host estimate of the offset between the local
+clock and the exchange, refreshed with the weight-1 time endpoint, stamps it
+onto every signed request together with a recvWindow sized from the observed
+round-trip jitter, and retries a -1021 timestamp rejection once after
+resyncing.
+"""
+
+import logging
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+from binance.exceptions import BinanceAPIException
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# "Timestamp for this request is outside of the recvWindow"
+TIMESTAMP_ERROR_CODE = -1021
+# Largest recvWindow the exchange accepts
+EXCHANGE_MAX_RECV_WINDOW_MS = 60000
+
+
+class TimeSync:
+    """
+    Clock offset and recvWindow for one exchange host.
+    
+    The offset comes from the lowest-latency recent sample, whose midpoint
+    estimate has the smallest error. Jitter is the mean absolute deviation
+    of recent round trips.
+    """
+    
+    def __init__(
+        self,
+        refresh_seconds: float = 300,
+        min_recv_window_ms: int = 5000,
+        max_recv_window_ms: int = 15000,
+        sample_size: int = 8
+    ):
+        """
+        Initialize an unsynchronised estimate (offset 0).
+        
+        Args:
+            refresh_seconds: Age after which the next signed request resyncs
+            min_recv_window_ms: recvWindow floor
+            max_recv_window_ms: recvWindow ceiling
+            sample_size: Round trips kept for the estimate
+        """
+        self.refresh_seconds = refresh_seconds
+        self.min_recv_window_ms = min_recv_window_ms
+        self.max_recv_window_ms = min(max_recv_window_ms, EXCHANGE_MAX_RECV_WINDOW_MS)
+        self._samples = deque(maxlen=sample_size)
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self.offset_ms = 0.0
+        self.jitter_ms = 0.0
+        self.recv_window_ms = min_recv_window_ms
+        self.synced_at: Optional[float] = None
+        self.syncs = 0
+        self.retries = 0
+    
+    def add_sample(self, sent_ms: float, server_ms: float, received_ms: float) -> None:
+        """Fold one time-endpoint round trip into the estimate."""
+        rtt = max(0.0, received_ms - sent_ms)
+        with self._lock:
+            self._samples.append((server_ms - (sent_ms + received_ms) / 2, rtt))
+            self.offset_ms = min(self._samples, key=lambda s: s[1])[0]
+            
+            rtts = [s[1] for s in self._samples]
+            median = statistics.median(rtts)
+            self.jitter_ms = sum(abs(r - median) for r in rtts) / len(rtts)
+            # Room for a slow round trip plus the error of the offset itself
+            needed = 2 * (median + 4 * self.jitter_ms) + min(rtts) / 2
+            self.recv_window_ms = int(min(self.max_recv_window_ms, max(self.min_recv_window_ms, needed)))
+            self.synced_at = time.monotonic()
+            self.syncs += 1
+    
+    def needs_refresh(self) -> bool:
+        synced_at = self.synced_at
+        return synced_at is None or time.monotonic() - synced_at >= self.refresh_seconds
+    
+    def claim_refresh(self) -> bool:
+        """True for the one caller that should resync now; others carry on."""
+        with self._lock:
+            if self._refreshing or not self.needs_refresh():
+                return False
+            self._refreshing = True
+            return True
+    
+    def release_refresh(self) -> None:
+        with self._lock:
+            self._refreshing = False
+    
+    def measure(self, fetch_server_time: Callable[[], Dict[str, Any]]) -> None:
+        """Take one sample with a sync time call, e.g. ``client.futures_time``."""
+        sent = time.time() * 1000
+        server = fetch_server_time()['serverTime']
+        self.add_sample(sent, server, time.time() * 1000)
+    
+    async def measure_async(self, fetch_server_time: Callable) -> None:
+        """Take one sample with an async time call."""
+        sent = time.time() * 1000
+        server = (await fetch_server_time())['serverTime']
+        self.add_sample(sent, server, time.time() * 1000)
+    
+    def apply(self, client: Any, kwargs: Dict[str, Any]) -> None:
+        """Set the client's offset and add recvWindow to the request data."""
+        client.timestamp_offset = int(round(self.offset_ms))
+        data = kwargs.get('data')
+        if isinstance(data, dict):
+            data = dict(data)
+            data.setdefault('recvWindow', self.recv_window_ms)
+            kwargs['data'] = data
+    
+    def stats(self) -> Dict[str, Any]:
+        synced_at = self.synced_at
+        return {
+            'offset_ms': round(self.offset_ms, 1),
+            'jitter_ms': round(self.jitter_ms, 1),
+            'recv_window_ms': self.recv_window_ms,
+            'synced_seconds_ago': None if synced_at is None else round(time.monotonic() - synced_at, 1),
+            'syncs': self.syncs,
+            'timestamp_retries': self.retries
+        }
+
+
+_syncs: Dict[str, TimeSync] = {}
+_syncs_lock = threading.Lock()
+
+
+def get_time_sync(host: str) -> TimeSync:
+    """Return the shared estimate for an exchange host."""
+    with _syncs_lock:
+        sync = _syncs.get(host)
+        if sync is None:
+            sync = TimeSync(
+                refresh_seconds=settings.TIME_SYNC_REFRESH_SECONDS,
+                min_recv_window_ms=settings.RECV_WINDOW_MIN_MS,
+                max_recv_window_ms=settings.RECV_WINDOW_MAX_MS
+            )
+            _syncs[host] = sync
+    return sync
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    """Stats for every host, for health reporting."""
+    with _syncs_lock:
+        return {host: sync.stats() for host, sync in _syncs.items()}
+
+
+def _client_host(client: Any) -> str:
+    attribute = 'FUTURES_TESTNET_URL' if getattr(client, 'testnet', False) else 'FUTURES_URL'
+    return getattr(client, attribute, '')
+
+
+def _is_timestamp_error(error: Exception, data: Any) -> bool:
+    return isinstance(error, BinanceAPIException) and error.code == TIMESTAMP_ERROR_CODE and isinstance(data, dict)
+
+
+def wrap_sync(client: Any, call):
+    """Wrap a sync client's _request with the offset, recvWindow and -1021 retry."""
+    sync = get_time_sync(_client_host(client))
+    
+    def synced_request(method, uri, signed, force_params=False, **kwargs):
+        if not signed:
+            return call(method, uri, signed, force_params, **kwargs)
+        
+        if sync.claim_refresh():
+            try:
+                sync.measure(client.futures_time)
+            except Exception as e:
+                logger.warning(f"Server time sync failed: {str(e)}")
+            finally:
+                sync.release_refresh()
+        
+        original = kwargs.get('data')
+        sync.apply(client, kwargs)
+        try:
+            return call(method, uri, signed, force_params, **kwargs)
+        except Exception as e:
+            if not _is_timestamp_error(e, original):
+                raise
+            logger.warning(f"Timestamp rejected (offset {sync.offset_ms:.0f} ms), resyncing and retrying once")
+            sync.retries += 1
+            sync.measure(client.futures_time)
+            kwargs['data'] = original
+            sync.apply(client, kwargs)
+            return call(method, uri, signed, force_params, **kwargs)
+    
+    return synced_request
+
+
+def wrap_async(client: Any, call):
+    """Wrap an async client's _request with the offset, recvWindow and -1021 retry."""
+    sync = get_time_sync(_client_host(client))
+    
+    async def synced_request(method, uri, signed, force_params=False, **kwargs):
+        if not signed:
+            return await call(method, uri, signed, force_params, **kwargs)
+        
+        if sync.claim_refresh():
+            try:
+                await sync.measure_async(client.futures_time)
+            except Exception as e:
+                logger.warning(f"Server time sync failed: {str(e)}")
+            finally:
+                sync.release_refresh()
+        
+        original = kwargs.get('data')
+        sync.apply(client, kwargs)
+        try:
+            return await call(method, uri, signed, force_params, **kwargs)
+        except Exception as e:
+            if not _is_timestamp_error(e, original):
+                raise
+            logger.warning(f"Timestamp rejected (offset {sync.offset_ms:.0f} ms), resyncing and retrying once")
+            sync.retries += 1
+            await sync.measure_async(client.futures_time)
+            kwargs['data'] = original
+            sync.apply(client, kwargs)
+            return await call(method, uri, signed, force_params, **kwargs)
+    
+    return synced_request
@@ -0,0 +1,105 @@
+"""
+Request layers shared by every Binance client the bots use.
+Each layer wraps the client's ``_request`` method, so it sees every REST
+call whether it comes from BasicBot, AsyncBasicBot or AdvancedOrderBot.
+"""
+
+import logging
+from typing import Any, Callable, Dict, Optional, Type
+
+from binance.client import AsyncClient, Client
+
+import metrics
+from bot import rate_limiter, time_sync
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_redirected_classes: Dict[tuple, type] = {}
+
+
+def install_layer(client: Any, name: str, wrap_sync: Callable, wrap_async: Callable) -> None:
+    """
+    Wrap a client's ``_request`` with a named layer, once.
+    
+    Args:
+        client: python-binance Client or AsyncClient
+        name: Layer name used to avoid installing it twice
+        wrap_sync: Builds the wrapper for a sync client from (client, call)
+        wrap_async: Builds the wrapper for an async client from (client, call)
+    """
+    installed = client.__dict__.setdefault('_request_layers', [])
+    if name in installed:
+        return
+    
+    call = client._request
+    if isinstance(client, AsyncClient):
+        client._request = wrap_async(client, call)
+    else:
+        client._request = wrap_sync(client, call)
+    installed.append(name)
+
+
+def prepare_client(client: Any) -> Any:
+    """
+    Install the standard request layers on a client.
+    
+    Safe to call more than once on the same client.
+    
+    Returns:
+        The same client, for chaining
+    """
+    # Innermost, so latency covers the exchange call and not rate-limit waits
+    install_layer(client, 'metrics', metrics.wrap_sync, metrics.wrap_async)
+    install_layer(client, 'rate_limit', rate_limiter.wrap_sync, rate_limiter.wrap_async)
+    # Outermost, so a -1021 retry is admitted by the rate limiter again
+    install_layer(client, 'time_sync', time_sync.wrap_sync, time_sync.wrap_async)
+    return client
+
+
+def endpoint_overrides(base_url: str) -> Dict[str, str]:
+    """Client URL attributes that send spot pings and futures calls to ``base_url``."""
+    base = base_url.rstrip('/')
+    return {
+        'API_URL': f"{base}/api",
+        'API_TESTNET_URL': f"{base}/api",
+        'FUTURES_URL': f"{base}/fapi",
+        'FUTURES_TESTNET_URL': f"{base}/fapi",
+        'FUTURES_DATA_URL': f"{base}/futures/data",
+        'FUTURES_DATA_TESTNET_URL': f"{base}/futures/data",
+    }
+
+
+def create_client(
+    api_key: Optional[str],
+    api_secret: Optional[str],
+    testnet: bool = True,
+    client_class: Type = Client,
+    **kwargs
+) -> Any:
+    """
+    Build a python-binance client, honouring BINANCE_API_URL.
+    
+    The URLs are set on a subclass because Client pings the exchange from
+    its constructor, before instance attributes could be changed.
+    
+    Args:
+        api_key: Binance API key
+        api_secret: Binance API secret
+        testnet: Whether to use testnet
+        client_class: Client, AsyncClient or a subclass of either
+        **kwargs: Passed through to the client constructor
+    
+    Returns:
+        Client instance (request layers are not installed here)
+    """
+    base_url = settings.BINANCE_API_URL
+    if base_url:
+        key = (client_class, base_url)
+        redirected = _redirected_classes.get(key)
+        if redirected is None:
+            redirected = type(client_class.__name__, (client_class,), endpoint_overrides(base_url))
+            _redirected_classes[key] = redirected
+        client_class = redirected
+        logger.info(f"Using exchange at {base_url}")
+    return client_class(api_key, api_secret, testnet=testnet, **kwargs)
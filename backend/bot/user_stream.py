@@ -0,0 +1,272 @@
+"""
+Futures user-data stream.
+Owns the listenKey lifecycle and turns ORDER_TRADE_UPDATE / ACCOUNT_UPDATE
+events into callbacks, so strategies learn about fills as they happen instead
+of polling each order over REST.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from binance.client import Client
+
+from bot.ws_client import StreamConnection, futures_ws_base
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Latest update per order kept for callbacks registered after the event
+RECENT_UPDATES_SIZE = 2048
+
+
+def decode_order_update(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten an ORDER_TRADE_UPDATE event into the fields strategies use."""
+    order = event['o']
+    return {
+        'symbol': order['s'],
+        'order_id': order['i'],
+        'client_order_id': order.get('c'),
+        'side': order['S'],
+        'type': order['o'],
+        'status': order['X'],
+        'execution_type': order['x'],
+        'price': float(order.get('p', 0)),
+        'average_price': float(order.get('ap', 0)),
+        'quantity': float(order.get('q', 0)),
+        'filled_quantity': float(order.get('z', 0)),
+        'last_fill_quantity': float(order.get('l', 0)),
+        'last_fill_price': float(order.get('L', 0)),
+        'event_time': event.get('E'),
+        'transaction_time': event.get('T')
+    }
+
+
+def decode_account_update(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten an ACCOUNT_UPDATE event into balance and position lists."""
+    account = event['a']
+    return {
+        'reason': account.get('m'),
+        'balances': [
+            {
+                'asset': b['a'],
+                'wallet_balance': float(b['wb']),
+                'cross_wallet_balance': float(b.get('cw', 0))
+            }
+            for b in account.get('B', [])
+        ],
+        'positions': [
+            {
+                'symbol': p['s'],
+                'position_amount': float(p['pa']),
+                'entry_price': float(p['ep']),
+                'unrealized_pnl': float(p.get('up', 0)),
+                'position_side': p.get('ps')
+            }
+            for p in account.get('P', [])
+        ],
+        'event_time': event.get('E')
+    }
+
+
+class UserDataStream:
+    """
+    One user-data stream per API key.
+    
+    Callbacks run on a single dispatcher thread in event order, never on the
+    socket thread, so they may make REST calls.
+    """
+    
+    def __init__(self, client: Client, testnet: bool):
+        """
+        Initialize the stream (call start() to connect).
+        
+        Args:
+            client: Binance client for the listenKey endpoints
+            testnet: Whether the client points at testnet
+        """
+        self.client = client
+        self.testnet = testnet
+        self.listen_key: Optional[str] = None
+        self._order_callbacks: Dict[int, Callable[[Dict[str, Any]], None]] = {}
+        self._account_callbacks: List[Callable[[Dict[str, Any]], None]] = []
+        self._connect_callbacks: List[Callable[[], None]] = []
+        self._recent: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._dispatcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix='user-stream')
+        self._keepalive_stop = threading.Event()
+        self._keepalive_thread: Optional[threading.Thread] = None
+        self._keepalive_ok = True
+        self.events_received = 0
+        self.connection = StreamConnection(
+            name='user-data',
+            url_factory=self._stream_url,
+            on_message=self._handle_message,
+            on_connect=self._handle_connect
+        )
+    
+    def start(self) -> None:
+        """Connect (in the background) and start the keepalive timer."""
+        self.connection.start()
+        if self._keepalive_thread is None or not self._keepalive_thread.is_alive():
+            self._keepalive_stop.clear()
+            self._keepalive_thread = threading.Thread(
+                target=self._keepalive_loop,
+                name='user-stream-keepalive',
+                daemon=True
+            )
+            self._keepalive_thread.start()
+    
+    def stop(self) -> None:
+        """Disconnect and release the listenKey."""
+        self._keepalive_stop.set()
+        self.connection.stop()
+        if self.listen_key:
+            try:
+                self.client.futures_stream_close(listenKey=self.listen_key)
+            except Exception as e:
+                logger.warning(f"Failed to close listenKey: {str(e)}")
+            self.listen_key = None
+        self._dispatcher.shutdown(wait=False)
+    
+    def is_healthy(self) -> bool:
+        """Whether events can be relied on; callers fall back to polling if not."""
+        return self.connection.connected and self._keepalive_ok
+    
+    def on_order(self, order_id: int, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Register a callback for updates to one order.
+        
+        If an update for the order already arrived, the latest one is replayed
+        so fills that race the registration are not missed.
+        """
+        with self._lock:
+            self._order_callbacks[order_id] = callback
+            recent = self._recent.get(order_id)
+        if recent is not None:
+            self._dispatch(callback, recent)
+    
+    def remove_order(self, order_id: int) -> None:
+        """Stop delivering updates for an order."""
+        with self._lock:
+            self._order_callbacks.pop(order_id, None)
+    
+    def add_account_listener(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """Register a callback for balance and position updates."""
+        with self._lock:
+            self._account_callbacks.append(callback)
+    
+    def add_connect_listener(self, callback: Callable[[], None]) -> None:
+        """
+        Register a callback run after every (re)connect.
+        
+        Events sent while the stream was down are never delivered, so
+        listeners use this to reconcile their orders over REST.
+        """
+        with self._lock:
+            self._connect_callbacks.append(callback)
+    
+    def _stream_url(self) -> str:
+        # A fresh (or renewed) key on every connect; the exchange returns the
+        # existing key while it is still valid
+        self.listen_key = self.client.futures_stream_get_listen_key()
+        self._keepalive_ok = True
+        return f"{futures_ws_base(self.testnet)}/ws/{self.listen_key}"
+    
+    def _keepalive_loop(self) -> None:
+        while not self._keepalive_stop.wait(settings.USER_STREAM_KEEPALIVE_SECONDS):
+            if not self.listen_key:
+                continue
+            try:
+                self.client.futures_stream_keepalive(listenKey=self.listen_key)
+                self._keepalive_ok = True
+            except Exception as e:
+                logger.error(f"listenKey keepalive failed: {str(e)}")
+                self._keepalive_ok = False
+                self.connection.reconnect()
+    
+    def _handle_message(self, message: Dict[str, Any]) -> None:
+        event_type = message.get('e')
+        self.events_received += 1
+        
+        if event_type == 'ORDER_TRADE_UPDATE':
+            update = decode_order_update(message)
+            with self._lock:
+                self._recent[update['order_id']] = update
+                self._recent.move_to_end(update['order_id'])
+                if len(self._recent) > RECENT_UPDATES_SIZE:
+                    self._recent.popitem(last=False)
+                callback = self._order_callbacks.get(update['order_id'])
+            if callback is not None:
+                self._dispatch(callback, update)
+        
+        elif event_type == 'ACCOUNT_UPDATE':
+            update = decode_account_update(message)
+            with self._lock:
+                callbacks = list(self._account_callbacks)
+            for callback in callbacks:
+                self._dispatch(callback, update)
+        
+        elif event_type == 'listenKeyExpired':
+            logger.warning("listenKey expired; reconnecting user stream")
+            self._keepalive_ok = False
+            self.connection.reconnect()
+    
+    def _handle_connect(self) -> None:
+        # Runs on the socket thread; listeners go through the dispatcher
+        with self._lock:
+            callbacks = list(self._connect_callbacks)
+        for callback in callbacks:
+            self._dispatch(callback)
+    
+    def _dispatch(self, callback: Callable[..., None], *args: Any) -> None:
+        try:
+            self._dispatcher.submit(self._invoke, callback, *args)
+        except RuntimeError:
+            # Dispatcher already shut down (stream stopped or interpreter exiting)
+            pass
+    
+    @staticmethod
+    def _invoke(callback: Callable[..., None], *args: Any) -> None:
+        try:
+            callback(*args)
+        except Exception as e:
+            logger.error(f"User stream callback error: {str(e)}")
+    
+    def stats(self) -> Dict[str, Any]:
+        """Stream state for health reporting."""
+        with self._lock:
+            watched = len(self._order_callbacks)
+        return {
+            'healthy': self.is_healthy(),
+            'events_received': self.events_received,
+            'orders_watched': watched,
+            **self.connection.stats()
+        }
+
+
+_streams: Dict[tuple, UserDataStream] = {}
+_streams_lock = threading.Lock()
+
+
+def get_user_stream(client: Client) -> UserDataStream:
+    """
+    Return the shared, started user-data stream for a client's API key.
+    
+    Args:
+        client: Binance client; its API key identifies the stream
+    
+    Returns:
+        UserDataStream already connecting in the background
+    """
+    testnet = bool(getattr(client, 'testnet', False))
+    key = (client.API_KEY, testnet)
+    with _streams_lock:
+        stream = _streams.get(key)
+        if stream is None:
+            stream = UserDataStream(client, testnet)
+            _streams[key] = stream
+    stream.start()
+    return stream
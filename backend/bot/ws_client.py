@@ -0,0 +1,158 @@
+"""
+Background WebSocket connection for Binance streams.
+Each connection runs its own asyncio loop in a daemon thread and reconnects
+with exponential back-off, so callers only deal in plain callbacks.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import websockets
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def futures_ws_base(testnet: bool) -> str:
+    """Base URL of the futures market/user streams for an environment."""
+    if settings.BINANCE_WS_URL:
+        return settings.BINANCE_WS_URL.rstrip('/')
+    return settings.BINANCE_TESTNET_WS_URL if testnet else settings.BINANCE_FUTURES_WS_URL
+
+
+class StreamConnection:
+    """
+    A self-healing WebSocket connection.
+    
+    Messages are decoded from JSON and handed to ``on_message`` on the
+    connection thread, so handlers must return quickly.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        url_factory: Callable[[], str],
+        on_message: Callable[[Dict[str, Any]], None],
+        on_connect: Optional[Callable[[], None]] = None
+    ):
+        """
+        Initialize the connection (nothing is opened until start()).
+        
+        Args:
+            name: Label used in logs and thread names
+            url_factory: Returns the URL to connect to; called before every
+                connect attempt and may block (e.g. to fetch a listenKey)
+            on_message: Called with each decoded message
+            on_connect: Called after every successful (re)connect
+        """
+        self.name = name
+        self._url_factory = url_factory
+        self._on_message = on_message
+        self._on_connect = on_connect
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ws = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self.connected = False
+        self.connected_at: Optional[float] = None
+        self.last_message_at: Optional[float] = None
+        self.reconnects = 0
+    
+    def start(self) -> None:
+        """Start the connection thread if it is not already running."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name=f"ws-{self.name}", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: float = 5) -> None:
+        """Close the connection and wait for the thread to finish."""
+        self._stopping.set()
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(lambda: asyncio.ensure_future(self._close()))
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.connected = False
+    
+    def reconnect(self) -> None:
+        """Drop the current socket; the loop reconnects with a fresh URL."""
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(lambda: asyncio.ensure_future(self._close()))
+    
+    def send(self, payload: Dict[str, Any]) -> bool:
+        """
+        Send a JSON message if connected.
+        
+        Returns:
+            True if the message was queued on an open socket
+        """
+        loop = self._loop
+        ws = self._ws
+        if not self.connected or loop is None or ws is None:
+            return False
+        asyncio.run_coroutine_threadsafe(ws.send(json.dumps(payload)), loop)
+        return True
+    
+    async def _close(self) -> None:
+        if self._ws is not None:
+            await self._ws.close()
+    
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._connect_forever())
+        finally:
+            self._loop.close()
+            self._loop = None
+    
+    async def _connect_forever(self) -> None:
+        backoff = 1.0
+        while not self._stopping.is_set():
+            try:
+                url = await self._loop.run_in_executor(None, self._url_factory)
+                async with websockets.connect(url, ping_interval=60, ping_timeout=30, close_timeout=5) as ws:
+                    self._ws = ws
+                    self.connected = True
+                    self.connected_at = time.monotonic()
+                    backoff = 1.0
+                    logger.info(f"Stream {self.name} connected")
+                    if self._on_connect is not None:
+                        self._on_connect()
+                    
+                    async for raw in ws:
+                        self.last_message_at = time.monotonic()
+                        try:
+                            self._on_message(json.loads(raw))
+                        except Exception as e:
+                            logger.error(f"Stream {self.name} handler error: {str(e)}")
+            
+            except Exception as e:
+                logger.warning(f"Stream {self.name} disconnected: {str(e)}")
+            finally:
+                self._ws = None
+                self.connected = False
+            
+            if self._stopping.is_set():
+                break
+            self.reconnects += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, settings.WS_RECONNECT_MAX_SECONDS)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Connection state for health reporting."""
+        now = time.monotonic()
+        return {
+            'connected': self.connected,
+            'reconnects': self.reconnects,
+            'seconds_since_message': (
+                round(now - self.last_message_at, 3) if self.last_message_at is not None else None
+            )
+        }
@@ -9,14 +9,82 @@ class Settings(BaseSettings):
     BINANCE_API_SECRET: str = ""
     BINANCE_TESTNET: bool = True
     BINANCE_TESTNET_URL: str = "https://testnet.binancefuture.com"
+    # Point every client at another exchange (e.g. the mock exchange at
+    # http://127.0.0.1:9000); empty means the real Binance endpoints
+    BINANCE_API_URL: str = ""
+    BINANCE_WS_URL: str = ""
+    
+    # Bot Registry Configuration
+    BOT_REGISTRY_MAX_SIZE: int = 256
+    BOT_REGISTRY_IDLE_TTL_SECONDS: int = 900
+    BINANCE_HTTP_POOL_SIZE: int = 20
+    BINANCE_ASYNC_POOL_LIMIT: int = 1000
+    
+    # Rate Limit Configuration (Binance Futures defaults)
+    BINANCE_WEIGHT_LIMIT_PER_MINUTE: int = 2400
+    BINANCE_ORDER_LIMIT_PER_10S: int = 300
+    BINANCE_ORDER_LIMIT_PER_MINUTE: int = 1200
+    RATE_LIMIT_QUERY_RESERVE: float = 0.2
+    RATE_LIMIT_MAX_WAIT_SECONDS: float = 30
+    
+    # Exchange Info Cache Configuration
+    EXCHANGE_INFO_TTL_SECONDS: int = 300
+    EXCHANGE_INFO_BACKGROUND_REFRESH: bool = True
+    
+    # Time Sync Configuration
+    TIME_SYNC_REFRESH_SECONDS: int = 300
+    RECV_WINDOW_MIN_MS: int = 5000
+    RECV_WINDOW_MAX_MS: int = 15000
+    
+    # WebSocket Stream Configuration
+    BINANCE_FUTURES_WS_URL: str = "wss://fstream.binance.com"
+    BINANCE_TESTNET_WS_URL: str = "wss://stream.binancefuture.com"
+    USER_STREAM_KEEPALIVE_SECONDS: int = 1800
+    WS_RECONNECT_MAX_SECONDS: float = 30
+    
+    # Strategy Scheduler Configuration
+    STRATEGY_WORKER_THREADS: int = 16
+    TWAP_DEADLINE_GRACE_SECONDS: int = 300
+    TWAP_CATCH_UP_POLICY: str = "merge"
+    # SQLite file holding live strategy state for crash recovery, e.g.
+    # "./strategies.db"; empty (the default) keeps strategies in memory only
+    STRATEGY_STORE_PATH: str = ""
+    STRATEGY_SNAPSHOT_SECONDS: int = 60
+    
+    # Market Data Cache Configuration
+    MARKET_DATA_MAX_AGE_SECONDS: float = 5
+    MARKET_DATA_IDLE_SECONDS: int = 300
+    MARKET_DATA_MAX_SYMBOLS: int = 200
     
     # Database Configuration
     DATABASE_URL: str = "sqlite:///./crypto_trading.db"
+    # Serve dashboard counts from a per-user counter table instead of a grouped query
+    TRADE_STATS_COUNTERS: bool = False
+    # Rows fetched from the database per chunk of a trade export
+    EXPORT_CHUNK_ROWS: int = 5000
     
     # JWT Configuration
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Authenticated users are served from memory for this long (0 disables)
+    USER_CACHE_TTL_SECONDS: int = 30
+    USER_CACHE_MAX_SIZE: int = 10000
+    # bcrypt cost; stored hashes with another cost are upgraded on login
+    BCRYPT_ROUNDS: int = 12
+    # Password hashing runs in its own process pool; requests beyond the
+    # pending limit are refused with 503 instead of queueing
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 16
+    
+    # Logging Configuration
+    LOG_LEVEL: str = "INFO"
+    # Rotate at this size, or on a schedule when LOG_ROTATE_WHEN is set
+    # (a TimedRotatingFileHandler ``when`` such as "midnight")
+    LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    LOG_ROTATE_WHEN: str = ""
+    LOG_BACKUP_COUNT: int = 5
+    LOG_COMPRESS: bool = True
     
     # CORS Configuration
     ALLOWED_ORIGINS: str = "http://localhost:5173,http://localhost:3000"
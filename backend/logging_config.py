@@ -0,0 +1,111 @@
+"""
+Central logging setup.
+Loggers hand records to a queue; a background listener thread formats
+them and writes to the console and a rotating, optionally gzip-compressed
+log file. Request and order paths therefore never wait on disk I/O.
+
+Entry points (the API app and the command-line scripts) call
+``configure_logging`` once; library modules only call getLogger.
+"""
+
+import atexit
+import gzip
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+from typing import Optional
+
+from config import settings
+
+DEFAULT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _gzip_namer(name: str) -> str:
+    return f"{name}.gz"
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    with open(source, 'rb') as src, gzip.open(dest, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+def _file_handler(log_file: str) -> logging.Handler:
+    if settings.LOG_ROTATE_WHEN:
+        handler = logging.handlers.TimedRotatingFileHandler(
+            log_file, when=settings.LOG_ROTATE_WHEN,
+            backupCount=settings.LOG_BACKUP_COUNT, encoding='utf-8'
+        )
+    else:
+        handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=settings.LOG_MAX_BYTES,
+            backupCount=settings.LOG_BACKUP_COUNT, encoding='utf-8'
+        )
+    if settings.LOG_COMPRESS:
+        # Runs on the listener thread, so compression is off the hot path too
+        handler.namer = _gzip_namer
+        handler.rotator = _gzip_rotator
+    return handler
+
+
+def configure_logging(
+    log_file: Optional[str] = 'app.log',
+    fmt: str = DEFAULT_FORMAT,
+    level: Optional[str] = None,
+    console: bool = True
+) -> logging.handlers.QueueListener:
+    """
+    Route all logging through a queue to console and file handlers.
+    
+    Calling it again replaces the previous setup.
+    
+    Args:
+        log_file: Rotating log file, or None for console only
+        fmt: Record format
+        level: Root level name (default LOG_LEVEL)
+        console: Also write to stderr
+    
+    Returns:
+        The running QueueListener
+    """
+    global _listener
+    shutdown_logging()
+    
+    formatter = logging.Formatter(fmt)
+    handlers = []
+    if console:
+        handlers.append(logging.StreamHandler())
+    if log_file:
+        handlers.append(_file_handler(log_file))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(logging.handlers.QueueHandler(records))
+    root.setLevel((level or settings.LOG_LEVEL).upper())
+    
+    _listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and close the handlers."""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is None:
+        return
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+atexit.register(shutdown_logging)
@@ -1,34 +1,98 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
 import logging
-from database import engine, Base
+import time
+import anyio.to_thread
+from database import engine, Base, SessionLocal
+from models import BotConfig
 from routes import auth, users, trading, bot_configs, notes
 from config import settings
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('app.log'),
-        logging.StreamHandler()
-    ]
-)
+from logging_config import configure_logging, shutdown_logging
+import metrics
+from bot.advanced_orders import active_strategy_counts, recover_all
+from bot.async_bot import close_public_bots, close_shared_connector
+from bot.market_data import get_market_data
+from bot.rate_limiter import governor
+from bot.registry import bot_registry, async_bot_registry
+from bot.scheduler import get_scheduler
+from bot import time_sync
+from note_search import install_search
+from note_tags import backfill_tags
+from trade_stats import install_counters, rebuild_counters
+from password_pool import password_hasher
+from user_cache import user_cache
 
 logger = logging.getLogger(__name__)
 
+metrics.install_db_metrics(engine)
+
+
+def _threadpool_statistics():
+    return anyio.to_thread.current_default_thread_limiter().statistics()
+
+
+metrics.registry.register(metrics.Gauge(
+    'threadpool_busy_threads', 'Worker threads running sync endpoints',
+    lambda: _threadpool_statistics().borrowed_tokens
+))
+metrics.registry.register(metrics.Gauge(
+    'threadpool_queue_depth', 'Sync endpoint calls waiting for a worker thread',
+    lambda: _threadpool_statistics().tasks_waiting
+))
+metrics.registry.register(metrics.Gauge(
+    'strategy_monitors', 'Active strategies being monitored, by strategy type',
+    active_strategy_counts, ('type',)
+))
+metrics.registry.register(metrics.Gauge(
+    'strategy_queue_depth', 'Strategy callbacks waiting for a scheduler worker',
+    lambda: get_scheduler().stats()['queued']
+))
+
+
+def _recover_strategies():
+    """Resume the stored strategies of every active bot config."""
+    with SessionLocal() as db:
+        credentials = [
+            (config.api_key, config.api_secret, config.is_testnet)
+            for config in db.query(BotConfig).filter(BotConfig.is_active == True).all()
+        ]
+    results = recover_all(credentials)
+    logger.info(f"Recovered strategies for {len(results)} accounts")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events."""
-    # Startup
+    # Startup; logging is set up here, not at import, so importing the app
+    # (tests, hashing worker processes) leaves the root logger alone
+    configure_logging('app.log')
     logger.info("Starting up application...")
     Base.metadata.create_all(bind=engine)
+    # create_all skips existing tables, so add any indexes introduced since
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
     logger.info("Database tables created")
+    install_search(engine)
+    with SessionLocal() as db:
+        backfill_tags(db)
+    if settings.TRADE_STATS_COUNTERS:
+        install_counters(SessionLocal)
+        with SessionLocal() as db:
+            rebuild_counters(db)
+    if settings.STRATEGY_STORE_PATH:
+        _recover_strategies()
     yield
     # Shutdown
     logger.info("Shutting down application...")
+    bot_registry.clear()
+    await async_bot_registry.aclear()
+    await close_public_bots()
+    await close_shared_connector()
+    password_hasher.shutdown()
+    shutdown_logging()
 
 
 # Create FastAPI app
@@ -52,14 +116,23 @@ app.add_middleware(
 # Add request logging middleware
 @app.middleware("http")
 async def log_requests(request, call_next):
-    logger.info(f"Request: {request.method} {request.url}")
+    started = time.perf_counter()
     try:
         response = await call_next(request)
-        logger.info(f"Response: {response.status_code}")
-        return response
     except Exception as e:
-        logger.error(f"Request failed: {str(e)}")
+        metrics.observe_request(request.method, _route_template(request), 500, time.perf_counter() - started)
+        logger.error(f"Request failed: {request.method} {request.url.path}: {str(e)}")
         raise
+    elapsed = time.perf_counter() - started
+    metrics.observe_request(request.method, _route_template(request), response.status_code, elapsed)
+    logger.info(f"{request.method} {request.url.path} {response.status_code} {elapsed * 1000:.1f}ms")
+    return response
+
+
+def _route_template(request) -> str:
+    # The matched route's path template keeps label values bounded
+    route = request.scope.get("route")
+    return getattr(route, "path", "unmatched")
 
 # Include routers
 app.include_router(auth.router)
@@ -80,10 +153,27 @@ def root():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    """Prometheus metrics."""
+    # Rendered on the event loop, where the threadpool gauges can be read
+    return PlainTextResponse(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.get("/health")
 def health_check():
     """Health check endpoint."""
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "bot_registry": bot_registry.stats(),
+        "async_bot_registry": async_bot_registry.stats(),
+        "rate_limits": governor.snapshot(),
+        "market_data": get_market_data(settings.BINANCE_TESTNET).stats(),
+        "scheduler": get_scheduler().stats(),
+        "time_sync": time_sync.snapshot(),
+        "user_cache": user_cache.stats(),
+        "password_hashing": password_hasher.stats()
+    }
 
 
 if __name__ == "__main__":
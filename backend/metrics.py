@@ -0,0 +1,306 @@
+"""
+Prometheus-style metrics.
+A small in-process registry rendered in the Prometheus text format at
+/metrics. Recording is a lock, a dict lookup and a bisect, so it is cheap
+enough to leave on everywhere, including every exchange and database call.
+"""
+
+import bisect
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from bot.exchange_info import get_exchange_info_cache
+from bot.rate_limiter import RateLimitGovernor, governor
+
+# Seconds; spans a cached DB read up to a slow exchange round trip
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[Any], extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic count per label set."""
+    
+    kind = 'counter'
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, *labelvalues, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+    
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for labelvalues, value in values:
+            yield f"{self.name}{_labels(self.labelnames, labelvalues)} {_number(value)}"
+
+
+class Histogram:
+    """Bucketed observations per label set, with running sum and count."""
+    
+    kind = 'histogram'
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple, List[float]] = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float, *labelvalues) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labelvalues)
+            if state is None:
+                state = self._values[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[index] += 1
+            state[-1] += value
+    
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = [(labelvalues, list(state)) for labelvalues, state in self._values.items()]
+        for labelvalues, state in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), state):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, labelvalues, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labelvalues)} {_number(state[-1])}"
+            yield f"{self.name}_count{_labels(self.labelnames, labelvalues)} {cumulative}"
+
+
+class Gauge:
+    """Value read from a callback when metrics are collected."""
+    
+    kind = 'gauge'
+    
+    def __init__(self, name: str, documentation: str, read: Callable[[], Any], labelnames: Sequence[str] = ()):
+        """
+        Args:
+            read: Returns a number, or with ``labelnames`` a dict of label values to numbers
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.read = read
+    
+    def samples(self) -> Iterable[str]:
+        value = self.read()
+        if not self.labelnames:
+            yield f"{self.name} {_number(value)}"
+            return
+        for labelvalues, number in value.items():
+            yield f"{self.name}{_labels(self.labelnames, labelvalues)} {_number(number)}"
+
+
+class Registry:
+    """Ordered collection of metrics rendered together."""
+    
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+    
+    def register(self, metric):
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+    
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._metrics.pop(name, None)
+    
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+http_request_duration = registry.register(Histogram(
+    'http_request_duration_seconds', 'HTTP request latency by route template',
+    ('method', 'route', 'status')
+))
+exchange_request_duration = registry.register(Histogram(
+    'binance_request_duration_seconds', 'Binance REST call latency, excluding rate-limit waits',
+    ('method', 'endpoint', 'symbol')
+))
+exchange_request_errors = registry.register(Counter(
+    'binance_request_errors_total', 'Binance REST calls that raised',
+    ('method', 'endpoint', 'symbol', 'code')
+))
+db_query_duration = registry.register(Histogram(
+    'db_query_duration_seconds', 'Database statement latency by statement type',
+    ('operation',)
+))
+
+
+def observe_request(method: str, route: str, status: int, seconds: float) -> None:
+    """Record one HTTP request; ``route`` is the path template, not the raw path."""
+    http_request_duration.observe(seconds, method, route, str(status))
+
+
+# Exchange calls: a request layer on every python-binance client
+
+def _endpoint(uri: str) -> str:
+    # '/fapi/v1/order' -> 'order', matching the rate limiter's keys
+    parts = urlparse(uri).path.strip('/').split('/')
+    return '/'.join(parts[2:]) if len(parts) > 2 else '/'.join(parts)
+
+
+def _symbol(client: Any, kwargs: Dict[str, Any]) -> str:
+    # Symbols come from callers; only listed ones become label values, so
+    # made-up symbols cannot grow the series without bound
+    data = kwargs.get('data') or kwargs.get('params') or {}
+    symbol = data.get('symbol') if isinstance(data, dict) else None
+    if not symbol:
+        return ''
+    cache = get_exchange_info_cache(getattr(client, 'testnet', False))
+    if isinstance(symbol, str) and cache.lookup(symbol) is not None:
+        return symbol
+    return 'other'
+
+
+def _record_exchange_call(
+    client: Any,
+    method: str,
+    uri: str,
+    kwargs: Dict[str, Any],
+    started: float,
+    error: Optional[Exception]
+) -> None:
+    endpoint = _endpoint(uri)
+    symbol = _symbol(client, kwargs)
+    method = method.upper()
+    exchange_request_duration.observe(time.perf_counter() - started, method, endpoint, symbol)
+    if error is not None:
+        code = getattr(error, 'code', None) or type(error).__name__
+        exchange_request_errors.inc(method, endpoint, symbol, str(code))
+
+
+def wrap_sync(client: Any, call):
+    """Wrap a sync client's _request to time every exchange call."""
+    def timed_request(method, uri, signed, force_params=False, **kwargs):
+        started = time.perf_counter()
+        try:
+            result = call(method, uri, signed, force_params, **kwargs)
+        except Exception as e:
+            _record_exchange_call(client, method, uri, kwargs, started, e)
+            raise
+        _record_exchange_call(client, method, uri, kwargs, started, None)
+        return result
+    
+    return timed_request
+
+
+def wrap_async(client: Any, call):
+    """Wrap an async client's _request to time every exchange call."""
+    async def timed_request(method, uri, signed, force_params=False, **kwargs):
+        started = time.perf_counter()
+        try:
+            result = await call(method, uri, signed, force_params, **kwargs)
+        except Exception as e:
+            _record_exchange_call(client, method, uri, kwargs, started, e)
+            raise
+        _record_exchange_call(client, method, uri, kwargs, started, None)
+        return result
+    
+    return timed_request
+
+
+# Rate-limit headroom, read from the governor when metrics are collected
+
+def weight_available(limiter: RateLimitGovernor = governor) -> Dict[Tuple[str, ...], int]:
+    """Request weight left in the current minute, keyed by (host,)."""
+    return {(host,): entry['weight_available'] for host, entry in limiter.snapshot()['hosts'].items()}
+
+
+def order_headroom(limiter: RateLimitGovernor = governor) -> Dict[Tuple[str, ...], int]:
+    """Orders left per API key and window, keyed by (masked key, window)."""
+    headroom = {}
+    for api_key, entry in limiter.snapshot()['api_keys'].items():
+        for name, value in entry.items():
+            if name.startswith('orders_') and name.endswith('_available'):
+                headroom[(api_key, name[len('orders_'):-len('_available')])] = value
+    return headroom
+
+
+registry.register(Gauge(
+    'binance_weight_available', 'Request weight left in the current minute, by host',
+    weight_available, ('host',)
+))
+registry.register(Gauge(
+    'binance_order_headroom', 'Orders left in each rate-limit window, by masked API key',
+    order_headroom, ('api_key', 'window')
+))
+
+
+# Database statements
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault('metrics_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info['metrics_started'].pop()
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else 'OTHER'
+    db_query_duration.observe(time.perf_counter() - started, operation)
+
+
+def _handle_error(exception_context) -> None:
+    # A failed statement never reaches after_cursor_execute
+    conn = exception_context.connection
+    if conn is not None and conn.info.get('metrics_started'):
+        conn.info['metrics_started'].pop()
+
+
+def install_db_metrics(engine: Engine) -> None:
+    """Time every statement executed through ``engine``."""
+    if event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        return
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+    event.listen(engine, 'handle_error', _handle_error)
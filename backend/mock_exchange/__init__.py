@@ -0,0 +1,10 @@
+"""
+Local stand-in for the Binance Futures API.
+Run it with ``python -m mock_exchange`` and point the bots at it by setting
+BINANCE_API_URL and BINANCE_WS_URL.
+"""
+
+from mock_exchange.app import create_app
+from mock_exchange.engine import ExchangeError, MatchingEngine, random_walk, replay
+
+__all__ = ['create_app', 'ExchangeError', 'MatchingEngine', 'random_walk', 'replay']
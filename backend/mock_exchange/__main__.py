@@ -0,0 +1,59 @@
+"""
+Run the mock exchange.
+
+Usage:
+    python -m mock_exchange --port 9000 --latency-ms 20 --seed 42
+    python -m mock_exchange --prices BTCUSDT=btc_prices.csv --tick-seconds 0.5
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import uvicorn
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from mock_exchange.app import create_app
+from mock_exchange.engine import MatchingEngine, replay
+
+
+def load_prices(path: str) -> list:
+    """Read one price per line (the last comma-separated column is used)."""
+    prices = []
+    for line in Path(path).read_text().splitlines():
+        value = line.strip().split(',')[-1]
+        try:
+            prices.append(float(value))
+        except ValueError:
+            # Header or blank line
+            continue
+    return prices
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mock Binance Futures exchange')
+    parser.add_argument('--host', default='127.0.0.1', help='Bind address')
+    parser.add_argument('--port', type=int, default=9000, help='Port to listen on')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Delay added to every REST call')
+    parser.add_argument('--jitter-ms', type=float, default=0, help='Random extra delay per REST call')
+    parser.add_argument('--tick-seconds', type=float, default=1.0, help='Price step interval (0 = manual only)')
+    parser.add_argument('--volatility', type=float, default=0.0005, help='Per-step volatility of the random walk')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed for reproducible price paths')
+    parser.add_argument('--balance', type=float, default=10000, help='Starting USDT balance per API key')
+    parser.add_argument('--prices', action='append', default=[], metavar='SYMBOL=FILE',
+                        help='Replay prices from a CSV file instead of a random walk')
+    
+    args = parser.parse_args()
+    
+    engine = MatchingEngine(starting_balance=args.balance, volatility=args.volatility, seed=args.seed)
+    for spec in args.prices:
+        symbol, path = spec.split('=', 1)
+        engine.set_path(symbol.upper(), replay(load_prices(path)))
+    
+    app = create_app(engine, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, tick_seconds=args.tick_seconds)
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()
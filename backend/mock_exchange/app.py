@@ -0,0 +1,339 @@
+"""
+FastAPI application serving the mock exchange over Binance's REST and
+WebSocket interfaces.
+Signatures and timestamps are accepted without checking; the X-MBX-APIKEY
+header alone selects the account.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import secrets
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Set
+from urllib.parse import parse_qsl, unquote_plus
+
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse
+
+from mock_exchange.engine import ExchangeError, MatchingEngine
+
+logger = logging.getLogger(__name__)
+
+
+async def read_params(request: Request) -> Dict[str, Any]:
+    """Merge query-string and form-body parameters, as Binance does."""
+    params = dict(request.query_params)
+    body = await request.body()
+    if body:
+        params.update(parse_qsl(body.decode(), keep_blank_values=True))
+    params.pop('signature', None)
+    return params
+
+
+def require_api_key(request: Request) -> str:
+    api_key = request.headers.get('X-MBX-APIKEY')
+    if not api_key:
+        raise ExchangeError(-2014, 'API-key format invalid.', status_code=401)
+    return api_key
+
+
+def decode_json_param(params: Dict[str, Any], name: str) -> List[Any]:
+    """Decode a JSON list parameter that python-binance may url-encode twice."""
+    raw = params.get(name)
+    if not raw:
+        raise ExchangeError(-1102, f"Mandatory parameter '{name}' was not sent, was empty/null, or malformed.")
+    for candidate in (raw, unquote_plus(raw)):
+        try:
+            return json.loads(candidate)
+        except ValueError:
+            continue
+    raise ExchangeError(-1102, f"Parameter '{name}' was malformed.")
+
+
+def market_streams(event: Dict[str, Any]) -> List[str]:
+    """Stream names a market event is published on."""
+    symbol = event['s'].lower()
+    if event['e'] == 'bookTicker':
+        return [f"{symbol}@bookTicker"]
+    if event['e'] == 'markPriceUpdate':
+        return [f"{symbol}@markPrice", f"{symbol}@markPrice@1s"]
+    return []
+
+
+def create_app(
+    engine: Optional[MatchingEngine] = None,
+    latency_ms: float = 0,
+    jitter_ms: float = 0,
+    tick_seconds: float = 1.0
+) -> FastAPI:
+    """
+    Build the mock exchange application.
+    
+    Args:
+        engine: Matching engine to serve (a default one is created if omitted)
+        latency_ms: Delay added to every REST response
+        jitter_ms: Random extra delay of up to this many milliseconds
+        tick_seconds: Interval between price-path steps; 0 disables the ticker
+            so prices only move through POST /mock/price
+    
+    Returns:
+        FastAPI application
+    """
+    engine = engine or MatchingEngine()
+    listen_keys: Dict[str, str] = {}
+    user_queues: Dict[str, Set[asyncio.Queue]] = {}
+    market_queues: Dict[asyncio.Queue, Set[str]] = {}
+    weight_window = {'minute': 0, 'used': 0}
+    
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        loop = asyncio.get_running_loop()
+        
+        def publish(api_key: Optional[str], event: Dict[str, Any]) -> None:
+            if api_key is None:
+                streams = market_streams(event)
+                for queue, subscribed in list(market_queues.items()):
+                    if subscribed.intersection(streams):
+                        loop.call_soon_threadsafe(queue.put_nowait, event)
+            else:
+                for queue in list(user_queues.get(api_key, ())):
+                    loop.call_soon_threadsafe(queue.put_nowait, event)
+        
+        engine.listeners.append(publish)
+        ticker = None
+        if tick_seconds > 0:
+            ticker = asyncio.create_task(run_ticker())
+        yield
+        if ticker is not None:
+            ticker.cancel()
+        engine.listeners.remove(publish)
+    
+    async def run_ticker():
+        while True:
+            await asyncio.sleep(tick_seconds)
+            engine.step()
+    
+    app = FastAPI(title="Mock Binance Futures", lifespan=lifespan)
+    app.state.engine = engine
+    
+    @app.exception_handler(ExchangeError)
+    async def exchange_error_handler(request: Request, exc: ExchangeError):
+        return JSONResponse(status_code=exc.status_code, content={'code': exc.code, 'msg': exc.msg})
+    
+    @app.middleware("http")
+    async def simulate_network(request: Request, call_next):
+        delay = latency_ms + random.uniform(0, jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        
+        response = await call_next(request)
+        
+        minute = int(time.time() // 60)
+        if weight_window['minute'] != minute:
+            weight_window.update(minute=minute, used=0)
+        weight_window['used'] += 1
+        response.headers['X-MBX-USED-WEIGHT-1M'] = str(weight_window['used'])
+        return response
+    
+    @app.get("/api/v3/ping")
+    @app.get("/fapi/v1/ping")
+    async def ping():
+        return {}
+    
+    @app.get("/fapi/v1/time")
+    async def server_time():
+        return {'serverTime': int(time.time() * 1000)}
+    
+    @app.get("/fapi/v1/exchangeInfo")
+    async def exchange_info():
+        return engine.exchange_info()
+    
+    @app.get("/fapi/v1/ticker/price")
+    async def ticker_price(symbol: Optional[str] = None):
+        if symbol:
+            return engine.ticker_price(symbol)
+        return [engine.ticker_price(s) for s in engine.specs]
+    
+    @app.get("/fapi/v1/ticker/bookTicker")
+    async def book_ticker(symbol: Optional[str] = None):
+        if symbol:
+            return engine.book_ticker(symbol)
+        return [engine.book_ticker(s) for s in engine.specs]
+    
+    @app.get("/fapi/v1/premiumIndex")
+    async def premium_index(symbol: str):
+        price = engine.ticker_price(symbol)['price']
+        return {
+            'symbol': symbol,
+            'markPrice': price,
+            'indexPrice': price,
+            'lastFundingRate': '0.0001',
+            'time': int(time.time() * 1000)
+        }
+    
+    @app.get("/fapi/v1/depth")
+    async def depth(symbol: str, limit: int = 20):
+        return engine.depth(symbol, limit)
+    
+    @app.post("/fapi/v1/order")
+    async def new_order(request: Request):
+        return engine.place_order(require_api_key(request), await read_params(request))
+    
+    @app.get("/fapi/v1/order")
+    async def query_order(request: Request):
+        return engine.get_order(require_api_key(request), await read_params(request))
+    
+    @app.delete("/fapi/v1/order")
+    async def cancel_order(request: Request):
+        return engine.cancel_order(require_api_key(request), await read_params(request))
+    
+    @app.get("/fapi/v1/openOrders")
+    async def open_orders(request: Request):
+        params = await read_params(request)
+        return engine.open_orders(require_api_key(request), params.get('symbol'))
+    
+    @app.delete("/fapi/v1/allOpenOrders")
+    async def cancel_all_open_orders(request: Request):
+        params = await read_params(request)
+        return engine.cancel_all(require_api_key(request), params.get('symbol', ''))
+    
+    @app.post("/fapi/v1/batchOrders")
+    async def batch_orders(request: Request):
+        api_key = require_api_key(request)
+        orders = decode_json_param(await read_params(request), 'batchOrders')
+        if len(orders) > 5:
+            raise ExchangeError(-4183, 'Batch orders size should not be more than 5.')
+        
+        results = []
+        for params in orders:
+            try:
+                results.append(engine.place_order(api_key, params))
+            except ExchangeError as e:
+                results.append({'code': e.code, 'msg': e.msg})
+        return results
+    
+    @app.delete("/fapi/v1/batchOrders")
+    async def batch_cancel(request: Request):
+        api_key = require_api_key(request)
+        params = await read_params(request)
+        order_ids = decode_json_param(params, 'orderIdList')
+        if len(order_ids) > 10:
+            raise ExchangeError(-4184, 'Batch cancel size should not be more than 10.')
+        
+        results = []
+        for order_id in order_ids:
+            try:
+                results.append(engine.cancel_order(api_key, {'symbol': params.get('symbol'), 'orderId': order_id}))
+            except ExchangeError as e:
+                results.append({'code': e.code, 'msg': e.msg})
+        return results
+    
+    @app.get("/fapi/v2/account")
+    async def account(request: Request):
+        return engine.account_info(require_api_key(request))
+    
+    @app.get("/fapi/v2/balance")
+    async def balance(request: Request):
+        info = engine.account_info(require_api_key(request))
+        return [
+            {
+                'asset': asset['asset'],
+                'balance': asset['walletBalance'],
+                'crossUnPnl': asset['unrealizedProfit'],
+                'availableBalance': asset['availableBalance']
+            }
+            for asset in info['assets']
+        ]
+    
+    @app.get("/fapi/v2/positionRisk")
+    async def position_risk(request: Request):
+        return engine.positions(require_api_key(request))
+    
+    @app.post("/fapi/v1/listenKey")
+    async def create_listen_key(request: Request):
+        api_key = require_api_key(request)
+        # Like Binance, hand back the existing key while it is alive
+        for key, owner in listen_keys.items():
+            if owner == api_key:
+                return {'listenKey': key}
+        key = secrets.token_hex(32)
+        listen_keys[key] = api_key
+        return {'listenKey': key}
+    
+    @app.put("/fapi/v1/listenKey")
+    async def keepalive_listen_key(request: Request):
+        require_api_key(request)
+        params = await read_params(request)
+        if params.get('listenKey') not in listen_keys:
+            raise ExchangeError(-1125, 'This listenKey does not exist.')
+        return {}
+    
+    @app.delete("/fapi/v1/listenKey")
+    async def close_listen_key(request: Request):
+        require_api_key(request)
+        params = await read_params(request)
+        listen_keys.pop(params.get('listenKey'), None)
+        return {}
+    
+    @app.post("/mock/price")
+    async def set_price(request: Request):
+        """Test control: move a symbol's price (settling crossed orders)."""
+        body = await request.json()
+        engine.set_price(body['symbol'], body['price'])
+        return engine.ticker_price(body['symbol'])
+    
+    @app.websocket("/ws")
+    async def market_socket(websocket: WebSocket):
+        await serve_market(websocket, set())
+    
+    @app.websocket("/ws/{path}")
+    async def stream_socket(websocket: WebSocket, path: str):
+        if '@' in path:
+            await serve_market(websocket, set(path.split('/')))
+            return
+        
+        api_key = listen_keys.get(path)
+        if api_key is None:
+            await websocket.close(code=1008)
+            return
+        
+        await websocket.accept()
+        queue: asyncio.Queue = asyncio.Queue()
+        user_queues.setdefault(api_key, set()).add(queue)
+        try:
+            while True:
+                await websocket.send_text(json.dumps(await queue.get()))
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+        finally:
+            user_queues[api_key].discard(queue)
+    
+    async def serve_market(websocket: WebSocket, subscribed: Set[str]):
+        await websocket.accept()
+        queue: asyncio.Queue = asyncio.Queue()
+        market_queues[queue] = subscribed
+        
+        async def forward():
+            while True:
+                await websocket.send_text(json.dumps(await queue.get()))
+        
+        sender = asyncio.create_task(forward())
+        try:
+            while True:
+                message = json.loads(await websocket.receive_text())
+                streams = message.get('params', [])
+                if message.get('method') == 'SUBSCRIBE':
+                    subscribed.update(streams)
+                elif message.get('method') == 'UNSUBSCRIBE':
+                    subscribed.difference_update(streams)
+                await websocket.send_text(json.dumps({'result': None, 'id': message.get('id')}))
+        except (WebSocketDisconnect, RuntimeError, ValueError):
+            pass
+        finally:
+            sender.cancel()
+            market_queues.pop(queue, None)
+    
+    return app
@@ -0,0 +1,686 @@
+"""
+Matching engine for the mock Binance Futures exchange.
+Orders rest in per-symbol books with price-time priority. Besides matching
+against each other, resting orders trade against a synthetic market that
+follows a configurable price path, so strategies see realistic fills without
+a second participant.
+"""
+
+import bisect
+import itertools
+import math
+import random
+import threading
+import time
+from collections import deque
+from decimal import Decimal, ROUND_DOWN
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+# Stop types and whether they trigger when the price rises through stopPrice
+TRIGGER_TYPES = {
+    ('STOP', 'BUY'): True,
+    ('STOP', 'SELL'): False,
+    ('STOP_MARKET', 'BUY'): True,
+    ('STOP_MARKET', 'SELL'): False,
+    ('TAKE_PROFIT', 'BUY'): False,
+    ('TAKE_PROFIT', 'SELL'): True,
+    ('TAKE_PROFIT_MARKET', 'BUY'): False,
+    ('TAKE_PROFIT_MARKET', 'SELL'): True,
+}
+ORDER_TYPES = {'LIMIT', 'MARKET'} | {order_type for order_type, _ in TRIGGER_TYPES}
+FINAL_STATUSES = {'FILLED', 'CANCELED', 'EXPIRED'}
+
+DEFAULT_SYMBOLS = {
+    'BTCUSDT': {'price': '45000', 'tick_size': '0.10', 'step_size': '0.001', 'min_qty': '0.001', 'min_notional': '100'},
+    'ETHUSDT': {'price': '3000', 'tick_size': '0.01', 'step_size': '0.001', 'min_qty': '0.001', 'min_notional': '20'},
+}
+
+
+class ExchangeError(Exception):
+    """An error reported to clients in Binance's {code, msg} format."""
+    
+    def __init__(self, code: int, msg: str, status_code: int = 400):
+        super().__init__(msg)
+        self.code = code
+        self.msg = msg
+        self.status_code = status_code
+
+
+def fmt(value: Decimal) -> str:
+    """Render a decimal without exponent or trailing zeros."""
+    text = format(value, 'f')
+    if '.' in text:
+        text = text.rstrip('0').rstrip('.')
+    return text or '0'
+
+
+def random_walk(start: float, volatility: float = 0.0005, seed: Optional[int] = None) -> Iterator[float]:
+    """Geometric random walk; ``volatility`` is the per-step standard deviation."""
+    rng = random.Random(seed)
+    price = start
+    while True:
+        price *= math.exp(rng.gauss(0, volatility))
+        yield price
+
+
+def replay(prices: List[float]) -> Iterator[float]:
+    """Cycle through a recorded price series."""
+    return itertools.cycle(prices)
+
+
+class Order:
+    """A single order as the exchange tracks it."""
+    
+    __slots__ = (
+        'order_id', 'client_order_id', 'api_key', 'symbol', 'side', 'type',
+        'orig_type', 'time_in_force', 'price', 'stop_price', 'quantity',
+        'executed_qty', 'cum_quote', 'status', 'reduce_only', 'triggered',
+        'time', 'update_time'
+    )
+    
+    def remaining(self) -> Decimal:
+        return self.quantity - self.executed_qty
+    
+    def avg_price(self) -> Decimal:
+        return self.cum_quote / self.executed_qty if self.executed_qty else Decimal('0')
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Order in the shape of Binance's futures order responses."""
+        return {
+            'orderId': self.order_id,
+            'symbol': self.symbol,
+            'status': self.status,
+            'clientOrderId': self.client_order_id,
+            'price': fmt(self.price) if self.price is not None else '0',
+            'avgPrice': fmt(self.avg_price()),
+            'origQty': fmt(self.quantity),
+            'executedQty': fmt(self.executed_qty),
+            'cumQuote': fmt(self.cum_quote),
+            'timeInForce': self.time_in_force,
+            'type': self.type,
+            'reduceOnly': self.reduce_only,
+            'closePosition': False,
+            'side': self.side,
+            'positionSide': 'BOTH',
+            'stopPrice': fmt(self.stop_price) if self.stop_price is not None else '0',
+            'workingType': 'CONTRACT_PRICE',
+            'priceProtect': False,
+            'origType': self.orig_type,
+            'time': self.time,
+            'updateTime': self.update_time
+        }
+
+
+class OrderBook:
+    """Resting limit orders for one symbol, FIFO within each price level."""
+    
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.levels: Dict[str, Dict[Decimal, Deque[Order]]] = {'BUY': {}, 'SELL': {}}
+        # Ascending price lists per side
+        self.prices: Dict[str, List[Decimal]] = {'BUY': [], 'SELL': []}
+    
+    def add(self, order: Order) -> None:
+        level = self.levels[order.side].get(order.price)
+        if level is None:
+            level = deque()
+            self.levels[order.side][order.price] = level
+            bisect.insort(self.prices[order.side], order.price)
+        level.append(order)
+    
+    def remove(self, order: Order) -> None:
+        level = self.levels[order.side].get(order.price)
+        if level is None or order not in level:
+            return
+        level.remove(order)
+        if not level:
+            del self.levels[order.side][order.price]
+            prices = self.prices[order.side]
+            del prices[bisect.bisect_left(prices, order.price)]
+    
+    def best(self, side: str) -> Optional[Decimal]:
+        prices = self.prices[side]
+        if not prices:
+            return None
+        return prices[-1] if side == 'BUY' else prices[0]
+    
+    def iter_priority(self, side: str) -> Iterator[Order]:
+        """Resting orders on one side, best price first, oldest first."""
+        prices = self.prices[side]
+        ordered = reversed(prices) if side == 'BUY' else prices
+        for price in list(ordered):
+            for order in list(self.levels[side].get(price, ())):
+                yield order
+    
+    def depth(self, side: str, limit: int) -> List[List[str]]:
+        prices = self.prices[side]
+        ordered = list(reversed(prices)) if side == 'BUY' else list(prices)
+        return [
+            [fmt(price), fmt(sum(o.remaining() for o in self.levels[side][price]))]
+            for price in ordered[:limit]
+        ]
+
+
+class Account:
+    """Wallet balance and one-way positions for an API key."""
+    
+    def __init__(self, balance: Decimal):
+        self.wallet_balance = balance
+        # symbol -> {'amount': Decimal, 'entry_price': Decimal}
+        self.positions: Dict[str, Dict[str, Decimal]] = {}
+    
+    def apply_fill(self, symbol: str, side: str, qty: Decimal, price: Decimal, fee: Decimal) -> None:
+        position = self.positions.setdefault(symbol, {'amount': Decimal('0'), 'entry_price': Decimal('0')})
+        amount = position['amount']
+        signed = qty if side == 'BUY' else -qty
+        
+        if amount == 0 or (amount > 0) == (signed > 0):
+            total = abs(amount) + qty
+            position['entry_price'] = (position['entry_price'] * abs(amount) + price * qty) / total
+        else:
+            closing = min(abs(amount), qty)
+            direction = 1 if amount > 0 else -1
+            self.wallet_balance += (price - position['entry_price']) * closing * direction
+            if qty > abs(amount):
+                position['entry_price'] = price
+        
+        position['amount'] = amount + signed
+        if position['amount'] == 0:
+            position['entry_price'] = Decimal('0')
+        self.wallet_balance -= fee
+
+
+class MatchingEngine:
+    """
+    Books, accounts and the synthetic market for every symbol.
+    
+    All public methods are thread-safe. Listeners receive
+    ``(api_key, event)`` for user-data events and ``(None, event)`` for
+    market events.
+    """
+    
+    def __init__(
+        self,
+        symbols: Optional[Dict[str, Dict[str, str]]] = None,
+        starting_balance: float = 10000,
+        maker_fee: float = 0.0002,
+        taker_fee: float = 0.0004,
+        volatility: float = 0.0005,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize the engine.
+        
+        Args:
+            symbols: Symbol specs (price, tick_size, step_size, min_qty, min_notional)
+            starting_balance: USDT wallet balance of each new account
+            maker_fee: Commission rate for resting orders
+            taker_fee: Commission rate for crossing orders
+            volatility: Per-step volatility of the default random-walk paths
+            seed: Random seed for reproducible price paths
+        """
+        self.specs = {
+            symbol: {key: Decimal(str(value)) for key, value in spec.items()}
+            for symbol, spec in (symbols or DEFAULT_SYMBOLS).items()
+        }
+        self.books = {symbol: OrderBook(symbol) for symbol in self.specs}
+        self.prices = {symbol: spec['price'] for symbol, spec in self.specs.items()}
+        self.paths: Dict[str, Iterator[float]] = {
+            symbol: random_walk(float(spec['price']), volatility, None if seed is None else seed + i)
+            for i, (symbol, spec) in enumerate(self.specs.items())
+        }
+        self.orders: Dict[int, Order] = {}
+        self.stops: Dict[str, List[Order]] = {symbol: [] for symbol in self.specs}
+        self.accounts: Dict[str, Account] = {}
+        self.starting_balance = Decimal(str(starting_balance))
+        self.maker_fee = Decimal(str(maker_fee))
+        self.taker_fee = Decimal(str(taker_fee))
+        self.listeners: List[Callable[[Optional[str], Dict[str, Any]], None]] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+        self.fills = 0
+    
+    @staticmethod
+    def _now_ms() -> int:
+        return int(time.time() * 1000)
+    
+    def _emit(self, api_key: Optional[str], event: Dict[str, Any]) -> None:
+        for listener in list(self.listeners):
+            listener(api_key, event)
+    
+    def account(self, api_key: str) -> Account:
+        with self._lock:
+            account = self.accounts.get(api_key)
+            if account is None:
+                account = Account(self.starting_balance)
+                self.accounts[api_key] = account
+            return account
+    
+    def _spec(self, symbol: str) -> Dict[str, Decimal]:
+        spec = self.specs.get(symbol)
+        if spec is None:
+            raise ExchangeError(-1121, 'Invalid symbol.')
+        return spec
+    
+    def _decimal(self, params: Dict[str, Any], name: str, required: bool = True) -> Optional[Decimal]:
+        value = params.get(name)
+        if value in (None, ''):
+            if required:
+                raise ExchangeError(-1102, f"Mandatory parameter '{name}' was not sent, was empty/null, or malformed.")
+            return None
+        try:
+            return Decimal(str(value))
+        except Exception:
+            raise ExchangeError(-1102, f"Parameter '{name}' was malformed.")
+    
+    def _quote(self, symbol: str) -> tuple:
+        """Synthetic best bid/ask one tick either side of the reference price."""
+        tick = self.specs[symbol]['tick_size']
+        price = self.prices[symbol].quantize(tick, rounding=ROUND_DOWN)
+        return price - tick, price + tick
+    
+    def _order_event(self, order: Order, execution_type: str, last_qty: Decimal, last_price: Decimal) -> None:
+        now = self._now_ms()
+        self._emit(order.api_key, {
+            'e': 'ORDER_TRADE_UPDATE',
+            'E': now,
+            'T': now,
+            'o': {
+                's': order.symbol,
+                'c': order.client_order_id,
+                'S': order.side,
+                'o': order.type,
+                'f': order.time_in_force,
+                'q': fmt(order.quantity),
+                'p': fmt(order.price) if order.price is not None else '0',
+                'ap': fmt(order.avg_price()),
+                'sp': fmt(order.stop_price) if order.stop_price is not None else '0',
+                'x': execution_type,
+                'X': order.status,
+                'i': order.order_id,
+                'l': fmt(last_qty),
+                'z': fmt(order.executed_qty),
+                'L': fmt(last_price),
+                'T': now,
+                'R': order.reduce_only,
+                'ot': order.orig_type,
+                'ps': 'BOTH'
+            }
+        })
+    
+    def _account_event(self, api_key: str, symbol: str) -> None:
+        account = self.accounts[api_key]
+        position = account.positions.get(symbol, {'amount': Decimal('0'), 'entry_price': Decimal('0')})
+        self._emit(api_key, {
+            'e': 'ACCOUNT_UPDATE',
+            'E': self._now_ms(),
+            'a': {
+                'm': 'ORDER',
+                'B': [{'a': 'USDT', 'wb': fmt(account.wallet_balance), 'cw': fmt(account.wallet_balance)}],
+                'P': [{
+                    's': symbol,
+                    'pa': fmt(position['amount']),
+                    'ep': fmt(position['entry_price']),
+                    'up': fmt(self._unrealized(position, symbol)),
+                    'ps': 'BOTH'
+                }]
+            }
+        })
+    
+    def _unrealized(self, position: Dict[str, Decimal], symbol: str) -> Decimal:
+        return (self.prices[symbol] - position['entry_price']) * position['amount'] if position['amount'] else Decimal('0')
+    
+    def _fill(self, order: Order, qty: Decimal, price: Decimal, maker: bool) -> None:
+        order.executed_qty += qty
+        order.cum_quote += qty * price
+        order.status = 'FILLED' if order.remaining() == 0 else 'PARTIALLY_FILLED'
+        order.update_time = self._now_ms()
+        fee = qty * price * (self.maker_fee if maker else self.taker_fee)
+        self.account(order.api_key).apply_fill(order.symbol, order.side, qty, price, fee)
+        self.fills += 1
+        self._order_event(order, 'TRADE', qty, price)
+        self._account_event(order.api_key, order.symbol)
+    
+    def _match(self, order: Order) -> None:
+        """Execute an incoming (or newly triggered) order as taker."""
+        book = self.books[order.symbol]
+        opposite = 'SELL' if order.side == 'BUY' else 'BUY'
+        limit = order.price if order.type in ('LIMIT', 'STOP', 'TAKE_PROFIT') else None
+        
+        # Resting orders first, in price-time priority
+        for maker in book.iter_priority(opposite):
+            if order.remaining() == 0:
+                break
+            if limit is not None and (maker.price > limit if order.side == 'BUY' else maker.price < limit):
+                break
+            qty = min(order.remaining(), maker.remaining())
+            self._fill(maker, qty, maker.price, maker=True)
+            self._fill(order, qty, maker.price, maker=False)
+            if maker.remaining() == 0:
+                book.remove(maker)
+        
+        # Then the synthetic market, which has unlimited depth at its quote
+        if order.remaining() > 0:
+            bid, ask = self._quote(order.symbol)
+            market_price = ask if order.side == 'BUY' else bid
+            if limit is None or (market_price <= limit if order.side == 'BUY' else market_price >= limit):
+                self._fill(order, order.remaining(), market_price, maker=False)
+    
+    def _would_fill_completely(self, order: Order) -> bool:
+        bid, ask = self._quote(order.symbol)
+        if order.side == 'BUY' and ask <= order.price or order.side == 'SELL' and bid >= order.price:
+            return True
+        opposite = 'SELL' if order.side == 'BUY' else 'BUY'
+        available = Decimal('0')
+        for maker in self.books[order.symbol].iter_priority(opposite):
+            if maker.price > order.price if order.side == 'BUY' else maker.price < order.price:
+                break
+            available += maker.remaining()
+        return available >= order.quantity
+    
+    def _execute(self, order: Order) -> None:
+        """Match an order and rest, expire or keep it as its type requires."""
+        if order.time_in_force == 'FOK' and order.price is not None and not self._would_fill_completely(order):
+            order.status = 'EXPIRED'
+            order.update_time = self._now_ms()
+            self._order_event(order, 'EXPIRED', Decimal('0'), Decimal('0'))
+            return
+        
+        self._match(order)
+        
+        if order.remaining() > 0:
+            if order.price is not None and order.time_in_force == 'GTC':
+                self.books[order.symbol].add(order)
+            else:
+                order.status = 'EXPIRED'
+                order.update_time = self._now_ms()
+                self._order_event(order, 'EXPIRED', Decimal('0'), Decimal('0'))
+    
+    def _market_sweep(self, symbol: str) -> None:
+        """Fill resting orders the synthetic market has traded through."""
+        book = self.books[symbol]
+        price = self.prices[symbol]
+        
+        for side, crossed in (('BUY', lambda p: p >= price), ('SELL', lambda p: p <= price)):
+            for order in book.iter_priority(side):
+                if not crossed(order.price):
+                    break
+                book.remove(order)
+                self._fill(order, order.remaining(), order.price, maker=True)
+    
+    def _trigger_stops(self, symbol: str) -> None:
+        price = self.prices[symbol]
+        pending = self.stops[symbol]
+        triggered = [
+            o for o in pending
+            if (price >= o.stop_price if TRIGGER_TYPES[(o.type, o.side)] else price <= o.stop_price)
+        ]
+        for order in triggered:
+            pending.remove(order)
+            order.triggered = True
+            self._execute(order)
+    
+    def set_price(self, symbol: str, price: float) -> None:
+        """Move the synthetic market to a new price and settle what it crosses."""
+        with self._lock:
+            spec = self._spec(symbol)
+            self.prices[symbol] = Decimal(str(price)).quantize(spec['tick_size'])
+            self._trigger_stops(symbol)
+            self._market_sweep(symbol)
+            
+            bid, ask = self._quote(symbol)
+            now = self._now_ms()
+            self._emit(None, {
+                'e': 'bookTicker', 'u': now, 'E': now, 'T': now, 's': symbol,
+                'b': fmt(bid), 'B': '10', 'a': fmt(ask), 'A': '10'
+            })
+            self._emit(None, {
+                'e': 'markPriceUpdate', 'E': now, 's': symbol,
+                'p': fmt(self.prices[symbol]), 'i': fmt(self.prices[symbol]), 'r': '0.0001', 'T': now
+            })
+    
+    def step(self) -> None:
+        """Advance every symbol one step along its price path."""
+        for symbol, path in self.paths.items():
+            self.set_price(symbol, next(path))
+    
+    def set_path(self, symbol: str, path: Iterator[float]) -> None:
+        """Replace the price path used by step() for a symbol."""
+        with self._lock:
+            self._spec(symbol)
+            self.paths[symbol] = path
+    
+    def place_order(self, api_key: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate and execute a new order.
+        
+        Args:
+            api_key: Account placing the order
+            params: Binance order parameters (string values)
+        
+        Returns:
+            Order response after any immediate fills
+        """
+        with self._lock:
+            symbol = params.get('symbol', '')
+            spec = self._spec(symbol)
+            side = params.get('side')
+            if side not in ('BUY', 'SELL'):
+                raise ExchangeError(-1117, 'Invalid side.')
+            order_type = params.get('type')
+            if order_type not in ORDER_TYPES:
+                raise ExchangeError(-1116, 'Invalid orderType.')
+            
+            quantity = self._decimal(params, 'quantity')
+            if quantity < spec['min_qty']:
+                raise ExchangeError(-4003, 'Quantity less than or equal to zero.')
+            if quantity % spec['step_size'] != 0:
+                raise ExchangeError(-1111, 'Precision is over the maximum defined for this asset.')
+            
+            price = self._decimal(params, 'price', required=order_type in ('LIMIT', 'STOP', 'TAKE_PROFIT'))
+            if order_type in ('MARKET', 'STOP_MARKET', 'TAKE_PROFIT_MARKET'):
+                price = None
+            if price is not None and (price <= 0 or price % spec['tick_size'] != 0):
+                raise ExchangeError(-4014, 'Price not increased by tick size.')
+            
+            stop_price = self._decimal(params, 'stopPrice', required=(order_type, side) in TRIGGER_TYPES)
+            notional = quantity * (price if price is not None else self.prices[symbol])
+            if notional < spec['min_notional']:
+                raise ExchangeError(-4164, f"Order's notional must be no smaller than {fmt(spec['min_notional'])} (unless you choose reduce only).")
+            
+            if (order_type, side) in TRIGGER_TYPES:
+                current = self.prices[symbol]
+                rises = TRIGGER_TYPES[(order_type, side)]
+                if (current >= stop_price) if rises else (current <= stop_price):
+                    raise ExchangeError(-2021, 'Order would immediately trigger.')
+            
+            client_order_id = params.get('newClientOrderId') or f"mock_{next(self._ids)}"
+            if any(o.client_order_id == client_order_id and o.api_key == api_key and o.status not in FINAL_STATUSES for o in self.orders.values()):
+                raise ExchangeError(-4015, 'Client order id is not valid.')
+            
+            now = self._now_ms()
+            order = Order()
+            order.order_id = next(self._ids)
+            order.client_order_id = client_order_id
+            order.api_key = api_key
+            order.symbol = symbol
+            order.side = side
+            order.type = order_type
+            order.orig_type = order_type
+            order.time_in_force = params.get('timeInForce', 'GTC') if price is not None else 'GTC'
+            order.price = price
+            order.stop_price = stop_price
+            order.quantity = quantity
+            order.executed_qty = Decimal('0')
+            order.cum_quote = Decimal('0')
+            order.status = 'NEW'
+            order.reduce_only = str(params.get('reduceOnly', 'false')).lower() == 'true'
+            order.triggered = False
+            order.time = now
+            order.update_time = now
+            
+            self.orders[order.order_id] = order
+            self.account(api_key)
+            self._order_event(order, 'NEW', Decimal('0'), Decimal('0'))
+            
+            if (order_type, side) in TRIGGER_TYPES:
+                self.stops[symbol].append(order)
+            else:
+                self._execute(order)
+            return order.to_dict()
+    
+    def _find(self, api_key: str, params: Dict[str, Any]) -> Order:
+        order = None
+        if params.get('orderId'):
+            order = self.orders.get(int(params['orderId']))
+        elif params.get('origClientOrderId'):
+            order = next(
+                (o for o in self.orders.values() if o.client_order_id == params['origClientOrderId']),
+                None
+            )
+        if order is None or order.api_key != api_key or order.symbol != params.get('symbol'):
+            raise ExchangeError(-2013, 'Order does not exist.')
+        return order
+    
+    def get_order(self, api_key: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            return self._find(api_key, params).to_dict()
+    
+    def cancel_order(self, api_key: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            try:
+                order = self._find(api_key, params)
+            except ExchangeError:
+                raise ExchangeError(-2011, 'Unknown order sent.')
+            if order.status in FINAL_STATUSES:
+                raise ExchangeError(-2011, 'Unknown order sent.')
+            
+            self.books[order.symbol].remove(order)
+            if order in self.stops[order.symbol]:
+                self.stops[order.symbol].remove(order)
+            order.status = 'CANCELED'
+            order.update_time = self._now_ms()
+            self._order_event(order, 'CANCELED', Decimal('0'), Decimal('0'))
+            return order.to_dict()
+    
+    def open_orders(self, api_key: str, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            if symbol:
+                self._spec(symbol)
+            return [
+                o.to_dict() for o in self.orders.values()
+                if o.api_key == api_key and o.status in ('NEW', 'PARTIALLY_FILLED')
+                and (not symbol or o.symbol == symbol)
+            ]
+    
+    def cancel_all(self, api_key: str, symbol: str) -> Dict[str, Any]:
+        with self._lock:
+            for order in self.open_orders(api_key, symbol):
+                self.cancel_order(api_key, {'symbol': symbol, 'orderId': order['orderId']})
+            return {'code': 200, 'msg': 'The operation of cancel all open order is done.'}
+    
+    def account_info(self, api_key: str) -> Dict[str, Any]:
+        """Account in the shape of GET /fapi/v2/account."""
+        with self._lock:
+            account = self.account(api_key)
+            unrealized = sum(
+                (self._unrealized(p, symbol) for symbol, p in account.positions.items()),
+                Decimal('0')
+            )
+            wallet = fmt(account.wallet_balance)
+            margin = fmt(account.wallet_balance + unrealized)
+            return {
+                'totalWalletBalance': wallet,
+                'totalUnrealizedProfit': fmt(unrealized),
+                'totalMarginBalance': margin,
+                'availableBalance': margin,
+                'maxWithdrawAmount': margin,
+                'assets': [{
+                    'asset': 'USDT',
+                    'walletBalance': wallet,
+                    'unrealizedProfit': fmt(unrealized),
+                    'marginBalance': margin,
+                    'availableBalance': margin,
+                    'maxWithdrawAmount': margin
+                }],
+                'positions': self.positions(api_key)
+            }
+    
+    def positions(self, api_key: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            account = self.account(api_key)
+            return [
+                {
+                    'symbol': symbol,
+                    'positionAmt': fmt(p['amount']),
+                    'entryPrice': fmt(p['entry_price']),
+                    'markPrice': fmt(self.prices[symbol]),
+                    'unRealizedProfit': fmt(self._unrealized(p, symbol)),
+                    'positionSide': 'BOTH',
+                    'leverage': '20'
+                }
+                for symbol, p in account.positions.items()
+            ]
+    
+    def book_ticker(self, symbol: str) -> Dict[str, Any]:
+        with self._lock:
+            self._spec(symbol)
+            bid, ask = self._quote(symbol)
+            book = self.books[symbol]
+            best_bid = book.best('BUY')
+            best_ask = book.best('SELL')
+            if best_bid is not None and best_bid > bid:
+                bid = best_bid
+            if best_ask is not None and best_ask < ask:
+                ask = best_ask
+            return {'symbol': symbol, 'bidPrice': fmt(bid), 'bidQty': '10', 'askPrice': fmt(ask), 'askQty': '10', 'time': self._now_ms()}
+    
+    def ticker_price(self, symbol: str) -> Dict[str, Any]:
+        with self._lock:
+            self._spec(symbol)
+            return {'symbol': symbol, 'price': fmt(self.prices[symbol]), 'time': self._now_ms()}
+    
+    def depth(self, symbol: str, limit: int = 20) -> Dict[str, Any]:
+        with self._lock:
+            self._spec(symbol)
+            book = self.books[symbol]
+            return {
+                'lastUpdateId': self.fills,
+                'E': self._now_ms(),
+                'T': self._now_ms(),
+                'bids': book.depth('BUY', limit),
+                'asks': book.depth('SELL', limit)
+            }
+    
+    def exchange_info(self) -> Dict[str, Any]:
+        """Exchange info in the shape of GET /fapi/v1/exchangeInfo."""
+        return {
+            'timezone': 'UTC',
+            'serverTime': self._now_ms(),
+            'rateLimits': [
+                {'rateLimitType': 'REQUEST_WEIGHT', 'interval': 'MINUTE', 'intervalNum': 1, 'limit': 2400},
+                {'rateLimitType': 'ORDERS', 'interval': 'MINUTE', 'intervalNum': 1, 'limit': 1200},
+                {'rateLimitType': 'ORDERS', 'interval': 'SECOND', 'intervalNum': 10, 'limit': 300}
+            ],
+            'symbols': [
+                {
+                    'symbol': symbol,
+                    'pair': symbol,
+                    'contractType': 'PERPETUAL',
+                    'status': 'TRADING',
+                    'baseAsset': symbol[:-4],
+                    'quoteAsset': 'USDT',
+                    'pricePrecision': max(0, -spec['tick_size'].normalize().as_tuple().exponent),
+                    'quantityPrecision': max(0, -spec['step_size'].normalize().as_tuple().exponent),
+                    'orderTypes': sorted(ORDER_TYPES),
+                    'timeInForce': ['GTC', 'IOC', 'FOK'],
+                    'filters': [
+                        {'filterType': 'PRICE_FILTER', 'tickSize': fmt(spec['tick_size']), 'minPrice': fmt(spec['tick_size']), 'maxPrice': '10000000'},
+                        {'filterType': 'LOT_SIZE', 'stepSize': fmt(spec['step_size']), 'minQty': fmt(spec['min_qty']), 'maxQty': '1000'},
+                        {'filterType': 'MARKET_LOT_SIZE', 'stepSize': fmt(spec['step_size']), 'minQty': fmt(spec['min_qty']), 'maxQty': '1000'},
+                        {'filterType': 'MIN_NOTIONAL', 'notional': fmt(spec['min_notional'])}
+                    ]
+                }
+                for symbol, spec in self.specs.items()
+            ]
+        }
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
@@ -92,6 +92,22 @@ class Trade(Base):
     # Relationships
     user = relationship("User", back_populates="trades")
     bot_config = relationship("BotConfig", back_populates="trades")
+    
+    __table_args__ = (
+        # Prefixes serve the dashboard GROUP BY; full keys serve keyset pages
+        Index("ix_trades_user_status_created", "user_id", "status", "created_at", "id"),
+        Index("ix_trades_user_symbol_created", "user_id", "symbol", "created_at", "id"),
+        Index("ix_trades_user_created_id", "user_id", "created_at", "id"),
+    )
+
+
+class TradeStatusCount(Base):
+    """Per-user trade count for each status, kept current when TRADE_STATS_COUNTERS is on"""
+    __tablename__ = "trade_status_counts"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    status = Column(Enum(OrderStatus), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
 
 
 class Note(Base):
@@ -109,3 +125,20 @@ class Note(Base):
     
     # Relationships
     user = relationship("User", back_populates="notes")
+    tag_rows = relationship("NoteTag", back_populates="note", cascade="all, delete-orphan")
+
+
+class NoteTag(Base):
+    """One tag of a note; ``Note.tags`` stays the comma-separated form the API returns"""
+    __tablename__ = "note_tags"
+    
+    note_id = Column(Integer, ForeignKey("notes.id", ondelete="CASCADE"), primary_key=True)
+    tag = Column(String(50), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    
+    # Relationships
+    note = relationship("Note", back_populates="tag_rows")
+    
+    __table_args__ = (
+        Index("ix_note_tags_user_tag", "user_id", "tag"),
+    )
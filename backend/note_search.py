@@ -0,0 +1,147 @@
+"""
+Full-text search over notes.
+SQLite gets an FTS5 index and PostgreSQL a weighted tsvector column with a
+GIN index; both are kept current by the database itself (triggers and a
+generated column), so every write path stays in sync. Other databases, or
+a SQLite build without FTS5, fall back to ILIKE.
+"""
+
+import logging
+import re
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import column, func, literal_column, or_, table, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Query
+
+from models import Note
+
+logger = logging.getLogger(__name__)
+
+SEARCH_FTS5 = 'fts5'
+SEARCH_TSVECTOR = 'tsvector'
+SEARCH_ILIKE = 'ilike'
+
+# Search mode per engine, set by install_search
+_modes: Dict[Engine, str] = {}
+
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE notes_fts USING fts5(
+        title, content, tags,
+        content='notes', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS notes_fts_insert AFTER INSERT ON notes BEGIN
+        INSERT INTO notes_fts(rowid, title, content, tags)
+        VALUES (new.id, new.title, new.content, new.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS notes_fts_delete AFTER DELETE ON notes BEGIN
+        INSERT INTO notes_fts(notes_fts, rowid, title, content, tags)
+        VALUES ('delete', old.id, old.title, old.content, old.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS notes_fts_update AFTER UPDATE OF title, content, tags ON notes BEGIN
+        INSERT INTO notes_fts(notes_fts, rowid, title, content, tags)
+        VALUES ('delete', old.id, old.title, old.content, old.tags);
+        INSERT INTO notes_fts(rowid, title, content, tags)
+        VALUES (new.id, new.title, new.content, new.tags);
+    END
+    """,
+    # Index notes written before the table existed
+    "INSERT INTO notes_fts(notes_fts) VALUES ('rebuild')",
+]
+
+POSTGRES_DDL = [
+    """
+    ALTER TABLE notes ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(tags, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(content, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_notes_search_vector ON notes USING GIN (search_vector)",
+]
+
+FTS_TABLE = table("notes_fts", column("rowid"))
+
+# bm25 column weights for title, content, tags
+FTS5_WEIGHTS = (10.0, 1.0, 4.0)
+
+
+def install_search(engine: Engine) -> str:
+    """
+    Create the text index for ``engine`` if it is missing.
+    
+    Returns:
+        The search mode in use: 'fts5', 'tsvector' or 'ilike'
+    """
+    dialect = engine.dialect.name
+    mode = SEARCH_ILIKE
+    try:
+        with engine.begin() as conn:
+            if dialect == 'sqlite':
+                exists = conn.execute(text(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'notes_fts'"
+                )).first()
+                if not exists:
+                    for statement in SQLITE_DDL:
+                        conn.execute(text(statement))
+                mode = SEARCH_FTS5
+            elif dialect == 'postgresql':
+                for statement in POSTGRES_DDL:
+                    conn.execute(text(statement))
+                mode = SEARCH_TSVECTOR
+    except OperationalError as e:
+        logger.warning(f"Full-text search unavailable, using ILIKE: {str(e)}")
+        mode = SEARCH_ILIKE
+    
+    _modes[engine] = mode
+    logger.info(f"Note search mode: {mode}")
+    return mode
+
+
+def search_terms(search: str) -> List[str]:
+    """Words of a search string; punctuation cannot reach the query syntax."""
+    return re.findall(r"\w+", search.lower())
+
+
+def apply_search(query: Query, search: str, engine: Engine) -> Tuple[Query, Any]:
+    """
+    Filter a Note query to matches for ``search``.
+    
+    Every word must match, as a whole word or the start of one, so
+    results narrow as the user types.
+    
+    Returns:
+        Tuple of (filtered query, ORDER BY clause ranking the best match first or None)
+    """
+    terms = search_terms(search)
+    mode = _modes.get(engine, SEARCH_ILIKE)
+    
+    if mode == SEARCH_FTS5 and terms:
+        fts = literal_column("notes_fts")
+        match = ' '.join(f'"{term}"*' for term in terms)
+        query = query.join(FTS_TABLE, FTS_TABLE.c.rowid == Note.id).filter(fts.op("MATCH")(match))
+        return query, func.bm25(fts, *FTS5_WEIGHTS)
+    
+    if mode == SEARCH_TSVECTOR and terms:
+        vector = literal_column("notes.search_vector")
+        tsquery = func.to_tsquery('simple', ' & '.join(f"{term}:*" for term in terms))
+        query = query.filter(vector.op("@@")(tsquery))
+        return query, func.ts_rank(vector, tsquery).desc()
+    
+    search_pattern = f"%{search}%"
+    query = query.filter(or_(
+        Note.title.ilike(search_pattern),
+        Note.content.ilike(search_pattern),
+        Note.tags.ilike(search_pattern)
+    ))
+    return query, None
@@ -0,0 +1,83 @@
+"""
+Normalised note tags.
+``Note.tags`` keeps the comma-separated string the API has always used;
+each tag is also stored as a NoteTag row indexed by (user_id, tag), so
+exact tag filters and the tag cloud are index lookups instead of scans.
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+from sqlalchemy import exists, func, select
+from sqlalchemy.orm import Query, Session
+
+from models import Note, NoteTag
+
+logger = logging.getLogger(__name__)
+
+MAX_TAG_LENGTH = 50
+
+
+def parse_tags(tags: Optional[str]) -> List[str]:
+    """Distinct lower-case tags of a comma-separated string, in order."""
+    seen: Dict[str, None] = {}
+    for tag in (tags or '').split(','):
+        tag = tag.strip().lower()[:MAX_TAG_LENGTH]
+        if tag:
+            seen.setdefault(tag, None)
+    return list(seen)
+
+
+def set_tags(note: Note) -> None:
+    """Rebuild a note's tag rows from ``note.tags``; call after changing it."""
+    current = {row.tag: row for row in note.tag_rows}
+    note.tag_rows = [
+        current.get(tag) or NoteTag(tag=tag, user_id=note.user_id)
+        for tag in parse_tags(note.tags)
+    ]
+
+
+def filter_by_tag(query: Query, user_id: int, tag: str) -> Query:
+    """Restrict a Note query to notes carrying exactly ``tag``."""
+    return query.filter(exists().where(
+        NoteTag.note_id == Note.id,
+        NoteTag.user_id == user_id,
+        NoteTag.tag == tag.strip().lower()
+    ))
+
+
+def tag_counts(db: Session, user_id: int) -> List[Dict[str, int]]:
+    """Notes per tag for a user, most used first, in one grouped query."""
+    rows = db.query(NoteTag.tag, func.count(NoteTag.note_id)).filter(
+        NoteTag.user_id == user_id
+    ).group_by(NoteTag.tag).order_by(func.count(NoteTag.note_id).desc(), NoteTag.tag).all()
+    return [{'tag': tag, 'count': count} for tag, count in rows]
+
+
+def backfill_tags(db: Session, batch_size: int = 500) -> int:
+    """
+    Create tag rows for notes that have tags but none stored yet.
+    
+    Returns:
+        Number of notes backfilled
+    """
+    untagged = select(Note).where(
+        Note.tags.isnot(None),
+        Note.tags != '',
+        ~exists().where(NoteTag.note_id == Note.id)
+    ).order_by(Note.id)
+    
+    last_id, total = 0, 0
+    while True:
+        notes = db.scalars(untagged.where(Note.id > last_id).limit(batch_size)).all()
+        if not notes:
+            break
+        for note in notes:
+            set_tags(note)
+        last_id = notes[-1].id
+        db.commit()
+        total += len(notes)
+    
+    if total:
+        logger.info(f"Backfilled tags for {total} notes")
+    return total
@@ -0,0 +1,67 @@
+"""
+Keyset (cursor) pagination.
+A cursor is an opaque token holding the sort key of the last row served,
+so the next page starts with an index seek instead of skipping rows.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import Query
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded."""
+
+
+def encode_cursor(created_at: Optional[datetime], row_id: int) -> str:
+    """Opaque cursor for a row ordered by (created_at, id)."""
+    payload = [created_at.isoformat() if created_at else None, row_id]
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """Inverse of ``encode_cursor``; raises InvalidCursor for bad input."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return (datetime.fromisoformat(created_at) if created_at else None), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+def keyset_page(query: Query, model: Any, cursor: Optional[str], limit: int, scope: Any = None) -> Tuple[list, Optional[str]]:
+    """
+    One page of ``query`` newest first, by (created_at, id).
+    
+    The cursor row's own created_at is read back from the table, so the
+    comparison is exact whatever precision the database stores; the value
+    in the cursor is only used if that row has since been deleted.
+    
+    Args:
+        query: Filtered query over ``model``
+        model: Mapped class with ``created_at`` and ``id`` columns
+        cursor: Cursor from the previous page, or None for the first page
+        limit: Page size
+        scope: Extra condition the cursor row must satisfy (e.g. same user)
+    
+    Returns:
+        Tuple of (rows, next cursor or None when this is the last page)
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        anchor = select(model.created_at).where(model.id == row_id)
+        if scope is not None:
+            anchor = anchor.where(scope)
+        anchor_created = func.coalesce(anchor.scalar_subquery(), created_at)
+        query = query.filter(tuple_(model.created_at, model.id) < tuple_(anchor_created, row_id))
+    
+    rows = query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
@@ -0,0 +1,146 @@
+"""
+Password hashing off the request path.
+bcrypt is deliberately slow, so hashes are computed in a dedicated process
+pool. A bounded admission count refuses work beyond what the pool can
+absorb, so a burst of logins cannot tie up the threads and CPU that order
+execution needs.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from passlib.context import CryptContext
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HashingBusy(Exception):
+    """Raised when the hashing pool has no room for another request."""
+
+
+@lru_cache(maxsize=4)
+def _context(rounds: int) -> CryptContext:
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+def _hash(password: str, rounds: int) -> str:
+    return _context(rounds).hash(password)
+
+
+def _verify_and_update(password: str, hashed_password: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    # The new hash is only returned when the stored one uses other parameters
+    return _context(rounds).verify_and_update(password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Process pool for bcrypt with admission control.
+    
+    ``hash``/``verify`` are awaited from async routes; ``hash_blocking`` is
+    for sync routes. All raise HashingBusy when ``max_pending`` hashes are
+    already queued or running.
+    """
+    
+    def __init__(self, workers: int = 2, max_pending: int = 16, rounds: int = 12):
+        """
+        Initialize the hasher; worker processes start on first use.
+        
+        Args:
+            workers: Number of hashing processes
+            max_pending: Hashes allowed to be queued or running at once
+            rounds: bcrypt cost for new hashes
+        """
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+    
+    def _submit(self, fn, *args) -> Future:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise HashingBusy(f"{self._pending} password hashes already pending")
+            if self._executor is None:
+                # spawn: forking a process that runs threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            self._pending += 1
+        
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future
+    
+    def _release(self, future: Optional[Future]) -> None:
+        with self._lock:
+            self._pending -= 1
+            if future is not None and not future.cancelled() and future.exception() is None:
+                self.completed += 1
+    
+    async def hash(self, password: str) -> str:
+        """Hash a new password."""
+        return await asyncio.wrap_future(self._submit(_hash, password, self.rounds))
+    
+    def hash_blocking(self, password: str) -> str:
+        """Hash a new password from a sync route (waits without using CPU)."""
+        return self._submit(_hash, password, self.rounds).result()
+    
+    async def verify(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Check a password against its stored hash.
+        
+        Returns:
+            Tuple of (matches, replacement hash when the stored one is outdated, else None)
+        """
+        matches, new_hash = await asyncio.wrap_future(
+            self._submit(_verify_and_update, password, hashed_password, self.rounds)
+        )
+        if new_hash:
+            with self._lock:
+                self.rehashed += 1
+        return matches, new_hash
+    
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return pool size, queue depth and counters."""
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'pending': self._pending,
+                'max_pending': self.max_pending,
+                'rounds': self.rounds,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'rehashed': self.rehashed
+            }
+
+
+# Shared hasher used by the auth and user routes
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    rounds=settings.BCRYPT_ROUNDS
+)
@@ -1,32 +1,47 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from datetime import timedelta
+from typing import Optional
 from database import get_db
 from models import User as UserModel
 from schemas import UserCreate, User, Token, UserLogin
 from auth import (
-    get_password_hash,
-    verify_password,
     create_access_token,
-    get_current_active_user
+    get_current_active_user,
+    hashing_busy
 )
 from config import settings
+from password_pool import HashingBusy, password_hasher
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
 
+def find_user(db: Session, username: str, email: str) -> Optional[UserModel]:
+    """Find a user by username or email."""
+    return db.query(UserModel).filter(
+        (UserModel.email == email) | (UserModel.username == username)
+    ).first()
+
+
+def save_user(db: Session, user: UserModel) -> UserModel:
+    """Insert or update a user and reload it."""
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
 @router.post("/register", response_model=User, status_code=status.HTTP_201_CREATED)
-def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: Session = Depends(get_db)):
     """Register a new user."""
     logger.info(f"Registration attempt for username: {user.username}")
     
-    # Check if user already exists
-    db_user = db.query(UserModel).filter(
-        (UserModel.email == user.email) | (UserModel.username == user.username)
-    ).first()
+    # Check if user already exists; database work runs in the threadpool
+    db_user = await run_in_threadpool(find_user, db, user.username, user.email)
     
     if db_user:
         if db_user.email == user.email:
@@ -41,24 +56,24 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
             )
     
     # Create new user
-    hashed_password = get_password_hash(user.password)
+    try:
+        hashed_password = await password_hasher.hash(user.password)
+    except HashingBusy:
+        raise hashing_busy()
     db_user = UserModel(
         email=user.email,
         username=user.username,
         full_name=user.full_name,
         hashed_password=hashed_password
     )
-    
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    db_user = await run_in_threadpool(save_user, db, db_user)
     
     logger.info(f"User registered successfully: {user.username}")
     return db_user
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
@@ -66,11 +81,16 @@ def login(
     logger.info(f"Login attempt for username: {form_data.username}")
     
     # Find user by username or email
-    user = db.query(UserModel).filter(
-        (UserModel.username == form_data.username) | (UserModel.email == form_data.username)
-    ).first()
+    user = await run_in_threadpool(find_user, db, form_data.username, form_data.username)
+    
+    matches, new_hash = False, None
+    if user:
+        try:
+            matches, new_hash = await password_hasher.verify(form_data.password, user.hashed_password)
+        except HashingBusy:
+            raise hashing_busy()
     
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not matches:
         logger.warning(f"Failed login attempt for username: {form_data.username}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -84,6 +104,12 @@ def login(
             detail="Inactive user account"
         )
     
+    if new_hash:
+        # Stored with an older bcrypt cost; upgrade now that we have the password
+        user.hashed_password = new_hash
+        user = await run_in_threadpool(save_user, db, user)
+        logger.info(f"Password hash upgraded for user: {user.username}")
+    
     # Create access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -5,6 +5,7 @@ from database import get_db
 from models import User as UserModel, BotConfig as BotConfigModel
 from schemas import BotConfig, BotConfigCreate, BotConfigUpdate
 from auth import get_current_active_user
+from bot.registry import invalidate_bot_config
 import logging
 
 logger = logging.getLogger(__name__)
@@ -136,6 +137,9 @@ def update_bot_config(
     db.commit()
     db.refresh(config)
     
+    # Drop any warm bot still holding the old credentials
+    invalidate_bot_config(config_id)
+    
     logger.info(f"Bot config {config_id} updated successfully")
     return config
 
@@ -163,5 +167,7 @@ def delete_bot_config(
     db.delete(config)
     db.commit()
     
+    invalidate_bot_config(config_id)
+    
     logger.info(f"Bot config {config_id} deleted successfully")
     return None
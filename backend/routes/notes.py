@@ -3,8 +3,10 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from database import get_db
 from models import User as UserModel, Note as NoteModel
-from schemas import Note, NoteCreate, NoteUpdate
+from schemas import Note, NoteCreate, NoteUpdate, TagCount
 from auth import get_current_active_user
+from note_search import apply_search
+from note_tags import filter_by_tag, set_tags, tag_counts
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,6 +18,7 @@ def get_notes(
     skip: int = 0,
     limit: int = 100,
     search: Optional[str] = Query(None, description="Search in title and content"),
+    tag: Optional[str] = Query(None, description="Only notes with exactly this tag"),
     pinned_only: bool = False,
     current_user: UserModel = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -23,25 +26,34 @@ def get_notes(
     """Get all notes for the current user with optional filtering."""
     query = db.query(NoteModel).filter(NoteModel.user_id == current_user.id)
     
+    rank = None
     if search:
-        search_pattern = f"%{search}%"
-        query = query.filter(
-            (NoteModel.title.ilike(search_pattern)) |
-            (NoteModel.content.ilike(search_pattern)) |
-            (NoteModel.tags.ilike(search_pattern))
-        )
+        query, rank = apply_search(query, search, db.get_bind())
+    
+    if tag:
+        query = filter_by_tag(query, current_user.id, tag)
     
     if pinned_only:
         query = query.filter(NoteModel.is_pinned == True)
     
-    notes = query.order_by(
-        NoteModel.is_pinned.desc(),
-        NoteModel.updated_at.desc()
-    ).offset(skip).limit(limit).all()
+    order = [NoteModel.is_pinned.desc(), NoteModel.updated_at.desc()]
+    if rank is not None:
+        order.insert(1, rank)
+    
+    notes = query.order_by(*order).offset(skip).limit(limit).all()
     
     return notes
 
 
+@router.get("/tags", response_model=List[TagCount])
+def get_tag_cloud(
+    current_user: UserModel = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get the user's tags with the number of notes carrying each."""
+    return tag_counts(db, current_user.id)
+
+
 @router.post("/", response_model=Note, status_code=status.HTTP_201_CREATED)
 def create_note(
     note: NoteCreate,
@@ -58,6 +70,7 @@ def create_note(
         tags=note.tags,
         is_pinned=note.is_pinned
     )
+    set_tags(db_note)
     
     db.add(db_note)
     db.commit()
@@ -117,6 +130,7 @@ def update_note(
     
     if note_update.tags is not None:
         note.tags = note_update.tags
+        set_tags(note)
     
     if note_update.is_pinned is not None:
         note.is_pinned = note_update.is_pinned
@@ -1,28 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from starlette.status import HTTP_400_BAD_REQUEST, HTTP_501_NOT_IMPLEMENTED
 from typing import List, Optional
-from database import get_db
+from database import SessionLocal, get_db
 from models import User as UserModel, Trade as TradeModel, BotConfig as BotConfigModel
 from schemas import (
-    OrderRequest, OrderResponse, Trade, TradeCreate, TradeUpdate,
+    OrderRequest, OrderResponse, Trade,
     OrderStatus, OrderType, AccountBalance, DashboardStats
 )
 from auth import get_current_active_user
-from bot.basic_bot import BasicBot
+from bot.async_bot import AsyncBasicBot, get_public_bot
+from bot.registry import async_bot_registry
 from config import settings
+from pagination import InvalidCursor, keyset_page
+from trade_export import EXPORT_FORMATS, PARQUET_AVAILABLE, export_trades
+from trade_stats import dashboard_stats
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/trading", tags=["Trading"])
 
 
-def get_bot_instance(bot_config: BotConfigModel) -> BasicBot:
-    """Create a bot instance from bot config."""
-    return BasicBot(
-        api_key=bot_config.api_key,
-        api_secret=bot_config.api_secret,
-        testnet=bot_config.is_testnet
-    )
+def get_async_bot_instance(bot_config: BotConfigModel) -> AsyncBasicBot:
+    """Get a warm async bot instance for a bot config from the shared registry."""
+    return async_bot_registry.get(bot_config)
 
 
 def get_default_bot_config(user_id: int, db: Session) -> Optional[BotConfigModel]:
@@ -33,36 +36,103 @@ def get_default_bot_config(user_id: int, db: Session) -> Optional[BotConfigModel
     ).first()
 
 
+def get_user_bot_config(
+    user_id: int,
+    bot_config_id: Optional[int],
+    db: Session
+) -> Optional[BotConfigModel]:
+    """Get a user's bot config by id, or the default one when no id is given."""
+    if bot_config_id:
+        return db.query(BotConfigModel).filter(
+            BotConfigModel.id == bot_config_id,
+            BotConfigModel.user_id == user_id
+        ).first()
+    return get_default_bot_config(user_id, db)
+
+
+def create_pending_trade(
+    order: OrderRequest,
+    user_id: int,
+    bot_config_id: int,
+    db: Session
+) -> TradeModel:
+    """Record an order as a pending trade before it is sent to the exchange."""
+    trade = TradeModel(
+        user_id=user_id,
+        bot_config_id=bot_config_id,
+        symbol=order.symbol.upper(),
+        side=order.side,
+        order_type=order.order_type,
+        quantity=order.quantity,
+        price=order.price,
+        stop_price=order.stop_price,
+        status=OrderStatus.PENDING
+    )
+    db.add(trade)
+    db.commit()
+    db.refresh(trade)
+    return trade
+
+
+def record_order_result(
+    trade: TradeModel,
+    order_type: OrderType,
+    result: dict,
+    db: Session
+) -> TradeModel:
+    """Update a trade record with the exchange's answer."""
+    if result.get('success'):
+        trade.status = OrderStatus.FILLED if order_type == OrderType.MARKET else OrderStatus.PENDING
+        trade.binance_order_id = str(result.get('order_id'))
+        trade.executed_quantity = float(result.get('quantity', 0))
+        if 'price' in result and result['price'] != 'N/A':
+            trade.price = float(result['price'])
+    else:
+        trade.status = OrderStatus.FAILED
+        trade.error_message = result.get('error', 'Unknown error')
+    
+    db.commit()
+    db.refresh(trade)
+    return trade
+
+
+def mark_trade_failed(trade: TradeModel, error: str, db: Session) -> None:
+    """Mark a trade as failed after an unexpected error."""
+    trade.status = OrderStatus.FAILED
+    trade.error_message = error
+    db.commit()
+
+
 @router.post("/execute", response_model=OrderResponse)
-def execute_order(
+async def execute_order(
     order: OrderRequest,
     current_user: UserModel = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Execute a trading order."""
+    """
+    Execute a trading order.
+    
+    Database work runs in the threadpool; only the exchange call is awaited
+    on the event loop.
+    """
     logger.info(f"Order execution request from user {current_user.username}: {order.dict()}")
     
     try:
         # Get bot config
-        if order.bot_config_id:
-            bot_config = db.query(BotConfigModel).filter(
-                BotConfigModel.id == order.bot_config_id,
-                BotConfigModel.user_id == current_user.id
-            ).first()
-            
-            if not bot_config:
+        bot_config = await run_in_threadpool(
+            get_user_bot_config, current_user.id, order.bot_config_id, db
+        )
+        
+        if not bot_config:
+            if order.bot_config_id:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Bot configuration not found"
                 )
-        else:
-            bot_config = get_default_bot_config(current_user.id, db)
-            
-            if not bot_config:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="No bot configuration found. Please create one first."
-                )
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No bot configuration found. Please create one first."
+            )
         
         if not bot_config.is_active:
             raise HTTPException(
@@ -70,28 +140,18 @@ def execute_order(
                 detail="Bot configuration is not active"
             )
         
+        # Get a warm bot before the commit below expires the config's attributes
+        bot = get_async_bot_instance(bot_config)
+        
         # Create trade record
-        trade = TradeModel(
-            user_id=current_user.id,
-            bot_config_id=bot_config.id,
-            symbol=order.symbol.upper(),
-            side=order.side,
-            order_type=order.order_type,
-            quantity=order.quantity,
-            price=order.price,
-            stop_price=order.stop_price,
-            status=OrderStatus.PENDING
+        trade = await run_in_threadpool(
+            create_pending_trade, order, current_user.id, bot_config.id, db
         )
-        db.add(trade)
-        db.commit()
-        db.refresh(trade)
-        
-        # Initialize bot and execute order
-        bot = get_bot_instance(bot_config)
         
+        # Execute order without blocking a worker thread
         result = None
         if order.order_type == OrderType.MARKET:
-            result = bot.place_market_order(
+            result = await bot.place_market_order(
                 symbol=order.symbol.upper(),
                 side=order.side.value,
                 quantity=order.quantity
@@ -102,7 +162,7 @@ def execute_order(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Price is required for limit orders"
                 )
-            result = bot.place_limit_order(
+            result = await bot.place_limit_order(
                 symbol=order.symbol.upper(),
                 side=order.side.value,
                 quantity=order.quantity,
@@ -114,7 +174,7 @@ def execute_order(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Both stop_price and price are required for stop-limit orders"
                 )
-            result = bot.place_stop_limit_order(
+            result = await bot.place_stop_limit_order(
                 symbol=order.symbol.upper(),
                 side=order.side.value,
                 quantity=order.quantity,
@@ -123,37 +183,24 @@ def execute_order(
             )
         
         # Update trade record with result
-        if result.get('success'):
-            trade.status = OrderStatus.FILLED if order.order_type == OrderType.MARKET else OrderStatus.PENDING
-            trade.binance_order_id = str(result.get('order_id'))
-            trade.executed_quantity = float(result.get('quantity', 0))
-            if 'price' in result and result['price'] != 'N/A':
-                trade.price = float(result['price'])
-        else:
-            trade.status = OrderStatus.FAILED
-            trade.error_message = result.get('error', 'Unknown error')
-        
-        db.commit()
-        db.refresh(trade)
+        trade = await run_in_threadpool(record_order_result, trade, order.order_type, result, db)
         
         return OrderResponse(
             success=result.get('success', False),
             trade_id=trade.id,
-            order_id=result.get('order_id'),
+            order_id=trade.binance_order_id,
             message="Order executed successfully" if result.get('success') else "Order failed",
             error=result.get('error'),
             details=result
         )
-        
+    
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error executing order: {str(e)}")
         # Update trade status to failed if it was created
         if 'trade' in locals():
-            trade.status = OrderStatus.FAILED
-            trade.error_message = str(e)
-            db.commit()
+            await run_in_threadpool(mark_trade_failed, trade, str(e), db)
         
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -163,14 +210,24 @@ def execute_order(
 
 @router.get("/trades", response_model=List[Trade])
 def get_trades(
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = None,
     symbol: Optional[str] = None,
     status: Optional[OrderStatus] = None,
     current_user: UserModel = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Get user's trade history."""
+    """
+    Get user's trade history, newest first.
+    
+    Pass the X-Next-Cursor header of one page as ``cursor`` to fetch the
+    next; the header is absent on the last page. ``skip`` is kept for older
+    clients and is ignored when a cursor is given. ``limit`` is capped at
+    1000 rather than rejected, so older clients asking for more still work.
+    """
+    limit = min(limit, 1000)
     query = db.query(TradeModel).filter(TradeModel.user_id == current_user.id)
     
     if symbol:
@@ -179,10 +236,58 @@ def get_trades(
     if status:
         query = query.filter(TradeModel.status == status)
     
-    trades = query.order_by(TradeModel.created_at.desc()).offset(skip).limit(limit).all()
+    if skip and not cursor:
+        return query.order_by(TradeModel.created_at.desc(), TradeModel.id.desc()).offset(skip).limit(limit).all()
+    
+    try:
+        trades, next_cursor = keyset_page(
+            query, TradeModel, cursor, limit, scope=TradeModel.user_id == current_user.id
+        )
+    except InvalidCursor as e:
+        # ``status`` is the filter argument here, not fastapi.status
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return trades
 
 
+@router.get("/trades/export")
+def export_trade_history(
+    format: str = Query("csv", pattern="^(csv|ndjson|parquet)$"),
+    gzip: bool = False,
+    symbol: Optional[str] = None,
+    status: Optional[OrderStatus] = None,
+    current_user: UserModel = Depends(get_current_active_user)
+):
+    """
+    Stream the user's full trade history as CSV, NDJSON or Parquet.
+    
+    Rows are read and encoded in chunks, so memory stays flat however
+    many trades are exported. ``gzip`` wraps the stream in a .gz file.
+    """
+    if format == 'parquet' and not PARQUET_AVAILABLE:
+        # ``status`` is the filter argument here, not fastapi.status
+        raise HTTPException(
+            status_code=HTTP_501_NOT_IMPLEMENTED,
+            detail="Parquet export requires pyarrow"
+        )
+    
+    media_type, extension = EXPORT_FORMATS[format]
+    filename = f"trades.{extension}"
+    if gzip:
+        media_type, filename = "application/gzip", f"{filename}.gz"
+    
+    return StreamingResponse(
+        export_trades(SessionLocal, current_user.id, format, symbol=symbol, status=status, gzip=gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
 @router.get("/trades/{trade_id}", response_model=Trade)
 def get_trade(
     trade_id: int,
@@ -205,7 +310,7 @@ def get_trade(
 
 
 @router.get("/balance", response_model=AccountBalance)
-def get_balance(
+async def get_balance(
     bot_config_id: Optional[int] = None,
     current_user: UserModel = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -213,13 +318,9 @@ def get_balance(
     """Get account balance."""
     try:
         # Get bot config
-        if bot_config_id:
-            bot_config = db.query(BotConfigModel).filter(
-                BotConfigModel.id == bot_config_id,
-                BotConfigModel.user_id == current_user.id
-            ).first()
-        else:
-            bot_config = get_default_bot_config(current_user.id, db)
+        bot_config = await run_in_threadpool(
+            get_user_bot_config, current_user.id, bot_config_id, db
+        )
         
         if not bot_config:
             raise HTTPException(
@@ -228,11 +329,11 @@ def get_balance(
             )
         
         # Get balance
-        bot = get_bot_instance(bot_config)
-        balance = bot.get_account_balance()
+        bot = get_async_bot_instance(bot_config)
+        balance = await bot.get_account_balance()
         
         return AccountBalance(**balance)
-        
+    
     except HTTPException:
         raise
     except Exception as e:
@@ -244,32 +345,38 @@ def get_balance(
 
 
 @router.get("/price/{symbol}")
-def get_price(
+async def get_price(
     symbol: str,
     bot_config_id: Optional[int] = None,
     current_user: UserModel = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Get current price for a symbol."""
+    """
+    Get current price for a symbol.
+    
+    While the streamed quote is fresh the price is the bid/ask midpoint
+    (the mark price until the first quote arrives); otherwise it is the last
+    trade price from REST. Unlisted symbols return 404.
+    
+    Prices are public, so the bot config only selects testnet or live; no
+    API keys are used.
+    """
     try:
-        # Get bot config
-        if bot_config_id:
-            bot_config = db.query(BotConfigModel).filter(
-                BotConfigModel.id == bot_config_id,
-                BotConfigModel.user_id == current_user.id
-            ).first()
-        else:
-            bot_config = get_default_bot_config(current_user.id, db)
+        # Bot config only decides the environment
+        bot_config = await run_in_threadpool(
+            get_user_bot_config, current_user.id, bot_config_id, db
+        )
         
-        if not bot_config:
+        if bot_config_id and not bot_config:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Bot configuration not found"
             )
         
+        testnet = bot_config.is_testnet if bot_config else settings.BINANCE_TESTNET
+        
         # Get price
-        bot = get_bot_instance(bot_config)
-        price = bot.get_current_price(symbol.upper())
+        price = await get_public_bot(testnet).get_current_price(symbol.upper())
         
         if price is None:
             raise HTTPException(
@@ -278,7 +385,7 @@ def get_price(
             )
         
         return {"symbol": symbol.upper(), "price": price}
-        
+    
     except HTTPException:
         raise
     except Exception as e:
@@ -296,39 +403,8 @@ def get_dashboard_stats(
 ):
     """Get dashboard statistics."""
     try:
-        total_trades = db.query(TradeModel).filter(
-            TradeModel.user_id == current_user.id
-        ).count()
-        
-        successful_trades = db.query(TradeModel).filter(
-            TradeModel.user_id == current_user.id,
-            TradeModel.status == OrderStatus.FILLED
-        ).count()
-        
-        failed_trades = db.query(TradeModel).filter(
-            TradeModel.user_id == current_user.id,
-            TradeModel.status == OrderStatus.FAILED
-        ).count()
-        
-        pending_trades = db.query(TradeModel).filter(
-            TradeModel.user_id == current_user.id,
-            TradeModel.status == OrderStatus.PENDING
-        ).count()
-        
-        active_bot_configs = db.query(BotConfigModel).filter(
-            BotConfigModel.user_id == current_user.id,
-            BotConfigModel.is_active == True
-        ).count()
-        
-        return DashboardStats(
-            total_trades=total_trades,
-            successful_trades=successful_trades,
-            failed_trades=failed_trades,
-            pending_trades=pending_trades,
-            total_profit=0.0,  # This would require calculating P&L
-            active_bot_configs=active_bot_configs
-        )
-        
+        return DashboardStats(**dashboard_stats(db, current_user.id))
+    
     except Exception as e:
         logger.error(f"Error fetching dashboard stats: {str(e)}")
         raise HTTPException(
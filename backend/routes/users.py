@@ -4,7 +4,9 @@ from typing import List
 from database import get_db
 from models import User as UserModel
 from schemas import User, UserUpdate
-from auth import get_current_active_user
+from auth import get_current_active_user, hashing_busy
+from password_pool import HashingBusy, password_hasher
+from user_cache import user_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,6 +27,7 @@ def update_profile(
 ):
     """Update current user profile."""
     logger.info(f"Profile update attempt for user: {current_user.username}")
+    previous_username = current_user.username
     
     # Check if new email/username already exists
     if user_update.email and user_update.email != current_user.email:
@@ -49,12 +52,17 @@ def update_profile(
         current_user.full_name = user_update.full_name
     
     if user_update.password:
-        from auth import get_password_hash
-        current_user.hashed_password = get_password_hash(user_update.password)
+        try:
+            current_user.hashed_password = password_hasher.hash_blocking(user_update.password)
+        except HashingBusy:
+            raise hashing_busy()
     
     db.commit()
     db.refresh(current_user)
     
+    # Tokens name the user by username, so drop the entry under the old one
+    user_cache.invalidate(previous_username)
+    
     logger.info(f"Profile updated successfully for user: {current_user.username}")
     return current_user
 
@@ -70,5 +78,7 @@ def delete_profile(
     db.delete(current_user)
     db.commit()
     
+    user_cache.invalidate(current_user.username)
+    
     logger.info(f"Account deleted successfully: {current_user.username}")
     return None
@@ -180,6 +180,11 @@ class Note(NoteBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class TagCount(BaseModel):
+    tag: str
+    count: int
+
+
 # Account Balance Schema
 class AccountBalance(BaseModel):
     total_wallet_balance: str
@@ -15,16 +15,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from binance.client import Client
 from bot.advanced_orders import AdvancedOrderBot
 from dotenv import load_dotenv
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('bot.log'),
-        logging.StreamHandler()
-    ]
-)
+from logging_config import configure_logging
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +23,8 @@ logger = logging.getLogger(__name__)
 def main():
     """Execute OCO order from command line."""
     
+    configure_logging('bot.log', fmt='%(asctime)s - %(levelname)s - %(message)s')
+    
     # Load environment variables
     load_dotenv()
     
@@ -98,6 +91,9 @@ def main():
         
         # Initialize advanced bot
         bot = AdvancedOrderBot(client)
+        # Resume strategies an earlier run left behind
+        if bot.store is not None:
+            bot.recover_strategies()
         
         # Place OCO order
         print("\nPlacing OCO order...")
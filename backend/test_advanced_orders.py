@@ -10,7 +10,7 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from binance.client import Client
+from bot.transport import create_client
 from bot.advanced_orders import AdvancedOrderBot
 from dotenv import load_dotenv
 import logging
@@ -51,7 +51,7 @@ def test_advanced_orders():
     
     try:
         # Initialize client
-        client = Client(api_key, api_secret, testnet=testnet)
+        client = create_client(api_key, api_secret, testnet=testnet)
         if testnet:
             client.API_URL = 'https://testnet.binancefuture.com'
         
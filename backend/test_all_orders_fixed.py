@@ -1,7 +1,7 @@
 """
 Fixed test with proper quantities and price precision
 """
-from binance.client import Client
+from bot.transport import create_client
 from bot.basic_bot import BasicBot
 from bot.advanced_orders import AdvancedOrderBot
 from dotenv import load_dotenv
@@ -16,7 +16,7 @@ print("COMPREHENSIVE TRADING BOT TEST - FIXED")
 print("="*70)
 
 # Initialize client
-client = Client(os.getenv('BINANCE_API_KEY'), os.getenv('BINANCE_API_SECRET'), testnet=True)
+client = create_client(os.getenv('BINANCE_API_KEY'), os.getenv('BINANCE_API_SECRET'), testnet=True)
 client.API_URL = 'https://testnet.binancefuture.com'
 
 # Get current price and symbol info
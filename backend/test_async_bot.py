@@ -0,0 +1,270 @@
+"""
+Test script for the async bot and the async trading routes.
+Runs offline with a stand-in exchange client and an in-memory SQLite database.
+"""
+
+import asyncio
+import sys
+import threading
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from bot import async_bot
+from bot.async_bot import AsyncBasicBot
+from bot.exchange_info import ExchangeInfoCache
+from bot.market_data import MarketDataService
+from bot.registry import async_bot_registry
+from database import Base
+from models import BotConfig, OrderStatus, Trade, User
+from routes.trading import execute_order, get_balance, get_price
+from schemas import OrderRequest
+
+
+EXCHANGE_INFO = {
+    'symbols': [
+        {
+            'symbol': 'BTCUSDT',
+            'filters': [
+                {'filterType': 'PRICE_FILTER', 'tickSize': '0.10', 'minPrice': '556.80', 'maxPrice': '4529764'},
+                {'filterType': 'LOT_SIZE', 'stepSize': '0.001', 'minQty': '0.001', 'maxQty': '1000'}
+            ]
+        },
+        {
+            'symbol': 'ETHUSDT',
+            'filters': [
+                {'filterType': 'LOT_SIZE', 'stepSize': '0.001', 'minQty': '0.001', 'maxQty': '10000'},
+                {'filterType': 'MIN_NOTIONAL', 'notional': '20'}
+            ]
+        }
+    ]
+}
+
+
+class FakeAsyncClient:
+    """AsyncClient stand-in answering the few endpoints the bot uses."""
+    
+    session = None
+    
+    def __init__(self):
+        self.orders = []
+        self.exchange_info_calls = 0
+    
+    async def futures_exchange_info(self):
+        self.exchange_info_calls += 1
+        await asyncio.sleep(0.01)
+        return EXCHANGE_INFO
+    
+    async def futures_create_order(self, **params):
+        self.orders.append(params)
+        return {
+            'orderId': len(self.orders), 'symbol': params['symbol'], 'side': params['side'],
+            'type': params['type'], 'origQty': params['quantity'], 'status': 'NEW',
+            'price': params.get('price', '0'), 'avgPrice': '45000.0', 'stopPrice': params.get('stopPrice', '0'),
+            'executedQty': '0', 'timeInForce': params.get('timeInForce', 'GTC'), 'updateTime': 0
+        }
+    
+    async def futures_account(self):
+        return {
+            'totalWalletBalance': '100.0', 'totalUnrealizedProfit': '0.0',
+            'totalMarginBalance': '100.0', 'availableBalance': '90.0',
+            'assets': [
+                {'asset': 'USDT', 'walletBalance': '100.0', 'availableBalance': '90.0', 'unrealizedProfit': '0.0'},
+                {'asset': 'BNB', 'walletBalance': '0', 'availableBalance': '0', 'unrealizedProfit': '0'}
+            ]
+        }
+    
+    async def futures_symbol_ticker(self, symbol):
+        return {'symbol': symbol, 'price': '45000.5'}
+
+
+async def make_bot(bot=None):
+    """Build a bot on the running loop and swap in the stand-in client."""
+    bot = bot or AsyncBasicBot('key', 'secret', testnet=True)
+    await bot.client.close_connection()
+    bot.client = FakeAsyncClient()
+    bot.exchange_info = ExchangeInfoCache(background_refresh=False)
+    bot.market_data = MarketDataService(testnet=True)
+    # Keep the market-data service offline
+    bot.market_data._ensure_started = lambda: None
+    bot.market_data.connection.send = lambda payload: True
+    return bot
+
+
+def make_db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    user = User(email="alice@example.com", username="alice", hashed_password="x")
+    db.add(user)
+    db.flush()
+    config = BotConfig(user_id=user.id, name="main", api_key="key", api_secret="secret", is_testnet=True)
+    db.add(config)
+    db.commit()
+    # Loaded, as get_current_user hands it to the routes
+    db.refresh(user)
+    return engine, db, user, config
+
+
+def query_threads(engine):
+    """Record the thread every SQL statement runs on."""
+    threads = []
+    event.listen(engine, "before_cursor_execute", lambda *args: threads.append(threading.get_ident()))
+    return threads
+
+
+def run_offline(scenario):
+    """Run a test scenario on a fresh loop and release the shared connector."""
+    async def runner():
+        try:
+            await scenario()
+        finally:
+            await async_bot.close_shared_connector()
+    asyncio.run(runner())
+
+
+def test_bot_orders_offline():
+    """Orders are validated against the filters and shaped like BasicBot's."""
+    async def scenario():
+        bot = await make_bot()
+        
+        result = await bot.place_market_order('BTCUSDT', 'BUY', 0.0105)
+        assert result['success'], result
+        assert bot.client.orders[0]['quantity'] == '0.010'
+        
+        result = await bot.place_limit_order('BTCUSDT', 'SELL', 0.01, 50000.0)
+        assert result['success'] and bot.client.orders[1]['type'] == 'LIMIT'
+        
+        result = await bot.place_market_order('BTCUSDT', 'HOLD', 0.01)
+        assert not result['success'] and len(bot.client.orders) == 2
+        
+        result = await bot.place_market_order('NOPEUSDT', 'BUY', 0.01)
+        assert not result['success'] and 'not found' in result['error']
+        
+        # Notional is checked at the limit price, or the streamed price for
+        # market orders; without one the exchange checks it (no REST lookup)
+        result = await bot.place_market_order('ETHUSDT', 'BUY', 0.005)
+        assert result['success'], result
+        bot.market_data.record_price('ETHUSDT', 3000.0)
+        result = await bot.place_market_order('ETHUSDT', 'BUY', 0.005)
+        assert not result['success'] and 'notional' in result['error']
+        result = await bot.place_limit_order('ETHUSDT', 'BUY', 0.005, 5000.0)
+        assert result['success'], result
+    
+    run_offline(scenario)
+    print("✅ Async orders validated and formatted")
+
+
+def test_exchange_info_single_flight():
+    """Concurrent requests on a stale cache share one exchange info download."""
+    async def scenario():
+        bot = await make_bot()
+        other = await make_bot()
+        other.exchange_info = bot.exchange_info
+        
+        tasks = [
+            (bot if i % 2 else other)._get_filters('BTCUSDT')
+            for i in range(20)
+        ]
+        results = await asyncio.gather(*tasks)
+        assert all(filters is results[0] for filters in results)
+        assert bot.client.exchange_info_calls + other.client.exchange_info_calls == 1
+    
+    run_offline(scenario)
+    print("✅ One exchange info download for concurrent requests")
+
+
+def test_bot_balance_and_price_offline():
+    """Balances are formatted and REST prices refill the market-data cache."""
+    async def scenario():
+        bot = await make_bot()
+        
+        balance = await bot.get_account_balance()
+        assert balance['available_balance'] == '90.0'
+        assert [a['asset'] for a in balance['assets']] == ['USDT']
+        
+        assert await bot.get_current_price('BTCUSDT') == 45000.5
+        assert bot.market_data.get_price('BTCUSDT') == 45000.5
+    
+    run_offline(scenario)
+    print("✅ Async balance and price")
+
+
+def test_close_from_worker_thread():
+    """close() from a threadpool thread hands the session close to the bot's loop."""
+    async def scenario():
+        bot = AsyncBasicBot('key', 'secret', testnet=True)
+        session = bot.client.session
+        await asyncio.to_thread(bot.close)
+        for _ in range(10):
+            if session.closed:
+                break
+            await asyncio.sleep(0.01)
+        assert session.closed
+        
+        other = AsyncBasicBot('key', 'secret', testnet=True)
+        await other.aclose()
+        assert other.client.session.closed
+    
+    run_offline(scenario)
+    print("✅ Sessions closed on their own loop")
+
+
+def test_routes_keep_database_off_loop():
+    """The async routes run every query in the threadpool, never on the loop."""
+    engine, db, user, config = make_db()
+    threads = query_threads(engine)
+    
+    async def scenario():
+        loop_thread = threading.get_ident()
+        bot = await make_bot(async_bot_registry.get(config))
+        async_bot._public_bots[True] = bot
+        db.refresh(user)
+        threads.clear()
+        
+        order = OrderRequest(symbol="btcusdt", side="BUY", order_type="MARKET", quantity=0.01)
+        response = await execute_order(order, current_user=user, db=db)
+        assert response.success, response
+        assert threads and loop_thread not in threads
+        
+        db.refresh(user)
+        threads.clear()
+        balance = await get_balance(bot_config_id=None, current_user=user, db=db)
+        assert balance.available_balance == '90.0'
+        assert threads and loop_thread not in threads
+        
+        db.refresh(user)
+        threads.clear()
+        price = await get_price('btcusdt', bot_config_id=config.id, current_user=user, db=db)
+        assert price == {'symbol': 'BTCUSDT', 'price': 45000.5}
+        assert threads and loop_thread not in threads
+        return response.trade_id
+    
+    try:
+        run_offline(scenario)
+    finally:
+        async_bot._public_bots.pop(True, None)
+        async_bot_registry.clear()
+    
+    trade = db.query(Trade).one()
+    assert trade.status == OrderStatus.FILLED and trade.binance_order_id == '1'
+    print("✅ Async routes query the database from the threadpool")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("ASYNC BOT TESTS")
+    print("=" * 60)
+    
+    try:
+        test_bot_orders_offline()
+        test_exchange_info_single_flight()
+        test_bot_balance_and_price_offline()
+        test_close_from_worker_thread()
+        test_routes_keep_database_off_loop()
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+    
+    print("\n✅ All async bot tests passed!")
@@ -0,0 +1,129 @@
+"""
+Test script for the strategy backtester.
+Runs offline on synthetic price data.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from bot.backtest import BUY, SELL, Bars, backtest_grid, backtest_oco, backtest_twap, load_bars
+
+
+def random_bars(n: int, seed: int = 0) -> Bars:
+    rng = np.random.default_rng(seed)
+    close = 45000 * np.exp(np.cumsum(rng.normal(0, 0.0008, n)))
+    open_ = np.r_[45000, close[:-1]]
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.0003, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.0003, n)))
+    timestamps = 1700000000000 + np.arange(n) * 60000
+    return Bars(timestamps, open_, high, low, close)
+
+
+def test_grid_matches_bar_by_bar_replay():
+    """Vectorised grid fills equal a straightforward per-bar simulation."""
+    bars = random_bars(3000)
+    result = backtest_grid(bars, 43000, 47000, 25, 0.01)
+    
+    levels = np.linspace(43000, 47000, 25)
+    active = np.where(levels < bars.open[0], BUY, SELL)
+    expected = []
+    for t in range(len(bars)):
+        for j, level in enumerate(levels):
+            if active[j] == BUY and bars.low[t] <= level:
+                expected.append((t, j, BUY))
+                active[j] = SELL
+            elif active[j] == SELL and bars.high[t] >= level:
+                expected.append((t, j, SELL))
+                active[j] = BUY
+    
+    fills = list(zip(result.fills['bar'].tolist(), result.fills['level'].tolist(), result.fills['side'].tolist()))
+    assert fills == expected
+    assert len(result.equity) == len(bars)
+    print(f"✅ Grid: {len(fills)} fills match the bar-by-bar replay")
+
+
+def test_grid_year_of_minute_bars():
+    """A year of minute bars for a 100-level grid evaluates in seconds."""
+    bars = random_bars(525600, seed=1)
+    
+    started = time.perf_counter()
+    result = backtest_grid(bars, 40000, 50000, 100, 0.001)
+    elapsed = time.perf_counter() - started
+    
+    assert result.summary()['fills'] > 0
+    assert elapsed < 60
+    print(f"✅ Year of minute bars, 100 levels: {elapsed:.1f}s")
+
+
+def test_twap_schedule():
+    """Slices execute at their scheduled bars with the sliced quantity."""
+    bars = random_bars(100)
+    result = backtest_twap(bars, 'BUY', 1.0, 30, 10)
+    
+    # 30 minutes over 10 slices -> one slice every 3 one-minute bars
+    assert result.fills['bar'].tolist() == list(range(0, 30, 3))
+    assert np.allclose(result.fills['quantity'], 0.1)
+    assert abs(result.position[-1] - 1.0) < 1e-9
+    print(f"✅ TWAP: average {result.summary()['average_price']:.2f}")
+
+
+def test_oco_outcomes():
+    """Take profit, stop loss and gaps through the stop limit."""
+    flat = np.full(5, 100.0)
+    
+    up = Bars(np.arange(5), flat, [100, 101, 106, 100, 100], flat - 1, flat)
+    assert backtest_oco(up, 'SELL', 1, 105, 95, 94).summary()['outcome'] == 'TAKE_PROFIT'
+    
+    down = Bars(np.arange(5), flat, flat + 1, [99, 94, 90, 90, 90], flat)
+    result = backtest_oco(down, 'SELL', 1, 105, 95, 94).summary()
+    assert result['outcome'] == 'STOP_LOSS' and result['exit_price'] == 95
+    
+    # Gap below the stop limit: rests until price comes back up to 94
+    gap = Bars(np.arange(5), [100, 90, 91, 93, 93], [100, 91, 92, 94.5, 94], [99, 89, 90, 92, 92], flat)
+    result = backtest_oco(gap, 'SELL', 1, 105, 95, 94)
+    assert result.fills['bar'].tolist() == [3] and result.summary()['exit_price'] == 94
+    assert abs(result.summary()['pnl'] - (94 - 100) + 94 * 0.0004) < 1e-9
+    print("✅ OCO outcomes resolved")
+
+
+def test_load_bars_and_trades():
+    """Kline CSVs load and trades aggregate into bars."""
+    with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as f:
+        f.write("open_time,open,high,low,close,volume\n")
+        f.write("1700000000000,100,101,99,100.5,10\n")
+        f.write("1700000060000,100.5,102,100,101,12\n")
+        path = f.name
+    try:
+        bars = load_bars(path)
+    finally:
+        os.unlink(path)
+    assert len(bars) == 2 and bars.high[1] == 102 and bars.volume[0] == 10
+    
+    trades = Bars.from_trades([0, 10, 59999, 60000, 60001], [100, 103, 101, 99, 98], bar_ms=60000)
+    assert trades.high.tolist() == [103, 99] and trades.low.tolist() == [100, 98]
+    assert trades.close.tolist() == [101, 98]
+    print("✅ Bars loaded from CSV and trades")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Testing Backtester")
+    print("=" * 60)
+    
+    try:
+        test_grid_matches_bar_by_bar_replay()
+        test_grid_year_of_minute_bars()
+        test_twap_schedule()
+        test_oco_outcomes()
+        test_load_bars_and_trades()
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+    
+    print("=" * 60)
+    print("All backtest tests passed ✅")
+    print("=" * 60)
@@ -0,0 +1,91 @@
+"""
+Test script for batch order placement in AdvancedOrderBot.
+Runs offline with a stand-in client.
+"""
+
+import sys
+
+from binance.exceptions import BinanceAPIException
+
+from bot.advanced_orders import AdvancedOrderBot, BATCH_ORDER_LIMIT
+
+
+class FakeResponse:
+    status_code = 400
+    text = '{"code": -1102, "msg": "Mandatory parameter missing"}'
+
+
+class FakeClient:
+    """Records batch requests; rejects orders priced at zero."""
+    
+    testnet = True
+    
+    def __init__(self, fail_request: bool = False):
+        self.batches = []
+        self.fail_request = fail_request
+        self.next_id = 1
+    
+    def _request(self, method, uri, signed, force_params=False, **kwargs):
+        raise AssertionError("unexpected REST call")
+    
+    def futures_place_batch_order(self, batchOrders):
+        self.batches.append(batchOrders)
+        if self.fail_request:
+            raise BinanceAPIException(FakeResponse(), 400, FakeResponse.text)
+        
+        response = []
+        for order in batchOrders:
+            if order['price'] == '0':
+                response.append({'code': -4014, 'msg': 'Price not increased by tick size.'})
+            else:
+                response.append({'orderId': self.next_id, 'status': 'NEW'})
+                self.next_id += 1
+        return response
+
+
+def test_chunking_and_alignment():
+    """Orders are chunked and results line up with the input."""
+    client = FakeClient()
+    bot = AdvancedOrderBot(client)
+    orders = [
+        {'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'LIMIT', 'quantity': 0.001, 'price': price}
+        for price in [100, 0, 102, 103, 104, 105, 0]
+    ]
+    
+    results = bot.place_batch_orders(orders)
+    
+    assert [len(batch) for batch in client.batches] == [BATCH_ORDER_LIMIT, 2]
+    assert all(isinstance(v, str) for batch in client.batches for order in batch for v in order.values())
+    assert len(results) == len(orders)
+    assert results[1]['error_code'] == -4014 and results[6]['error_code'] == -4014
+    assert [r['orderId'] for r in results if 'orderId' in r] == [1, 2, 3, 4, 5]
+    print(f"✅ {len(orders)} orders in {len(client.batches)} requests")
+
+
+def test_failed_request_maps_to_every_order():
+    """A rejected request reports its error against each order in the chunk."""
+    bot = AdvancedOrderBot(FakeClient(fail_request=True))
+    orders = [{'symbol': 'BTCUSDT', 'price': 100}, {'symbol': 'BTCUSDT', 'price': 101}]
+    
+    results = bot.place_batch_orders(orders)
+    
+    assert len(results) == 2
+    assert all(r['error_code'] == -1102 for r in results)
+    print("✅ Request failure mapped to each order")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Testing Batch Order Placement")
+    print("=" * 60)
+    
+    try:
+        test_chunking_and_alignment()
+        test_failed_request_maps_to_every_order()
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+    
+    print("=" * 60)
+    print("All batch order tests passed ✅")
+    print("=" * 60)
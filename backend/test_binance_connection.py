@@ -1,5 +1,5 @@
 """Test direct Binance API connection"""
-from binance.client import Client
+from bot.transport import create_client
 from binance.exceptions import BinanceAPIException
 
 # Replace with your Binance Testnet API credentials
@@ -13,7 +13,7 @@ print("=" * 70)
 # Test 1: Spot Testnet
 print("\n1. Testing SPOT Testnet (testnet.binance.vision)...")
 try:
-    client = Client(API_KEY, API_SECRET, testnet=True)
+    client = create_client(API_KEY, API_SECRET, testnet=True)
     
     # Try to get account info
     account = client.get_account()
@@ -33,7 +33,7 @@ except Exception as e:
 # Test 2: Futures Testnet
 print("\n2. Testing FUTURES Testnet (testnet.binancefuture.com)...")
 try:
-    client = Client(API_KEY, API_SECRET, testnet=True)
+    client = create_client(API_KEY, API_SECRET, testnet=True)
     client.API_URL = 'https://testnet.binancefuture.com'
     
     # Try to get futures account info
@@ -55,7 +55,7 @@ except Exception as e:
 # Test 3: Check API key permissions
 print("\n3. Checking API key status...")
 try:
-    client = Client(API_KEY, API_SECRET, testnet=True)
+    client = create_client(API_KEY, API_SECRET, testnet=True)
     status = client.get_account_api_trading_status()
     print(f"   ✓ API Status retrieved:")
     print(f"   Status: {status}")
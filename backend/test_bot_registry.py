@@ -0,0 +1,120 @@
+"""
+Test script for the shared bot registry.
+Runs offline with a stand-in bot factory.
+"""
+
+import asyncio
+import sys
+import time
+
+from bot.registry import BotRegistry
+
+
+class FakeBot:
+    """Minimal bot stand-in that records close() calls."""
+    
+    def __init__(self, api_key: str, api_secret: str, testnet: bool):
+        self.api_key = api_key
+        self.closed = False
+    
+    def close(self):
+        self.closed = True
+
+
+class FakeAsyncBot(FakeBot):
+    """Async bot stand-in; aclose() must be awaited instead of close()."""
+    
+    def close(self):
+        raise AssertionError("close() called on the event loop")
+    
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeConfig:
+    def __init__(self, config_id: int, api_key: str = 'key', api_secret: str = 'secret'):
+        self.id = config_id
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.is_testnet = True
+
+
+def test_reuse_and_counters():
+    """A second lookup for the same config reuses the warm bot."""
+    registry = BotRegistry(FakeBot, max_size=4, idle_ttl_seconds=60)
+    
+    first = registry.get(FakeConfig(1))
+    second = registry.get(FakeConfig(1))
+    
+    assert first is second
+    stats = registry.stats()
+    assert stats['hits'] == 1 and stats['misses'] == 1
+    print(f"✅ Reuse: {stats}")
+
+
+def test_credentials_change_and_invalidate():
+    """Changed keys or explicit invalidation build a fresh bot."""
+    registry = BotRegistry(FakeBot, max_size=4, idle_ttl_seconds=60)
+    
+    old = registry.get(FakeConfig(1, api_key='old'))
+    new = registry.get(FakeConfig(1, api_key='new'))
+    assert new is not old and old.closed
+    
+    assert registry.invalidate(1)
+    assert new.closed
+    assert not registry.invalidate(1)
+    print("✅ Credential change and invalidation drop stale bots")
+
+
+def test_lru_and_ttl_eviction():
+    """The least recently used and idle entries are evicted."""
+    registry = BotRegistry(FakeBot, max_size=2, idle_ttl_seconds=0.05)
+    
+    a = registry.get(FakeConfig(1))
+    registry.get(FakeConfig(2))
+    registry.get(FakeConfig(1))
+    registry.get(FakeConfig(3))
+    assert registry.stats()['size'] == 2
+    assert registry.get(FakeConfig(1)) is a
+    
+    time.sleep(0.1)
+    registry.get(FakeConfig(4))
+    assert registry.stats()['size'] == 1
+    assert a.closed
+    print(f"✅ Eviction: {registry.stats()}")
+
+
+def test_aclear_awaits_async_close():
+    """Shutdown awaits async closes and still closes sync bots."""
+    registry = BotRegistry(FakeAsyncBot, max_size=4, idle_ttl_seconds=60)
+    bots = [registry.get(FakeConfig(1)), registry.get(FakeConfig(2))]
+    
+    asyncio.run(registry.aclear())
+    
+    assert all(bot.closed for bot in bots)
+    assert registry.stats()['size'] == 0
+    
+    sync_registry = BotRegistry(FakeBot, max_size=4, idle_ttl_seconds=60)
+    bot = sync_registry.get(FakeConfig(1))
+    asyncio.run(sync_registry.aclear())
+    assert bot.closed
+    print("✅ Shutdown closes every bot")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Testing Bot Registry")
+    print("=" * 60)
+    
+    try:
+        test_reuse_and_counters()
+        test_credentials_change_and_invalidate()
+        test_lru_and_ttl_eviction()
+        test_aclear_awaits_async_close()
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+    
+    print("=" * 60)
+    print("All registry tests passed ✅")
+    print("=" * 60)
@@ -0,0 +1,120 @@
+"""
+Test script for bulk cancellation in AdvancedOrderBot.
+Runs offline with a stand-in client.
+"""
+
+import json
+import sys
+
+from bot.advanced_orders import AdvancedOrderBot
+
+
+class FakeClient:
+    """Keeps a set of open order IDs and counts cancel requests."""
+    
+    testnet = True
+    
+    def __init__(self, open_ids):
+        self.open_ids = set(open_ids)
+        self.calls = []
+    
+    def _request(self, method, uri, signed, force_params=False, **kwargs):
+        raise AssertionError("unexpected REST call")
+    
+    def futures_get_open_orders(self, symbol):
+        self.calls.append('openOrders')
+        return [{'orderId': order_id, 'symbol': symbol} for order_id in sorted(self.open_ids)]
+    
+    def futures_cancel_all_open_orders(self, symbol):
+        self.calls.append('allOpenOrders')
+        self.open_ids.clear()
+        return {'code': 200, 'msg': 'The operation of cancel all open order is done.'}
+    
+    def futures_cancel_orders(self, symbol, orderIdList):
+        self.calls.append('batchOrders')
+        response = []
+        for order_id in json.loads(orderIdList):
+            if order_id == 13:
+                response.append({'code': -2011, 'msg': 'Unknown order sent.'})
+            else:
+                self.open_ids.discard(order_id)
+                response.append({'orderId': order_id, 'status': 'CANCELED'})
+        return response
+
+
+def make_grid(bot, grid_id, symbol, order_ids):
+    bot.active_strategies[grid_id] = {
+        'type': 'GRID',
+        'symbol': symbol,
+        'status': 'active',
+        'active_orders': len(order_ids),
+        'slots': [{'order_id': order_id, 'side': 'BUY', 'status': 'NEW'} for order_id in order_ids],
+        'open_orders': {order_id: index for index, order_id in enumerate(order_ids)},
+        'created_at': '2024-01-01T00:00:00'
+    }
+
+
+def test_owned_symbol_uses_cancel_all():
+    """A grid that owns its symbol is cleared with one cancel-all request."""
+    client = FakeClient(open_ids=range(1, 31))
+    bot = AdvancedOrderBot(client)
+    # Orders 31-40 filled before the fills were seen
+    make_grid(bot, 'GRID_1', 'BTCUSDT', list(range(1, 41)))
+    
+    result = bot.stop_grid_trading('GRID_1')
+    
+    assert client.calls == ['openOrders', 'allOpenOrders'], client.calls
+    assert result['orders_cancelled'] == 30
+    statuses = {r['order_id']: r['status'] for r in result['results']}
+    assert statuses[1] == 'CANCELED' and statuses[35] == 'NOT_OPEN'
+    assert bot.active_strategies['GRID_1']['active_orders'] == 0
+    print(f"✅ 40 recorded orders stopped in {len(client.calls)} requests")
+
+
+def test_shared_symbol_uses_batch_cancel():
+    """Other orders on the symbol are left alone and errors are reported."""
+    client = FakeClient(open_ids=list(range(1, 15)) + [99])
+    bot = AdvancedOrderBot(client)
+    make_grid(bot, 'GRID_1', 'BTCUSDT', list(range(1, 15)))
+    
+    result = bot.stop_grid_trading('GRID_1')
+    
+    assert client.calls == ['openOrders', 'batchOrders', 'batchOrders'], client.calls
+    assert 99 in client.open_ids
+    statuses = {r['order_id']: r for r in result['results']}
+    assert statuses[13]['status'] == 'ERROR' and statuses[13]['error_code'] == -2011
+    assert result['orders_cancelled'] == 13
+    print(f"✅ Batch cancel: {result['orders_cancelled']} cancelled, 1 error reported")
+
+
+def test_emergency_stop():
+    """Emergency stop clears every strategy per symbol."""
+    client = FakeClient(open_ids=[1, 2, 3, 4])
+    bot = AdvancedOrderBot(client)
+    make_grid(bot, 'GRID_1', 'BTCUSDT', [1, 2])
+    make_grid(bot, 'GRID_2', 'BTCUSDT', [3, 4])
+    
+    result = bot.emergency_stop()
+    
+    assert result['success'] and result['strategies_stopped'] == 2
+    assert client.calls == ['openOrders', 'allOpenOrders'], client.calls
+    assert all(s['status'] == 'stopped' for s in bot.active_strategies.values())
+    print(f"✅ Emergency stop: {result['symbols']['BTCUSDT']['orders_cancelled']} orders cancelled")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Testing Bulk Cancellation")
+    print("=" * 60)
+    
+    try:
+        test_owned_symbol_uses_cancel_all()
+        test_shared_symbol_uses_batch_cancel()
+        test_emergency_stop()
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+    
+    print("=" * 60)
+    print("All bulk cancellation tests passed ✅")
+    print("=" * 60)
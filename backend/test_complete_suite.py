@@ -1,7 +1,7 @@
 """
 Complete test suite with all order types including TWAP and Grid
 """
-from binance.client import Client
+from bot.transport import create_client
 from bot.basic_bot import BasicBot
 from bot.advanced_orders import AdvancedOrderBot
 from dotenv import load_dotenv
@@ -16,7 +16,7 @@ print("COMPLETE TEST SUITE - ALL ORDER TYPES")
 print("="*70)
 
 # Initialize
-client = Client(os.getenv('BINANCE_API_KEY'), os.getenv('BINANCE_API_SECRET'), testnet=True)
+client = create_client(os.getenv('BINANCE_API_KEY'), os.getenv('BINANCE_API_SECRET'), testnet=True)
 client.API_URL = 'https://testnet.binancefuture.com'
 
 # Get current price
@@ -1,11 +1,11 @@
 """Quick API connection test"""
-from binance.client import Client
+from bot.transport import create_client
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
-client = Client(os.getenv('BINANCE_API_KEY'), os.getenv('BINANCE_API_SECRET'), testnet=True)
+client = create_client(os.getenv('BINANCE_API_KEY'), os.getenv('BINANCE_API_SECRET'), testnet=True)
 client.API_URL = 'https://testnet.binancefuture.com'
 
 # Test connection
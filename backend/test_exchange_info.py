@@ -0,0 +1,120 @@
+"""
+Test script for the exchange info cache and symbol filter index.
+Runs offline against a canned exchange info payload.
+"""
+
+import sys
+from decimal import Decimal, ROUND_HALF_EVEN
+
+from bot.exchange_info import ExchangeInfoCache
+
+
+EXCHANGE_INFO = {
+    'symbols': [
+        {
+            'symbol': 'BTCUSDT',
+            'filters': [
+                {'filterType': 'PRICE_FILTER', 'tickSize': '0.10', 'minPrice': '556.80', 'maxPrice': '4529764'},
+                {'filterType': 'LOT_SIZE', 'stepSize': '0.001', 'minQty': '0.001', 'maxQty': '1000'},
+                {'filterType': 'MIN_NOTIONAL', 'notional': '100'}
+            ]
+        },
+        {
+            'symbol': 'ETHUSDT',
+            'filters': [
+                {'filterType': 'PRICE_FILTER', 'tickSize': '0.01', 'minPrice': '39.86', 'maxPrice': '306177'},
+                {'filterType': 'LOT_SIZE', 'stepSize': '0.001', 'minQty': '0.001', 'maxQty': '10000'}
+            ]
+        }
+    ]
+}
+
+
+class CountingClient:
+    """Client stand-in that counts exchange info downloads."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def futures_exchange_info(self):
+        self.calls += 1
+        return EXCHANGE_INFO
+
+
+def test_single_download():
+    """Repeated lookups are served from the index."""
+    client = CountingClient()
+    cache = ExchangeInfoCache(ttl_seconds=300, background_refresh=False)
+    
+    for _ in range(100):
+        cache.get('BTCUSDT', client)
+        cache.get('ETHUSDT', client)
+    
+    assert client.calls == 1
+    print(f"✅ 200 lookups, {client.calls} download: {cache.stats()}")
+
+
+def test_filters():
+    """Prices land on the tick grid and quantities on the lot grid."""
+    cache = ExchangeInfoCache(background_refresh=False)
+    filters = cache.get('BTCUSDT', CountingClient())
+    
+    assert filters.quantize_price(95000.17) == Decimal('95000.1')
+    assert filters.quantize_price(95000.15, ROUND_HALF_EVEN) == Decimal('95000.2')
+    assert filters.validate_quantity(0.0019) == Decimal('0.001')
+    assert filters.min_notional == Decimal('100')
+    
+    try:
+        filters.validate_quantity(0.0001)
+        raise AssertionError("quantity below minimum was accepted")
+    except ValueError:
+        pass
+    
+    assert filters.validate_quantity(0.0021, price=95000) == Decimal('0.002')
+    try:
+        filters.validate_quantity(0.001, price=95000)
+        raise AssertionError("order below minimum notional was accepted")
+    except ValueError as e:
+        assert 'notional' in str(e)
+    print("✅ Filters round and validate locally")
+
+
+def test_refresh_uses_calling_client():
+    """Reloads go through the client of the call that needs them."""
+    cache = ExchangeInfoCache(ttl_seconds=0, background_refresh=False)
+    first, second = CountingClient(), CountingClient()
+    
+    cache.get('BTCUSDT', first)
+    cache.get('BTCUSDT', second)
+    
+    assert first.calls == 1 and second.calls == 1
+    print("✅ Refresh follows the calling client")
+
+
+def test_unknown_symbol():
+    """Unknown symbols raise instead of silently passing."""
+    cache = ExchangeInfoCache(background_refresh=False)
+    try:
+        cache.get('NOPEUSDT', CountingClient())
+        raise AssertionError("unknown symbol was accepted")
+    except ValueError as e:
+        print(f"✅ Unknown symbol rejected: {e}")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Testing Exchange Info Cache")
+    print("=" * 60)
+    
+    try:
+        test_single_download()
+        test_filters()
+        test_refresh_uses_calling_client()
+        test_unknown_symbol()
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+    
+    print("=" * 60)
+    print("All exchange info tests passed ✅")
+    print("=" * 60)
@@ -1,5 +1,5 @@
 """Test Futures trading with correct parameters"""
-from binance.client import Client
+from bot.transport import create_client
 from binance.exceptions import BinanceAPIException
 import time
 
@@ -12,7 +12,7 @@ print("=" * 70)
 print("FUTURES TRADING TEST - CORRECT PARAMETERS")
 print("=" * 70)
 
-client = Client(API_KEY, API_SECRET, testnet=True)
+client = create_client(API_KEY, API_SECRET, testnet=True)
 client.API_URL = 'https://testnet.binancefuture.com'
 
 print("\n1. Getting account balance...")
@@ -1,5 +1,5 @@
 """Test Futures Testnet with new API keys"""
-from binance.client import Client
+from bot.transport import create_client
 from binance.exceptions import BinanceAPIException
 
 # Replace with your Binance Futures Testnet API credentials
@@ -13,7 +13,7 @@ print("=" * 70)
 
 print("\n1. Testing Futures Testnet Connection...")
 try:
-    client = Client(API_KEY, API_SECRET, testnet=True)
+    client = create_client(API_KEY, API_SECRET, testnet=True)
     client.API_URL = 'https://testnet.binancefuture.com'
     
     # Try to get futures account info
@@ -45,7 +45,7 @@ except Exception as e:
 
 print("\n2. Testing Price Fetch...")
 try:
-    client = Client(API_KEY, API_SECRET, testnet=True)
+    client = create_client(API_KEY, API_SECRET, testnet=True)
     client.API_URL = 'https://testnet.binancefuture.com'
     
     # Get current price
@@ -57,7 +57,7 @@ except Exception as e:
 
 print("\n3. Testing Order Placement (Market Order - VERY SMALL AMOUNT)...")
 try:
-    client = Client(API_KEY, API_SECRET, testnet=True)
+    client = create_client(API_KEY, API_SECRET, testnet=True)
     client.API_URL = 'https://testnet.binancefuture.com'
     
     # Place a very small market order
@@ -83,7 +83,7 @@ except Exception as e:
 
 print("\n4. Testing Limit Order...")
 try:
-    client = Client(API_KEY, API_SECRET, testnet=True)
+    client = create_client(API_KEY, API_SECRET, testnet=True)
     client.API_URL = 'https://testnet.binancefuture.com'
     
     # Get current price
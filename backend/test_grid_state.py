@@ -0,0 +1,150 @@
+"""
+Test script for indexed grid book-keeping in AdvancedOrderBot.
+Runs offline with a stand-in client; fills are resolved by the order watcher.
+"""
+
+import sys
+import time
+
+from bot import advanced_orders
+from bot.advanced_orders import AdvancedOrderBot, GRID_FILL_HISTORY
+from bot.exchange_info import ExchangeInfoCache
+from bot.scheduler import StrategyScheduler
+
+
+class FakeClient:
+    """Tracks open orders on one symbol; fill_all() fills all of them."""
+    
+    testnet = True
+    
+    def __init__(self, price):
+        self.price = price
+        self.open = {}
+        self.final = {}
+        self.next_id = 1
+        self.failing_creates = 0
+    
+    def _request(self, method, uri, signed, force_params=False, **kwargs):
+        raise AssertionError("unexpected REST call")
+    
+    def futures_exchange_info(self):
+        return {'symbols': [{
+            'symbol': 'BTCUSDT',
+            'filters': [
+                {'filterType': 'PRICE_FILTER', 'tickSize': '0.10', 'minPrice': '0.10', 'maxPrice': '1000000'},
+                {'filterType': 'LOT_SIZE', 'stepSize': '0.001', 'minQty': '0.001', 'maxQty': '1000'}
+            ]
+        }]}
+    
+    def futures_symbol_ticker(self, symbol):
+        return {'symbol': symbol, 'price': str(self.price)}
+    
+    def _new_order(self, side, price):
+        order_id = self.next_id
+        self.next_id += 1
+        self.open[order_id] = {'orderId': order_id, 'side': side, 'price': price, 'status': 'NEW'}
+        return {'orderId': order_id, 'status': 'NEW'}
+    
+    def futures_place_batch_order(self, batchOrders):
+        return [self._new_order(order['side'], float(order['price'])) for order in batchOrders]
+    
+    def futures_create_order(self, symbol, side, type, timeInForce, quantity, price):
+        if self.failing_creates:
+            self.failing_creates -= 1
+            raise ConnectionError("connection reset")
+        return self._new_order(side, price)
+    
+    def futures_get_open_orders(self, symbol):
+        return list(self.open.values())
+    
+    def futures_get_order(self, symbol, orderId):
+        return {'orderId': orderId, 'status': self.final[orderId]}
+    
+    def futures_cancel_all_open_orders(self, symbol):
+        self.open.clear()
+        return {'code': 200, 'msg': 'The operation of cancel all open order is done.'}
+    
+    def fill_all(self):
+        for order_id in list(self.open):
+            del self.open[order_id]
+            self.final[order_id] = 'FILLED'
+
+
+def test_state_bounded_by_levels():
+    """Thousands of fills leave one live order per level and a capped history."""
+    client = FakeClient(price=45000)
+    scheduler = StrategyScheduler(max_workers=1)
+    bot = AdvancedOrderBot(client, use_user_stream=False, scheduler=scheduler)
+    bot.exchange_info = ExchangeInfoCache(background_refresh=False)
+    bot.order_watcher.interval_seconds = 3600
+    
+    grid = bot.start_grid_trading('BTCUSDT', 44000, 46000, 10, 0.01)
+    assert grid['success'], grid
+    strategy = bot.active_strategies[grid['grid_id']]
+    sides = [slot['side'] for slot in strategy['slots']]
+    assert sides == ['BUY'] * 5 + ['SELL'] * 5, sides
+    
+    for _ in range(300):
+        client.fill_all()
+        bot.order_watcher.poll()
+    
+    assert strategy['total_trades'] == 3000
+    assert len(strategy['open_orders']) == strategy['active_orders'] == 10
+    assert len(strategy['fills']) == GRID_FILL_HISTORY
+    assert bot.order_watcher.stats()['orders'] == 10
+    assert [slot['side'] for slot in strategy['slots']] == sides
+    assert sorted(strategy['open_orders'].values()) == list(range(10))
+    
+    stop = bot.stop_grid_trading(grid['grid_id'])
+    assert stop['success'] and stop['orders_cancelled'] == 10
+    assert strategy['open_orders'] == {} and strategy['active_orders'] == 0
+    scheduler.shutdown()
+    print(f"✅ {strategy['total_trades']} fills kept {len(strategy['open_orders'])} live orders")
+
+
+def test_failed_replacement_retried():
+    """A replacement order that fails is logged, journaled and retried."""
+    client = FakeClient(price=45000)
+    scheduler = StrategyScheduler(max_workers=1)
+    bot = AdvancedOrderBot(client, use_user_stream=False, scheduler=scheduler)
+    bot.exchange_info = ExchangeInfoCache(background_refresh=False)
+    bot.order_watcher.interval_seconds = 3600
+    retry_seconds, advanced_orders.GRID_REPLACE_RETRY_SECONDS = advanced_orders.GRID_REPLACE_RETRY_SECONDS, 0.01
+    
+    try:
+        grid = bot.start_grid_trading('BTCUSDT', 44000, 46000, 10, 0.01)
+        strategy = bot.active_strategies[grid['grid_id']]
+        client.failing_creates = 3
+        client.fill_all()
+        bot.order_watcher.poll()
+        assert strategy['active_orders'] < 10
+        
+        deadline = time.monotonic() + 2
+        while strategy['active_orders'] < 10 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        advanced_orders.GRID_REPLACE_RETRY_SECONDS = retry_seconds
+    
+    assert strategy['active_orders'] == 10 and all(strategy['slots'])
+    assert len(strategy['errors']) == 3
+    assert strategy['errors'][0]['error'] == 'connection reset'
+    bot.stop_grid_trading(grid['grid_id'])
+    scheduler.shutdown()
+    print(f"✅ {len(strategy['errors'])} failed replacements retried")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Testing Grid State")
+    print("=" * 60)
+    
+    try:
+        test_state_bounded_by_levels()
+        test_failed_replacement_retried()
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+    
+    print("=" * 60)
+    print("All grid state tests passed ✅")
+    print("=" * 60)
@@ -0,0 +1,132 @@
+"""
+Test script for the queue-based logging setup.
+Runs offline; log files are written to a temporary directory.
+"""
+
+import gzip
+import logging
+import logging.handlers
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from config import settings
+from logging_config import configure_logging, shutdown_logging
+
+
+def restore_root(handlers, level):
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+def test_records_reach_file_through_queue():
+    """The root logger only enqueues; the listener thread writes the file."""
+    root = logging.getLogger()
+    saved = (list(root.handlers), root.level)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'app.log')
+        try:
+            listener = configure_logging(path, console=False, level='info')
+            assert [type(h) for h in root.handlers] == [logging.handlers.QueueHandler]
+            
+            logging.getLogger('bot.test').info("order placed")
+            logging.getLogger('bot.test').debug("not written")
+            shutdown_logging()
+            
+            with open(path, encoding='utf-8') as f:
+                content = f.read()
+            assert "bot.test - INFO - order placed" in content
+            assert "not written" not in content
+            assert listener._thread is None
+        finally:
+            shutdown_logging()
+            restore_root(*saved)
+    print("✅ Records written by the listener thread")
+
+
+def test_rotation_compresses_backups():
+    """Rolled-over files are gzipped and capped at the backup count."""
+    root = logging.getLogger()
+    saved = (list(root.handlers), root.level)
+    original = (settings.LOG_MAX_BYTES, settings.LOG_BACKUP_COUNT)
+    settings.LOG_MAX_BYTES, settings.LOG_BACKUP_COUNT = 2000, 2
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'app.log')
+        try:
+            configure_logging(path, console=False)
+            for i in range(200):
+                logging.getLogger('rotation').info(f"line {i} " + "x" * 40)
+            shutdown_logging()
+            
+            files = sorted(os.listdir(tmp))
+            assert files == ['app.log', 'app.log.1.gz', 'app.log.2.gz'], files
+            with gzip.open(os.path.join(tmp, 'app.log.1.gz'), 'rt') as f:
+                assert 'rotation - INFO - line' in f.read()
+        finally:
+            shutdown_logging()
+            restore_root(*saved)
+            settings.LOG_MAX_BYTES, settings.LOG_BACKUP_COUNT = original
+    print(f"✅ Rotation with compression: {files}")
+
+
+def test_slow_handler_does_not_block_callers():
+    """Logging returns immediately even while the file handler is stalled."""
+    root = logging.getLogger()
+    saved = (list(root.handlers), root.level)
+    gate = threading.Event()
+    
+    class StalledHandler(logging.Handler):
+        def emit(self, record):
+            gate.wait(5)
+    
+    try:
+        listener = configure_logging(None, console=False)
+        listener.handlers = (StalledHandler(),)
+        started = time.perf_counter()
+        for i in range(100):
+            logging.getLogger('hot.path').info(f"request {i}")
+        elapsed = time.perf_counter() - started
+        assert elapsed < 0.5, elapsed
+        gate.set()
+    finally:
+        gate.set()
+        shutdown_logging()
+        restore_root(*saved)
+    print("✅ Callers never wait on the handlers")
+
+
+def test_importing_app_leaves_root_logger_alone():
+    """Only the app's lifespan configures logging, not importing main."""
+    script = (
+        "import logging; before = list(logging.getLogger().handlers); import main; "
+        "assert logging.getLogger().handlers == before, logging.getLogger().handlers"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    print("✅ Importing the app does not touch logging")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Testing Logging Config")
+    print("=" * 60)
+    
+    try:
+        test_records_reach_file_through_queue()
+        test_rotation_compresses_backups()
+        test_slow_handler_does_not_block_callers()
+        test_importing_app_leaves_root_logger_alone()
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+    
+    print("=" * 60)
+    print("All logging config tests passed ✅")
+    print("=" * 60)
@@ -0,0 +1,122 @@
+"""
+Test script for the streaming market-data price cache.
+Runs offline; stream messages are fed in directly.
+"""
+
+import sys
+import time
+
+from bot.exchange_info import ExchangeInfoCache
+from bot.market_data import MarketDataService
+
+
+def make_service(**kwargs):
+    service = MarketDataService(testnet=True, **kwargs)
+    # Keep the test offline: record outgoing frames instead of connecting
+    service.sent = []
+    service._ensure_started = lambda: None
+    service.connection.send = lambda payload: service.sent.append(payload) or True
+    return service
+
+
+def test_subscribe_on_demand_and_serve():
+    """First read subscribes and misses; streamed quotes are served after."""
+    service = make_service(max_age_seconds=5)
+    
+    assert service.get_price('BTCUSDT') is None
+    assert service.sent[0]['method'] == 'SUBSCRIBE'
+    assert service.sent[0]['params'] == ['btcusdt@bookTicker', 'btcusdt@markPrice@1s']
+    
+    service._handle_message({'e': 'bookTicker', 's': 'BTCUSDT', 'b': '44999.0', 'a': '45001.0'})
+    
+    started = time.perf_counter()
+    for _ in range(10000):
+        price = service.get_price('BTCUSDT')
+    per_read = (time.perf_counter() - started) / 10000
+    
+    assert price == 45000.0
+    assert service.get_quote('BTCUSDT')['bid'] == 44999.0
+    print(f"✅ Cached read: {per_read * 1e6:.2f} µs")
+
+
+def test_staleness_and_rest_fallback():
+    """Stale prices are not served; REST results refill the cache."""
+    service = make_service(max_age_seconds=0.05)
+    service._handle_message({'e': 'markPriceUpdate', 's': 'ETHUSDT', 'p': '3000'})
+    service.get_price('ETHUSDT')
+    service._handle_message({'e': 'markPriceUpdate', 's': 'ETHUSDT', 'p': '3000'})
+    assert service.get_price('ETHUSDT') == 3000.0
+    
+    time.sleep(0.1)
+    assert service.get_price('ETHUSDT') is None
+    service.record_price('ETHUSDT', 3001.0)
+    assert service.get_price('ETHUSDT') == 3001.0
+    print(f"✅ Staleness bound honoured: {service.stats()['hits']} hits, {service.stats()['misses']} misses")
+
+
+def test_idle_unsubscribe():
+    """Symbols nobody asked about recently are unsubscribed."""
+    service = make_service(idle_seconds=0.05)
+    service.get_price('BTCUSDT')
+    time.sleep(0.1)
+    service.get_price('ETHUSDT')
+    
+    assert service.unsubscribe_idle() == 1
+    assert service.sent[-1] == {
+        'method': 'UNSUBSCRIBE',
+        'params': ['btcusdt@bookTicker', 'btcusdt@markPrice@1s'],
+        'id': service.sent[-1]['id']
+    }
+    assert service.stats()['symbols'] == 1
+    print("✅ Idle symbol unsubscribed")
+
+
+def test_only_listed_symbols_subscribed():
+    """Unlisted symbols open no stream and leave no cache entry."""
+    exchange_info = ExchangeInfoCache(background_refresh=False)
+    exchange_info.load({'symbols': [{'symbol': 'BTCUSDT', 'filters': []}]})
+    service = make_service(exchange_info=exchange_info)
+    
+    for made_up in ('AAAUSDT', 'BBBUSDT'):
+        assert service.get_price(made_up) is None
+        service.record_price(made_up, 1.0)
+    assert service.sent == [] and service.stats()['symbols'] == 0
+    
+    service.get_price('BTCUSDT')
+    assert service.sent[0]['params'][0] == 'btcusdt@bookTicker'
+    print("✅ Unlisted symbols never subscribed")
+
+
+def test_subscription_cap_evicts_least_recent():
+    """Past the cap, the least recently requested symbol is dropped."""
+    service = make_service(max_symbols=2)
+    service.get_price('BTCUSDT')
+    service.get_price('ETHUSDT')
+    service.get_price('BTCUSDT')
+    service.get_price('BNBUSDT')
+    
+    assert service.stats()['symbols'] == 2
+    assert service.sent[-2]['method'] == 'UNSUBSCRIBE'
+    assert service.sent[-2]['params'] == ['ethusdt@bookTicker', 'ethusdt@markPrice@1s']
+    assert service.sent[-1]['params'][0] == 'bnbusdt@bookTicker'
+    print("✅ Subscriptions capped")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Testing Market Data Cache")
+    print("=" * 60)
+    
+    try:
+        test_subscribe_on_demand_and_serve()
+        test_staleness_and_rest_fallback()
+        test_idle_unsubscribe()
+        test_only_listed_symbols_subscribed()
+        test_subscription_cap_evicts_least_recent()
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+    
+    print("=" * 60)
+    print("All market data tests passed ✅")
+    print("=" * 60)
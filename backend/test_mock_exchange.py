@@ -0,0 +1,145 @@
+"""
+Test script for the mock exchange.
+Starts the mock on a local port and drives BasicBot and AdvancedOrderBot
+against it; no internet access is needed.
+"""
+
+import socket
+import sys
+import threading
+import time
+
+import requests
+import uvicorn
+
+from config import settings
+from mock_exchange import MatchingEngine, create_app
+from mock_exchange.engine import ExchangeError
+
+
+def start_mock_exchange():
+    """Run the mock on a free port and point the bots at it."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    
+    engine = MatchingEngine(seed=1)
+    server = uvicorn.Server(uvicorn.Config(
+        create_app(engine, tick_seconds=0),
+        host='127.0.0.1',
+        port=port,
+        log_level='warning'
+    ))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    
+    base_url = f"http://127.0.0.1:{port}"
+    settings.BINANCE_API_URL = base_url
+    settings.BINANCE_WS_URL = f"ws://127.0.0.1:{port}"
+    return engine, base_url
+
+
+def test_price_time_priority():
+    """Equal-priced orders fill oldest first; better prices fill before worse."""
+    engine = MatchingEngine(seed=1)
+    order = {'symbol': 'BTCUSDT', 'side': 'SELL', 'type': 'LIMIT', 'timeInForce': 'GTC', 'quantity': '0.01'}
+    first = engine.place_order('maker', dict(order, price='45100'))
+    second = engine.place_order('maker', dict(order, price='45100'))
+    better = engine.place_order('maker', dict(order, price='45050'))
+    
+    taker = engine.place_order('taker', {
+        'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'LIMIT', 'timeInForce': 'IOC',
+        'quantity': '0.02', 'price': '45100'
+    })
+    
+    status = {o['orderId']: o['status'] for o in engine.open_orders('maker', 'BTCUSDT')}
+    assert better['orderId'] not in status and first['orderId'] not in status
+    assert status == {second['orderId']: 'NEW'}
+    assert taker['status'] == 'FILLED' and taker['avgPrice'] == '45075'
+    
+    try:
+        engine.place_order('taker', dict(order, price='45100.05'))
+        raise AssertionError("off-tick price accepted")
+    except ExchangeError as e:
+        assert e.code == -4014
+    print("✅ Price-time priority and filters enforced")
+
+
+def test_bots_against_mock():
+    """BasicBot and AdvancedOrderBot trade against the mock over HTTP."""
+    from bot.advanced_orders import AdvancedOrderBot
+    from bot.basic_bot import BasicBot
+    
+    saved = settings.BINANCE_API_URL, settings.BINANCE_WS_URL
+    engine, base_url = start_mock_exchange()
+    try:
+        bot = BasicBot('mock-key', 'mock-secret', testnet=True)
+        
+        balance = bot.get_account_balance()
+        assert float(balance['total_wallet_balance']) == 10000
+        
+        market = bot.place_market_order('BTCUSDT', 'BUY', 0.01)
+        assert market['success'] and market['status'] == 'FILLED', market
+        
+        limit = bot.place_limit_order('BTCUSDT', 'BUY', 0.01, 44000)
+        assert limit['success'] and limit['status'] == 'NEW', limit
+        assert bot.get_open_orders('BTCUSDT')['count'] == 1
+        
+        # Market trades down through the bid
+        requests.post(f"{base_url}/mock/price", json={'symbol': 'BTCUSDT', 'price': 43990})
+        assert bot.get_order_status('BTCUSDT', limit['order_id'])['status'] == 'FILLED'
+        
+        advanced = AdvancedOrderBot(bot.client)
+        grid = advanced.start_grid_trading('BTCUSDT', 43000, 45000, 4, 0.04)
+        assert grid['success'], grid
+        strategy = advanced.active_strategies[grid['grid_id']]
+        placed = strategy['active_orders']
+        assert placed >= 4
+        
+        # Wait for the user stream, then fill the lowest buy level
+        stream = advanced._get_user_stream()
+        deadline = time.monotonic() + 5
+        while not stream.is_healthy() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert stream.is_healthy()
+        
+        requests.post(f"{base_url}/mock/price", json={'symbol': 'BTCUSDT', 'price': 43400})
+        deadline = time.monotonic() + 5
+        while (strategy['total_trades'] == 0 or strategy['active_orders'] < placed) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert strategy['total_trades'] >= 1
+        assert strategy['active_orders'] == placed
+        
+        # Market data arrives over the market stream
+        bot.market_data.get_price('ETHUSDT')
+        deadline = time.monotonic() + 5
+        while bot.market_data.get_price('ETHUSDT') != 3100.0 and time.monotonic() < deadline:
+            requests.post(f"{base_url}/mock/price", json={'symbol': 'ETHUSDT', 'price': 3100})
+            time.sleep(0.1)
+        assert bot.market_data.get_price('ETHUSDT') == 3100.0
+        
+        stop = advanced.stop_grid_trading(grid['grid_id'])
+        assert stop['success'] and stop['orders_cancelled'] == placed, stop
+        assert engine.open_orders('mock-key', 'BTCUSDT') == []
+    finally:
+        # Later tests must not talk to the mock
+        settings.BINANCE_API_URL, settings.BINANCE_WS_URL = saved
+    print(f"✅ Bots traded against the mock ({engine.fills} fills)")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Testing Mock Exchange")
+    print("=" * 60)
+    
+    try:
+        test_price_time_priority()
+        test_bots_against_mock()
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+    
+    print("=" * 60)
+    print("All mock exchange tests passed ✅")
+    print("=" * 60)
@@ -0,0 +1,97 @@
+"""
+Test script for note full-text search.
+Runs offline against an in-memory SQLite database with FTS5.
+"""
+
+import sys
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from database import Base
+from models import Note, User
+from note_search import SEARCH_FTS5, install_search
+from routes.notes import get_notes
+
+
+def make_db():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    user = User(email="alice@example.com", username="alice", hashed_password="x")
+    other = User(email="bob@example.com", username="bob", hashed_password="x")
+    db.add_all([user, other])
+    db.flush()
+    db.add_all([
+        Note(user_id=user.id, title="Weekly review", content="Bitcoin broke resistance, took profit", tags="btc,review"),
+        Note(user_id=user.id, title="Bitcoin grid setup", content="Grid between 60k and 70k", tags="btc,grid"),
+        Note(user_id=user.id, title="Ethereum", content="Waiting for a pullback", tags="eth"),
+        Note(user_id=other.id, title="Bitcoin notes", content="Not Alice's", tags="btc"),
+    ])
+    db.commit()
+    return engine, db, user
+
+
+def search(db, user, term):
+    return [note.title for note in get_notes(
+        skip=0, limit=100, search=term, tag=None, pinned_only=False, current_user=user, db=db
+    )]
+
+
+def test_ranked_prefix_search():
+    """Title matches rank first and partial words match."""
+    engine, db, user = make_db()
+    assert install_search(engine) == SEARCH_FTS5
+    
+    assert search(db, user, "bitc") == ["Bitcoin grid setup", "Weekly review"]
+    assert search(db, user, "grid 60k") == ["Bitcoin grid setup"]
+    assert search(db, user, 'eth"(*') == ["Ethereum"]
+    print("✅ Ranked prefix search")
+
+
+def test_index_follows_writes():
+    """Creates, updates and deletes are reflected immediately."""
+    engine, db, user = make_db()
+    install_search(engine)
+    
+    note = db.query(Note).filter(Note.title == "Ethereum").one()
+    note.content = "Solana looks stronger"
+    db.commit()
+    assert search(db, user, "pullback") == []
+    assert search(db, user, "solana") == ["Ethereum"]
+    
+    db.delete(note)
+    db.add(Note(user_id=user.id, title="Solana entry", content=None, tags=None))
+    db.commit()
+    assert search(db, user, "solana") == ["Solana entry"]
+    print("✅ Index kept in sync on create, update and delete")
+
+
+def test_existing_notes_indexed_and_fallback():
+    """Notes written before install are indexed; no index means ILIKE."""
+    engine, db, user = make_db()
+    assert search(db, user, "pullback") == ["Ethereum"]
+    
+    install_search(engine)
+    assert search(db, user, "pullback") == ["Ethereum"]
+    assert install_search(engine) == SEARCH_FTS5
+    print("✅ Backfill on install and ILIKE fallback")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Testing Note Search")
+    print("=" * 60)
+    
+    try:
+        test_ranked_prefix_search()
+        test_index_follows_writes()
+        test_existing_notes_indexed_and_fallback()
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+    
+    print("=" * 60)
+    print("All note search tests passed ✅")
+    print("=" * 60)
@@ -0,0 +1,91 @@
+"""
+Test script for normalised note tags.
+Runs offline against an in-memory SQLite database.
+"""
+
+import sys
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models import Note, NoteTag, User
+from note_tags import backfill_tags, parse_tags
+from routes.notes import create_note, get_notes, get_tag_cloud, update_note
+from schemas import NoteCreate, NoteUpdate
+
+
+def make_db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    user = User(email="alice@example.com", username="alice", hashed_password="x")
+    db.add(user)
+    db.commit()
+    return db, user
+
+
+def titles(db, user, tag):
+    return sorted(note.title for note in get_notes(
+        skip=0, limit=100, search=None, tag=tag, pinned_only=False, current_user=user, db=db
+    ))
+
+
+def test_parse_tags():
+    """Tags are trimmed, lower-cased and de-duplicated."""
+    assert parse_tags(" BTC, eth,,btc ") == ["btc", "eth"]
+    assert parse_tags(None) == []
+    print("✅ Tags parsed")
+
+
+def test_exact_filter_and_cloud():
+    """The tag filter is exact and the cloud counts notes per tag."""
+    db, user = make_db()
+    create_note(NoteCreate(title="A", tags="eth, btc"), current_user=user, db=db)
+    create_note(NoteCreate(title="B", tags="ethusdt"), current_user=user, db=db)
+    created = create_note(NoteCreate(title="C", tags="ETH"), current_user=user, db=db)
+    
+    assert titles(db, user, "eth") == ["A", "C"]
+    assert titles(db, user, "Ethusdt") == ["B"]
+    
+    update_note(created.id, NoteUpdate(tags="btc"), current_user=user, db=db)
+    assert titles(db, user, "eth") == ["A"]
+    assert get_tag_cloud(current_user=user, db=db) == [
+        {'tag': 'btc', 'count': 2}, {'tag': 'eth', 'count': 1}, {'tag': 'ethusdt', 'count': 1}
+    ]
+    assert created.tags == "btc"
+    print("✅ Exact tag filter and tag cloud")
+
+
+def test_backfill_existing_notes():
+    """Notes saved with only the comma-separated column get tag rows."""
+    db, user = make_db()
+    db.add_all([
+        Note(user_id=user.id, title=f"Old {i}", tags="swing, btc" if i % 2 else "scalp")
+        for i in range(7)
+    ] + [Note(user_id=user.id, title="Empty", tags=" , ")])
+    db.commit()
+    
+    assert backfill_tags(db, batch_size=3) == 8
+    assert backfill_tags(db) == 1  # only the note without usable tags is seen again
+    assert db.query(NoteTag).count() == 3 * 2 + 4
+    assert titles(db, user, "scalp") == ["Old 0", "Old 2", "Old 4", "Old 6"]
+    print("✅ Existing tags backfilled")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Testing Note Tags")
+    print("=" * 60)
+    
+    try:
+        test_parse_tags()
+        test_exact_filter_and_cloud()
+        test_backfill_existing_notes()
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+    
+    print("=" * 60)
+    print("All note tag tests passed ✅")
+    print("=" * 60)
@@ -0,0 +1,117 @@
+"""
+Test script for the consolidated open-orders poller.
+Runs offline with a stand-in client.
+"""
+
+import sys
+import time
+
+from bot.advanced_orders import AdvancedOrderBot
+from bot.order_watcher import OrderWatcher
+from bot.scheduler import StrategyScheduler
+
+
+class FakeClient:
+    """Holds open orders per symbol and counts REST calls."""
+    
+    testnet = True
+    
+    def __init__(self):
+        self.open = {}
+        self.final = {}
+        self.calls = []
+    
+    def _request(self, method, uri, signed, force_params=False, **kwargs):
+        raise AssertionError("unexpected REST call")
+    
+    def add(self, symbol, order_id):
+        self.open.setdefault(symbol, {})[order_id] = 'NEW'
+    
+    def fill(self, symbol, order_id):
+        del self.open[symbol][order_id]
+        self.final[order_id] = 'FILLED'
+    
+    def futures_get_open_orders(self, symbol):
+        self.calls.append(('openOrders', symbol))
+        return [{'orderId': i, 'status': s} for i, s in self.open.get(symbol, {}).items()]
+    
+    def futures_get_order(self, symbol, orderId):
+        self.calls.append(('order', orderId))
+        return {'orderId': orderId, 'status': self.final.get(orderId, 'NEW')}
+    
+    def futures_cancel_order(self, symbol, orderId):
+        self.calls.append(('cancel', orderId))
+        self.open[symbol].pop(orderId, None)
+        self.final[orderId] = 'CANCELED'
+        return {'orderId': orderId, 'status': 'CANCELED'}
+
+
+def test_one_request_per_symbol():
+    """A tick costs one call per symbol plus one per departed order."""
+    client = FakeClient()
+    watcher = OrderWatcher(client, interval_seconds=60, scheduler=StrategyScheduler(max_workers=1))
+    updates = []
+    
+    for symbol in ('BTCUSDT', 'ETHUSDT', 'BNBUSDT'):
+        for i in range(20):
+            order_id = hash((symbol, i)) & 0xFFFFFF
+            client.add(symbol, order_id)
+            watcher.watch(symbol, order_id, updates.append)
+    
+    watcher.poll()
+    assert len(client.calls) == 3, client.calls
+    assert len(updates) == 60 and all(u['status'] == 'NEW' for u in updates)
+    
+    # Unchanged orders are not reported again
+    client.calls.clear()
+    updates.clear()
+    filled = next(iter(client.open['ETHUSDT']))
+    client.fill('ETHUSDT', filled)
+    watcher.poll()
+    
+    assert client.calls.count(('order', filled)) == 1
+    assert len(client.calls) == 4, client.calls
+    assert updates == [{'symbol': 'ETHUSDT', 'order_id': filled, 'status': 'FILLED'}]
+    assert watcher.stats()['orders'] == 59
+    watcher.scheduler.shutdown()
+    print(f"✅ 60 orders on 3 symbols polled with {len(client.calls)} requests")
+
+
+def test_oco_resolved_without_stream():
+    """With no user-data stream the OCO is settled through the watcher."""
+    client = FakeClient()
+    client.add('BTCUSDT', 1)
+    client.add('BTCUSDT', 2)
+    bot = AdvancedOrderBot(client, use_user_stream=False, scheduler=StrategyScheduler(max_workers=2))
+    bot.order_watcher.interval_seconds = 0.02
+    bot.active_strategies['OCO_1'] = {'type': 'OCO', 'symbol': 'BTCUSDT'}
+    
+    bot._monitor_oco_orders('OCO_1', 'BTCUSDT', 1, 2)
+    client.fill('BTCUSDT', 1)
+    
+    deadline = time.monotonic() + 2
+    while 'status' not in bot.active_strategies['OCO_1'] and time.monotonic() < deadline:
+        time.sleep(0.005)
+    
+    assert ('cancel', 2) in client.calls
+    assert bot.active_strategies['OCO_1']['status'] == 'completed'
+    assert bot.order_watcher.stats()['orders'] == 0
+    bot.scheduler.shutdown()
+    print("✅ OCO settled by the order watcher")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Testing Order Watcher")
+    print("=" * 60)
+    
+    try:
+        test_one_request_per_symbol()
+        test_oco_resolved_without_stream()
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+    
+    print("=" * 60)
+    print("All order watcher tests passed ✅")
+    print("=" * 60)
@@ -0,0 +1,126 @@
+"""
+Test script for keyset pagination of trade history.
+Runs offline against an in-memory SQLite database.
+"""
+
+import sys
+
+from fastapi import HTTPException, Response
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models import OrderSide, OrderStatus, OrderType, Trade, User
+from pagination import decode_cursor, encode_cursor
+from routes.trading import get_trades
+
+
+def make_db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+
+def seed(db, count):
+    """Trades inserted in one statement share a server-side created_at."""
+    user = User(email="alice@example.com", username="alice", hashed_password="x")
+    other = User(email="bob@example.com", username="bob", hashed_password="x")
+    db.add_all([user, other])
+    db.flush()
+    for i in range(count):
+        db.add(Trade(
+            user_id=user.id, symbol="BTCUSDT" if i % 2 else "ETHUSDT", side=OrderSide.BUY,
+            order_type=OrderType.MARKET, quantity=0.01,
+            status=OrderStatus.FILLED if i % 3 else OrderStatus.PENDING
+        ))
+    db.add(Trade(user_id=other.id, symbol="BTCUSDT", side=OrderSide.BUY, order_type=OrderType.MARKET, quantity=1))
+    db.commit()
+    return user
+
+
+def fetch_all(db, user, limit, **filters):
+    pages, cursor, seen = 0, None, []
+    while True:
+        response = Response()
+        rows = get_trades(
+            response=response, skip=0, limit=limit, cursor=cursor,
+            symbol=filters.get('symbol'), status=filters.get('status'), current_user=user, db=db
+        )
+        pages += 1
+        seen.extend(trade.id for trade in rows)
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return seen, pages
+
+
+def test_cursor_round_trip():
+    """Cursors are opaque and decode to the same key."""
+    created_at, row_id = decode_cursor(encode_cursor(None, 42))
+    assert (created_at, row_id) == (None, 42)
+    print("✅ Cursor round trip")
+
+
+def test_pages_cover_every_trade_once():
+    """Walking the cursors returns every trade once, newest first."""
+    db = make_db()
+    user = seed(db, 25)
+    seen, pages = fetch_all(db, user, limit=10)
+    
+    expected = [t.id for t in db.query(Trade).filter(Trade.user_id == user.id)
+                .order_by(Trade.created_at.desc(), Trade.id.desc())]
+    assert seen == expected, seen
+    assert pages == 3
+    print(f"✅ {len(seen)} trades in {pages} pages, ties broken by id")
+
+
+def test_filters_and_deleted_anchor():
+    """Filters apply on every page and a deleted cursor row still resumes."""
+    db = make_db()
+    user = seed(db, 30)
+    seen, _ = fetch_all(db, user, limit=4, symbol="btcusdt", status=OrderStatus.FILLED)
+    expected = [t.id for t in db.query(Trade).filter(
+        Trade.user_id == user.id, Trade.symbol == "BTCUSDT", Trade.status == OrderStatus.FILLED
+    ).order_by(Trade.created_at.desc(), Trade.id.desc())]
+    assert seen == expected, seen
+    
+    response = Response()
+    first = get_trades(response=response, skip=0, limit=5, cursor=None, symbol=None, status=None, current_user=user, db=db)
+    cursor = response.headers["X-Next-Cursor"]
+    db.delete(first[-1])
+    db.commit()
+    rest = get_trades(response=Response(), skip=0, limit=100, cursor=cursor, symbol=None, status=None, current_user=user, db=db)
+    # The cursor's own timestamp takes over; nothing older may be skipped
+    older = {t.id for t in db.query(Trade).filter(Trade.user_id == user.id, Trade.id < first[-1].id)}
+    assert older <= {t.id for t in rest}
+    print("✅ Filters and deleted cursor rows handled")
+
+
+def test_invalid_cursor():
+    """A malformed cursor is a 400."""
+    db = make_db()
+    user = seed(db, 1)
+    try:
+        get_trades(response=Response(), skip=0, limit=10, cursor="not-a-cursor", symbol=None, status=None, current_user=user, db=db)
+        raise AssertionError("invalid cursor accepted")
+    except HTTPException as e:
+        assert e.status_code == 400
+    print("✅ Invalid cursor rejected")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Testing Trade Pagination")
+    print("=" * 60)
+    
+    try:
+        test_cursor_round_trip()
+        test_pages_cover_every_trade_once()
+        test_filters_and_deleted_anchor()
+        test_invalid_cursor()
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+    
+    print("=" * 60)
+    print("All pagination tests passed ✅")
+    print("=" * 60)
@@ -0,0 +1,92 @@
+"""
+Test script for the password hashing pool.
+Runs offline; hashes are computed in a spawned worker process.
+"""
+
+import asyncio
+import sys
+import time
+
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from database import Base
+from models import User
+from password_pool import HashingBusy, PasswordHasher, _hash, password_hasher
+from routes.auth import login
+
+
+def test_hash_verify_and_rehash():
+    """Hashes verify, and an old cost yields a replacement hash."""
+    hasher = PasswordHasher(workers=1, max_pending=4, rounds=4)
+    try:
+        hashed = asyncio.run(hasher.hash("s3cret"))
+        assert hashed.startswith("$2b$04$")
+        assert asyncio.run(hasher.verify("s3cret", hashed)) == (True, None)
+        assert asyncio.run(hasher.verify("wrong", hashed))[0] is False
+        
+        hasher.rounds = 5
+        matches, new_hash = asyncio.run(hasher.verify("s3cret", hashed))
+        assert matches and new_hash.startswith("$2b$05$")
+        assert hasher.stats()['rehashed'] == 1
+    finally:
+        hasher.shutdown()
+    print("✅ Hash, verify and rehash on cost change")
+
+
+def test_admission_limit():
+    """Work beyond max_pending is refused immediately."""
+    hasher = PasswordHasher(workers=1, max_pending=1, rounds=4)
+    try:
+        running = hasher._submit(time.sleep, 0.5)
+        started = time.monotonic()
+        try:
+            hasher.hash_blocking("s3cret")
+            raise AssertionError("hash admitted past max_pending")
+        except HashingBusy:
+            pass
+        assert time.monotonic() - started < 0.1
+        running.result()
+        assert hasher.hash_blocking("s3cret").startswith("$2b$04$")
+        assert hasher.stats()['rejected'] == 1 and hasher.stats()['pending'] == 0
+    finally:
+        hasher.shutdown()
+    print("✅ Admission limit enforced")
+
+
+def test_login_upgrades_hash():
+    """Logging in with an outdated hash stores one at the configured cost."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    db.add(User(email="alice@example.com", username="alice", hashed_password=_hash("s3cret", 4)))
+    db.commit()
+    
+    try:
+        token = asyncio.run(login(form_data=OAuth2PasswordRequestForm(username="alice", password="s3cret"), db=db))
+        stored = db.query(User).one().hashed_password
+        assert token["access_token"]
+        assert stored.startswith(f"$2b${password_hasher.rounds:02d}$"), stored
+    finally:
+        password_hasher.shutdown()
+    print("✅ Login upgrades outdated hashes")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Testing Password Pool")
+    print("=" * 60)
+    
+    try:
+        test_hash_verify_and_rehash()
+        test_admission_limit()
+        test_login_upgrades_hash()
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+    
+    print("=" * 60)
+    print("All password pool tests passed ✅")
+    print("=" * 60)
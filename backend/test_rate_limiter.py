@@ -0,0 +1,166 @@
+"""
+Test script for the request-weight rate limiter.
+Runs offline; no exchange calls are made.
+"""
+
+import sys
+import threading
+import time
+
+from bot import rate_limiter
+from bot.rate_limiter import (
+    PRIORITY_CANCEL,
+    PRIORITY_ORDER,
+    PRIORITY_QUERY,
+    RateLimitExceeded,
+    RateLimitGovernor,
+    classify_request,
+)
+from bot.transport import install_layer
+
+BASE = 'https://testnet.binancefuture.com/fapi/v1/'
+
+
+def test_classify_request():
+    """Weights, order counts and priorities follow the endpoint."""
+    cancel = classify_request('delete', BASE + 'order', {'symbol': 'BTCUSDT'})
+    order = classify_request('post', BASE + 'order', {'symbol': 'BTCUSDT'})
+    poll = classify_request('get', BASE + 'order', {'symbol': 'BTCUSDT'})
+    all_open = classify_request('get', BASE + 'openOrders', {})
+    
+    assert cancel.priority == PRIORITY_CANCEL and cancel.orders == 0
+    assert order.priority == PRIORITY_ORDER and order.orders == 1
+    assert poll.priority == PRIORITY_QUERY and poll.weight == 1
+    assert all_open.weight == 40
+    assert order.host == 'testnet.binancefuture.com'
+    print("✅ Requests classified")
+
+
+def test_priority_when_weight_is_scarce():
+    """Status polls stand aside while cancels wait for weight."""
+    governor = RateLimitGovernor(weight_per_minute=60, query_reserve=0.0, max_wait_seconds=5)
+    host_cost = classify_request('get', BASE + 'order', {'symbol': 'BTCUSDT'})
+    
+    # Drain the bucket
+    governor.update_from_headers(host_cost.host, 'key', {'X-MBX-USED-WEIGHT-1M': '60'})
+    
+    admitted = []
+    
+    def run(method):
+        cost = classify_request(method, BASE + 'order', {'symbol': 'BTCUSDT'})
+        governor.acquire(cost, 'key')
+        admitted.append(method)
+    
+    poll = threading.Thread(target=run, args=('get',))
+    cancel = threading.Thread(target=run, args=('delete',))
+    cancel.start()
+    time.sleep(0.05)
+    poll.start()
+    cancel.join()
+    poll.join()
+    
+    assert admitted == ['delete', 'get'], admitted
+    print(f"✅ Admission order under pressure: {admitted}")
+
+
+def test_order_limits_and_rejection():
+    """Per-key order counts are enforced and long waits are rejected."""
+    governor = RateLimitGovernor(orders_per_10s=2, max_wait_seconds=0.2)
+    cost = classify_request('post', BASE + 'order', {'symbol': 'BTCUSDT'})
+    
+    governor.acquire(cost, 'key-a')
+    governor.acquire(cost, 'key-a')
+    governor.acquire(cost, 'key-b')
+    
+    try:
+        governor.acquire(cost, 'key-a')
+        raise AssertionError("third order within 10s was admitted")
+    except RateLimitExceeded:
+        pass
+    
+    snapshot = governor.snapshot()
+    assert snapshot['rejected'] == 1
+    print(f"✅ Order limits: {snapshot['api_keys']}")
+
+
+def test_penalize_pauses_host():
+    """A 429 pauses further requests to that host."""
+    governor = RateLimitGovernor(max_wait_seconds=0.1)
+    cost = classify_request('get', BASE + 'time', {})
+    
+    governor.penalize(cost.host, 429, retry_after=5)
+    try:
+        governor.acquire(cost, 'key')
+        raise AssertionError("request admitted during back-off")
+    except RateLimitExceeded:
+        pass
+    assert governor.snapshot()['hosts'][cost.host]['paused_for_seconds'] > 0
+    print("✅ 429 back-off honoured")
+
+
+class FakeResponse:
+    def __init__(self, used_weight):
+        self.headers = {'X-MBX-USED-WEIGHT-1M': str(used_weight)}
+
+
+class RacingClient:
+    """
+    Mimics python-binance's _request, but another call overwrites the shared
+    client.response before this one returns.
+    """
+    
+    API_KEY = 'key'
+    
+    def __init__(self):
+        self.response = FakeResponse(2000)
+    
+    def _handle_response(self, response):
+        return {'ok': True}
+    
+    def _request(self, method, uri, signed, force_params=False, **kwargs):
+        if 'unreachable' in uri:
+            raise ConnectionError("connection refused")
+        own = FakeResponse(100)
+        result = self._handle_response(own)
+        self.response = FakeResponse(2000)
+        return result
+
+
+def test_resync_uses_own_response():
+    """Buckets resync from this call's response, and not at all without one."""
+    client = RacingClient()
+    install_layer(client, 'rate_limit', rate_limiter.wrap_sync, rate_limiter.wrap_async)
+    
+    limit = rate_limiter.governor.weight_per_minute
+    client._request('get', 'https://race.example/fapi/v1/time', False)
+    hosts = rate_limiter.governor.snapshot()['hosts']
+    assert hosts['race.example']['weight_available'] >= limit - 100 - 1, hosts['race.example']
+    
+    try:
+        client._request('get', 'https://unreachable.example/fapi/v1/time', False)
+        raise AssertionError("connection error swallowed")
+    except ConnectionError:
+        pass
+    hosts = rate_limiter.governor.snapshot()['hosts']
+    assert hosts['unreachable.example']['weight_available'] >= limit - 2, hosts['unreachable.example']
+    print("✅ Resync reads only the call's own response")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Testing Rate Limiter")
+    print("=" * 60)
+    
+    try:
+        test_classify_request()
+        test_priority_when_weight_is_scarce()
+        test_order_limits_and_rejection()
+        test_penalize_pauses_host()
+        test_resync_uses_own_response()
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+    
+    print("=" * 60)
+    print("All rate limiter tests passed ✅")
+    print("=" * 60)
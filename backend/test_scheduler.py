@@ -0,0 +1,111 @@
+"""
+Test script for the shared strategy scheduler.
+Runs offline; no exchange calls are made.
+"""
+
+import sys
+import threading
+import time
+
+from bot.scheduler import StrategyScheduler
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+
+def test_wakeups_run_in_time_order():
+    """Callbacks run in deadline order, not submission order."""
+    scheduler = StrategyScheduler(max_workers=1)
+    ran = []
+    
+    scheduler.call_later(0.15, ran.append, 'late')
+    scheduler.call_later(0.05, ran.append, 'early')
+    scheduler.submit(ran.append, 'now')
+    
+    assert wait_for(lambda: len(ran) == 3)
+    assert ran == ['now', 'early', 'late'], ran
+    scheduler.shutdown()
+    print(f"✅ Wakeup order: {ran}")
+
+
+def test_cancel_owner_and_repeat():
+    """Cancelling an owner stops its repeating and pending tasks only."""
+    scheduler = StrategyScheduler(max_workers=2)
+    ticks = {'a': 0, 'b': 0}
+    
+    def tick(name):
+        ticks[name] += 1
+    
+    scheduler.call_every(0.02, tick, 'a', owner='A')
+    scheduler.call_every(0.02, tick, 'b', owner='B')
+    scheduler.call_later(10, tick, 'a', owner='A')
+    assert wait_for(lambda: ticks['a'] >= 3 and ticks['b'] >= 3)
+    
+    assert scheduler.cancel_owner('A') == 2
+    stopped_at = ticks['a']
+    time.sleep(0.1)
+    assert ticks['a'] <= stopped_at + 1
+    assert ticks['b'] > stopped_at
+    assert scheduler.stats()['strategies'] == 1
+    scheduler.shutdown()
+    print(f"✅ Owner cancellation: {ticks}")
+
+
+def test_deadline_expires_owner():
+    """A passed deadline cancels the owner's tasks and reports it."""
+    scheduler = StrategyScheduler(max_workers=2)
+    expired = threading.Event()
+    ran = []
+    
+    scheduler.call_later(0.3, ran.append, 'too late', owner='TWAP')
+    scheduler.set_deadline('TWAP', 0.05, lambda owner: expired.set())
+    
+    assert expired.wait(1)
+    time.sleep(0.35)
+    assert ran == []
+    assert scheduler.stats()['expired'] == 1
+    assert scheduler.stats()['pending_wakeups'] == 0
+    scheduler.shutdown()
+    print("✅ Deadline expiry")
+
+
+def test_many_strategies_share_bounded_pool():
+    """Hundreds of waiting strategies need no thread of their own."""
+    scheduler = StrategyScheduler(max_workers=4)
+    done = []
+    baseline = threading.active_count()
+    
+    for i in range(500):
+        scheduler.call_later(0.05 + (i % 10) * 0.01, done.append, i, owner=f"S{i}")
+    
+    assert threading.active_count() <= baseline + 1
+    assert scheduler.stats()['pending_wakeups'] == 500
+    assert wait_for(lambda: len(done) == 500)
+    assert threading.active_count() <= baseline + 5
+    assert scheduler.stats()['strategies'] == 0
+    assert scheduler.stats()['pending_wakeups'] == 0
+    scheduler.shutdown()
+    print(f"✅ 500 strategies on {threading.active_count() - baseline} extra threads")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Testing Strategy Scheduler")
+    print("=" * 60)
+    
+    try:
+        test_wakeups_run_in_time_order()
+        test_cancel_owner_and_repeat()
+        test_deadline_expires_owner()
+        test_many_strategies_share_bounded_pool()
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+    
+    print("=" * 60)
+    print("All scheduler tests passed ✅")
+    print("=" * 60)
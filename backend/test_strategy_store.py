@@ -0,0 +1,254 @@
+"""
+Test script for the durable strategy store and crash recovery.
+Runs offline with a stand-in client and a temporary SQLite file.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from bot import advanced_orders
+from bot.advanced_orders import AdvancedOrderBot, account_id, recover_all
+from bot.exchange_info import ExchangeInfoCache
+from bot.scheduler import StrategyScheduler
+from bot.strategy_store import StrategyStore
+
+SYMBOLS = ['BTCUSDT', 'ETHUSDT', 'BNBUSDT', 'SOLUSDT', 'XRPUSDT']
+
+
+class FakeClient:
+    """Open orders per symbol; survives the bot that placed them."""
+    
+    testnet = True
+    API_KEY = 'recovery-key'
+    
+    def __init__(self):
+        self.open = {symbol: {} for symbol in SYMBOLS}
+        self.final = {}
+        self.next_id = 1
+        self.calls = []
+    
+    def _request(self, method, uri, signed, force_params=False, **kwargs):
+        raise AssertionError("unexpected REST call")
+    
+    def futures_exchange_info(self):
+        return {'symbols': [
+            {
+                'symbol': symbol,
+                'filters': [
+                    {'filterType': 'PRICE_FILTER', 'tickSize': '0.01', 'minPrice': '0.01', 'maxPrice': '1000000'},
+                    {'filterType': 'LOT_SIZE', 'stepSize': '0.001', 'minQty': '0.001', 'maxQty': '1000'}
+                ]
+            }
+            for symbol in SYMBOLS
+        ]}
+    
+    def futures_symbol_ticker(self, symbol):
+        return {'symbol': symbol, 'price': '100'}
+    
+    def _new_order(self, symbol, side):
+        order_id = self.next_id
+        self.next_id += 1
+        self.open[symbol][order_id] = {'orderId': order_id, 'side': side, 'status': 'NEW'}
+        return {'orderId': order_id, 'status': 'NEW'}
+    
+    def futures_place_batch_order(self, batchOrders):
+        return [self._new_order(order['symbol'], order['side']) for order in batchOrders]
+    
+    def futures_create_order(self, symbol, side, type, timeInForce, quantity, price):
+        self.calls.append(('create', symbol))
+        return self._new_order(symbol, side)
+    
+    def futures_get_open_orders(self, symbol):
+        self.calls.append(('openOrders', symbol))
+        return list(self.open[symbol].values())
+    
+    def futures_get_order(self, symbol, orderId):
+        self.calls.append(('order', orderId))
+        return {'orderId': orderId, 'status': self.final[orderId]}
+    
+    def fill(self, symbol, order_id):
+        del self.open[symbol][order_id]
+        self.final[order_id] = 'FILLED'
+
+
+def make_bot(client, store):
+    bot = AdvancedOrderBot(client, use_user_stream=False, scheduler=StrategyScheduler(max_workers=2), store=store)
+    bot.exchange_info = ExchangeInfoCache(background_refresh=False)
+    bot.order_watcher.interval_seconds = 3600
+    return bot
+
+
+def test_journal_replay_and_snapshot():
+    """State rebuilt from the journal matches state rebuilt after a snapshot."""
+    store = StrategyStore(':memory:')
+    store.record('acct', 'GRID_1', 'create', {'status': 'active', 'slots': [None, None], 'fills': []})
+    store.record('acct', 'GRID_1', 'set_item', {'key': 'slots', 'index': 1, 'value': {'order_id': 7}})
+    for i in range(5):
+        store.record('acct', 'GRID_1', 'append', {'key': 'fills', 'value': i, 'maxlen': 3})
+    store.record('acct', 'OCO_1', 'create', {'status': 'active'})
+    store.record('acct', 'OCO_1', 'set', {'status': 'completed'})
+    store.record('other', 'GRID_1', 'create', {'status': 'active'})
+    
+    replayed = store.load('acct')
+    assert list(replayed) == ['GRID_1']
+    assert replayed['GRID_1']['slots'] == [None, {'order_id': 7}]
+    assert replayed['GRID_1']['fills'] == [2, 3, 4]
+    
+    store.snapshot('acct', store.load('acct', active_only=False))
+    assert store.stats()['journal_rows'] == 1
+    store.record('acct', 'GRID_1', 'set', {'total_trades': 5})
+    
+    restored = store.load('acct')
+    assert restored['GRID_1']['fills'] == [2, 3, 4]
+    assert restored['GRID_1']['total_trades'] == 5
+    print(f"✅ Journal replay and snapshots agree: {store.stats()}")
+
+
+def test_recover_thousand_grids():
+    """A restarted bot resumes 1,000 grids with one open-orders call per symbol."""
+    path = os.path.join(tempfile.mkdtemp(), 'strategies.db')
+    client = FakeClient()
+    
+    first = make_bot(client, StrategyStore(path))
+    for i in range(1000):
+        grid = first.start_grid_trading(SYMBOLS[i % len(SYMBOLS)], 90, 110, 4, 0.01)
+        assert grid['success'], grid
+    first.snapshot_strategies()
+    
+    # Fills handled before the crash land in the journal tail
+    filled_before = next(iter(client.open['BTCUSDT']))
+    client.fill('BTCUSDT', filled_before)
+    first.order_watcher.poll()
+    first.scheduler.shutdown()
+    
+    # Fills that happen while nothing is running
+    missed = [next(iter(client.open[symbol])) for symbol in SYMBOLS]
+    for symbol, order_id in zip(SYMBOLS, missed):
+        client.fill(symbol, order_id)
+    
+    client.calls.clear()
+    second = make_bot(client, StrategyStore(path))
+    started = time.monotonic()
+    result = second.recover_strategies()
+    elapsed = time.monotonic() - started
+    
+    assert result['success'] and result['recovered'] == {'GRID': 1000}, result
+    open_calls = [c for c in client.calls if c[0] == 'openOrders']
+    lookups = [c for c in client.calls if c[0] == 'order']
+    assert len(open_calls) == len(SYMBOLS), open_calls
+    assert sorted(order_id for _, order_id in lookups) == sorted(missed)
+    assert sum(s['total_trades'] for s in second.active_strategies.values()) == 1 + len(missed)
+    assert all(s['active_orders'] == 4 for s in second.active_strategies.values())
+    assert elapsed < 10
+    second.scheduler.shutdown()
+    print(f"✅ Recovered 1000 grids in {elapsed:.2f}s with {len(client.calls)} requests")
+
+
+def test_snapshot_during_changes():
+    """Snapshots taken while a strategy changes never store a change twice."""
+    store = StrategyStore(':memory:')
+    bot = make_bot(FakeClient(), store)
+    with bot._state_lock:
+        bot.active_strategies['TWAP_1'] = {'type': 'TWAP', 'symbol': 'BTCUSDT', 'orders': [], 'status': 'active'}
+        bot._journal('TWAP_1', 'create', bot.active_strategies['TWAP_1'])
+    
+    def place_slices():
+        strategy = bot.active_strategies['TWAP_1']
+        for i in range(200):
+            with bot._state_lock:
+                strategy['orders'].append({'order_id': i})
+                # Widen the gap between a change and its journal entry
+                time.sleep(0.001)
+                bot._journal('TWAP_1', 'append', {'key': 'orders', 'value': {'order_id': i}})
+    
+    worker = threading.Thread(target=place_slices)
+    worker.start()
+    while worker.is_alive():
+        bot.snapshot_strategies()
+        # What a restart at this moment would see
+        orders = store.load(bot.account)['TWAP_1']['orders']
+        assert [o['order_id'] for o in orders] == list(range(len(orders))), orders[-3:]
+    worker.join()
+    bot.snapshot_strategies()
+    
+    orders = store.load(bot.account)['TWAP_1']['orders']
+    assert [o['order_id'] for o in orders] == list(range(200))
+    bot.scheduler.shutdown()
+    print("✅ Snapshots and journal agree under concurrent changes")
+
+
+def test_finished_strategies_purged():
+    """Finished strategies leave the store at the next snapshot."""
+    store = StrategyStore(':memory:')
+    bot = make_bot(FakeClient(), store)
+    for sid in ('OCO_1', 'OCO_2'):
+        with bot._state_lock:
+            bot.active_strategies[sid] = {'type': 'OCO', 'symbol': 'BTCUSDT', 'status': 'active'}
+            bot._journal(sid, 'create', bot.active_strategies[sid])
+    assert bot.snapshot_strategies() == 2
+    
+    bot._set_status('OCO_1', 'completed')
+    assert bot.snapshot_strategies() == 1
+    assert list(store.load(bot.account, active_only=False)) == ['OCO_2']
+    
+    # Late changes to a purged strategy are not journaled again
+    bot._journal('OCO_1', 'set', {'note': 'late'})
+    stats = store.stats()
+    assert stats['snapshot_rows'] == 1 and stats['journal_rows'] == 0, stats
+    bot.scheduler.shutdown()
+    print("✅ Finished strategies purged from the store")
+
+
+def test_recover_all_at_startup():
+    """Startup recovery builds a bot only for accounts with stored strategies."""
+    store = StrategyStore(':memory:')
+    client = FakeClient()
+    first = make_bot(client, store)
+    assert first.start_grid_trading('BTCUSDT', 90, 110, 4, 0.01)['success']
+    first.scheduler.shutdown()
+    
+    class RestartedClient(FakeClient):
+        def __init__(self, api_key, api_secret, testnet):
+            super().__init__()
+            self.open = client.open
+            self.final = client.final
+    
+    credentials = [('unused-key', 'secret', True), (FakeClient.API_KEY, 'secret', True), (FakeClient.API_KEY, 'secret', True)]
+    # Keep the fake symbols out of the shared exchange info cache
+    cache = ExchangeInfoCache(background_refresh=False)
+    shared_cache, advanced_orders.get_exchange_info_cache = advanced_orders.get_exchange_info_cache, lambda testnet: cache
+    try:
+        results = recover_all(credentials, store=store, client_class=RestartedClient, use_user_stream=False)
+        assert list(results) == [account_id(FakeClient.API_KEY)], results
+        assert results[account_id(FakeClient.API_KEY)]['recovered'] == {'GRID': 1}
+        assert len(advanced_orders._recovered_bots) == 1
+    finally:
+        for bot in advanced_orders._recovered_bots:
+            for sid in bot.active_strategies:
+                bot._stop_strategy(sid)
+        advanced_orders._recovered_bots.clear()
+        advanced_orders.get_exchange_info_cache = shared_cache
+    print("✅ Stored strategies recovered at startup")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Testing Strategy Store")
+    print("=" * 60)
+    
+    try:
+        test_journal_replay_and_snapshot()
+        test_recover_thousand_grids()
+        test_snapshot_during_changes()
+        test_finished_strategies_purged()
+        test_recover_all_at_startup()
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+    
+    print("=" * 60)
+    print("All strategy store tests passed ✅")
+    print("=" * 60)
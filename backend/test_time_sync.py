@@ -0,0 +1,124 @@
+"""
+Test script for server-time synchronisation of signed requests.
+Runs offline against a stand-in client whose "exchange" clock is skewed.
+"""
+
+import json
+import sys
+import time
+
+from binance.exceptions import BinanceAPIException
+
+from bot.time_sync import TimeSync, get_time_sync
+from bot.transport import prepare_client
+
+
+class FakeResponse:
+    status_code = 400
+    headers = {}
+    
+    def __init__(self, code, msg):
+        self.text = json.dumps({'code': code, 'msg': msg})
+
+
+class SkewedClient:
+    """Checks signed timestamps the way the exchange does, against a skewed clock."""
+    
+    testnet = True
+    API_KEY = 'key'
+    
+    def __init__(self, host, skew_ms):
+        self.FUTURES_TESTNET_URL = host
+        self.skew_ms = skew_ms
+        self.timestamp_offset = 0
+        self.response = None
+        self.signed_calls = []
+    
+    def server_ms(self):
+        return time.time() * 1000 + self.skew_ms
+    
+    def _request(self, method, uri, signed, force_params=False, **kwargs):
+        if not signed:
+            return {'serverTime': int(self.server_ms())}
+        data = kwargs['data']
+        timestamp = int(time.time() * 1000 + self.timestamp_offset)
+        self.signed_calls.append(dict(data))
+        if timestamp > self.server_ms() + 1000 or self.server_ms() - timestamp > data['recvWindow']:
+            response = FakeResponse(-1021, 'Timestamp for this request is outside of the recvWindow.')
+            raise BinanceAPIException(response, 400, response.text)
+        return {'ok': True}
+    
+    def futures_time(self):
+        return self._request('get', self.FUTURES_TESTNET_URL + '/v1/time', False, True)
+    
+    def futures_account(self, **params):
+        return self._request('get', self.FUTURES_TESTNET_URL + '/v2/account', True, True, data=params)
+
+
+def test_estimate_uses_best_sample():
+    """The lowest-latency sample sets the offset; jitter widens recvWindow."""
+    sync = TimeSync(min_recv_window_ms=100, max_recv_window_ms=60000)
+    sync.add_sample(1000, 1600, 1400)
+    sync.add_sample(2000, 2510, 2020)
+    assert sync.offset_ms == 500
+    
+    for i in range(6):
+        sync.add_sample(3000, 3500, 3000 + (10 if i % 2 else 900))
+    assert sync.recv_window_ms > 1000
+    assert TimeSync(min_recv_window_ms=5000).recv_window_ms == 5000
+    print(f"✅ Estimate: {sync.stats()}")
+
+
+def test_first_signed_request_syncs():
+    """An 8 s skew is measured before the first signed request goes out."""
+    client = prepare_client(SkewedClient('https://skew-a.test/fapi', skew_ms=8000))
+    
+    assert client.futures_account() == {'ok': True}
+    assert len(client.signed_calls) == 1
+    assert client.signed_calls[0]['recvWindow'] == 5000
+    assert abs(client.timestamp_offset - 8000) < 50
+    print(f"✅ Offset applied: {client.timestamp_offset} ms")
+
+
+def test_timestamp_error_retried_once():
+    """A -1021 after drift resyncs and retries exactly once."""
+    client = prepare_client(SkewedClient('https://skew-b.test/fapi', skew_ms=0))
+    sync = get_time_sync('https://skew-b.test/fapi')
+    params = {'symbol': 'BTCUSDT'}
+    
+    client.futures_account(**params)
+    client.skew_ms = 20000
+    assert client.futures_account(**params) == {'ok': True}
+    assert len(client.signed_calls) == 3 and sync.retries == 1
+    assert params == {'symbol': 'BTCUSDT'}
+    
+    # A time endpoint that disagrees with the signing check fails after one retry
+    client.skew_ms = 40000
+    original_time = client.futures_time
+    client.futures_time = lambda: {'serverTime': int(time.time() * 1000 + 20000)}
+    try:
+        client.futures_account()
+        raise AssertionError("second -1021 was swallowed")
+    except BinanceAPIException as e:
+        assert e.code == -1021
+    client.futures_time = original_time
+    assert sync.retries == 2
+    print(f"✅ -1021 retried once: {sync.stats()}")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Testing Time Sync")
+    print("=" * 60)
+    
+    try:
+        test_estimate_uses_best_sample()
+        test_first_signed_request_syncs()
+        test_timestamp_error_retried_once()
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+    
+    print("=" * 60)
+    print("All time sync tests passed ✅")
+    print("=" * 60)
@@ -0,0 +1,127 @@
+"""
+Test script for the dashboard trade statistics.
+Runs offline against an in-memory SQLite database.
+"""
+
+import sys
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from config import settings
+from database import Base
+from models import BotConfig, OrderSide, OrderStatus, OrderType, Trade, TradeStatusCount, User
+from trade_stats import _track_status_changes, dashboard_stats, install_counters, rebuild_counters
+
+
+def make_session_factory():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def add_user(db, name):
+    user = User(email=f"{name}@example.com", username=name, hashed_password="x")
+    db.add(user)
+    db.flush()
+    return user
+
+
+def add_trades(db, user, statuses):
+    for status in statuses:
+        db.add(Trade(
+            user_id=user.id, symbol="BTCUSDT", side=OrderSide.BUY,
+            order_type=OrderType.MARKET, quantity=0.01, status=status
+        ))
+    db.commit()
+
+
+def counter_rows(db, user_id):
+    rows = db.query(TradeStatusCount).filter(TradeStatusCount.user_id == user_id).all()
+    return {row.status: row.count for row in rows if row.count}
+
+
+def test_grouped_counts():
+    """One grouped query gives every dashboard count."""
+    factory = make_session_factory()
+    with factory() as db:
+        alice = add_user(db, "alice")
+        bob = add_user(db, "bob")
+        add_trades(db, alice, [OrderStatus.FILLED] * 3 + [OrderStatus.FAILED, OrderStatus.PENDING, OrderStatus.CANCELLED])
+        add_trades(db, bob, [OrderStatus.FILLED])
+        db.add(BotConfig(user_id=alice.id, name="main", api_key="k", api_secret="s"))
+        db.commit()
+        alice_id = alice.id
+        
+        statements = []
+        event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+        stats = dashboard_stats(db, alice_id)
+    
+    assert stats['total_trades'] == 6
+    assert stats['successful_trades'] == 3
+    assert stats['failed_trades'] == 1
+    assert stats['pending_trades'] == 1
+    assert stats['active_bot_configs'] == 1
+    assert len(statements) == 2, statements
+    print(f"✅ Grouped counts in {len(statements)} queries: {stats}")
+
+
+def test_counters_follow_trades():
+    """The counter table matches the grouped counts across inserts, updates and deletes."""
+    factory = make_session_factory()
+    install_counters(factory)
+    settings.TRADE_STATS_COUNTERS = True
+    try:
+        with factory() as db:
+            alice = add_user(db, "alice")
+            add_trades(db, alice, [OrderStatus.PENDING] * 4)
+            
+            trades = db.query(Trade).filter(Trade.user_id == alice.id).all()
+            trades[0].status = OrderStatus.FILLED
+            trades[1].status = OrderStatus.FAILED
+            db.delete(trades[2])
+            db.commit()
+            
+            assert counter_rows(db, alice.id) == {
+                OrderStatus.PENDING: 1, OrderStatus.FILLED: 1, OrderStatus.FAILED: 1
+            }, counter_rows(db, alice.id)
+            stats = dashboard_stats(db, alice.id)
+            assert stats['total_trades'] == 3
+            assert stats['successful_trades'] == 1
+            
+            db.delete(alice)
+            db.commit()
+            assert db.query(TradeStatusCount).count() == 0
+    finally:
+        settings.TRADE_STATS_COUNTERS = False
+        event.remove(factory, 'before_flush', _track_status_changes)
+    print("✅ Counters follow inserts, status changes and deletes")
+
+
+def test_rebuild_counters():
+    """Rebuilding backfills counters for trades written without the listener."""
+    factory = make_session_factory()
+    with factory() as db:
+        alice = add_user(db, "alice")
+        add_trades(db, alice, [OrderStatus.FILLED, OrderStatus.FILLED, OrderStatus.PENDING])
+        rebuild_counters(db)
+        assert counter_rows(db, alice.id) == {OrderStatus.FILLED: 2, OrderStatus.PENDING: 1}
+    print("✅ Counters rebuilt from trades")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Testing Trade Stats")
+    print("=" * 60)
+    
+    try:
+        test_grouped_counts()
+        test_counters_follow_trades()
+        test_rebuild_counters()
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+    
+    print("=" * 60)
+    print("All trade stats tests passed ✅")
+    print("=" * 60)
@@ -0,0 +1,122 @@
+"""
+Test script for the authenticated-user cache.
+Runs offline against an in-memory SQLite database.
+"""
+
+import sys
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from auth import create_access_token, get_current_user
+from database import Base
+from models import Note, User
+from routes.users import delete_profile, update_profile
+from schemas import UserUpdate
+from user_cache import UserCache, user_cache
+
+
+def make_factory():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with factory() as db:
+        db.add(User(email="alice@example.com", username="alice", hashed_password="x"))
+        db.commit()
+    user_cache.clear()
+    return engine, factory
+
+
+def authenticate(factory, username):
+    token = create_access_token({"sub": username})
+    db = factory()
+    return get_current_user(token=token, db=db), db
+
+
+def count_queries(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_hit_skips_database():
+    """The second request for a user makes no query and gets an attached user."""
+    engine, factory = make_factory()
+    authenticate(factory, "alice")
+    
+    statements = count_queries(engine)
+    user, db = authenticate(factory, "alice")
+    assert statements == [], statements
+    assert user in db
+    
+    db.add(Note(user_id=user.id, title="hello"))
+    db.commit()
+    assert [note.title for note in user.notes] == ["hello"]
+    print(f"✅ Cache hit with no query: {user_cache.stats()}")
+
+
+def test_profile_changes_invalidate():
+    """Renaming, deactivating and deleting a user drop the cached entry."""
+    engine, factory = make_factory()
+    user, db = authenticate(factory, "alice")
+    update_profile(UserUpdate(username="alice2"), current_user=user, db=db)
+    try:
+        authenticate(factory, "alice")
+        raise AssertionError("old username still authenticates")
+    except Exception as e:
+        assert getattr(e, 'status_code', None) == 401, e
+    
+    user, db = authenticate(factory, "alice2")
+    user.is_active = False
+    db.commit()
+    try:
+        authenticate(factory, "alice2")
+        raise AssertionError("deactivated user still authenticates")
+    except Exception as e:
+        assert getattr(e, 'status_code', None) == 400, e
+    
+    user.is_active = True
+    db.commit()
+    user, db = authenticate(factory, "alice2")
+    delete_profile(current_user=user, db=db)
+    assert user_cache.stats()['size'] == 0
+    print("✅ Rename, deactivate and delete invalidate the cache")
+
+
+def test_lru_and_ttl():
+    """Entries are bounded in number and expire."""
+    engine, factory = make_factory()
+    cache = UserCache(max_size=2, ttl_seconds=60)
+    with factory() as db:
+        for name in ("bob", "carol", "dave"):
+            db.add(User(email=f"{name}@example.com", username=name, hashed_password="x"))
+        db.commit()
+        for user in db.query(User).filter(User.username != "alice"):
+            cache.put(user)
+        assert cache.stats()['size'] == 2 and cache.evictions == 1
+        assert cache.get("bob", db) is None
+        
+        cache.ttl_seconds = 0.01
+        time.sleep(0.02)
+        assert cache.get("dave", db) is None
+    print("✅ LRU bound and TTL expiry")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Testing User Cache")
+    print("=" * 60)
+    
+    try:
+        test_hit_skips_database()
+        test_profile_changes_invalidate()
+        test_lru_and_ttl()
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+    
+    print("=" * 60)
+    print("All user cache tests passed ✅")
+    print("=" * 60)
@@ -0,0 +1,177 @@
+"""
+Test script for the user-data stream and stream-driven strategy monitors.
+Runs offline; stream messages are fed in directly.
+"""
+
+import sys
+import threading
+import time
+
+from bot import advanced_orders
+from bot.advanced_orders import AdvancedOrderBot
+from bot.user_stream import UserDataStream
+
+
+class FakeClient:
+    """Answers the listenKey endpoints and records cancels."""
+    
+    testnet = True
+    API_KEY = 'key'
+    
+    def __init__(self):
+        self.cancelled = []
+        self.polled = 0
+    
+    def _request(self, method, uri, signed, force_params=False, **kwargs):
+        raise AssertionError("unexpected REST call")
+    
+    def futures_stream_get_listen_key(self):
+        return 'listen-key'
+    
+    def futures_cancel_order(self, symbol, orderId):
+        self.cancelled.append(orderId)
+        return {'orderId': orderId, 'status': 'CANCELED'}
+    
+    def futures_get_order(self, symbol, orderId):
+        self.polled += 1
+        return {'orderId': orderId, 'status': 'NEW'}
+
+
+def order_event(order_id, status, symbol='BTCUSDT'):
+    return {
+        'e': 'ORDER_TRADE_UPDATE',
+        'E': 1700000000000,
+        'T': 1700000000000,
+        'o': {
+            's': symbol, 'c': 'cid', 'S': 'SELL', 'o': 'LIMIT', 'q': '0.010',
+            'p': '45000', 'ap': '45000', 'x': 'TRADE', 'X': status, 'i': order_id,
+            'l': '0.010', 'z': '0.010', 'L': '45000'
+        }
+    }
+
+
+def connected_stream(client):
+    stream = UserDataStream(client, testnet=True)
+    stream.connection.connected = True
+    return stream
+
+
+def test_dispatch_and_replay():
+    """Updates reach the order's callback, including ones that arrived first."""
+    stream = connected_stream(FakeClient())
+    received = []
+    done = threading.Event()
+    
+    stream._handle_message(order_event(7, 'FILLED'))
+    stream.on_order(7, lambda update: (received.append(update), done.set()))
+    
+    assert done.wait(1)
+    assert received[0]['status'] == 'FILLED' and received[0]['filled_quantity'] == 0.01
+    print(f"✅ Replayed update: {received[0]['order_id']} {received[0]['status']}")
+
+
+def test_account_update_decoding():
+    """ACCOUNT_UPDATE events are flattened for listeners."""
+    stream = connected_stream(FakeClient())
+    received = []
+    done = threading.Event()
+    stream.add_account_listener(lambda update: (received.append(update), done.set()))
+    
+    stream._handle_message({
+        'e': 'ACCOUNT_UPDATE',
+        'E': 1700000000000,
+        'a': {
+            'm': 'ORDER',
+            'B': [{'a': 'USDT', 'wb': '1000.5', 'cw': '1000.5'}],
+            'P': [{'s': 'BTCUSDT', 'pa': '0.01', 'ep': '45000', 'up': '1.2', 'ps': 'BOTH'}]
+        }
+    })
+    
+    assert done.wait(1)
+    assert received[0]['balances'][0]['wallet_balance'] == 1000.5
+    assert received[0]['positions'][0]['position_amount'] == 0.01
+    print("✅ Account update decoded")
+
+
+def test_oco_sibling_cancelled_on_fill():
+    """A take-profit fill cancels the stop loss without polling."""
+    client = FakeClient()
+    bot = AdvancedOrderBot(client)
+    bot.user_stream = connected_stream(client)
+    bot.active_strategies['OCO_1'] = {'type': 'OCO', 'symbol': 'BTCUSDT'}
+    
+    bot._monitor_oco_orders('OCO_1', 'BTCUSDT', 1, 2)
+    
+    started = time.monotonic()
+    bot.user_stream._handle_message(order_event(1, 'FILLED'))
+    while not client.cancelled and time.monotonic() - started < 1:
+        time.sleep(0.001)
+    elapsed = time.monotonic() - started
+    while 'status' not in bot.active_strategies['OCO_1'] and time.monotonic() - started < 5:
+        time.sleep(0.001)
+    
+    assert client.cancelled == [2]
+    assert client.polled == 0
+    assert bot.active_strategies['OCO_1']['status'] == 'completed'
+    print(f"✅ Sibling cancelled {elapsed * 1000:.1f} ms after fill")
+
+
+class OutageClient(FakeClient):
+    """The take profit filled while the stream was down."""
+    
+    def __init__(self):
+        super().__init__()
+        self.open_orders_calls = []
+    
+    def futures_get_open_orders(self, symbol):
+        self.open_orders_calls.append(symbol)
+        return [{'orderId': 2, 'status': 'NEW'}]
+    
+    def futures_get_order(self, symbol, orderId):
+        self.polled += 1
+        return {'orderId': orderId, 'status': 'FILLED'}
+
+
+def test_reconnect_reconciles_missed_fills():
+    """A reconnect triggers one REST poll that picks up fills made during the outage."""
+    client = OutageClient()
+    stream = UserDataStream(client, testnet=True)
+    shared_stream, advanced_orders.get_user_stream = advanced_orders.get_user_stream, lambda client: stream
+    try:
+        bot = AdvancedOrderBot(client)
+        bot.active_strategies['OCO_1'] = {'type': 'OCO', 'symbol': 'BTCUSDT'}
+        bot._monitor_oco_orders('OCO_1', 'BTCUSDT', 1, 2)
+    finally:
+        advanced_orders.get_user_stream = shared_stream
+    
+    # Healthy again: regular polling is off, so only the reconnect poll runs
+    stream.connection.connected = True
+    stream._handle_connect()
+    started = time.monotonic()
+    while 'status' not in bot.active_strategies['OCO_1'] and time.monotonic() - started < 5:
+        time.sleep(0.001)
+    
+    assert client.open_orders_calls == ['BTCUSDT']
+    assert client.polled == 1 and client.cancelled == [2]
+    assert bot.active_strategies['OCO_1']['status'] == 'completed'
+    stream.stop()
+    print("✅ Fills missed during an outage reconciled on reconnect")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Testing User Data Stream")
+    print("=" * 60)
+    
+    try:
+        test_dispatch_and_replay()
+        test_account_update_decoding()
+        test_oco_sibling_cancelled_on_fill()
+        test_reconnect_reconciles_missed_fills()
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+    
+    print("=" * 60)
+    print("All user stream tests passed ✅")
+    print("=" * 60)
@@ -0,0 +1,214 @@
+"""
+Streaming export of trade history.
+Rows are read from a server-side cursor in chunks and encoded straight to
+CSV, NDJSON or Parquet, without building ORM objects, so an export holds
+one chunk in memory however many trades it covers.
+"""
+
+import csv
+import enum
+import io
+import json
+import logging
+import zlib
+from datetime import datetime, timezone
+from typing import Callable, Iterator, List, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from config import settings
+from models import OrderStatus, Trade
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+EXPORT_COLUMNS = [
+    Trade.id, Trade.bot_config_id, Trade.binance_order_id, Trade.symbol, Trade.side,
+    Trade.order_type, Trade.status, Trade.quantity, Trade.executed_quantity, Trade.price,
+    Trade.stop_price, Trade.executed_at, Trade.error_message, Trade.created_at, Trade.updated_at,
+]
+COLUMN_NAMES = [column.key for column in EXPORT_COLUMNS]
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+
+def _plain(value):
+    """Enum members as their value and datetimes as ISO 8601."""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def iter_chunks(
+    session_factory: Callable[[], Session],
+    user_id: int,
+    symbol: Optional[str] = None,
+    status: Optional[OrderStatus] = None,
+    chunk_rows: Optional[int] = None
+) -> Iterator[Sequence[tuple]]:
+    """
+    Yield a user's trades, oldest first, as lists of row tuples.
+    
+    The session is opened here rather than taken from the request, because
+    a streamed body outlives the request's dependencies.
+    """
+    query = select(*EXPORT_COLUMNS).where(Trade.user_id == user_id)
+    if symbol:
+        query = query.where(Trade.symbol == symbol.upper())
+    if status:
+        query = query.where(Trade.status == status)
+    query = query.order_by(Trade.created_at, Trade.id)
+    
+    with session_factory() as db:
+        result = db.execute(query.execution_options(yield_per=chunk_rows or settings.EXPORT_CHUNK_ROWS))
+        for partition in result.partitions():
+            yield partition
+
+
+def encode_csv(chunks: Iterator[Sequence[tuple]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMN_NAMES)
+    for rows in chunks:
+        writer.writerows([_plain(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def encode_ndjson(chunks: Iterator[Sequence[tuple]]) -> Iterator[bytes]:
+    for rows in chunks:
+        lines = [json.dumps(dict(zip(COLUMN_NAMES, map(_plain, row)))) for row in rows]
+        yield ('\n'.join(lines) + '\n').encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands written bytes back to the stream."""
+    
+    def __init__(self):
+        self.parts: List[bytes] = []
+        self.position = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self.position
+    
+    def drain(self) -> bytes:
+        data = b''.join(self.parts)
+        self.parts.clear()
+        return data
+
+
+def _parquet_schema():
+    types = {
+        'id': pa.int64(), 'bot_config_id': pa.int64(),
+        'quantity': pa.float64(), 'executed_quantity': pa.float64(),
+        'price': pa.float64(), 'stop_price': pa.float64(),
+        'executed_at': pa.timestamp('us', tz='UTC'),
+        'created_at': pa.timestamp('us', tz='UTC'),
+        'updated_at': pa.timestamp('us', tz='UTC'),
+    }
+    return pa.schema([(name, types.get(name, pa.string())) for name in COLUMN_NAMES])
+
+
+def _parquet_value(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        # Naive values are read as UTC by the timestamp column
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def encode_parquet(chunks: Iterator[Sequence[tuple]]) -> Iterator[bytes]:
+    """One Parquet row group per chunk, streamed as each is written."""
+    schema = _parquet_schema()
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for rows in chunks:
+            columns = list(zip(*rows))
+            table = pa.Table.from_arrays(
+                [pa.array([_parquet_value(v) for v in values], type=field.type)
+                 for values, field in zip(columns, schema)],
+                schema=schema
+            )
+            writer.write_table(table)
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+ENCODERS = {
+    'csv': encode_csv,
+    'ndjson': encode_ndjson,
+    'parquet': encode_parquet,
+}
+
+
+def gzip_stream(parts: Iterator[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)  # 31: gzip container
+    for part in parts:
+        data = compressor.compress(part)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_trades(
+    session_factory: Callable[[], Session],
+    user_id: int,
+    fmt: str,
+    symbol: Optional[str] = None,
+    status: Optional[OrderStatus] = None,
+    gzip: bool = False,
+    chunk_rows: Optional[int] = None
+) -> Iterator[bytes]:
+    """
+    Byte stream of a user's trades in ``fmt``.
+    
+    Args:
+        session_factory: Opens the session the export reads from
+        user_id: Owner of the trades
+        fmt: One of EXPORT_FORMATS
+        symbol: Optional symbol filter
+        status: Optional status filter
+        gzip: Compress the stream as a .gz file
+        chunk_rows: Rows per database fetch (default EXPORT_CHUNK_ROWS)
+    
+    Returns:
+        Iterator of encoded byte chunks
+    """
+    if fmt not in ENCODERS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    if fmt == 'parquet' and not PARQUET_AVAILABLE:
+        raise RuntimeError("Parquet export requires pyarrow")
+    
+    logger.info(f"Exporting trades for user {user_id} as {fmt}{' (gzip)' if gzip else ''}")
+    stream = ENCODERS[fmt](iter_chunks(session_factory, user_id, symbol, status, chunk_rows))
+    return gzip_stream(stream) if gzip else stream
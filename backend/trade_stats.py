@@ -0,0 +1,124 @@
+"""
+Dashboard trade statistics.
+Status counts come from one grouped query over trades, or, with
+TRADE_STATS_COUNTERS enabled, from a per-user counter table that is kept
+current in the same transaction whenever trades are inserted, change status
+or are deleted.
+"""
+
+import logging
+from collections import Counter
+from typing import Dict, Tuple
+
+from sqlalchemy import delete, event, func, inspect, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from config import settings
+from models import BotConfig, OrderStatus, Trade, TradeStatusCount, User
+
+logger = logging.getLogger(__name__)
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE
+UPSERT_DIALECTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+def count_by_status(db: Session, user_id: int) -> Dict[OrderStatus, int]:
+    """Trade counts per status for a user, in one grouped query."""
+    if settings.TRADE_STATS_COUNTERS:
+        rows = db.query(TradeStatusCount.status, TradeStatusCount.count).filter(
+            TradeStatusCount.user_id == user_id
+        ).all()
+    else:
+        rows = db.query(Trade.status, func.count(Trade.id)).filter(
+            Trade.user_id == user_id
+        ).group_by(Trade.status).all()
+    return {status: count for status, count in rows}
+
+
+def dashboard_stats(db: Session, user_id: int) -> Dict[str, float]:
+    """Fields of DashboardStats for a user."""
+    counts = count_by_status(db, user_id)
+    active_bot_configs = db.query(func.count(BotConfig.id)).filter(
+        BotConfig.user_id == user_id,
+        BotConfig.is_active == True
+    ).scalar()
+    
+    return {
+        'total_trades': sum(counts.values()),
+        'successful_trades': counts.get(OrderStatus.FILLED, 0),
+        'failed_trades': counts.get(OrderStatus.FAILED, 0),
+        'pending_trades': counts.get(OrderStatus.PENDING, 0),
+        'total_profit': 0.0,  # This would require calculating P&L
+        'active_bot_configs': active_bot_configs
+    }
+
+
+def rebuild_counters(db: Session) -> None:
+    """Recompute the counter table from trades (startup backfill)."""
+    db.execute(delete(TradeStatusCount))
+    db.execute(insert(TradeStatusCount).from_select(
+        ['user_id', 'status', 'count'],
+        select(Trade.user_id, Trade.status, func.count(Trade.id)).group_by(Trade.user_id, Trade.status)
+    ))
+    db.commit()
+    logger.info("Trade status counters rebuilt")
+
+
+def _status_deltas(session: Session) -> Counter:
+    deltas: Counter = Counter()
+    for obj in session.new:
+        if isinstance(obj, Trade):
+            deltas[(obj.user_id, obj.status or OrderStatus.PENDING)] += 1
+    for obj in session.dirty:
+        if isinstance(obj, Trade):
+            history = inspect(obj).attrs.status.history
+            if history.added and history.deleted and history.added[0] != history.deleted[0]:
+                deltas[(obj.user_id, history.deleted[0])] -= 1
+                deltas[(obj.user_id, history.added[0])] += 1
+    for obj in session.deleted:
+        if isinstance(obj, Trade):
+            deltas[(obj.user_id, inspect(obj).attrs.status.loaded_value)] -= 1
+    return deltas
+
+
+def _apply_deltas(session: Session, deltas: Dict[Tuple[int, OrderStatus], int]) -> None:
+    dialect = session.get_bind().dialect.name
+    for (user_id, status), delta in deltas.items():
+        if not delta:
+            continue
+        if dialect in UPSERT_DIALECTS:
+            # Atomic, so concurrent first trades for a user cannot collide
+            stmt = UPSERT_DIALECTS[dialect](TradeStatusCount).values(user_id=user_id, status=status, count=delta)
+            session.execute(stmt.on_conflict_do_update(
+                index_elements=['user_id', 'status'],
+                set_={'count': TradeStatusCount.count + delta}
+            ))
+            continue
+        updated = session.execute(
+            update(TradeStatusCount)
+            .where(TradeStatusCount.user_id == user_id, TradeStatusCount.status == status)
+            .values(count=TradeStatusCount.count + delta)
+        )
+        if updated.rowcount == 0:
+            session.execute(insert(TradeStatusCount).values(user_id=user_id, status=status, count=delta))
+
+
+def _track_status_changes(session: Session, flush_context, instances) -> None:
+    deltas = _status_deltas(session)
+    removed_users = {obj.id for obj in session.deleted if isinstance(obj, User)}
+    if removed_users:
+        # Their counter rows go with them; the rows reference users.id
+        session.execute(delete(TradeStatusCount).where(TradeStatusCount.user_id.in_(removed_users)))
+        deltas = Counter({key: delta for key, delta in deltas.items() if key[0] not in removed_users})
+    if deltas:
+        _apply_deltas(session, deltas)
+
+
+def install_counters(session_factory) -> None:
+    """Keep TradeStatusCount current for sessions made by ``session_factory``."""
+    if not event.contains(session_factory, 'before_flush', _track_status_changes):
+        event.listen(session_factory, 'before_flush', _track_status_changes)
@@ -0,0 +1,141 @@
+"""
+Process-wide cache of authenticated users.
+Saves the users lookup that every authenticated request would otherwise
+make after verifying its token.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import NO_VALUE
+
+from config import settings
+from models import User
+
+logger = logging.getLogger(__name__)
+
+
+class UserCache:
+    """
+    LRU/TTL cache of users keyed by token subject (the username).
+    
+    Entries are detached copies holding only column values. ``get`` merges
+    one into the request's session without a query, so routes receive an
+    attached User they can update, delete or lazy-load relationships from.
+    Entries expire after ``ttl_seconds`` and are invalidated when a profile
+    changes, is deleted or is (de)activated.
+    """
+    
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 30):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_size: Maximum number of users kept
+            ttl_seconds: Reload a user from the database after this many seconds
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_size > 0
+    
+    def get(self, username: str, db: Session) -> Optional[User]:
+        """
+        Return the cached user attached to ``db``, or None on a miss.
+        
+        Args:
+            username: Token subject
+            db: Session of the current request
+        """
+        if not self.enabled:
+            return None
+        
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None or now - entry['loaded_at'] >= self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[username]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(username)
+            self.hits += 1
+            user = entry['user']
+        
+        return db.merge(user, load=False)
+    
+    def put(self, user: User) -> None:
+        """Cache a user just loaded from the database."""
+        if not self.enabled:
+            return
+        
+        # A copy, so the cache never holds an instance bound to a session
+        copy = User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+        make_transient_to_detached(copy)
+        
+        with self._lock:
+            self._entries[user.username] = {'user': copy, 'loaded_at': time.monotonic()}
+            self._entries.move_to_end(user.username)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def invalidate(self, username: Optional[str]) -> bool:
+        """
+        Drop the cached user for a token subject.
+        
+        Returns:
+            True if an entry was removed
+        """
+        with self._lock:
+            if self._entries.pop(username, None) is None:
+                return False
+        
+        logger.info(f"User cache: invalidated {username}")
+        return True
+    
+    def clear(self) -> None:
+        """Drop every cached user."""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return cache size and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+# Shared cache used by auth.get_current_user
+user_cache = UserCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS
+)
+
+
+@event.listens_for(User.is_active, 'set', active_history=True)
+def _invalidate_on_active_change(target: User, value, oldvalue, initiator) -> None:
+    # Whatever code path (de)activates an account, stop serving the old state;
+    # objects being built (no previous value) are not cached under any name yet
+    if oldvalue is not NO_VALUE and value != oldvalue:
+        user_cache.invalidate(target.username)